@@ -0,0 +1,204 @@
+"""
+Rolling correlation matrix over a date-aligned close panel.
+
+The correlation monitor used to fetch both legs of every pair and run a
+pure-Python Pearson per pair, so SPY was downloaded once per pair it
+appeared in. This engine takes each distinct ticker's closes once, aligns
+them on a common date index and computes every pairwise correlation at once:
+
+  - rolling(): the full (T, N, N) series of window correlations, one NumPy
+    pass over cumulative sums of the per-bar outer products.
+  - current() / baseline(): the latest window and baseline matrices, kept as
+    running sums so append() folds in a new (or revised) bar in O(N^2)
+    instead of recomputing the panel.
+
+Missing bars (a ticker halted, or not listed for part of the lookback) are
+handled pairwise: each pair uses only the dates where both legs have a close,
+and a pair with fewer than min_fraction of the window in common is NaN.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Correlation window and baseline (trading days).
+WINDOW = 20
+BASELINE_WINDOW = 60
+# Share of a window a pair must have in common for its correlation to count.
+MIN_FRACTION = 0.8
+
+
+def align_closes(closes: Dict[str, Dict[date, float]]) -> Tuple[List[date], List[str], np.ndarray]:
+    """
+    Stack {ticker: {date: close}} into a (T, N) panel with NaN for gaps.
+
+    The date index keeps only sessions at least half the tickers traded, so a
+    24/7 symbol does not add weekend rows that every equity is missing.
+    """
+    tickers = [t for t, series in closes.items() if series]
+    counts: Dict[date, int] = {}
+    for t in tickers:
+        for d in closes[t]:
+            counts[d] = counts.get(d, 0) + 1
+    quorum = max(1, (len(tickers) + 1) // 2)
+    dates = sorted(d for d, n in counts.items() if n >= quorum)
+    row = {d: i for i, d in enumerate(dates)}
+    panel = np.full((len(dates), len(tickers)), np.nan)
+    for j, t in enumerate(tickers):
+        for d, close in closes[t].items():
+            i = row.get(d)
+            if i is not None and close is not None:
+                panel[i, j] = close
+    return dates, tickers, panel
+
+
+def _moments(x: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Pairwise-complete sums for a (T, N) block: n, Sx, Sxx, Sxy (each N x N)."""
+    mask = ~np.isnan(x)
+    m = mask.astype(float)
+    x0 = np.where(mask, x, 0.0)
+    # Sx[i, j] = sum of x_i over dates where both i and j are present.
+    return m.T @ m, x0.T @ m, (x0 * x0).T @ m, x0.T @ x0
+
+
+def _row_moments(row: np.ndarray) -> Tuple[np.ndarray, ...]:
+    mask = ~np.isnan(row)
+    m = mask.astype(float)
+    x0 = np.where(mask, row, 0.0)
+    return np.outer(m, m), np.outer(x0, m), np.outer(x0 * x0, m), np.outer(x0, x0)
+
+
+def _corr(n, sx, sxx, sxy, min_periods: int) -> np.ndarray:
+    sy, syy = np.swapaxes(sx, -1, -2), np.swapaxes(sxx, -1, -2)
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var_x * var_y)
+    corr = np.where((n >= min_periods) & (var_x > 0) & (var_y > 0), corr, np.nan)
+    return np.clip(corr, -1.0, 1.0)
+
+
+class CorrelationEngine:
+    def __init__(self, window: int = WINDOW, baseline_window: int = BASELINE_WINDOW,
+                 min_fraction: float = MIN_FRACTION):
+        self.window = window
+        self.baseline_window = baseline_window
+        self.min_fraction = min_fraction
+        self.dates: List[date] = []
+        self.tickers: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._panel = np.empty((0, 0))
+        self._ref = np.empty(0)
+        self._sums: Dict[int, List[np.ndarray]] = {}
+
+    @classmethod
+    def from_closes(cls, closes: Dict[str, Dict[date, float]], **kwargs) -> "CorrelationEngine":
+        engine = cls(**kwargs)
+        engine.load(closes)
+        return engine
+
+    def load(self, closes: Dict[str, Dict[date, float]]) -> None:
+        self.dates, self.tickers, panel = align_closes(closes)
+        self._index = {t: j for j, t in enumerate(self.tickers)}
+        # Centre each column on its first close: same correlations, and the
+        # running sums stay small enough that add/subtract does not drift.
+        first = np.array([col[~np.isnan(col)][0] if (~np.isnan(col)).any() else 0.0 for col in panel.T])
+        self._ref = first
+        self._panel = panel - first
+        self._sums = {w: list(_moments(self._panel[-w:])) for w in (self.window, self.baseline_window)}
+
+    # ── incremental ──────────────────────────────────────────────────
+
+    def append(self, day: date, closes: Dict[str, float]) -> None:
+        """
+        Fold in one session's closes. A day already in the panel (an intraday
+        revision of today's bar) replaces that row; an older day is ignored.
+        Tickers not loaded are ignored.
+        """
+        row = np.full(len(self.tickers), np.nan)
+        for t, close in closes.items():
+            j = self._index.get(t)
+            if j is not None and close is not None:
+                row[j] = close - self._ref[j]
+
+        if self.dates and day == self.dates[-1]:
+            old = self._panel[-1].copy()
+            self._panel[-1] = row
+            for sums in self._sums.values():
+                self._shift(sums, add=row, drop=old)
+            return
+        if self.dates and day < self.dates[-1]:
+            return
+
+        self.dates.append(day)
+        self._panel = np.vstack([self._panel, row])
+        for w, sums in self._sums.items():
+            leaving = self._panel[-w - 1] if len(self._panel) > w else None
+            self._shift(sums, add=row, drop=leaving)
+        # Keep only what the widest window can still need.
+        keep = max(self._sums)
+        if len(self._panel) > keep * 4:
+            self._panel = self._panel[-keep:]
+            self.dates = self.dates[-keep:]
+
+    @staticmethod
+    def _shift(sums: List[np.ndarray], add: np.ndarray, drop: Optional[np.ndarray]) -> None:
+        for k, part in enumerate(_row_moments(add)):
+            sums[k] += part
+        if drop is not None:
+            for k, part in enumerate(_row_moments(drop)):
+                sums[k] -= part
+
+    # ── results ──────────────────────────────────────────────────────
+
+    def _min_periods(self, window: int) -> int:
+        return max(5, int(np.ceil(window * self.min_fraction)))
+
+    def current(self) -> np.ndarray:
+        return _corr(*self._sums[self.window], self._min_periods(self.window))
+
+    def baseline(self) -> np.ndarray:
+        return _corr(*self._sums[self.baseline_window], self._min_periods(self.baseline_window))
+
+    def rolling(self, window: Optional[int] = None) -> np.ndarray:
+        """(T, N, N) correlations of each trailing window; rows before the first full window are NaN."""
+        window = window or self.window
+        mask = ~np.isnan(self._panel)
+        m = mask.astype(float)
+        x0 = np.where(mask, self._panel, 0.0)
+        t, n = x0.shape
+        cum = [np.zeros((t + 1, n, n)) for _ in range(4)]
+        cum[0][1:] = np.cumsum(m[:, :, None] * m[:, None, :], axis=0)
+        cum[1][1:] = np.cumsum(x0[:, :, None] * m[:, None, :], axis=0)
+        cum[2][1:] = np.cumsum((x0 * x0)[:, :, None] * m[:, None, :], axis=0)
+        cum[3][1:] = np.cumsum(x0[:, :, None] * x0[:, None, :], axis=0)
+        out = np.full((t, n, n), np.nan)
+        if t >= window:
+            sums = [c[window:] - c[:-window] for c in cum]
+            out[window - 1:] = _corr(*sums, self._min_periods(window))
+        return out
+
+    def pair(self, a: str, b: str) -> Optional[Dict[str, float]]:
+        """Current/baseline/delta for one pair, or None when either side is missing."""
+        i, j = self._index.get(a), self._index.get(b)
+        if i is None or j is None:
+            return None
+        current, baseline = self.current()[i, j], self.baseline()[i, j]
+        if np.isnan(current) or np.isnan(baseline):
+            return None
+        return {
+            "current": round(float(current), 3),
+            "baseline": round(float(baseline), 3),
+            "delta": round(float(current - baseline), 3),
+        }
+
+    def matrix(self, tickers: Optional[Iterable[str]] = None, decimals: int = 3) -> Dict[str, object]:
+        """Current matrix as JSON-friendly {"tickers", "values"} (NaN -> None)."""
+        names = list(tickers) if tickers is not None else list(self.tickers)
+        idx = [self._index[t] for t in names if t in self._index]
+        names = [self.tickers[k] for k in idx]
+        sub = self.current()[np.ix_(idx, idx)]
+        values = [[None if np.isnan(v) else round(float(v), decimals) for v in row] for row in sub]
+        return {"tickers": names, "values": values}
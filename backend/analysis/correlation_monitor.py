@@ -5,15 +5,21 @@ Tracks rolling correlations between key asset pairs and flags breakdowns.
 When historically correlated pairs diverge, it signals regime stress or
 dislocation that the committee and regime bar should know about.
 
+Each distinct ticker is fetched once and every pair is read off one
+correlation matrix (analysis/correlation_engine.py).
+
 Scheduled: Daily at 4:30 PM ET (after close).
 Stores results in Redis key `regime:correlations`.
 """
 
+import asyncio
 import json
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+from analysis.correlation_engine import CorrelationEngine
+
 logger = logging.getLogger(__name__)
 
 # Asset pairs to monitor — (ticker_a, ticker_b, label)
@@ -28,6 +34,16 @@ CORRELATION_PAIRS = [
     ("XLE", "SPY", "XLE vs SPY (energy)"),
 ]
 
+# Every sector ETF against equities, bonds, the dollar and bitcoin. Exchange-
+# traded proxies (UUP for DXY, IBIT for BTC) keep them on the equity calendar
+# and on the bar feed the other legs already use. Reported in `sector_pairs`
+# without alerts: a low XLU/IBIT correlation is normal, not a dislocation.
+SECTOR_ETFS = ["XLK", "XLF", "XLV", "XLY", "XLC", "XLI", "XLP", "XLE", "XLU", "XLRE", "XLB"]
+CROSS_ASSETS = [("SPY", "SPY"), ("TLT", "TLT"), ("UUP", "DXY"), ("IBIT", "BTC")]
+SECTOR_PAIRS = [
+    (etf, ticker, f"{etf} vs {name}") for etf in SECTOR_ETFS for ticker, name in CROSS_ASSETS
+]
+
 # Rolling window (trading days)
 ROLLING_WINDOW = 20
 # Lookback for bar data (needs extra days for weekends/holidays)
@@ -38,8 +54,8 @@ COLLAPSE_DELTA = 0.40
 DECORRELATED_THRESHOLD = 0.30
 
 
-async def fetch_close_series(ticker: str, days: int = LOOKBACK_DAYS) -> Optional[List[float]]:
-    """Fetch daily close prices from Polygon."""
+async def fetch_closes(ticker: str, days: int = LOOKBACK_DAYS) -> Optional[Dict[date, float]]:
+    """Fetch daily closes keyed by session date."""
     try:
         from integrations.uw_api import get_bars
     except ModuleNotFoundError:
@@ -53,59 +69,42 @@ async def fetch_close_series(ticker: str, days: int = LOOKBACK_DAYS) -> Optional
     if not bars:
         return None
 
-    closes = [b["c"] for b in bars if b.get("c") is not None]
-    return closes if len(closes) >= ROLLING_WINDOW + 5 else None
-
-
-def compute_rolling_correlation(
-    series_a: List[float], series_b: List[float], window: int = ROLLING_WINDOW
-) -> Optional[Dict[str, Any]]:
-    """
-    Compute rolling Pearson correlation between two close-price series.
-    Returns current correlation, baseline (full-window average), and delta.
-    """
-    # Align lengths
-    min_len = min(len(series_a), len(series_b))
-    a = series_a[-min_len:]
-    b = series_b[-min_len:]
-
-    if len(a) < window + 5:
-        return None
-
-    # Full-period baseline correlation
-    baseline_corr = _pearson(a, b)
-
-    # Recent window correlation
-    recent_a = a[-window:]
-    recent_b = b[-window:]
-    current_corr = _pearson(recent_a, recent_b)
-
-    if baseline_corr is None or current_corr is None:
-        return None
-
-    delta = current_corr - baseline_corr
-
-    return {
-        "current": round(current_corr, 3),
-        "baseline": round(baseline_corr, 3),
-        "delta": round(delta, 3),
+    closes = {
+        datetime.fromtimestamp(b["t"] / 1000, tz=timezone.utc).date(): b["c"]
+        for b in bars if b.get("c") is not None and b.get("t") is not None
     }
+    return closes if len(closes) >= ROLLING_WINDOW + 5 else None
 
 
-def _pearson(x: List[float], y: List[float]) -> Optional[float]:
-    """Simple Pearson correlation without numpy dependency."""
-    n = len(x)
-    if n < 5:
-        return None
-    mean_x = sum(x) / n
-    mean_y = sum(y) / n
-    cov = sum((xi - mean_x) * (yi - mean_y) for xi, yi in zip(x, y))
-    var_x = sum((xi - mean_x) ** 2 for xi in x)
-    var_y = sum((yi - mean_y) ** 2 for yi in y)
-    denom = (var_x * var_y) ** 0.5
-    if denom == 0:
-        return None
-    return cov / denom
+async def load_engine(tickers: List[str]) -> CorrelationEngine:
+    """Fetch each distinct ticker once and build the correlation engine."""
+    fetched = await asyncio.gather(*(fetch_closes(t) for t in tickers), return_exceptions=True)
+    closes: Dict[str, Dict[date, float]] = {}
+    for ticker, result in zip(tickers, fetched):
+        if isinstance(result, Exception):
+            logger.warning("Correlation bars fetch failed for %s: %s", ticker, result)
+        elif result:
+            closes[ticker] = result
+    return CorrelationEngine.from_closes(closes, window=ROLLING_WINDOW, baseline_window=LOOKBACK_DAYS)
+
+
+def _pair_result(engine: CorrelationEngine, ticker_a: str, ticker_b: str, label: str) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {"pair": label, "ticker_a": ticker_a, "ticker_b": ticker_b}
+    if ticker_a not in engine.tickers or ticker_b not in engine.tickers:
+        entry["status"] = "no_data"
+        return entry
+    corr = engine.pair(ticker_a, ticker_b)
+    if not corr:
+        entry["status"] = "insufficient_data"
+        return entry
+    entry.update(corr)
+    if abs(corr["delta"]) >= COLLAPSE_DELTA:
+        entry["status"] = "collapse"
+    elif abs(corr["current"]) < DECORRELATED_THRESHOLD:
+        entry["status"] = "decorrelated"
+    else:
+        entry["status"] = "normal"
+    return entry
 
 
 async def run_correlation_scan() -> Dict[str, Any]:
@@ -118,68 +117,31 @@ async def run_correlation_scan() -> Dict[str, Any]:
     except ModuleNotFoundError:
         from backend.database.redis_client import get_redis_client
 
+    pairs = CORRELATION_PAIRS + SECTOR_PAIRS
+    tickers = list(dict.fromkeys(t for a, b, _ in pairs for t in (a, b)))
+    engine = await load_engine(tickers)
+
     results: List[Dict[str, Any]] = []
     alerts: List[str] = []
-
     for ticker_a, ticker_b, label in CORRELATION_PAIRS:
-        try:
-            series_a = await fetch_close_series(ticker_a)
-            series_b = await fetch_close_series(ticker_b)
-
-            if not series_a or not series_b:
-                results.append({
-                    "pair": label,
-                    "ticker_a": ticker_a,
-                    "ticker_b": ticker_b,
-                    "status": "no_data",
-                })
-                continue
-
-            corr = compute_rolling_correlation(series_a, series_b)
-            if not corr:
-                results.append({
-                    "pair": label,
-                    "ticker_a": ticker_a,
-                    "ticker_b": ticker_b,
-                    "status": "insufficient_data",
-                })
-                continue
-
-            # Determine alert status
-            status = "normal"
-            if abs(corr["delta"]) >= COLLAPSE_DELTA:
-                status = "collapse"
-                alerts.append(f"{label}: corr dropped {corr['delta']:+.2f} (now {corr['current']:.2f})")
-            elif abs(corr["current"]) < DECORRELATED_THRESHOLD:
-                status = "decorrelated"
-                alerts.append(f"{label}: decorrelated at {corr['current']:.2f}")
-
-            results.append({
-                "pair": label,
-                "ticker_a": ticker_a,
-                "ticker_b": ticker_b,
-                "current": corr["current"],
-                "baseline": corr["baseline"],
-                "delta": corr["delta"],
-                "status": status,
-            })
-
-        except Exception as e:
-            logger.warning("Correlation scan error for %s: %s", label, e)
-            results.append({
-                "pair": label,
-                "ticker_a": ticker_a,
-                "ticker_b": ticker_b,
-                "status": f"error: {e}",
-            })
-
-    from datetime import datetime, timezone
+        entry = _pair_result(engine, ticker_a, ticker_b, label)
+        if entry["status"] == "collapse":
+            alerts.append(f"{label}: corr dropped {entry['delta']:+.2f} (now {entry['current']:.2f})")
+        elif entry["status"] == "decorrelated":
+            alerts.append(f"{label}: decorrelated at {entry['current']:.2f}")
+        results.append(entry)
+
+    sector_results = [_pair_result(engine, a, b, label) for a, b, label in SECTOR_PAIRS]
+
     payload = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "pairs": results,
         "alerts": alerts,
         "collapse_count": sum(1 for r in results if r.get("status") == "collapse"),
         "decorrelated_count": sum(1 for r in results if r.get("status") == "decorrelated"),
+        "sector_pairs": sector_results,
+        "matrix": engine.matrix(),
+        "tickers_fetched": len(engine.tickers),
     }
 
     # Cache to Redis
@@ -187,8 +149,9 @@ async def run_correlation_scan() -> Dict[str, Any]:
         redis = await get_redis_client()
         await redis.setex("regime:correlations", 86400, json.dumps(payload))
         logger.info(
-            "Correlation scan complete: %d pairs, %d collapses, %d decorrelated",
-            len(results), payload["collapse_count"], payload["decorrelated_count"],
+            "Correlation scan complete: %d pairs (+%d sector) from %d tickers, %d collapses, %d decorrelated",
+            len(results), len(sector_results), len(engine.tickers),
+            payload["collapse_count"], payload["decorrelated_count"],
         )
     except Exception as e:
         logger.error("Failed to cache correlation results: %s", e)
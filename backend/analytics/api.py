@@ -36,6 +36,13 @@ from analytics.computations import (
     safe_div,
     std_dev,
 )
+from analytics.backtest_engine import (
+    EXIT_REASONS,
+    BacktestLeg,
+    index_bars,
+    simulate,
+    summarize_columns,
+)
 from analytics.queries import (
     close_trade,
     fetch_rows,
@@ -44,7 +51,7 @@ from analytics.queries import (
     get_factor_rows,
     get_latest_benchmarks,
     get_latest_portfolio_snapshots,
-    get_price_bars,
+    get_price_bars_bulk,
     get_schema_table_summary,
     get_signal_stats_rows,
     get_signals_for_backtest,
@@ -59,6 +66,7 @@ from analytics.queries import (
 )
 from analytics.robinhood_parser import parse_robinhood_csv_bytes
 from utils.json_sanitize import dumps_jsonb
+from utils.memory_cache import MemoryCache
 # (log_signal import removed 2026-07-21 with the /log-signal endpoint --
 #  this module no longer writes to `signals` directly.)
 
@@ -66,9 +74,13 @@ logger = logging.getLogger(__name__)
 
 analytics_router = APIRouter()
 
-_BACKTEST_CACHE: Dict[str, Dict[str, Any]] = {}
 _BACKTEST_CACHE_TTL_SECONDS = 600
+_BACKTEST_CACHE = MemoryCache(
+    "analytics.backtest", ttl=_BACKTEST_CACHE_TTL_SECONDS, max_entries=64, max_bytes=32 * 1024 * 1024,
+)
 _CONVICTION_ORDER = {"WATCH": 1, "MODERATE": 2, "HIGH": 3}
+_BACKTEST_WINDOW = timedelta(days=5)
+_BACKTEST_MAX_SWEEP_COMBOS = 400
 
 
 class BacktestParams(BaseModel):
@@ -81,6 +93,11 @@ class BacktestParams(BaseModel):
     min_conviction: Optional[str] = None
     require_convergence: bool = False
     bias_must_align: bool = False
+    # Parameter sweep (synthetic % distances, every stop x target pair). When
+    # either list is set the response gains a "sweep" array; a missing list
+    # falls back to the single stop/target_distance_pct above.
+    stop_distance_pcts: Optional[List[float]] = None
+    target_distance_pcts: Optional[List[float]] = None
 
 
 class BacktestRequest(BaseModel):
@@ -470,18 +487,21 @@ def _backtest_cache_key(body: BacktestRequest) -> str:
 
 
 def _maybe_get_cached_backtest(key: str) -> Optional[Dict[str, Any]]:
-    cached = _BACKTEST_CACHE.get(key)
-    if not cached:
-        return None
-    age = datetime.utcnow() - cached["created_at"]
-    if age.total_seconds() > _BACKTEST_CACHE_TTL_SECONDS:
-        _BACKTEST_CACHE.pop(key, None)
-        return None
-    return cached["payload"]
+    return _BACKTEST_CACHE.get(key)
 
 
 def _set_cached_backtest(key: str, payload: Dict[str, Any]) -> None:
-    _BACKTEST_CACHE[key] = {"created_at": datetime.utcnow(), "payload": payload}
+    _BACKTEST_CACHE.set(key, payload)
+
+
+def _backtest_sweep_grid(params: BacktestParams) -> Optional[List[Tuple[float, float]]]:
+    if not params.stop_distance_pcts and not params.target_distance_pcts:
+        return None
+    stops = params.stop_distance_pcts or [params.stop_distance_pct]
+    targets = params.target_distance_pcts or [params.target_distance_pct]
+    if any(v <= 0 for v in stops) or any(v <= 0 for v in targets):
+        raise HTTPException(status_code=400, detail="Sweep distances must be positive percentages")
+    return [(float(stop), float(target)) for stop in stops for target in targets]
 
 
 @analytics_router.get("/signal-stats")
@@ -1839,6 +1859,13 @@ async def run_backtest(request: BacktestRequest, _=Depends(require_api_key)):
     target_field = request.params.target_field  # "target_1" or "target_2"
     risk_per_trade = max(request.params.risk_per_trade, 1.0)
 
+    sweep_grid = _backtest_sweep_grid(request.params)
+    if sweep_grid is not None and len(sweep_grid) > _BACKTEST_MAX_SWEEP_COMBOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep has {len(sweep_grid)} stop/target combinations (max {_BACKTEST_MAX_SWEEP_COMBOS})",
+        )
+
     trades: List[Dict[str, Any]] = []
     cumulative = 0.0
     equity_curve: List[Dict[str, Any]] = [{"date": request.start_date, "cumulative_pnl": 0.0}]
@@ -1846,6 +1873,11 @@ async def run_backtest(request: BacktestRequest, _=Depends(require_api_key)):
     returns: List[float] = []
     skipped_no_levels = 0
 
+    # Prepare legs (entry + levels) for every usable signal. Synthetic levels
+    # for the sweep are computed per leg inside the engine, so every leg with
+    # an entry is eligible there even in native mode.
+    legs: List[BacktestLeg] = []
+    sweep_legs: List[BacktestLeg] = []
     for signal in signals:
         ticker = str(signal.get("ticker") or "").upper()
         if not ticker:
@@ -1862,7 +1894,8 @@ async def run_backtest(request: BacktestRequest, _=Depends(require_api_key)):
         if entry <= 0:
             continue
 
-        dir_label = direction_label(signal.get("direction"))
+        bullish = direction_label(signal.get("direction")) == "BULLISH"
+        sweep_legs.append(BacktestLeg(signal, ticker, ts, entry, bullish))
         if use_native:
             # Use signal's own stop/target levels
             native_stop = _as_float(signal.get("stop_loss"))
@@ -1875,63 +1908,30 @@ async def run_backtest(request: BacktestRequest, _=Depends(require_api_key)):
 
             stop_price = native_stop
             target_price = native_target
-
-            if dir_label == "BULLISH":
-                risk_per_share = max(entry - stop_price, 0.0001)
-            else:
-                risk_per_share = max(stop_price - entry, 0.0001)
         else:
             # Synthetic mode (old behavior) - apply uniform % distances
-            if dir_label == "BULLISH":
+            if bullish:
                 stop_price = entry * (1.0 - stop_pct)
                 target_price = entry * (1.0 + target_pct)
-                risk_per_share = max(entry - stop_price, 0.0001)
             else:
                 stop_price = entry * (1.0 + stop_pct)
                 target_price = entry * (1.0 - target_pct)
-                risk_per_share = max(stop_price - entry, 0.0001)
-
-        qty = risk_per_trade / risk_per_share
-        end_ts = ts + timedelta(days=5)
-        bars = await get_price_bars(ticker=ticker, timeframe="5m", start_ts=ts, end_ts=end_ts)
-        if not bars:
-            continue
-
-        exit_reason = "time_exit"
-        exit_price = _as_float(bars[-1].get("close"), entry)
-        last_bar_ts = ts
-        for bar in bars:
-            bar_ts = bar.get("timestamp")
-            if isinstance(bar_ts, datetime):
-                last_bar_ts = bar_ts
-            bar_high = _as_float(bar.get("high"), entry)
-            bar_low = _as_float(bar.get("low"), entry)
-            bar_close = _as_float(bar.get("close"), entry)
-            if dir_label == "BULLISH":
-                if bar_low <= stop_price:
-                    exit_price = stop_price
-                    exit_reason = "stop_hit"
-                    break
-                if bar_high >= target_price:
-                    exit_price = target_price
-                    exit_reason = "target_hit"
-                    break
-            else:
-                if bar_high >= stop_price:
-                    exit_price = stop_price
-                    exit_reason = "stop_hit"
-                    break
-                if bar_low <= target_price:
-                    exit_price = target_price
-                    exit_reason = "target_hit"
-                    break
-            exit_price = bar_close
+        legs.append(BacktestLeg(signal, ticker, ts, entry, bullish, stop_price, target_price))
+
+    # One bulk bar load for every signal's 5-day window (was one query per signal).
+    bar_legs = sweep_legs if sweep_grid is not None else legs
+    bars = index_bars(
+        await get_price_bars_bulk(
+            [(leg.ticker, leg.ts, leg.ts + _BACKTEST_WINDOW) for leg in bar_legs],
+            timeframe="5m",
+        )
+    )
 
-        if dir_label == "BULLISH":
-            pnl = (exit_price - entry) * qty
-        else:
-            pnl = (entry - exit_price) * qty
-        rr = pnl / risk_per_trade
+    sim = simulate(legs, bars, risk_per_trade, _BACKTEST_WINDOW)
+    for i, leg in enumerate(sim.legs):
+        pnl = float(sim.pnl[i, 0])
+        rr = float(sim.rr[i, 0])
+        last_bar_ts = sim.exit_stamp[i][0]
 
         cumulative += pnl
         date_label = last_bar_ts.date().isoformat()
@@ -1939,23 +1939,38 @@ async def run_backtest(request: BacktestRequest, _=Depends(require_api_key)):
 
         trades.append(
             {
-                "signal_id": signal.get("signal_id"),
-                "ticker": ticker,
-                "direction": dir_label,
-                "signal_type": signal.get("signal_type"),
-                "entry_date": ts.date().isoformat(),
-                "entry_price": round(entry, 4),
-                "stop_price": round(stop_price, 4),
-                "target_price": round(target_price, 4),
-                "exit_price": round(exit_price, 4),
+                "signal_id": leg.signal.get("signal_id"),
+                "ticker": leg.ticker,
+                "direction": direction_label(leg.signal.get("direction")),
+                "signal_type": leg.signal.get("signal_type"),
+                "entry_date": leg.ts.date().isoformat(),
+                "entry_price": round(leg.entry, 4),
+                "stop_price": round(leg.stop, 4),
+                "target_price": round(leg.target, 4),
+                "exit_price": round(float(sim.exit_price[i, 0]), 4),
                 "pnl": round(pnl, 3),
                 "rr_achieved": round(rr, 2),
-                "exit_reason": exit_reason,
+                "exit_reason": EXIT_REASONS[int(sim.exit_code[i, 0])],
             }
         )
         rr_values.append(rr)
         returns.append(safe_div(pnl, risk_per_trade))
 
+    sweep: Optional[List[Dict[str, Any]]] = None
+    if sweep_grid is not None:
+        sweep_sim = simulate(
+            sweep_legs,
+            bars,
+            risk_per_trade,
+            _BACKTEST_WINDOW,
+            stop_pcts=[stop / 100.0 for stop, _ in sweep_grid],
+            target_pcts=[target / 100.0 for _, target in sweep_grid],
+        )
+        sweep = [
+            {"stop_distance_pct": stop, "target_distance_pct": target, **stats}
+            for (stop, target), stats in zip(sweep_grid, summarize_columns(sweep_sim, risk_per_trade))
+        ]
+
     wins = [t for t in trades if t["pnl"] > 0]
     win_rate = safe_div(len(wins), len(trades))
     _, max_drawdown_dollars, _, _ = compute_max_drawdown(equity_curve)
@@ -1975,6 +1990,8 @@ async def run_backtest(request: BacktestRequest, _=Depends(require_api_key)):
             "trades": trades,
         },
     }
+    if sweep is not None:
+        payload["sweep"] = sweep
     _set_cached_backtest(cache_key, payload)
     return payload
 
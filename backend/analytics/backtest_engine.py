@@ -0,0 +1,258 @@
+"""
+Vectorized bar-walk engine for /analytics/backtest.
+
+Bars for every signal come from one bulk load (queries.get_price_bars_bulk)
+and are held per ticker as sorted NumPy arrays. A signal's 5-day window is a
+searchsorted slice of its ticker's arrays, and first touches are found without
+a Python bar loop: on the running min of lows / running max of highs, the
+first bar that reaches a level is a searchsorted lookup. That works for a whole
+grid of stop/target levels at once, which is what makes parameter sweeps cheap.
+
+Exit rules match the original per-bar loop exactly:
+  - a bar that touches the stop exits at the stop, even if it also touches the
+    target (stop is checked first);
+  - otherwise the first bar touching the target exits at the target;
+  - otherwise the trade exits at the last bar's close ("time_exit");
+  - missing high/low/close values fall back to the entry price.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analytics.computations import compute_sharpe, safe_div
+
+EXIT_STOP = 0
+EXIT_TARGET = 1
+EXIT_TIME = 2
+EXIT_REASONS = ("stop_hit", "target_hit", "time_exit")
+
+MIN_RISK_PER_SHARE = 0.0001
+
+
+def _epoch_us(value: datetime) -> int:
+    """Naive timestamps are treated as UTC, as get_price_bars does."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
+
+
+class TickerBars:
+    """One ticker's bars as parallel arrays sorted by timestamp."""
+
+    __slots__ = ("ts", "high", "low", "close", "stamps")
+
+    def __init__(self, rows: Sequence[Dict[str, Any]]):
+        rows = [r for r in rows if isinstance(r.get("timestamp"), datetime)]
+        ts = np.array([_epoch_us(r["timestamp"]) for r in rows], dtype=np.int64)
+        order = np.argsort(ts, kind="stable")
+        self.ts = ts[order]
+        self.high = np.array([r.get("high") for r in rows], dtype=float)[order]
+        self.low = np.array([r.get("low") for r in rows], dtype=float)[order]
+        self.close = np.array([r.get("close") for r in rows], dtype=float)[order]
+        self.stamps: List[datetime] = [rows[i]["timestamp"] for i in order]
+
+    def window(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """[lo, hi) bar indices with start <= timestamp <= end."""
+        lo = int(np.searchsorted(self.ts, _epoch_us(start), side="left"))
+        hi = int(np.searchsorted(self.ts, _epoch_us(end), side="right"))
+        return lo, hi
+
+
+def index_bars(bars_by_ticker: Dict[str, Sequence[Dict[str, Any]]]) -> Dict[str, TickerBars]:
+    return {ticker: TickerBars(rows) for ticker, rows in bars_by_ticker.items()}
+
+
+def first_touches(
+    high: np.ndarray,
+    low: np.ndarray,
+    stops: np.ndarray,
+    targets: np.ndarray,
+    bullish: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First bar index at which each stop / each target is touched (len(high)
+    when never touched). Vectorized over the level arrays.
+    """
+    falling = -np.minimum.accumulate(low)   # non-decreasing
+    rising = np.maximum.accumulate(high)    # non-decreasing
+    if bullish:
+        stop_idx = np.searchsorted(falling, -stops, side="left")
+        target_idx = np.searchsorted(rising, targets, side="left")
+    else:
+        stop_idx = np.searchsorted(rising, stops, side="left")
+        target_idx = np.searchsorted(falling, -targets, side="left")
+    return stop_idx, target_idx
+
+
+def resolve_exits(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    stops: np.ndarray,
+    targets: np.ndarray,
+    bullish: bool,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(exit_idx, exit_price, exit_code) per stop/target pair."""
+    n = len(close)
+    stop_idx, target_idx = first_touches(high, low, stops, targets, bullish)
+    stop_hit = (stop_idx < n) & (stop_idx <= target_idx)
+    target_hit = ~stop_hit & (target_idx < n)
+    exit_idx = np.where(stop_hit, stop_idx, np.where(target_hit, target_idx, n - 1))
+    exit_price = np.where(stop_hit, stops, np.where(target_hit, targets, close[n - 1]))
+    exit_code = np.where(stop_hit, EXIT_STOP, np.where(target_hit, EXIT_TARGET, EXIT_TIME))
+    return exit_idx, exit_price, exit_code
+
+
+class BacktestLeg:
+    """A signal prepared for simulation."""
+
+    __slots__ = ("signal", "ticker", "ts", "entry", "bullish", "stop", "target")
+
+    def __init__(
+        self,
+        signal: Dict[str, Any],
+        ticker: str,
+        ts: datetime,
+        entry: float,
+        bullish: bool,
+        stop: Optional[float] = None,
+        target: Optional[float] = None,
+    ):
+        self.signal = signal
+        self.ticker = ticker
+        self.ts = ts
+        self.entry = entry
+        self.bullish = bullish
+        self.stop = stop
+        self.target = target
+
+
+def synthetic_levels(
+    entry: float, bullish: bool, stop_pcts: np.ndarray, target_pcts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stop/target prices for fractional distances (0.005 = 0.5%)."""
+    if bullish:
+        return entry * (1.0 - stop_pcts), entry * (1.0 + target_pcts)
+    return entry * (1.0 + stop_pcts), entry * (1.0 - target_pcts)
+
+
+class Simulation:
+    """
+    Result of running legs over K stop/target pairs. Rows are the legs that
+    had bars in their window (in input order); columns are the K pairs.
+    exit_stamp (exit bar timestamps) is only kept for single-pair runs.
+    """
+
+    def __init__(self, legs, stops, targets, exit_price, exit_code, exit_stamp, pnl, rr):
+        self.legs: List[BacktestLeg] = legs
+        self.stops: np.ndarray = stops
+        self.targets: np.ndarray = targets
+        self.exit_price: np.ndarray = exit_price
+        self.exit_code: np.ndarray = exit_code
+        self.exit_stamp: List[List[datetime]] = exit_stamp
+        self.pnl: np.ndarray = pnl
+        self.rr: np.ndarray = rr
+
+
+def simulate(
+    legs: Sequence[BacktestLeg],
+    bars: Dict[str, TickerBars],
+    risk_per_trade: float,
+    window: timedelta,
+    stop_pcts: Optional[Sequence[float]] = None,
+    target_pcts: Optional[Sequence[float]] = None,
+) -> Simulation:
+    """
+    Walk every leg's bar window. With stop_pcts/target_pcts (paired,
+    equal-length fractional distances) each leg is evaluated at all K pairs;
+    without them each leg uses its own stop/target (K = 1).
+    """
+    grid = stop_pcts is not None
+    if grid:
+        s_pcts = np.asarray(stop_pcts, dtype=float)
+        t_pcts = np.asarray(target_pcts, dtype=float)
+        k = len(s_pcts)
+    else:
+        k = 1
+
+    kept: List[BacktestLeg] = []
+    stops_rows, targets_rows, price_rows, code_rows, pnl_rows = [], [], [], [], []
+    stamp_rows: List[List[datetime]] = []
+
+    for leg in legs:
+        series = bars.get(leg.ticker)
+        if series is None:
+            continue
+        lo, hi = series.window(leg.ts, leg.ts + window)
+        if hi <= lo:
+            continue
+        entry = leg.entry
+        high = np.nan_to_num(series.high[lo:hi], nan=entry)
+        low = np.nan_to_num(series.low[lo:hi], nan=entry)
+        close = np.nan_to_num(series.close[lo:hi], nan=entry)
+
+        if grid:
+            stops, targets = synthetic_levels(entry, leg.bullish, s_pcts, t_pcts)
+        else:
+            stops = np.array([leg.stop], dtype=float)
+            targets = np.array([leg.target], dtype=float)
+
+        exit_idx, exit_price, exit_code = resolve_exits(high, low, close, stops, targets, leg.bullish)
+        if leg.bullish:
+            risk_per_share = np.maximum(entry - stops, MIN_RISK_PER_SHARE)
+            pnl = (exit_price - entry) * (risk_per_trade / risk_per_share)
+        else:
+            risk_per_share = np.maximum(stops - entry, MIN_RISK_PER_SHARE)
+            pnl = (entry - exit_price) * (risk_per_trade / risk_per_share)
+
+        kept.append(leg)
+        stops_rows.append(stops)
+        targets_rows.append(targets)
+        price_rows.append(exit_price)
+        code_rows.append(exit_code)
+        pnl_rows.append(pnl)
+        if not grid:
+            stamp_rows.append([series.stamps[lo + int(i)] for i in exit_idx])
+
+    def _matrix(rows, dtype=float):
+        return np.vstack(rows).astype(dtype) if rows else np.empty((0, k), dtype=dtype)
+
+    pnl = _matrix(pnl_rows)
+    return Simulation(
+        legs=kept,
+        stops=_matrix(stops_rows),
+        targets=_matrix(targets_rows),
+        exit_price=_matrix(price_rows),
+        exit_code=_matrix(code_rows, dtype=np.int8),
+        exit_stamp=stamp_rows,
+        pnl=pnl,
+        rr=pnl / risk_per_trade,
+    )
+
+
+def summarize_columns(sim: Simulation, risk_per_trade: float) -> List[Dict[str, Any]]:
+    """Per stop/target pair: the same headline stats /backtest reports."""
+    out: List[Dict[str, Any]] = []
+    for j in range(sim.pnl.shape[1]):
+        pnl = sim.pnl[:, j]
+        rounded = np.round(pnl, 3)
+        equity = np.concatenate(([0.0], np.cumsum(rounded)))
+        drawdown = float(np.min(equity - np.maximum.accumulate(equity))) if len(equity) else 0.0
+        codes = sim.exit_code[:, j]
+        n = len(pnl)
+        out.append({
+            "total_trades": n,
+            "win_rate": round(safe_div(float(np.count_nonzero(rounded > 0)), n), 3),
+            "total_pnl": round(float(rounded.sum()), 3),
+            "avg_rr": round(float(sim.rr[:, j].mean()), 3) if n else 0.0,
+            "max_drawdown": round(drawdown, 3),
+            "sharpe": compute_sharpe((pnl / risk_per_trade).tolist()),
+            "stop_hits": int(np.count_nonzero(codes == EXIT_STOP)),
+            "target_hits": int(np.count_nonzero(codes == EXIT_TARGET)),
+            "time_exits": int(np.count_nonzero(codes == EXIT_TIME)),
+        })
+    return out
@@ -22,16 +22,28 @@ logger = logging.getLogger(__name__)
 # Schema migration
 # ---------------------------------------------------------------------------
 
+_attribution_columns_ready = False
+
+
+async def add_attribution_columns(conn) -> None:
+    """DDL for the attribution columns (also schema migration 2)."""
+    await conn.execute("""
+        ALTER TABLE trades
+            ADD COLUMN IF NOT EXISTS linked_signal_id TEXT,
+            ADD COLUMN IF NOT EXISTS attribution_type  TEXT
+    """)
+
+
 async def ensure_attribution_columns() -> None:
     """Add linked_signal_id and attribution_type columns to trades if they
-    don't already exist.  Safe to call repeatedly."""
+    don't already exist.  Runs the DDL at most once per process."""
+    global _attribution_columns_ready
+    if _attribution_columns_ready:
+        return
     pool = await get_postgres_client()
     async with pool.acquire() as conn:
-        await conn.execute("""
-            ALTER TABLE trades
-                ADD COLUMN IF NOT EXISTS linked_signal_id TEXT,
-                ADD COLUMN IF NOT EXISTS attribution_type  TEXT
-        """)
+        await add_attribution_columns(conn)
+    _attribution_columns_ready = True
     logger.info("ensure_attribution_columns: trades table columns verified")
 
 
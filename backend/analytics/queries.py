@@ -305,6 +305,69 @@ async def get_price_bars(
     return await fetch_rows(query, params)
 
 
+def _merge_bar_ranges(
+    ranges: Sequence[Tuple[str, datetime, datetime]],
+) -> List[Tuple[str, datetime, datetime]]:
+    by_ticker: Dict[str, List[Tuple[datetime, datetime]]] = {}
+    for ticker, start_ts, end_ts in ranges:
+        by_ticker.setdefault(ticker.upper(), []).append((_as_utc(start_ts), _as_utc(end_ts)))
+    merged: List[Tuple[str, datetime, datetime]] = []
+    for ticker in sorted(by_ticker):
+        spans = sorted(by_ticker[ticker])
+        cur_start, cur_end = spans[0]
+        for start_ts, end_ts in spans[1:]:
+            if start_ts <= cur_end:
+                cur_end = max(cur_end, end_ts)
+            else:
+                merged.append((ticker, cur_start, cur_end))
+                cur_start, cur_end = start_ts, end_ts
+        merged.append((ticker, cur_start, cur_end))
+    return merged
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+async def get_price_bars_bulk(
+    ranges: Sequence[Tuple[str, datetime, datetime]],
+    timeframe: str,
+    chunk_size: int = 500,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Bars for many (ticker, start_ts, end_ts) windows, keyed by upper-case ticker.
+
+    Overlapping windows on the same ticker are merged first, so every bar comes
+    back once, and the merged windows are fetched through an unnest() join,
+    chunk_size windows per query, instead of one get_price_bars call each.
+    """
+    merged = _merge_bar_ranges(ranges)
+    query = """
+        SELECT UPPER(ph.ticker) AS ticker, ph.timestamp, ph.open, ph.high, ph.low, ph.close, ph.volume
+        FROM unnest($1::text[], $2::timestamptz[], $3::timestamptz[]) AS w(ticker, start_ts, end_ts)
+        JOIN price_history ph
+          ON UPPER(ph.ticker) = w.ticker
+         AND ph.timeframe = $4
+         AND ph.timestamp >= w.start_ts
+         AND ph.timestamp <= w.end_ts
+        ORDER BY 1, ph.timestamp ASC
+    """
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for i in range(0, len(merged), chunk_size):
+        chunk = merged[i : i + chunk_size]
+        params = [
+            [r[0] for r in chunk],
+            [r[1] for r in chunk],
+            [r[2] for r in chunk],
+            timeframe,
+        ]
+        for row in await fetch_rows(query, params):
+            out.setdefault(row.pop("ticker"), []).append(row)
+    return out
+
+
 async def get_strategy_sources(days: int = 30, ticker: Optional[str] = None) -> List[str]:
     start_dt, end_dt = window_bounds(days=days)
     conditions = ["timestamp >= $1", "timestamp <= $2"]
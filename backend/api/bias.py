@@ -48,7 +48,7 @@ try:
         compute_composite,
         record_factor_reading,
         get_cached_composite,
-        get_latest_reading,
+        get_latest_readings,
         set_override,
         clear_override,
         score_to_bias
@@ -476,8 +476,9 @@ async def get_factor_health():
     statuses: list[str] = []
     unverifiable_count = 0
 
+    latest = await get_latest_readings()
     for factor_id, config in FACTOR_CONFIG.items():
-        reading = await get_latest_reading(factor_id)
+        reading = latest.get(factor_id)
         max_age = timedelta(hours=config["staleness_hours"])
 
         status = "MISSING"
@@ -576,9 +577,13 @@ async def get_composite_timeframes():
         timeframes[tf].append(entry)
 
     # Calculate independent sub-scores per timeframe
-    from bias_engine.composite import score_to_bias, get_reading_before
+    from bias_engine.composite import score_to_bias, get_readings_before
     now = datetime.utcnow()
     lookback = now - timedelta(hours=4)
+    try:
+        readings_4h_ago = await get_readings_before(list(FACTOR_CONFIG), lookback)
+    except Exception:
+        readings_4h_ago = {}
 
     timeframe_results = {}
     for tf_name, factors in timeframes.items():
@@ -597,7 +602,7 @@ async def get_composite_timeframes():
         try:
             old_scores = []
             for f in factors:
-                old_reading = await get_reading_before(f["factor_id"], lookback)
+                old_reading = readings_4h_ago.get(f["factor_id"])
                 if old_reading:
                     old_scores.append((old_reading.score, f["weight"]))
 
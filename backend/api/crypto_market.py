@@ -1,18 +1,25 @@
 """
 Crypto market data proxy for the frontend.
 Provides funding rates, CVD, order flow, and spot/perp basis without CORS issues.
+/market is answered from in-memory per-(symbol, limit) snapshots that
+CryptoSnapshotService refreshes in the background; /market/stats reports
+their ages and per-venue latency / failure rates.
 """
 from fastapi import APIRouter, Query
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import asyncio
 import logging
 import os
 import time
 import httpx
 
-from config.crypto_symbol_matrix import get_symbol_entry, get_tier, is_tracked
+from config.crypto_symbol_matrix import (
+    CRYPTO_SYMBOL_MATRIX, get_binance_futures_symbol, get_symbol_entry, get_tier, is_tracked,
+)
 from jobs.crypto_bars import normalize_crypto_ticker
+from utils.memory_cache import MemoryCache
 
 router = APIRouter(prefix="/crypto", tags=["crypto-market"])
 logger = logging.getLogger(__name__)
@@ -43,17 +50,50 @@ DEFAULT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.8",
 }
 
-_cache: Dict[str, Any] = {"timestamp": 0.0, "data": None}
-CACHE_TTL_SECONDS = 4
-_last_good: Dict[str, Any] = {}
+# Snapshot service: each (symbol, limit) the /market endpoint serves is kept
+# in memory and rebuilt in the background, so a request no longer waits on the
+# exchange fan-out once its key is warm. A key requested within
+# SNAPSHOT_HOT_SECONDS refreshes about as often as it is polled (clamped to
+# SNAPSHOT_REFRESH_SECONDS..SNAPSHOT_IDLE_REFRESH_SECONDS); the tracked symbols
+# (crypto_symbol_matrix) at the default limit stay warm every
+# SNAPSHOT_IDLE_REFRESH_SECONDS with nobody watching. A snapshot older than
+# SNAPSHOT_MAX_AGE_SECONDS (cold key, stalled refresher) is rebuilt inline,
+# concurrent requests sharing one fan-out. With CRYPTO_SNAPSHOT_REFRESH_ENABLED
+# off there is no refresher: snapshots older than SNAPSHOT_UNREFRESHED_TTL_SECONDS
+# are rebuilt inline and idle keys are pruned on request instead.
+DEFAULT_SNAPSHOT_LIMIT = 200
+SNAPSHOT_REFRESH_SECONDS = float(os.getenv("CRYPTO_SNAPSHOT_REFRESH_SECONDS", "5"))
+SNAPSHOT_IDLE_REFRESH_SECONDS = float(os.getenv("CRYPTO_SNAPSHOT_IDLE_REFRESH_SECONDS", "30"))
+SNAPSHOT_REFRESH_ENABLED = os.getenv("CRYPTO_SNAPSHOT_REFRESH_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+SNAPSHOT_HOT_SECONDS = 120
+SNAPSHOT_MAX_AGE_SECONDS = 60
+SNAPSHOT_UNREFRESHED_TTL_SECONDS = 4
+SNAPSHOT_MAX_KEYS = 32
+SNAPSHOT_REFRESH_CONCURRENCY = 3
+
+SnapshotKey = Tuple[str, int]
+
+# Per-(symbol, limit) fallbacks and CVD hysteresis. Both were single global
+# slots, so one symbol's last-good prices and trend state leaked into another's.
+_last_good: Dict[SnapshotKey, Dict[str, Any]] = {}
 _bybit_runtime_disabled = False
-_cvd_trend_state: Dict[str, Any] = {
-    "ema_ratio": None,
-    "direction": "NEUTRAL",
-    "pending_direction": None,
-    "pending_count": 0,
-    "updated_at": None,
-}
+_cvd_trend_state: Dict[SnapshotKey, Dict[str, Any]] = {}
+
+
+def _new_cvd_state() -> Dict[str, Any]:
+    return {
+        "ema_ratio": None,
+        "direction": "NEUTRAL",
+        "pending_direction": None,
+        "pending_count": 0,
+        "updated_at": None,
+    }
+
+
+def _canonical_symbol(symbol: str) -> str:
+    """Binance pair for a tracked bare base ("BTC" -> "BTCUSDT"), else the symbol upper-cased."""
+    normalized = (symbol or "").upper().strip()
+    return get_binance_futures_symbol(normalized) or normalized
 
 
 async def _fetch_json(client: httpx.AsyncClient, url: str, params: Optional[dict] = None) -> Dict[str, Any]:
@@ -68,6 +108,71 @@ async def _fetch_json(client: httpx.AsyncClient, url: str, params: Optional[dict
         return {"ok": False, "error": str(exc)}
 
 
+# Fan-out task -> venue, for per-venue latency / failure accounting.
+_TASK_VENUE = {
+    "binance_spot_price": "binance_spot",
+    "binance_perp_price": "binance_perp",
+    "binance_funding": "binance_perp",
+    "binance_trades": "binance_perp",
+    "coinbase_spot": "coinbase",
+    "okx_spot_price": "okx",
+    "okx_perp_price": "okx",
+    "okx_funding": "okx",
+    "okx_trades": "okx",
+    "bybit_funding": "bybit",
+    "bybit_perp_price": "bybit",
+}
+
+
+class _VenueStats:
+    """Calls, failures (geo-blocks counted separately too) and recent latency for one venue."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.geo_blocked = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[str] = None
+        self._latency_ms: deque = deque(maxlen=200)
+
+    def record(self, result: Dict[str, Any], seconds: float) -> None:
+        self.calls += 1
+        self._latency_ms.append(seconds * 1000)
+        if not result.get("ok"):
+            self.failures += 1
+            if _is_geo_restriction(result.get("error")):
+                self.geo_blocked += 1
+            self.last_error = str(result.get("error"))[:200]
+            self.last_error_at = datetime.now(timezone.utc).isoformat()
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self._latency_ms)
+
+        def pct(q: float) -> Optional[float]:
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 1) if latencies else None
+
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "geo_blocked": self.geo_blocked,
+            "failure_rate": round(self.failures / self.calls, 3) if self.calls else None,
+            "latency_ms_p50": pct(0.5),
+            "latency_ms_p95": pct(0.95),
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+        }
+
+
+_venue_stats: Dict[str, _VenueStats] = defaultdict(_VenueStats)
+
+
+async def _timed_fetch(task: str, fetch: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    started = time.monotonic()
+    result = await fetch
+    _venue_stats[_TASK_VENUE.get(task, task)].record(result, time.monotonic() - started)
+    return result
+
+
 def _is_geo_restriction(error: Optional[str]) -> bool:
     return bool(error and str(error).startswith("geo_restricted_"))
 
@@ -81,23 +186,21 @@ def _safe_float(value: Any) -> Optional[float]:
         return None
 
 
-def _classify_cvd_direction(net_usd: float, gross_usd: float) -> Dict[str, Any]:
-    """Return smoothed CVD direction using EMA + hysteresis deadband."""
-    global _cvd_trend_state
-
+def _classify_cvd_direction(net_usd: float, gross_usd: float, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Return smoothed CVD direction using EMA + hysteresis deadband; updates `state`."""
     if gross_usd <= 0:
         return {
-            "direction": _cvd_trend_state.get("direction", "NEUTRAL"),
+            "direction": state.get("direction", "NEUTRAL"),
             "confidence": "LOW",
             "raw_ratio": 0.0,
-            "ema_ratio": _cvd_trend_state.get("ema_ratio"),
+            "ema_ratio": state.get("ema_ratio"),
         }
 
     raw_ratio = net_usd / gross_usd
-    prev_ema = _cvd_trend_state.get("ema_ratio")
+    prev_ema = state.get("ema_ratio")
     ema_ratio = raw_ratio if prev_ema is None else ((1 - CVD_EMA_ALPHA) * prev_ema + CVD_EMA_ALPHA * raw_ratio)
 
-    prev_direction = _cvd_trend_state.get("direction", "NEUTRAL")
+    prev_direction = state.get("direction", "NEUTRAL")
     direction_candidate = prev_direction
 
     # If flow is very small, keep the prior state unless we have a clear move.
@@ -130,8 +233,8 @@ def _classify_cvd_direction(net_usd: float, gross_usd: float) -> Dict[str, Any]:
     # Confirm direction changes to avoid whipsaw (5s poll can be noisy on low timeframes).
     confirm_ticks = max(1, int(CVD_CONFIRM_TICKS))
     force_threshold = abs(float(CVD_FORCE_THRESHOLD))
-    pending_direction = _cvd_trend_state.get("pending_direction")
-    pending_count = int(_cvd_trend_state.get("pending_count") or 0)
+    pending_direction = state.get("pending_direction")
+    pending_count = int(state.get("pending_count") or 0)
 
     if direction_candidate != prev_direction:
         if force_threshold and abs(ema_ratio) >= force_threshold:
@@ -164,11 +267,11 @@ def _classify_cvd_direction(net_usd: float, gross_usd: float) -> Dict[str, Any]:
     else:
         confidence = "LOW"
 
-    _cvd_trend_state["ema_ratio"] = ema_ratio
-    _cvd_trend_state["direction"] = direction
-    _cvd_trend_state["pending_direction"] = pending_direction
-    _cvd_trend_state["pending_count"] = pending_count
-    _cvd_trend_state["updated_at"] = datetime.now(timezone.utc).isoformat()
+    state["ema_ratio"] = ema_ratio
+    state["direction"] = direction
+    state["pending_direction"] = pending_direction
+    state["pending_count"] = pending_count
+    state["updated_at"] = datetime.now(timezone.utc).isoformat()
 
     return {
         "direction": direction,
@@ -179,12 +282,19 @@ def _classify_cvd_direction(net_usd: float, gross_usd: float) -> Dict[str, Any]:
 
 
 @router.get("/market")
-async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query(200, ge=50, le=1000)):
-    global _bybit_runtime_disabled
-    now = time.time()
-    if _cache["data"] and (now - _cache["timestamp"]) < CACHE_TTL_SECONDS:
-        return _cache["data"]
+async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query(DEFAULT_SNAPSHOT_LIMIT, ge=50, le=1000)):
+    return await snapshot_service.get(symbol, limit)
+
 
+@router.get("/market/stats")
+async def get_market_snapshot_stats():
+    """Snapshot ages, refresher counters and per-venue latency / failure rates."""
+    return snapshot_service.stats()
+
+
+async def _build_market_snapshot(symbol: str, limit: int) -> Dict[str, Any]:
+    global _bybit_runtime_disabled
+    last_good = _last_good.setdefault((symbol, limit), {})
     # Derive exchange-specific symbol formats from input (e.g. BTCUSDT)
     # Strip "USDT" suffix to get base asset, then build per-exchange pairs
     base_asset = symbol.replace("USDT", "")  # BTC, ETH, etc.
@@ -224,7 +334,7 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
                 "bybit_perp_price": _fetch_json(client, f"{BYBIT_BASE}/v5/market/tickers", {"category": "linear", "symbol": symbol}),
             })
 
-        results = await asyncio.gather(*tasks.values())
+        results = await asyncio.gather(*(_timed_fetch(name, fetch) for name, fetch in tasks.items()))
         data_map = dict(zip(tasks.keys(), results))
         if not use_bybit:
             data_map["bybit_funding"] = {"ok": False, "error": "disabled"}
@@ -284,15 +394,15 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
     elif perp_price is None and not data_map["okx_perp_price"]["ok"]:
         errors.append(f"okx_perp_price: {data_map['okx_perp_price'].get('error')}")
 
-    if perp_price is None and _last_good.get("perp_price") is not None:
-        perp_price = _last_good["perp_price"]
-        perp_source = _last_good.get("perp_source")
-        perp_source_detail = _last_good.get("perp_source_detail")
+    if perp_price is None and last_good.get("perp_price") is not None:
+        perp_price = last_good["perp_price"]
+        perp_source = last_good.get("perp_source")
+        perp_source_detail = last_good.get("perp_source_detail")
         errors.append("perp_price: using cached fallback")
     elif perp_price is not None:
-        _last_good["perp_price"] = perp_price
-        _last_good["perp_source"] = perp_source
-        _last_good["perp_source_detail"] = perp_source_detail
+        last_good["perp_price"] = perp_price
+        last_good["perp_source"] = perp_source
+        last_good["perp_source_detail"] = perp_source_detail
 
     # Binance spot price
     binance_spot = None
@@ -309,11 +419,11 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
                 errors.append("binance_spot_price: using OKX spot fallback")
         except Exception:
             pass
-    if binance_spot is None and _last_good.get("binance_spot") is not None:
-        binance_spot = _last_good["binance_spot"]
+    if binance_spot is None and last_good.get("binance_spot") is not None:
+        binance_spot = last_good["binance_spot"]
         errors.append("binance_spot_price: using cached fallback")
     elif binance_spot is not None:
-        _last_good["binance_spot"] = binance_spot
+        last_good["binance_spot"] = binance_spot
 
     # Funding rates: Binance futures first, then OKX, then Bybit.
     funding_binance = None
@@ -330,13 +440,13 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
         binance_funding_error = data_map["binance_funding"].get("error")
         if binance_funding_error:
             errors.append(f"binance_funding: {binance_funding_error}")
-    if funding_binance is None and _last_good.get("funding_binance") is not None:
-        funding_binance = _last_good["funding_binance"]
-        funding_binance_time = _last_good.get("funding_binance_time")
+    if funding_binance is None and last_good.get("funding_binance") is not None:
+        funding_binance = last_good["funding_binance"]
+        funding_binance_time = last_good.get("funding_binance_time")
         errors.append("binance_funding: using cached fallback")
     elif funding_binance is not None:
-        _last_good["funding_binance"] = funding_binance
-        _last_good["funding_binance_time"] = funding_binance_time
+        last_good["funding_binance"] = funding_binance
+        last_good["funding_binance_time"] = funding_binance_time
 
     funding_okx = None
     funding_okx_time = None
@@ -352,13 +462,13 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
                 funding_okx_time = None
     else:
         errors.append(f"okx_funding: {data_map['okx_funding'].get('error')}")
-    if funding_okx is None and _last_good.get("funding_okx") is not None:
-        funding_okx = _last_good["funding_okx"]
-        funding_okx_time = _last_good.get("funding_okx_time")
+    if funding_okx is None and last_good.get("funding_okx") is not None:
+        funding_okx = last_good["funding_okx"]
+        funding_okx_time = last_good.get("funding_okx_time")
         errors.append("okx_funding: using cached fallback")
     elif funding_okx is not None:
-        _last_good["funding_okx"] = funding_okx
-        _last_good["funding_okx_time"] = funding_okx_time
+        last_good["funding_okx"] = funding_okx
+        last_good["funding_okx_time"] = funding_okx_time
 
     funding_bybit = None
     funding_bybit_time = None
@@ -378,12 +488,12 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
             _bybit_runtime_disabled = True
         elif BYBIT_ENABLED and bybit_funding_error != "disabled":
             errors.append(f"bybit_funding: {bybit_funding_error}")
-    if funding_bybit is None and _last_good.get("funding_bybit") is not None:
-        funding_bybit = _last_good["funding_bybit"]
-        funding_bybit_time = _last_good.get("funding_bybit_time")
+    if funding_bybit is None and last_good.get("funding_bybit") is not None:
+        funding_bybit = last_good["funding_bybit"]
+        funding_bybit_time = last_good.get("funding_bybit_time")
     elif funding_bybit is not None:
-        _last_good["funding_bybit"] = funding_bybit
-        _last_good["funding_bybit_time"] = funding_bybit_time
+        last_good["funding_bybit"] = funding_bybit
+        last_good["funding_bybit_time"] = funding_bybit_time
 
     funding_primary_rate = funding_binance if funding_binance is not None else (funding_okx if funding_okx is not None else funding_bybit)
     funding_primary_source = "binance" if funding_binance is not None else ("okx" if funding_okx is not None else ("bybit" if funding_bybit is not None else None))
@@ -397,11 +507,11 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
             coinbase_spot = None
     else:
         errors.append(f"coinbase_spot: {data_map['coinbase_spot'].get('error')}")
-    if coinbase_spot is None and _last_good.get("coinbase_spot") is not None:
-        coinbase_spot = _last_good["coinbase_spot"]
+    if coinbase_spot is None and last_good.get("coinbase_spot") is not None:
+        coinbase_spot = last_good["coinbase_spot"]
         errors.append("coinbase_spot: using cached fallback")
     elif coinbase_spot is not None:
-        _last_good["coinbase_spot"] = coinbase_spot
+        last_good["coinbase_spot"] = coinbase_spot
 
     # Trades -> CVD + order flow
     cvd_btc = 0.0
@@ -490,8 +600,8 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
             })
 
     gross_notional_usd = taker_buy_usd + taker_sell_usd
-    if not cvd_series and _last_good.get("cvd"):
-        cached_cvd = _last_good["cvd"]
+    if not cvd_series and last_good.get("cvd"):
+        cached_cvd = last_good["cvd"]
         cvd_btc = cached_cvd.get("net_btc", 0.0)
         cvd_usd = cached_cvd.get("net_usd", 0.0)
         cvd_direction = cached_cvd.get("direction", "NEUTRAL")
@@ -502,11 +612,12 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
         gross_notional_usd = cached_cvd.get("gross_usd", 0.0)
         cvd_series = cached_cvd.get("cvd_series", [])
         cvd_source = cached_cvd.get("source")
-        trade_tape = _last_good.get("order_flow", [])
+        trade_tape = last_good.get("order_flow", [])
         errors.append("trades: using cached fallback")
     elif cvd_series:
-        trend_info = _classify_cvd_direction(cvd_usd, gross_notional_usd)
-        _last_good["cvd"] = {
+        trend_state = _cvd_trend_state.setdefault((symbol, limit), _new_cvd_state())
+        trend_info = _classify_cvd_direction(cvd_usd, gross_notional_usd, trend_state)
+        last_good["cvd"] = {
             "net_btc": round(cvd_btc, 4),
             "net_usd": round(cvd_usd, 2),
             "direction": trend_info.get("direction", "NEUTRAL"),
@@ -521,7 +632,7 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
             "source": cvd_source,
             "cvd_series": cvd_series[-120:],
         }
-        _last_good["order_flow"] = trade_tape
+        last_good["order_flow"] = trade_tape
 
     basis = None
     basis_pct = None
@@ -538,7 +649,7 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
     if coinbase_spot is not None and binance_spot is not None:
         spot_spread = coinbase_spot - binance_spot
 
-    cvd_snapshot = _last_good.get("cvd", {})
+    cvd_snapshot = last_good.get("cvd", {})
     cvd_direction = cvd_snapshot.get("direction", "NEUTRAL")
     cvd_confidence = cvd_snapshot.get("direction_confidence", "LOW")
     cvd_raw_imbalance_pct = cvd_snapshot.get("raw_imbalance_pct")
@@ -593,12 +704,171 @@ async def get_market_snapshot(symbol: str = Query("BTCUSDT"), limit: int = Query
         "errors": errors
     }
 
-    _cache["data"] = snapshot
-    _cache["timestamp"] = now
-
     return snapshot
 
 
+class CryptoSnapshotService:
+    """In-memory (symbol, limit) market snapshots kept fresh by a background refresher.
+
+    Requests are answered from memory; a warm key that went idle is served
+    as-is and refreshed behind the request. The refresher runs in every API
+    process (it fills that process's memory), started from main.lifespan.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, refresh_enabled: bool = SNAPSHOT_REFRESH_ENABLED):
+        self._clock = clock
+        self.refresh_enabled = refresh_enabled
+        self._cache = MemoryCache(
+            "crypto_market.snapshot", ttl=SNAPSHOT_MAX_AGE_SECONDS, max_entries=SNAPSHOT_MAX_KEYS,
+        )
+        self._requested: Dict[SnapshotKey, float] = {}
+        self._poll_gap: Dict[SnapshotKey, float] = {}      # EWMA seconds between requests
+        self._refreshed: Dict[SnapshotKey, float] = {}
+        self._refreshes = 0
+        self._refresh_errors = 0
+        self._background: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def tracked_keys() -> List[SnapshotKey]:
+        return [(_canonical_symbol(base), DEFAULT_SNAPSHOT_LIMIT) for base in CRYPTO_SYMBOL_MATRIX]
+
+    def _is_hot(self, key: SnapshotKey, now: float) -> bool:
+        requested = self._requested.get(key)
+        return requested is not None and now - requested <= SNAPSHOT_HOT_SECONDS
+
+    def _cadence(self, key: SnapshotKey, now: float) -> float:
+        if not self._is_hot(key, now):
+            return SNAPSHOT_IDLE_REFRESH_SECONDS
+        gap = self._poll_gap.get(key, SNAPSHOT_REFRESH_SECONDS)
+        return min(SNAPSHOT_IDLE_REFRESH_SECONDS, max(SNAPSHOT_REFRESH_SECONDS, gap))
+
+    async def get(self, symbol: str, limit: int = DEFAULT_SNAPSHOT_LIMIT) -> Dict[str, Any]:
+        key = (_canonical_symbol(symbol), limit)
+        now = self._clock()
+        if not self.refresh_enabled:
+            self._prune(now, set(self.tracked_keys()))
+        was_hot = self._is_hot(key, now)
+        if was_hot:
+            gap = now - self._requested[key]
+            previous = self._poll_gap.get(key)
+            self._poll_gap[key] = gap if previous is None else 0.5 * previous + 0.5 * gap
+        self._requested[key] = now
+        snapshot = self._cache.get(key)
+        if snapshot is not None and not self.refresh_enabled:
+            if now - self._refreshed.get(key, now) >= SNAPSHOT_UNREFRESHED_TTL_SECONDS:
+                snapshot = None
+        if snapshot is None:
+            return await self._cache.load(key, lambda: self._build(key))
+        if self.refresh_enabled and not was_hot and now - self._refreshed.get(key, now) >= SNAPSHOT_REFRESH_SECONDS:
+            task = asyncio.create_task(self._refresh(key))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return snapshot
+
+    async def _build(self, key: SnapshotKey) -> Dict[str, Any]:
+        started = self._clock()
+        try:
+            snapshot = await _build_market_snapshot(*key)
+        except Exception:
+            self._refresh_errors += 1
+            raise
+        self._refreshed[key] = started
+        self._refreshes += 1
+        return snapshot
+
+    async def _refresh(self, key: SnapshotKey) -> None:
+        try:
+            await self._cache.load(key, lambda: self._build(key))
+        except Exception as exc:
+            logger.warning("Crypto snapshot refresh failed for %s/%s: %s", key[0], key[1], exc)
+
+    def _prune(self, now: float, tracked: set) -> None:
+        """Forget untracked keys nobody asked for lately, and cap how many stay hot."""
+        idle = [k for k in self._requested if k not in tracked and not self._is_hot(k, now)]
+        extra = sorted((k for k in self._requested if k not in tracked and k not in idle),
+                       key=self._requested.get)
+        idle += extra[:max(0, len(self._requested) - len(idle) - SNAPSHOT_MAX_KEYS)]
+        for key in idle:
+            self._requested.pop(key, None)
+            self._poll_gap.pop(key, None)
+            self._refreshed.pop(key, None)
+            self._cache.pop(key)
+            _last_good.pop(key, None)
+            _cvd_trend_state.pop(key, None)
+
+    async def refresh_due(self) -> int:
+        """One refresher pass: rebuild every key whose cadence has elapsed. Returns how many."""
+        now = self._clock()
+        tracked = set(self.tracked_keys())
+        self._prune(now, tracked)
+        due = []
+        for key in sorted(tracked | set(self._requested)):
+            last = self._refreshed.get(key)
+            # 10% slack: passes are SNAPSHOT_REFRESH_SECONDS apart, start to start.
+            if last is None or now - last >= self._cadence(key, now) * 0.9:
+                due.append(key)
+
+        gate = asyncio.Semaphore(SNAPSHOT_REFRESH_CONCURRENCY)
+
+        async def _one(key: SnapshotKey) -> None:
+            async with gate:
+                await self._refresh(key)
+
+        await asyncio.gather(*(_one(key) for key in due))
+        return len(due)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.refresh_due()
+            except Exception as exc:
+                logger.warning("Crypto snapshot refresher error: %s", exc)
+            await asyncio.sleep(max(0.5, SNAPSHOT_REFRESH_SECONDS - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        if self.refresh_enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="crypto_snapshot_refresher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        tracked = set(self.tracked_keys())
+        keys = []
+        for key in sorted(tracked | set(self._requested)):
+            refreshed = self._refreshed.get(key)
+            keys.append({
+                "symbol": key[0],
+                "limit": key[1],
+                "tracked": key in tracked,
+                "hot": self._is_hot(key, now),
+                "refresh_seconds": round(self._cadence(key, now), 1),
+                "age_seconds": round(now - refreshed, 1) if refreshed is not None else None,
+            })
+        return {
+            "refresh_enabled": self.refresh_enabled,
+            "refresher_running": self._task is not None and not self._task.done(),
+            "refresh_seconds": SNAPSHOT_REFRESH_SECONDS,
+            "idle_refresh_seconds": SNAPSHOT_IDLE_REFRESH_SECONDS,
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+            "keys": keys,
+            "venues": {name: stats.snapshot() for name, stats in sorted(_venue_stats.items())},
+        }
+
+
+snapshot_service = CryptoSnapshotService()
+
+
 @router.get("/binance/klines")
 async def get_binance_klines(
     symbol: str = Query("BTCUSDT"),
@@ -23,7 +23,7 @@ try:
     )
 except ImportError:
     CTA_SCANNER_AVAILABLE = False
-    logger.warning("CTA Scanner not available - install: pip install yfinance pandas_ta")
+    logger.warning("CTA Scanner not available - install: pip install yfinance")
 
 
 @router.get("/scan")
@@ -38,7 +38,7 @@ async def cta_full_scan(include_watchlist: bool = True):
     - Zone upgrades
     """
     if not CTA_SCANNER_AVAILABLE:
-        raise HTTPException(status_code=503, detail="CTA Scanner not available. Install: pip install yfinance pandas_ta")
+        raise HTTPException(status_code=503, detail="CTA Scanner not available. Install: pip install yfinance")
     
     try:
         results = await run_cta_scan(include_watchlist=include_watchlist)
@@ -22,7 +22,14 @@ router = APIRouter(tags=["layout"])
 _LAYOUT_KEY = "default"
 
 
+_table_ready = False
+
+
 async def _ensure_table(conn) -> None:
+    """Create the table once per process (schema migration 2 normally has)."""
+    global _table_ready
+    if _table_ready:
+        return
     await conn.execute(
         """CREATE TABLE IF NOT EXISTS v2_dashboard_layout (
                layout_key TEXT PRIMARY KEY,
@@ -30,6 +37,7 @@ async def _ensure_table(conn) -> None:
                updated_at TIMESTAMPTZ DEFAULT now()
            )"""
     )
+    _table_ready = True
 
 
 @router.get("/layout")
@@ -9,18 +9,18 @@ UW results are cached in Redis at the integration layer.
 """
 
 import logging
-import time
 from datetime import date, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
+from utils.memory_cache import MemoryCache
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# News cache: (timestamp, data)
-_news_cache: dict = {}
 _NEWS_CACHE_TTL = 600  # 10 minutes
+_news_cache = MemoryCache("market_data.news", ttl=_NEWS_CACHE_TTL, max_entries=50)
 
 
 @router.get("/market/quote/{ticker}")
@@ -125,8 +125,8 @@ async def get_news(
     """Top market headlines — UW API primary, Polygon fallback."""
     cache_key = f"news:{limit}"
     cached = _news_cache.get(cache_key)
-    if cached and (time.time() - cached[0]) < _NEWS_CACHE_TTL:
-        return cached[1]
+    if cached is not None:
+        return cached
 
     # Try UW API first
     try:
@@ -146,7 +146,7 @@ async def get_news(
                     "is_major": item.get("is_major", False),
                 })
             result = {"articles": articles, "count": len(articles), "source": "uw_api"}
-            _news_cache[cache_key] = (time.time(), result)
+            _news_cache.set(cache_key, result)
             return result
     except Exception as e:
         logger.warning("UW news fetch failed: %s", e)
@@ -696,8 +696,8 @@ async def get_sector_leaders(
     # field is surfaced to the route response as {value, ts, source} so the
     # popup can render staleness + source attribution per cell.
     # Phase A.3 (2026-05-22): also fetch the refresh universe so each row can
-    # carry a `tracked: bool` flag. Universe is top-3-per-sector; out-of-universe
-    # tickers display "not tracked" in the popup rather than "stale".
+    # carry a `tracked: bool` flag. Universe is every sector constituent;
+    # out-of-universe tickers display "not tracked" in the popup rather than "stale".
     if not fast:
         from integrations.sector_cache import read_many as _sector_cache_read_many
         from jobs.sector_constituent_refresh import get_tracked_universe
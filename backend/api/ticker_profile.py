@@ -327,7 +327,7 @@ async def get_ticker_profile(
     flow_dir, flow_events = await _get_flow_events(symbol)
 
     # Phase A.3 (2026-05-22): tracked = symbol is in the sector refresh universe
-    # (top-3 per sector). Frontend uses this to render "not tracked" annotation
+    # (every sector constituent). Frontend uses this to render "not tracked" annotation
     # for cells when the symbol falls outside the universe.
     try:
         from jobs.sector_constituent_refresh import get_tracked_universe
@@ -2199,24 +2199,239 @@ async def reconcile_positions(req: ReconcileRequest, _=Depends(require_api_key))
 
 
 # ── MARK TO MARKET ────────────────────────────────────────────────────
+#
+# Positions are grouped by (ticker, expiry). Each group's chain is fetched once
+# per option type it needs — get_options_snapshot caches per exact filter set,
+# so the per-position calls (each with its own strike window) used to miss the
+# cache and cost one UW request per position. Every leg in the group is then
+# priced from that shared snapshot. Groups run concurrently under a small cap;
+# the UW token bucket and governor still meter each request. Marks land in one
+# bulk UPDATE.
+
+MTM_CHAIN_CONCURRENCY = 4
+
+_EQUITY_STRUCTURES = ("stock", "stock_long", "long_stock", "stock_short", "short_stock", "")
+
+
+def _is_vertical(structure: str, short_strike: Optional[float]) -> bool:
+    return bool(short_strike) and ("spread" in structure or "credit" in structure or "debit" in structure)
+
+
+def _mtm_option_types(plan: Dict[str, Any]) -> set:
+    """Option types this position's pricing paths may read from its chain."""
+    types = set()
+    legs = plan["legs"]
+    if isinstance(legs, list) and len(legs) >= 2:
+        types |= {str(leg.get("option_type", "call")).lower() for leg in legs if isinstance(leg, dict)}
+    structure = plan["structure"]
+    if plan["long_strike"]:
+        if _is_vertical(structure, plan["short_strike"]):
+            if "put" in structure:
+                types.add("put")
+            elif "call" in structure:
+                types.add("call")
+        else:
+            types.add("put" if "put" in structure else "call")
+    return types
+
+
+async def _mtm_plan(row, pool) -> Optional[Dict[str, Any]]:
+    """Normalize one OPEN row for pricing, or None when it can't be marked."""
+    structure = (row.get("structure") or "").lower()
+    entry_price = float(row["entry_price"]) if row["entry_price"] else None
+    if entry_price is None:
+        return None
+    long_strike = float(row["long_strike"]) if row.get("long_strike") else None
+    short_strike = float(row["short_strike"]) if row.get("short_strike") else None
+    # Normalize strike order in case DB has them swapped
+    long_strike, short_strike = normalize_spread_strikes(long_strike, short_strike, structure)
+
+    # --- Multi-leg path: iron condors, straddles, etc. via legs JSONB ---
+    legs_data = row.get("legs")
+
+    # Auto-infer legs from notes if missing for multi-leg structures
+    if not legs_data and structure in MULTI_LEG_STRUCTURES:
+        inferred = _infer_legs_from_notes(row.get("notes") or "")
+        if inferred:
+            legs_data = inferred
+            # Persist inferred legs back to DB so future MTM runs don't re-parse
+            try:
+                legs_json_str = dumps_jsonb(inferred)
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        "UPDATE unified_positions SET legs = $1 WHERE position_id = $2",
+                        legs_json_str, row["position_id"],
+                    )
+                logger.info("Auto-populated legs for %s from notes", row["position_id"])
+            except Exception as e:
+                logger.warning("Failed to persist inferred legs for %s: %s", row["position_id"], e)
+
+    if isinstance(legs_data, str):
+        try:
+            legs_data = json.loads(legs_data)
+        except ValueError:
+            pass
+
+    # Guard: multi-leg structures without legs data must NOT fall through
+    # to spread/single-leg/yfinance paths — those produce wrong prices.
+    if structure in MULTI_LEG_STRUCTURES and not legs_data:
+        logger.warning(
+            "Skipping %s: structure=%s requires legs JSONB but none found",
+            row["position_id"], structure,
+        )
+        return None
+
+    at = (row.get("asset_type") or "").upper()
+    plan = {
+        "row": row,
+        "position_id": row["position_id"],
+        "ticker": row["ticker"],
+        "structure": structure,
+        "direction": row.get("direction") or "",
+        "entry_price": entry_price,
+        "quantity": row["quantity"],
+        "expiry": row.get("expiry"),
+        "long_strike": long_strike,
+        "short_strike": short_strike,
+        "legs": legs_data,
+        # GUARD: Never use stock price for OPTION or SPREAD positions — even if
+        # structure is empty/null, asset_type tells us it's not a stock.
+        "is_equity": structure in _EQUITY_STRUCTURES and at not in ("OPTION", "SPREAD"),
+    }
+    plan["option_types"] = _mtm_option_types(plan) if plan["expiry"] else set()
+    return plan
+
+
+async def _fetch_mtm_chains(groups, get_options_snapshot, gate: asyncio.Semaphore):
+    """{(ticker, expiry): chain or Exception} — one snapshot per (group, option type)."""
+
+    async def _one(ticker: str, expiry: str, option_type: str):
+        async with gate:
+            return await get_options_snapshot(ticker, expiration_date=expiry, contract_type=option_type)
+
+    keys = [(ticker, expiry, t) for (ticker, expiry), types in groups.items() for t in sorted(types)]
+    results = await asyncio.gather(*(_one(*k) for k in keys), return_exceptions=True)
+
+    chains: Dict[tuple, Any] = {}
+    for (ticker, expiry, _), result in zip(keys, results):
+        group = (ticker, expiry)
+        if isinstance(chains.get(group), Exception):
+            continue
+        if isinstance(result, Exception):
+            chains[group] = result
+        else:
+            chains[group] = (chains.get(group) or []) + (result or [])
+    return chains, len(keys)
+
+
+def _price_option_plan(plan: Dict[str, Any], chain: list, pricers, attempts: List[int]) -> Optional[Dict[str, Any]]:
+    """Price one option position from its group's chain, in the same order of
+    preference as before: multi-leg net mark, then vertical spread, then single
+    leg. `attempts[0]` counts the per-position chain reads this replaces."""
+    spread_from_chain, single_from_chain, multi_from_chain = pricers
+    ticker, expiry = plan["ticker"], str(plan["expiry"])
+    structure, direction = plan["structure"], plan["direction"].upper()
+    entry_price, quantity = plan["entry_price"], plan["quantity"]
+    legs = plan["legs"]
+
+    if isinstance(legs, list) and len(legs) >= 2:
+        attempts[0] += 1
+        result = multi_from_chain(chain, ticker, legs, expiry)
+        if result and result.get("net_mark") is not None:
+            current_price = abs(result["net_mark"])
+            return {
+                "current_price": current_price,
+                "unrealized": _compute_unrealized_pnl(
+                    entry_price, current_price, quantity, structure, direction=direction,
+                ),
+                "long_leg_price": None,
+                "short_leg_price": None,
+            }
+
+    long_strike, short_strike = plan["long_strike"], plan["short_strike"]
+    if not long_strike:
+        return None
+    attempts[0] += 1
+    if _is_vertical(structure, short_strike):
+        # Spread position — get both legs
+        result = spread_from_chain(chain, ticker, long_strike, short_strike, expiry, structure)
+        if result and result.get("spread_value") is not None:
+            current_price = result["spread_value"]
+            return {
+                "current_price": current_price,
+                "unrealized": _compute_unrealized_pnl(
+                    entry_price, current_price, quantity, structure, direction=direction,
+                ),
+                "long_leg_price": result.get("long_mid"),
+                "short_leg_price": result.get("short_mid"),
+            }
+        return None
+
+    # Single leg (long_put, long_call, etc.)
+    opt_type = "put" if "put" in structure else "call"
+    result = single_from_chain(chain, long_strike, expiry, opt_type)
+    if result and result.get("option_value") is not None:
+        current_price = result["option_value"]
+        return {
+            "current_price": current_price,
+            "unrealized": _compute_unrealized_pnl(
+                entry_price, current_price, quantity, structure, direction=plan["direction"],
+            ),
+            "long_leg_price": current_price,
+            "short_leg_price": None,
+        }
+    return None
+
+
+def _equity_last_price(ticker: str) -> Optional[float]:
+    import yfinance as yf
+    info = yf.Ticker(ticker).fast_info
+    if hasattr(info, 'last_price') and info.last_price:
+        return float(info.last_price)
+    return None
+
+
+async def _write_marks(pool, marks: List[Dict[str, Any]]) -> None:
+    """One UPDATE for every position priced this cycle."""
+    if not marks:
+        return
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            UPDATE unified_positions AS p SET
+                current_price = u.current_price, unrealized_pnl = u.unrealized_pnl,
+                long_leg_price = u.long_leg_price, short_leg_price = u.short_leg_price,
+                price_updated_at = NOW(), updated_at = NOW()
+            FROM UNNEST($1::text[], $2::float8[], $3::float8[], $4::float8[], $5::float8[])
+                AS u(position_id, current_price, unrealized_pnl, long_leg_price, short_leg_price)
+            WHERE p.position_id = u.position_id
+        """,
+            [m["position_id"] for m in marks],
+            [m["current_price"] for m in marks],
+            [m["unrealized"] for m in marks],
+            [m["long_leg_price"] for m in marks],
+            [m["short_leg_price"] for m in marks],
+        )
+
 
 async def run_mark_to_market() -> dict:
     """
     Core mark-to-market logic. Callable from background loop or HTTP endpoint.
-    Fetches current spread values via Polygon.io options snapshots.
+    Prices option positions from UW chain snapshots shared per (ticker, expiry).
     Falls back to yfinance underlying price for equity positions.
     Updates unrealized P&L based on actual spread mid-prices.
     """
+    started = time.perf_counter()
     # UW API only — Polygon is deprecated
     try:
         from integrations.uw_api import (
-            get_spread_value, get_single_option_value, get_multi_leg_value, UW_API_KEY
+            get_options_snapshot, spread_value_from_chain,
+            single_option_value_from_chain, multi_leg_value_from_chain, UW_API_KEY,
         )
+        pricers = (spread_value_from_chain, single_option_value_from_chain, multi_leg_value_from_chain)
     except ImportError:
         UW_API_KEY = ""
-        get_spread_value = None
-        get_single_option_value = None
-        get_multi_leg_value = None
+        get_options_snapshot = None
+        pricers = None
 
     pool = await get_postgres_client()
 
@@ -2228,169 +2443,92 @@ async def run_mark_to_market() -> dict:
     if not rows:
         return {"status": "no_open_positions", "updated": 0}
 
-    updated = 0
     errors = []
-    use_options_pricing = bool(UW_API_KEY) and get_spread_value is not None
-
-    # Cache chain snapshots per ticker to avoid duplicate API calls
-    for row in rows:
-        ticker = row["ticker"]
-        structure = (row.get("structure") or "").lower()
-        at = (row.get("asset_type") or "").upper()
-        entry_price = float(row["entry_price"]) if row["entry_price"] else None
-        quantity = row["quantity"]
-        expiry = row.get("expiry")
-        long_strike = float(row["long_strike"]) if row.get("long_strike") else None
-        short_strike = float(row["short_strike"]) if row.get("short_strike") else None
-        # Normalize strike order in case DB has them swapped
-        long_strike, short_strike = normalize_spread_strikes(
-            long_strike, short_strike, structure
-        )
-
-        if entry_price is None:
-            continue
-
-        current_price = None
-        unrealized = None
-        greeks_json = None
-        long_leg_price = None
-        short_leg_price = None
-
-        # --- Multi-leg path: iron condors, straddles, etc. via legs JSONB ---
-        legs_data = row.get("legs")
-
-        # Auto-infer legs from notes if missing for multi-leg structures
-        if not legs_data and structure in MULTI_LEG_STRUCTURES:
-            inferred = _infer_legs_from_notes(row.get("notes") or "")
-            if inferred:
-                legs_data = inferred
-                # Persist inferred legs back to DB so future MTM runs don't re-parse
-                try:
-                    legs_json_str = dumps_jsonb(inferred)
-                    async with pool.acquire() as conn:
-                        await conn.execute(
-                            "UPDATE unified_positions SET legs = $1 WHERE position_id = $2",
-                            legs_json_str, row["position_id"],
-                        )
-                    logger.info("Auto-populated legs for %s from notes", row["position_id"])
-                except Exception as e:
-                    logger.warning("Failed to persist inferred legs for %s: %s", row["position_id"], e)
-
-        if use_options_pricing and expiry and legs_data:
+    use_options_pricing = bool(UW_API_KEY) and get_options_snapshot is not None
+
+    plans = [p for p in [await _mtm_plan(row, pool) for row in rows] if p is not None]
+
+    groups: Dict[tuple, set] = {}
+    if use_options_pricing:
+        for plan in plans:
+            if plan["option_types"]:
+                groups.setdefault((plan["ticker"], str(plan["expiry"])[:10]), set()).update(plan["option_types"])
+
+    gate = asyncio.Semaphore(MTM_CHAIN_CONCURRENCY)
+    chains, chain_requests = await _fetch_mtm_chains(groups, get_options_snapshot, gate) if groups else ({}, 0)
+
+    marks: List[Dict[str, Any]] = []
+    unpriced_equity: List[Dict[str, Any]] = []
+    attempts = [0]
+    for plan in plans:
+        priced = None
+        chain = chains.get((plan["ticker"], str(plan["expiry"])[:10])) if plan["option_types"] else None
+        if isinstance(chain, Exception):
+            attempts[0] += 1
+            errors.append({"position_id": plan["position_id"], "error": str(chain)})
+            logger.warning("UW mark-to-market failed for %s: %s", plan["position_id"], chain)
+        elif use_options_pricing and plan["option_types"]:
             try:
-                if isinstance(legs_data, str):
-                    legs_data = json.loads(legs_data)
-                if isinstance(legs_data, list) and len(legs_data) >= 2:
-                    result = await get_multi_leg_value(ticker, legs_data, str(expiry))
-                    if result and result.get("net_mark") is not None:
-                        current_price = abs(result["net_mark"])
-                        direction = (row.get("direction") or "").upper()
-                        unrealized = _compute_unrealized_pnl(
-                            entry_price, current_price, quantity, structure,
-                            direction=direction,
-                        )
-                        greeks_json = json.dumps({
-                            "leg_details": result.get("leg_details"),
-                            "underlying_price": result.get("underlying_price"),
-                        })
+                priced = _price_option_plan(plan, chain or [], pricers, attempts)
             except Exception as e:
-                errors.append({"position_id": row["position_id"], "error": str(e)})
-                logger.warning("Multi-leg mark-to-market failed for %s: %s", row["position_id"], e)
-
-        # Guard: multi-leg structures without legs data must NOT fall through
-        # to spread/single-leg/yfinance paths — those produce wrong prices.
-        if current_price is None and structure in MULTI_LEG_STRUCTURES and not legs_data:
-            logger.warning(
-                "Skipping %s: structure=%s requires legs JSONB but none found",
-                row["position_id"], structure,
-            )
-            continue
-
-        # --- Polygon path: real spread-level pricing ---
-        if current_price is None and use_options_pricing and expiry and long_strike:
-            try:
-                if short_strike and ("spread" in structure or "credit" in structure or "debit" in structure):
-                    # Spread position — get both legs
-                    result = await get_spread_value(
-                        ticker, long_strike, short_strike, str(expiry), structure
-                    )
-                    if result and result.get("spread_value") is not None:
-                        current_price = result["spread_value"]
-                        long_leg_price = result.get("long_mid")
-                        short_leg_price = result.get("short_mid")
-                        direction = (row.get("direction") or "").upper()
-                        unrealized = _compute_unrealized_pnl(
-                            entry_price, current_price, quantity, structure,
-                            direction=direction,
-                        )
-
-                        greeks_json = json.dumps({
-                            "long": result.get("long_greeks"),
-                            "short": result.get("short_greeks"),
-                            "underlying_price": result.get("underlying_price"),
-                        })
-
-                else:
-                    # Single leg (long_put, long_call, etc.)
-                    opt_type = "put" if "put" in structure else "call"
-                    result = await get_single_option_value(
-                        ticker, long_strike, str(expiry), opt_type
-                    )
-                    if result and result.get("option_value") is not None:
-                        current_price = result["option_value"]
-                        long_leg_price = result["option_value"]
-                        unrealized = _compute_unrealized_pnl(
-                            entry_price, current_price, quantity, structure,
-                            direction=(row.get("direction") or ""),
-                        )
-                        greeks_json = json.dumps({
-                            "greeks": result.get("greeks"),
-                            "underlying_price": result.get("underlying_price"),
-                        })
-
-            except Exception as e:
-                errors.append({"position_id": row["position_id"], "error": str(e)})
-                logger.warning("UW mark-to-market failed for %s: %s", row["position_id"], e)
+                errors.append({"position_id": plan["position_id"], "error": str(e)})
+                logger.warning("UW mark-to-market failed for %s: %s", plan["position_id"], e)
+
+        if priced is not None:
+            marks.append({"position_id": plan["position_id"], **priced})
+        elif plan["is_equity"]:
+            # --- Fallback: yfinance for equity or if UW failed ---
+            unpriced_equity.append(plan)
+
+    if unpriced_equity:
+        async def _quote(ticker: str):
+            async with gate:
+                return await asyncio.to_thread(_equity_last_price, ticker)
+
+        tickers = sorted({p["ticker"] for p in unpriced_equity})
+        quotes = dict(zip(tickers, await asyncio.gather(*(_quote(t) for t in tickers), return_exceptions=True)))
+        for plan in unpriced_equity:
+            current_price = quotes.get(plan["ticker"])
+            if current_price is None or isinstance(current_price, Exception):
+                continue
+            marks.append({
+                "position_id": plan["position_id"],
+                "current_price": current_price,
+                "unrealized": _compute_unrealized_pnl(
+                    plan["entry_price"], current_price, plan["quantity"], plan["structure"],
+                    direction=plan["row"].get("direction", ""),
+                ),
+                "long_leg_price": None,
+                "short_leg_price": None,
+            })
 
-        # --- Fallback: yfinance for equity or if Polygon failed ---
-        # GUARD: Never use stock price for OPTION or SPREAD positions — even if
-        # structure is empty/null, asset_type tells us it's not a stock.
-        at = (row.get("asset_type") or "").upper()
-        is_equity_position = structure in ("stock", "stock_long", "long_stock", "stock_short", "short_stock", "") and at not in ("OPTION", "SPREAD")
-        if current_price is None and is_equity_position:
-            try:
-                import yfinance as yf
-                t = yf.Ticker(ticker)
-                info = t.fast_info
-                if hasattr(info, 'last_price') and info.last_price:
-                    current_price = float(info.last_price)
-                    unrealized = _compute_unrealized_pnl(
-                        entry_price, current_price, quantity, structure,
-                        direction=row.get("direction", "")
-                    )
-            except Exception:
-                pass
+    marks = [m for m in marks if m["current_price"] is not None and m["unrealized"] is not None]
+    await _write_marks(pool, marks)
+    # NOTE: prior versions had an elif that wiped current_price/unrealized_pnl
+    # to NULL/0 for OPTION/SPREAD rows whose current cycle failed to price.
+    # That branch defended against a historical "stock price written to options
+    # row" bug already prevented by the is_equity guard in _mtm_plan. The wipe
+    # caused legitimate prior prices to be erased on every UW 429 rate-limit
+    # cycle. Removed 2026-05-14 — outage behavior is now "retain prior price"
+    # rather than "wipe to NULL." Staleness is detected via price_updated_at
+    # downstream in portfolio_summary, not by clearing the field here.
+
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    uw_calls_saved = max(0, attempts[0] - chain_requests)
+    logger.info(
+        "MTM cycle: %d/%d positions marked, %d chain groups, %d chain requests (%d saved), %.0f ms",
+        len(marks), len(rows), len(groups), chain_requests, uw_calls_saved, latency_ms,
+    )
 
-        if current_price is not None and unrealized is not None:
-            async with pool.acquire() as conn:
-                await conn.execute("""
-                    UPDATE unified_positions SET
-                        current_price = $1, unrealized_pnl = $2,
-                        long_leg_price = $3, short_leg_price = $4,
-                        price_updated_at = NOW(), updated_at = NOW()
-                    WHERE position_id = $5
-                """, current_price, unrealized, long_leg_price, short_leg_price, row["position_id"])
-            updated += 1
-        # NOTE: prior versions had an elif that wiped current_price/unrealized_pnl
-        # to NULL/0 for OPTION/SPREAD rows whose current cycle failed to price.
-        # That branch defended against a historical "stock price written to options
-        # row" bug already prevented by the is_equity_position guard above. The wipe
-        # caused legitimate prior prices to be erased on every UW 429 rate-limit
-        # cycle. Removed 2026-05-14 — outage behavior is now "retain prior price"
-        # rather than "wipe to NULL." Staleness is detected via price_updated_at
-        # downstream in portfolio_summary, not by clearing the field here.
-
-    result = {"status": "updated", "updated": updated, "source": "uw" if use_options_pricing else "yfinance"}
+    result = {
+        "status": "updated",
+        "updated": len(marks),
+        "source": "uw" if use_options_pricing else "yfinance",
+        "latency_ms": latency_ms,
+        "chain_groups": len(groups),
+        "chain_requests": chain_requests,
+        "uw_calls_saved": uw_calls_saved,
+    }
     if errors:
         result["errors"] = errors
     return result
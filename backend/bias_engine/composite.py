@@ -9,6 +9,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, List
 
@@ -217,6 +218,8 @@ class CompositeResult(BaseModel):
     # "FADE" (net_gex > 0), "MOMENTUM" (net_gex < 0), "NEUTRAL" (zero or GEX absent).
     # Read-only derived field; never affects composite_score or any factor weight.
     gex_regime: Optional[str] = None
+    # Diagnostics for the compute pass (Redis round trips, load/compute ms).
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
 # Map circuit breaker's scheduler-style level names to composite's 5-level system.
@@ -312,6 +315,117 @@ async def get_latest_reading(factor_id: str) -> Optional[FactorReading]:
         return None
 
 
+def _parse_reading(raw: Any, factor_id: str) -> Optional[FactorReading]:
+    if not raw:
+        return None
+    try:
+        return FactorReading.model_validate(json.loads(raw))
+    except Exception as exc:
+        logger.warning(f"Failed to parse factor reading {factor_id}: {exc}")
+        return None
+
+
+async def get_latest_readings(factor_ids: Optional[List[str]] = None) -> Dict[str, Optional[FactorReading]]:
+    """Latest reading for each factor in one MGET (defaults to every FACTOR_CONFIG entry)."""
+    ids = list(factor_ids) if factor_ids is not None else list(FACTOR_CONFIG)
+    out: Dict[str, Optional[FactorReading]] = {factor_id: None for factor_id in ids}
+    if not ids:
+        return out
+    try:
+        client = await get_redis_client()
+        if not client:
+            return out
+        raws = await client.mget([REDIS_KEY_FACTOR_LATEST.format(factor_id=f) for f in ids])
+    except Exception as exc:
+        logger.warning(f"Failed to batch-load factor readings: {exc}")
+        return out
+    for factor_id, raw in zip(ids, raws):
+        out[factor_id] = _parse_reading(raw, factor_id)
+    return out
+
+
+def _queue_reading_before(pipe: Any, factor_id: str, cutoff_ts: float) -> None:
+    pipe.zrevrangebyscore(
+        REDIS_KEY_FACTOR_HISTORY.format(factor_id=factor_id),
+        max=cutoff_ts, min=0, start=0, num=1,
+    )
+
+
+async def get_readings_before(
+    factor_ids: List[str], cutoff: datetime
+) -> Dict[str, Optional[FactorReading]]:
+    """Batch form of get_reading_before: one pipelined round trip for all factors."""
+    ids = list(factor_ids)
+    out: Dict[str, Optional[FactorReading]] = {factor_id: None for factor_id in ids}
+    if not ids:
+        return out
+    try:
+        client = await get_redis_client()
+        if not client:
+            return out
+        cutoff_ts = _utc_naive(cutoff).timestamp()
+        pipe = client.pipeline(transaction=False)
+        for factor_id in ids:
+            _queue_reading_before(pipe, factor_id, cutoff_ts)
+        results = await pipe.execute()
+    except Exception as exc:
+        logger.warning(f"Failed to batch-load historical readings: {exc}")
+        return out
+    for factor_id, rows in zip(ids, results):
+        out[factor_id] = _parse_reading(rows[0], factor_id) if rows else None
+    return out
+
+
+async def _load_composite_inputs(
+    history_cutoff: datetime,
+) -> tuple[Dict[str, Optional[FactorReading]], Dict[str, Optional[FactorReading]], Optional[CompositeResult], int]:
+    """Everything compute_composite reads from Redis, in one pipeline.
+
+    Returns (latest readings, readings at `history_cutoff`, previous cached
+    composite, round trips used). Previously this was one GET per factor, two
+    more per factor for the velocity check and another for the prior composite.
+    """
+    ids = list(FACTOR_CONFIG)
+    latest: Dict[str, Optional[FactorReading]] = {factor_id: None for factor_id in ids}
+    before: Dict[str, Optional[FactorReading]] = {factor_id: None for factor_id in ids}
+
+    now = datetime.utcnow()
+    previous = _COMPOSITE_MEM_CACHE.get("payload")
+    expires = _COMPOSITE_MEM_CACHE.get("expires_at")
+    previous_fresh = bool(previous and expires and now < expires)
+    if not previous_fresh:
+        previous = None
+
+    try:
+        client = await get_redis_client()
+        if not client:
+            return latest, before, previous, 0
+        cutoff_ts = _utc_naive(history_cutoff).timestamp()
+        pipe = client.pipeline(transaction=False)
+        pipe.mget([REDIS_KEY_FACTOR_LATEST.format(factor_id=f) for f in ids])
+        for factor_id in ids:
+            _queue_reading_before(pipe, factor_id, cutoff_ts)
+        if not previous_fresh:
+            pipe.get(REDIS_KEY_COMPOSITE_LATEST)
+        results = await pipe.execute()
+    except Exception as exc:
+        logger.warning(f"Failed to load composite inputs: {exc}")
+        return latest, before, previous, 1
+
+    for factor_id, raw in zip(ids, results[0]):
+        latest[factor_id] = _parse_reading(raw, factor_id)
+    for factor_id, rows in zip(ids, results[1:1 + len(ids)]):
+        before[factor_id] = _parse_reading(rows[0], factor_id) if rows else None
+    if not previous_fresh and results[-1]:
+        try:
+            previous = CompositeResult.model_validate(json.loads(results[-1]))
+            _COMPOSITE_MEM_CACHE["payload"] = previous
+            _COMPOSITE_MEM_CACHE["expires_at"] = now + timedelta(seconds=COMPOSITE_MEM_CACHE_TTL)
+        except Exception as exc:
+            logger.warning(f"Failed to load cached composite bias: {exc}")
+    return latest, before, previous, 1
+
+
 async def store_factor_reading(reading: FactorReading) -> None:
     payload = _serialize_model(reading)
     try:
@@ -398,13 +512,26 @@ async def get_reading_before(factor_id: str, cutoff: datetime) -> Optional[Facto
         return None
 
 
-async def count_bearish_shifts(hours: int = 24) -> int:
-    cutoff = datetime.utcnow() - timedelta(hours=hours)
+async def count_bearish_shifts(
+    hours: int = 24,
+    latest: Optional[Dict[str, Optional[FactorReading]]] = None,
+    before: Optional[Dict[str, Optional[FactorReading]]] = None,
+) -> int:
+    """Factors whose score fell by >= 0.3 over the last `hours`.
+
+    `latest` / `before` let compute_composite pass readings it already
+    loaded; otherwise they are batch-loaded here.
+    """
+    if latest is None:
+        latest = await get_latest_readings()
+    if before is None:
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        before = await get_readings_before(list(FACTOR_CONFIG), cutoff)
     count = 0
 
     for factor_id in FACTOR_CONFIG:
-        current = await get_latest_reading(factor_id)
-        previous = await get_reading_before(factor_id, cutoff)
+        current = latest.get(factor_id)
+        previous = before.get(factor_id)
         if not current or not previous:
             continue
         delta = current.score - previous.score
@@ -738,12 +865,14 @@ async def _fetch_rvol() -> Optional[float]:
 
 async def compute_composite() -> CompositeResult:
     now = datetime.utcnow()
-    readings: Dict[str, FactorReading] = {}
-
-    for factor_id in FACTOR_CONFIG:
-        reading = await get_latest_reading(factor_id)
-        if reading:
-            readings[factor_id] = reading
+    load_started = time.perf_counter()
+    latest, readings_24h_ago, previous, redis_round_trips = await _load_composite_inputs(
+        now - timedelta(hours=24)
+    )
+    load_ms = round((time.perf_counter() - load_started) * 1000, 2)
+    readings: Dict[str, FactorReading] = {
+        factor_id: reading for factor_id, reading in latest.items() if reading
+    }
 
     active: Dict[str, FactorReading] = {}
     stale_set = set()
@@ -780,7 +909,9 @@ async def compute_composite() -> CompositeResult:
 
         velocity_multiplier = 1.0
         try:
-            bearish_shifts_24h = await count_bearish_shifts(hours=24)
+            bearish_shifts_24h = await count_bearish_shifts(
+                hours=24, latest=latest, before=readings_24h_ago
+            )
             if bearish_shifts_24h >= 3:
                 velocity_multiplier = 1.3
         except Exception as exc:
@@ -968,9 +1099,15 @@ async def compute_composite() -> CompositeResult:
         circuit_breaker=cb_meta,
         timeframe_scores=timeframe_scores,
         gex_regime=_gex_regime,
+        metadata={
+            "timing": {
+                "redis_round_trips": redis_round_trips,
+                "redis_load_ms": load_ms,
+                "compute_ms": round((time.perf_counter() - load_started) * 1000, 2),
+            },
+        },
     )
 
-    previous = await get_cached_composite()
     await cache_composite(result)
     await log_composite(result)
 
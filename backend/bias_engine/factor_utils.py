@@ -5,18 +5,19 @@ Shared utilities for composite bias factor scoring.
 from __future__ import annotations
 
 import asyncio
-from io import StringIO
-import json
 import logging
 import re
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 import pandas as pd
 import yfinance as yf
 
-from database.redis_client import get_redis_client
+from database.redis_client import get_redis_binary_client
 from bias_engine.composite import FactorReading
+from bias_engine import price_history_cache as _price_cache
+from bias_engine.price_history_cache import PriceHistoryEntry, SLICE_CALENDAR, SLICE_ROWS
 from bias_engine.anomaly_alerts import send_alert
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,10 @@ logger = logging.getLogger(__name__)
 _YFINANCE_ONLY_SYMBOLS = {"^VIX", "^VIX3M", "^ADVN", "^DECLN", "^ADV", "^DEC", "ADVN", "DECLN", "DX-Y.NYB"}
 
 PRICE_CACHE_TTL = 900  # 15 minutes
-PRICE_CACHE_VERSION = "v3"
+PRICE_CACHE_VERSION = "v4"  # v4: binary per-symbol entries (bias_engine/price_history_cache.py)
+# Upstream fetches are one request whatever the window, so a miss pulls at
+# least this many days; the short 5–30 day callers then share one entry.
+PRICE_CACHE_MIN_FETCH_DAYS = 60
 # Symbols with additional live-quote mismatch validation.
 PRICE_VALIDATION_SYMBOLS = {"SPY", "^VIX", "^VIX3M", "DX-Y.NYB"}
 # Plausibility bounds for all shared bias-system market tickers.
@@ -280,47 +284,23 @@ def _has_price_mismatch(
     return mismatch > PRICE_MISMATCH_THRESHOLD
 
 
-def _decode_cached_history(cached: Any) -> pd.DataFrame:
-    """
-    Decode cached payloads written by older and newer cache formats.
-
-    Supports:
-    - raw orient=split JSON string
-    - double-encoded JSON string (json.dumps(payload))
-    - already-decoded dict payload
-    """
-    payload: Any = cached
-
-    if isinstance(payload, (bytes, bytearray)):
-        payload = payload.decode("utf-8")
-
-    if isinstance(payload, str):
-        text = payload.strip()
-        if not text:
-            raise ValueError("empty payload")
-        try:
-            payload = json.loads(text)
-        except json.JSONDecodeError:
-            payload = text
-
-    if isinstance(payload, dict):
-        payload = json.dumps(payload)
-
-    if not isinstance(payload, str):
-        raise TypeError(f"unsupported cache payload type: {type(payload).__name__}")
-
-    return pd.read_json(StringIO(payload), orient="split")
+def _price_cache_key(symbol: str) -> str:
+    return f"prices:{PRICE_CACHE_VERSION}:{symbol}:adj"
 
 
 async def get_price_history(ticker: str, days: int = 30) -> pd.DataFrame:
     """
-    Fetch price history from yfinance with Redis caching.
-    Uses a key per ticker+days to avoid mismatched windows.
+    Fetch price history with a per-symbol binary cache (memory LRU → Redis).
+
+    One cache entry per symbol holds the widest window fetched; any shorter
+    `days` request is sliced from it. Cached data goes through the same
+    bounds / live-quote validation as a fresh download.
     """
     symbol = str(ticker).strip().upper()
     if symbol == "DXY":
         symbol = "DX-Y.NYB"
-    cache_key = f"prices:{PRICE_CACHE_VERSION}:{symbol}:{days}:adj"
+    cache_key = _price_cache_key(symbol)
+    fetch_days = max(days, PRICE_CACHE_MIN_FETCH_DAYS)
     reference_price: Optional[float] = None
     if symbol in PRICE_VALIDATION_SYMBOLS:
         reference_price = await _get_live_reference_price(symbol)
@@ -329,45 +309,47 @@ async def get_price_history(ticker: str, days: int = 30) -> pd.DataFrame:
         try:
             data = yf.download(
                 symbol,
-                period=f"{days}d",
+                period=f"{fetch_days}d",
                 progress=False,
                 auto_adjust=auto_adjust,
                 multi_level_index=False,
             )
         except TypeError:
             # Backward compatibility for older yfinance versions without multi_level_index.
-            data = yf.download(symbol, period=f"{days}d", progress=False, auto_adjust=auto_adjust)
+            data = yf.download(symbol, period=f"{fetch_days}d", progress=False, auto_adjust=auto_adjust)
         return _normalize_history(data)
 
+    async def _store(df: pd.DataFrame, slice_mode: str, source: str) -> None:
+        try:
+            entry = PriceHistoryEntry(df, fetch_days, slice_mode, time.time())
+            await _price_cache.write_entry(cache_key, symbol, entry, PRICE_CACHE_TTL)
+        except Exception as exc:
+            logger.warning("Price cache write failed for %s (%s): %s", symbol, source, type(exc).__name__)
+
     try:
-        client = await get_redis_client()
-        if client:
-            cached = await client.get(cache_key)
-            if cached:
-                df = _decode_cached_history(cached)
-                df = _normalize_history(df)
-                df = _prefer_adjusted_close(symbol, df, reference_price)
-                if _has_bounds_violation(symbol, df, stage="cached"):
-                    await client.delete(cache_key)
-                    logger.warning("Discarding cached %s prices due to bounds violation", symbol)
-                elif not _has_price_mismatch(symbol, df, reference_price):
-                    return df
-                else:
-                    logger.warning(
-                        "Discarding cached %s prices (close %.2f mismatches live %.2f by > %.0f%%)",
-                        symbol,
-                        _latest_column_value(df, "close") or -1.0,
-                        reference_price or -1.0,
-                        PRICE_MISMATCH_THRESHOLD * 100,
-                    )
-                    await client.delete(cache_key)
+        entry, _tier = await _price_cache.read_entry(cache_key, symbol, PRICE_CACHE_TTL)
+        if entry is not None and entry.covers(days):
+            df = entry.window(days)
+            df = _prefer_adjusted_close(symbol, df, reference_price)
+            if _has_bounds_violation(symbol, df, stage="cached"):
+                await _price_cache.discard_entry(cache_key, symbol)
+                logger.warning("Discarding cached %s prices due to bounds violation", symbol)
+            elif not _has_price_mismatch(symbol, df, reference_price):
+                return df
+            else:
+                logger.warning(
+                    "Discarding cached %s prices (close %.2f mismatches live %.2f by > %.0f%%)",
+                    symbol,
+                    _latest_column_value(df, "close") or -1.0,
+                    reference_price or -1.0,
+                    PRICE_MISMATCH_THRESHOLD * 100,
+                )
+                await _price_cache.discard_entry(cache_key, symbol)
     except Exception as exc:
         logger.warning(f"Price cache read failed for {symbol}: {type(exc).__name__}")
         # Remove poisoned cache entries so they don't spam on every run.
         try:
-            client = await get_redis_client()
-            if client:
-                await client.delete(cache_key)
+            await _price_cache.discard_entry(cache_key, symbol)
         except Exception:
             pass
 
@@ -375,20 +357,13 @@ async def get_price_history(ticker: str, days: int = 30) -> pd.DataFrame:
     if symbol not in _YFINANCE_ONLY_SYMBOLS:
         try:
             from integrations.uw_api import get_bars_as_dataframe as _polygon_bars
-            polygon_df = await _polygon_bars(symbol, days)
+            polygon_df = await _polygon_bars(symbol, fetch_days)
             if polygon_df is not None and not polygon_df.empty:
                 polygon_df = _normalize_history(polygon_df)
                 if not _has_bounds_violation(symbol, polygon_df, stage="polygon"):
                     if not _has_price_mismatch(symbol, polygon_df, reference_price):
-                        # Cache Polygon result in Redis
-                        try:
-                            client = await get_redis_client()
-                            if client and polygon_df is not None and not polygon_df.empty:
-                                payload = polygon_df.to_json(orient="split")
-                                await client.setex(cache_key, PRICE_CACHE_TTL, payload)
-                        except Exception as exc:
-                            logger.warning("Price cache write failed for %s (polygon): %s", symbol, type(exc).__name__)
-                        return polygon_df
+                        await _store(polygon_df, SLICE_ROWS, "polygon")
+                        return polygon_df.iloc[-days:].copy() if days < fetch_days else polygon_df
                     else:
                         logger.warning("Polygon %s data mismatches live quote, falling back to yfinance", symbol)
                 else:
@@ -433,16 +408,12 @@ async def get_price_history(ticker: str, days: int = 30) -> pd.DataFrame:
         )
         return pd.DataFrame()
 
-    try:
-        client = await get_redis_client()
-        if client and data is not None and not data.empty:
-            payload = data.to_json(orient="split")
-            # Store raw payload (not double-encoded) to avoid decode ambiguity.
-            await client.setex(cache_key, PRICE_CACHE_TTL, payload)
-    except Exception as exc:
-        logger.warning(f"Price cache write failed for {symbol}: {type(exc).__name__}")
+    if data is None or data.empty:
+        return data
 
-    return data
+    entry = PriceHistoryEntry(data, fetch_days, SLICE_CALENDAR, time.time())
+    await _store(data, SLICE_CALENDAR, "yfinance")
+    return entry.window(days)
 
 
 async def get_latest_price(ticker: str) -> Optional[float]:
@@ -460,35 +431,33 @@ async def purge_suspicious_cache_entries() -> Dict[str, int]:
     scanned = 0
     purged = 0
     try:
-        client = await get_redis_client()
+        client = await get_redis_binary_client()
         if not client:
             return {"scanned": scanned, "purged": purged}
 
         for symbol, (low, high) in PRICE_BOUNDS.items():
-            for days in (5, 30, 60):
-                key = f"prices:{PRICE_CACHE_VERSION}:{symbol}:{days}:adj"
-                scanned += 1
-                try:
-                    raw = await client.get(key)
-                    if not raw:
-                        continue
-                    df = _decode_cached_history(raw)
-                    df = _normalize_history(df)
-                    latest = _latest_column_value(df, "close")
-                    if latest is not None and (latest < low or latest > high):
-                        await client.delete(key)
-                        purged += 1
-                        logger.warning(
-                            "Purged corrupt cache key %s (close %.4f outside [%.2f, %.2f])",
-                            key,
-                            latest,
-                            low,
-                            high,
-                        )
-                except Exception:
-                    await client.delete(key)
+            key = _price_cache_key(symbol)
+            scanned += 1
+            try:
+                raw = await client.get(key)
+                if not raw:
+                    continue
+                df = _price_cache.decode_history(raw).frame
+                latest = _latest_column_value(df, "close")
+                if latest is not None and (latest < low or latest > high):
+                    await _price_cache.discard_entry(key, symbol)
                     purged += 1
-                    logger.warning("Purged unreadable cache key %s", key)
+                    logger.warning(
+                        "Purged corrupt cache key %s (close %.4f outside [%.2f, %.2f])",
+                        key,
+                        latest,
+                        low,
+                        high,
+                    )
+            except Exception:
+                await _price_cache.discard_entry(key, symbol)
+                purged += 1
+                logger.warning("Purged unreadable cache key %s", key)
     except Exception as exc:
         logger.warning("Cache purge failed: %s", exc)
     return {"scanned": scanned, "purged": purged}
@@ -0,0 +1,192 @@
+"""
+Binary, per-symbol price-history cache for get_price_history().
+
+The previous cache stored `df.to_json(orient="split")` under one key per
+(symbol, days) — SPY at 5/30/60/252 days lived in Redis four times — and every
+hit paid `pd.read_json` (plus up to three format fallbacks). This module:
+
+  - encodes a frame as raw NumPy column buffers behind a small JSON header
+    (datetime64 index + float64 columns; 8 bytes/cell, decoded with
+    `np.frombuffer`, no parsing),
+  - keeps ONE canonical key per symbol holding the widest window fetched,
+    from which any shorter `days` request is sliced, and
+  - fronts Redis with a small in-process LRU (a utils.memory_cache
+    namespace), since bias filters ask for the
+    same handful of symbols dozens of times per refresh.
+
+Slicing reproduces what the upstream source would have returned for the
+shorter window: Polygon/UW bars and yfinance `period="Nd"` are both "the
+last N sessions", so a window is the last N rows. The entry header still
+records the source's slice mode.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"PHC1"
+_HEADER_LEN = struct.Struct("<I")
+
+SLICE_ROWS = "rows"          # Polygon/UW: last N bars
+SLICE_CALENDAR = "calendar"  # yfinance period="Nd": also last N sessions
+
+LRU_MAX_ENTRIES = 128
+
+
+class PriceHistoryEntry:
+    """A cached frame plus the window it covers."""
+
+    __slots__ = ("frame", "days", "slice_mode", "fetched_at")
+
+    def __init__(self, frame: pd.DataFrame, days: int, slice_mode: str, fetched_at: float):
+        self.frame = frame
+        self.days = days
+        self.slice_mode = slice_mode
+        self.fetched_at = fetched_at
+
+    def covers(self, days: int) -> bool:
+        return self.days >= days
+
+    def window(self, days: int) -> pd.DataFrame:
+        """Copy of the last `days` sessions of history, as the source would return."""
+        df = self.frame
+        if days < self.days and not df.empty:
+            df = df.iloc[-days:] if days > 0 else df.iloc[:0]
+        return df.copy()
+
+
+def encode_history(entry: PriceHistoryEntry) -> Optional[bytes]:
+    """Serialize an entry; None if the frame has non-numeric columns."""
+    df = entry.frame
+    if not isinstance(df.index, pd.DatetimeIndex):
+        return None
+    tz = str(df.index.tz) if df.index.tz is not None else None
+    index = df.index.tz_convert("UTC").tz_localize(None) if tz else df.index
+    index_values = index.values
+    unit = np.datetime_data(index_values.dtype)[0]
+    columns = []
+    buffers = [np.ascontiguousarray(index_values.view("int64")).tobytes()]
+    for col in df.columns:
+        series = df[col]
+        if not pd.api.types.is_numeric_dtype(series.dtype):
+            return None
+        columns.append(str(col))
+        buffers.append(np.ascontiguousarray(series.to_numpy(dtype="float64", na_value=np.nan)).tobytes())
+    header = json.dumps({
+        "rows": len(df),
+        "columns": columns,
+        "tz": tz,
+        "unit": unit,
+        "index_name": df.index.name,
+        "days": entry.days,
+        "slice": entry.slice_mode,
+        "fetched_at": entry.fetched_at,
+    }).encode("utf-8")
+    return b"".join([_MAGIC, _HEADER_LEN.pack(len(header)), header, *buffers])
+
+
+def decode_history(payload: bytes) -> PriceHistoryEntry:
+    if not payload or payload[:4] != _MAGIC:
+        raise ValueError("not a price-history payload")
+    (header_len,) = _HEADER_LEN.unpack_from(payload, 4)
+    start = 4 + _HEADER_LEN.size
+    header = json.loads(payload[start:start + header_len])
+    offset = start + header_len
+    rows = header["rows"]
+    width = rows * 8
+
+    unit = header.get("unit", "ns")
+    index_values = np.frombuffer(payload, dtype="int64", count=rows, offset=offset).view(f"datetime64[{unit}]")
+    index = pd.DatetimeIndex(index_values, name=header.get("index_name"))
+    if header.get("tz"):
+        index = index.tz_localize("UTC").tz_convert(header["tz"])
+    offset += width
+
+    data = {}
+    for col in header["columns"]:
+        # Copy so the frame owns writable memory (callers add columns in place).
+        data[col] = np.frombuffer(payload, dtype="float64", count=rows, offset=offset).copy()
+        offset += width
+    frame = pd.DataFrame(data, index=index, columns=header["columns"])
+    return PriceHistoryEntry(frame, int(header["days"]), header.get("slice", SLICE_CALENDAR),
+                             float(header.get("fetched_at", 0.0)))
+
+
+# symbol -> decoded entry; each expires when its Redis copy would.
+_memory = MemoryCache("bias_engine.price_history", ttl=900, max_entries=LRU_MAX_ENTRIES)
+
+
+def _remember(symbol: str, entry: PriceHistoryEntry, ttl: float) -> None:
+    _memory.set(symbol, entry, ttl=max(0.0, ttl - (time.time() - entry.fetched_at)))
+_stats: Dict[str, int] = {"redis_hits": 0, "redis_misses": 0, "writes": 0, "decode_errors": 0}
+
+
+async def _binary_client():
+    from database.redis_client import get_redis_binary_client
+    return await get_redis_binary_client()
+
+
+async def read_entry(key: str, symbol: str, ttl: float) -> Tuple[Optional[PriceHistoryEntry], str]:
+    """Return (entry, tier) where tier is "memory", "redis" or "miss"."""
+    entry = _memory.get(symbol)
+    if entry is not None:
+        return entry, "memory"
+    client = await _binary_client()
+    if not client:
+        return None, "miss"
+    raw = await client.get(key)
+    if not raw:
+        _stats["redis_misses"] += 1
+        return None, "miss"
+    try:
+        entry = decode_history(raw)
+    except Exception:
+        _stats["decode_errors"] += 1
+        await client.delete(key)
+        raise
+    _stats["redis_hits"] += 1
+    _remember(symbol, entry, ttl)
+    return entry, "redis"
+
+
+async def write_entry(key: str, symbol: str, entry: PriceHistoryEntry, ttl: int) -> None:
+    _remember(symbol, entry, ttl)
+    payload = encode_history(entry)
+    if payload is None:
+        return
+    client = await _binary_client()
+    if client:
+        await client.setex(key, ttl, payload)
+        _stats["writes"] += 1
+
+
+async def discard_entry(key: str, symbol: str) -> None:
+    _memory.pop(symbol)
+    client = await _binary_client()
+    if client:
+        await client.delete(key)
+
+
+def get_price_cache_stats() -> Dict[str, Any]:
+    memory = _memory.stats()
+    return {
+        **_stats,
+        "memory_hits": memory["hits"],
+        "memory_misses": memory["misses"],
+        "memory_entries": memory["entries"],
+    }
+
+
+def clear_memory_cache() -> None:
+    _memory.clear()
@@ -12,12 +12,13 @@ is available for those symbols for price/basis if needed.
 
 import logging
 import os
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 import httpx
 
 from config.crypto_sanity_bounds import check_price, check_basis_annualized
 from bias_filters.crypto_vendor_health import record_observation
+from utils.memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
@@ -72,27 +73,20 @@ _OKX_SPOT_BOOK_INSTID: Dict[str, str] = {
     "FARTCOIN": "FARTCOIN-USDT",
 }
 
-# Cache for API responses
-_cache: Dict[str, Dict[str, Any]] = {}
+# Cache for API responses (per-symbol keys; TTL set per entry)
 CACHE_TTL_ORDERBOOK = 60   # 1 minute for orderbook
 CACHE_TTL_BASIS = 300      # 5 minutes for basis
+_cache = MemoryCache("binance_client.market", ttl=CACHE_TTL_ORDERBOOK, max_entries=64)
 
 
 def _get_cached(key: str) -> Optional[Dict[str, Any]]:
     """Get cached response if not expired"""
-    if key in _cache:
-        cached = _cache[key]
-        if datetime.now(timezone.utc) < cached["expires_at"]:
-            return cached["data"]
-    return None
+    return _cache.get(key)
 
 
 def _set_cache(key: str, data: Any, ttl: int):
     """Cache response with TTL"""
-    _cache[key] = {
-        "data": data,
-        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
-    }
+    _cache.set(key, data, ttl)
 
 
 def _na_cell(symbol: str, reason: str) -> Dict[str, Any]:
@@ -20,6 +20,7 @@ import httpx
 
 from config.crypto_sanity_bounds import check_funding_rate, check_open_interest
 from bias_filters.crypto_vendor_health import record_observation
+from utils.memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
@@ -57,8 +58,8 @@ OKX_BTC_SWAP_CTVAL_BTC = 0.01
 OKX_ALT_SWAP_CTVAL_USD = 1.0
 
 # Cache for API responses (avoid hitting rate limits). Keys are per-symbol.
-_cache: Dict[str, Dict[str, Any]] = {}
 CACHE_TTL_SECONDS = 300  # 5 minutes
+_cache = MemoryCache("coinalyze_client.market", ttl=CACHE_TTL_SECONDS, max_entries=64)
 
 
 def _get_api_key() -> str:
@@ -72,19 +73,12 @@ def _get_api_key() -> str:
 
 def _get_cached(key: str) -> Optional[Dict[str, Any]]:
     """Get cached response if not expired"""
-    if key in _cache:
-        cached = _cache[key]
-        if datetime.now(timezone.utc) < cached["expires_at"]:
-            return cached["data"]
-    return None
+    return _cache.get(key)
 
 
 def _set_cache(key: str, data: Any, ttl: int = CACHE_TTL_SECONDS):
     """Cache response with TTL"""
-    _cache[key] = {
-        "data": data,
-        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
-    }
+    _cache.set(key, data, ttl)
 
 
 def _na_cell(symbol: str, reason: str) -> Dict[str, Any]:
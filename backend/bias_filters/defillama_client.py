@@ -7,11 +7,12 @@ No authentication required
 """
 
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 import httpx
 
 from bias_filters.crypto_vendor_health import record_observation
+from utils.memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
@@ -31,25 +32,18 @@ STABLECOINS = ["USDC", "USDT", "DAI", "USDE", "FRAX"]
 MIN_TVL = 10_000_000  # $10M
 
 # Cache for API responses
-_cache: Dict[str, Dict[str, Any]] = {}
 CACHE_TTL_SECONDS = 900  # 15 minutes (yields don't change that fast)
+_cache = MemoryCache("defillama_client.yields", ttl=CACHE_TTL_SECONDS, max_entries=64)
 
 
 def _get_cached(key: str) -> Optional[Dict[str, Any]]:
     """Get cached response if not expired"""
-    if key in _cache:
-        cached = _cache[key]
-        if datetime.now(timezone.utc) < cached["expires_at"]:
-            return cached["data"]
-    return None
+    return _cache.get(key)
 
 
 def _set_cache(key: str, data: Any, ttl: int = CACHE_TTL_SECONDS):
     """Cache response with TTL"""
-    _cache[key] = {
-        "data": data,
-        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
-    }
+    _cache.set(key, data, ttl)
 
 
 async def _make_request(endpoint: str) -> Optional[Dict]:
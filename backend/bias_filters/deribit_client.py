@@ -21,6 +21,7 @@ import httpx
 
 from config.crypto_sanity_bounds import check_skew_25d
 from bias_filters.crypto_vendor_health import record_observation
+from utils.memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
@@ -44,25 +45,18 @@ _DERIBIT_CURRENCY: Dict[str, Optional[str]] = {
 _MIN_INSTRUMENT_COUNT = 1
 
 # Cache for API responses
-_cache: Dict[str, Dict[str, Any]] = {}
 CACHE_TTL_SECONDS = 300  # 5 minutes
+_cache = MemoryCache("deribit_client.options", ttl=CACHE_TTL_SECONDS, max_entries=64)
 
 
 def _get_cached(key: str) -> Optional[Dict[str, Any]]:
     """Get cached response if not expired"""
-    if key in _cache:
-        cached = _cache[key]
-        if datetime.now(timezone.utc) < cached["expires_at"]:
-            return cached["data"]
-    return None
+    return _cache.get(key)
 
 
 def _set_cache(key: str, data: Any, ttl: int = CACHE_TTL_SECONDS):
     """Cache response with TTL"""
-    _cache[key] = {
-        "data": data,
-        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
-    }
+    _cache.set(key, data, ttl)
 
 
 def _na_cell(symbol: str, reason: str) -> Dict[str, Any]:
@@ -34,12 +34,13 @@ from __future__ import annotations
 
 import logging
 import os
-from datetime import datetime, time as _time, timezone
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from zoneinfo import ZoneInfo
 
 from config.liquid_universe import is_liquid
+from utils.trading_calendar import is_session_open
 
 logger = logging.getLogger(__name__)
 
@@ -71,12 +72,10 @@ def _norm_dir(d: Optional[str]) -> str:
 
 
 def _in_rth() -> bool:
-    """Strict 09:30–16:00 ET (weekday). Matches the Chunk 3 watchdog gate; NOT the
-    looser api/sectors._is_market_hours (which over-extends to ~16:30)."""
-    now = datetime.now(_ET)
-    if now.weekday() >= 5:
-        return False
-    return _time(9, 30) <= now.time() <= _time(16, 0)
+    """Strict regular session, 09:30–16:00 ET (shared trading calendar: holidays,
+    13:00 early closes). Matches the Chunk 3 watchdog gate; NOT the looser
+    api/sectors._is_market_hours (which over-extends to ~16:30)."""
+    return is_session_open(datetime.now(_ET))
 
 
 # ── Flow half (pure) ─────────────────────────────────────────────────────────
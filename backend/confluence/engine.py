@@ -229,21 +229,27 @@ def _determine_tier(independent: int, lenses: set, signals: list) -> str:
     return "STANDALONE"
 
 
+# Also applied once by schema migration 2 (database/migrations.py).
+CONFLUENCE_COLUMNS_DDL = (
+    "ALTER TABLE signals ADD COLUMN IF NOT EXISTS confluence_tier VARCHAR(20) DEFAULT 'STANDALONE'",
+    "ALTER TABLE signals ADD COLUMN IF NOT EXISTS confluence_count INTEGER DEFAULT 0",
+    "ALTER TABLE signals ADD COLUMN IF NOT EXISTS confluence_updated_at TIMESTAMP",
+)
+_confluence_columns_ready = False
+
+
 async def _ensure_confluence_columns(conn) -> None:
     """
     Add confluence columns to signals table if they don't exist.
-    Safe to call repeatedly (IF NOT EXISTS).
+    Runs the DDL at most once per process (the migration normally has already).
     """
+    global _confluence_columns_ready
+    if _confluence_columns_ready:
+        return
     try:
-        await conn.execute("""
-            ALTER TABLE signals ADD COLUMN IF NOT EXISTS confluence_tier VARCHAR(20) DEFAULT 'STANDALONE';
-        """)
-        await conn.execute("""
-            ALTER TABLE signals ADD COLUMN IF NOT EXISTS confluence_count INTEGER DEFAULT 0;
-        """)
-        await conn.execute("""
-            ALTER TABLE signals ADD COLUMN IF NOT EXISTS confluence_updated_at TIMESTAMP;
-        """)
+        for statement in CONFLUENCE_COLUMNS_DDL:
+            await conn.execute(statement)
+        _confluence_columns_ready = True
     except Exception as e:
         # Column might already exist or table structure differs
         logger.debug("Confluence column check: %s", e)
@@ -0,0 +1,192 @@
+"""
+Versioned schema migrations with a ledger table.
+
+init_database used to run ~150 CREATE/ALTER/backfill statements on every boot,
+and several modules re-ran their own `ALTER TABLE ... IF NOT EXISTS` checks at
+runtime (some inside every scan). Webhooks that arrive while a fresh Railway
+deploy is still doing that are lost, so startup now does one query:
+
+    SELECT MAX(version) FROM schema_migrations
+
+and only when that is behind MIGRATIONS does it take a Postgres advisory lock
+(so two replicas never migrate concurrently) and apply the missing versions in
+order, recording each in the ledger.
+
+Rules for adding schema:
+  - Append a Migration with the next version number; never edit or renumber an
+    applied one. Keep the human-readable SQL in /migrations/NNN_*.sql as before.
+  - Statements run outside a transaction (the baseline relies on per-step
+    lock_timeout handling), so write them idempotently (IF NOT EXISTS, guarded
+    backfills).
+  - A migration that could only partly apply raises MigrationIncomplete: it is
+    not recorded and the next boot retries it. Later versions still run (their
+    statements are idempotent, and runtime code expects their tables) but are
+    not recorded either, so the ledger stays contiguous and they run again
+    after the retry succeeds.
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant key for pg_advisory_lock; shared by every replica.
+MIGRATION_LOCK_KEY = 7_340_211_013
+
+# Applied once the advisory lock is held, never while waiting for it: a second
+# process booting alongside the first (API + worker) must wait out the whole
+# migration, not time out after 5s. Fail fast on DDL lock contention instead of
+# blocking a table indefinitely (an ALTER TABLE queued behind a long query
+# holds ACCESS EXCLUSIVE and blocks every read and write to it), and give slow
+# first-run CREATE TABLEs some room.
+DDL_LOCK_TIMEOUT = "5s"
+DDL_STATEMENT_TIMEOUT = "60s"
+
+LEDGER_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version     INTEGER PRIMARY KEY,
+        name        TEXT NOT NULL,
+        applied_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        duration_ms INTEGER
+    )
+"""
+
+
+class MigrationIncomplete(Exception):
+    """Raised by a migration that skipped steps; it will be retried next boot."""
+
+
+class Migration:
+    __slots__ = ("version", "name", "apply")
+
+    def __init__(self, version: int, name: str, apply: Callable[[Any], Awaitable[None]]):
+        self.version = version
+        self.name = name
+        self.apply = apply
+
+
+async def _baseline(conn) -> None:
+    from database.postgres_client import _apply_baseline_schema
+    await _apply_baseline_schema(conn)
+
+
+async def _startup_tables(conn) -> None:
+    """DDL that used to run in main.py startup and in per-call `_ensure_*` helpers."""
+    from analytics.proximity_attribution import add_attribution_columns
+    from api.chronos import create_chronos_table
+    from api.layout import _ensure_table as ensure_layout_table
+    from api.trade_watchlist import TRADE_WATCHLIST_DDL
+    from confluence.engine import CONFLUENCE_COLUMNS_DDL
+    from stable_engine.job_status import _ensure_table as ensure_job_status_table
+
+    await conn.execute(TRADE_WATCHLIST_DDL)
+    await create_chronos_table(conn)
+    await add_attribution_columns(conn)
+    for statement in CONFLUENCE_COLUMNS_DDL:
+        await conn.execute(statement)
+    await ensure_job_status_table(conn)
+    await ensure_layout_table(conn)
+    await conn.execute(
+        "ALTER TABLE IF EXISTS lightning_cards ADD COLUMN IF NOT EXISTS confirmations JSONB DEFAULT '[]'"
+    )
+
+
+async def _sector_daily_bars(conn) -> None:
+    from jobs.sector_bar_panel import SECTOR_DAILY_BARS_DDL
+    await conn.execute(SECTOR_DAILY_BARS_DDL)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline_schema", _baseline),
+    Migration(2, "startup_side_tables", _startup_tables),
+    Migration(3, "sector_daily_bars", _sector_daily_bars),
+]
+
+
+def latest_version(migrations: List[Migration] = None) -> int:
+    migrations = MIGRATIONS if migrations is None else migrations
+    return max((m.version for m in migrations), default=0)
+
+
+async def current_version(conn) -> int:
+    """Highest applied version; 0 on a database that predates the ledger."""
+    try:
+        version = await conn.fetchval("SELECT MAX(version) FROM schema_migrations")
+    except asyncpg.UndefinedTableError:
+        return 0
+    return int(version or 0)
+
+
+async def migrate(conn, migrations: List[Migration] = None) -> Dict[str, Any]:
+    """
+    Apply unapplied migrations in version order.
+
+    Returns {"version", "applied", "pending", "fast_path"}; fast_path is True
+    when the ledger was already current and nothing but the version check ran.
+    """
+    migrations = sorted(MIGRATIONS if migrations is None else migrations, key=lambda m: m.version)
+    target = latest_version(migrations)
+
+    version = await current_version(conn)
+    if version >= target:
+        return {"version": version, "applied": [], "pending": [], "fast_path": True}
+
+    applied: List[int] = []
+    await conn.execute("SET lock_timeout = 0")
+    await conn.execute("SET statement_timeout = 0")
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+    try:
+        await conn.execute(f"SET lock_timeout = '{DDL_LOCK_TIMEOUT}'")
+        await conn.execute(f"SET statement_timeout = '{DDL_STATEMENT_TIMEOUT}'")
+        await conn.execute(LEDGER_DDL)
+        # Re-read under the lock: another replica may have migrated meanwhile.
+        done = {r["version"] for r in await conn.fetch("SELECT version FROM schema_migrations")}
+        incomplete = False
+        for migration in migrations:
+            if migration.version in done:
+                continue
+            if incomplete:
+                try:
+                    await migration.apply(conn)
+                    logger.info("Applied migration %d (%s) unrecorded after an incomplete one",
+                                migration.version, migration.name)
+                except Exception as e:
+                    logger.warning("Migration %d (%s) failed after an incomplete one: %s",
+                                   migration.version, migration.name, e)
+                continue
+            started = time.perf_counter()
+            try:
+                await migration.apply(conn)
+            except MigrationIncomplete as e:
+                logger.warning("Migration %d (%s) incomplete, will retry next boot: %s",
+                               migration.version, migration.name, e)
+                incomplete = True
+                continue
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            await conn.execute(
+                "INSERT INTO schema_migrations (version, name, duration_ms) VALUES ($1, $2, $3) "
+                "ON CONFLICT (version) DO NOTHING",
+                migration.version, migration.name, duration_ms,
+            )
+            done.add(migration.version)
+            applied.append(migration.version)
+            logger.info("Applied migration %d (%s) in %dms", migration.version, migration.name, duration_ms)
+    finally:
+        await conn.execute("RESET lock_timeout")
+        await conn.execute("RESET statement_timeout")
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+    contiguous = 0
+    for migration in migrations:
+        if migration.version not in done:
+            break
+        contiguous = migration.version
+    return {
+        "version": contiguous,
+        "applied": applied,
+        "pending": [m.version for m in migrations if m.version not in done],
+        "fast_path": False,
+    }
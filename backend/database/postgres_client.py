@@ -3,6 +3,7 @@ PostgreSQL Client for Permanent Signal Logging
 Stores all signals for backtesting and historical analysis
 """
 
+import asyncio
 import asyncpg
 import os
 from typing import Optional, Dict, Any, List
@@ -120,1493 +121,1539 @@ async def close_postgres_client():
         await _db_pool.close()
         _db_pool = None
 
-async def init_database():
-    """
-    Initialize database schema
-    Run this once on first deployment
-    """
-    pool = await get_postgres_client()
-
-    async with pool.acquire() as conn:
-        # Safety: fail fast on lock contention instead of blocking the table indefinitely.
-        # Without this, ALTER TABLE can hold ACCESS EXCLUSIVE lock for hours if another
-        # query is running, blocking ALL reads and writes to the table.
-        await conn.execute("SET lock_timeout = '5s'")
-        # Temporarily raise statement_timeout for DDL (CREATE TABLE can be slow on first run)
-        await conn.execute("SET statement_timeout = '60s'")
-
-        # Signals table - logs every trade recommendation
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS signals (
-                id SERIAL PRIMARY KEY,
-                signal_id VARCHAR(255) UNIQUE NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                strategy VARCHAR(100) NOT NULL,
-                ticker VARCHAR(20) NOT NULL,
-                asset_class VARCHAR(20) NOT NULL,
-                direction VARCHAR(10) NOT NULL,
-                signal_type VARCHAR(50) NOT NULL,
-                entry_price DECIMAL(10, 2),
-                stop_loss DECIMAL(10, 2),
-                target_1 DECIMAL(10, 2),
-                target_2 DECIMAL(10, 2),
-                risk_reward DECIMAL(5, 2),
-                timeframe VARCHAR(20),
-                bias_level VARCHAR(50),
-                adx DECIMAL(5, 2),
-                line_separation DECIMAL(10, 2),
-                user_action VARCHAR(20),
-                dismissed_at TIMESTAMP,
-                selected_at TIMESTAMP,
-                day_of_week INTEGER,
-                hour_of_day INTEGER,
-                is_opex_week BOOLEAN DEFAULT FALSE,
-                days_to_earnings INTEGER,
-                market_event TEXT,
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-        
-        # Positions table - tracks selected trades
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS positions (
-                id SERIAL PRIMARY KEY,
-                signal_id VARCHAR(255) NOT NULL,
-                ticker VARCHAR(20) NOT NULL,
-                direction VARCHAR(10) NOT NULL,
-                entry_price DECIMAL(10, 2),
-                entry_time TIMESTAMP,
-                exit_price DECIMAL(10, 2),
-                exit_time TIMESTAMP,
-                stop_loss DECIMAL(10, 2),
-                target_1 DECIMAL(10, 2),
-                quantity DECIMAL(18, 8),
-                realized_pnl DECIMAL(10, 2),
-                status VARCHAR(20),
-                broker VARCHAR(50),
-                created_at TIMESTAMP DEFAULT NOW(),
-                FOREIGN KEY (signal_id) REFERENCES signals(signal_id)
-            )
-        """)
-
-        # Trades table - user execution archive for analytics workflows.
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id SERIAL PRIMARY KEY,
-                signal_id VARCHAR(255),
-                ticker VARCHAR(20) NOT NULL,
-                direction VARCHAR(10),
-                status VARCHAR(20) DEFAULT 'open',
-                account VARCHAR(50),
-                structure TEXT,
-                signal_source TEXT,
-                entry_price DECIMAL(10, 2),
-                stop_loss DECIMAL(10, 2),
-                target_1 DECIMAL(10, 2),
-                quantity DECIMAL(18, 8),
-                opened_at TIMESTAMPTZ DEFAULT NOW(),
-                closed_at TIMESTAMPTZ,
-                exit_price DECIMAL(10, 2),
-                pnl_dollars DECIMAL(12, 2),
-                pnl_percent DECIMAL(8, 3),
-                rr_achieved DECIMAL(8, 3),
-                exit_reason TEXT,
-                bias_at_entry VARCHAR(50),
-                risk_amount DECIMAL(12, 2),
-                risk_pct DECIMAL(8, 3),
-                account_balance_at_open DECIMAL(12, 2),
-                notes TEXT
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_ticker_status
-                ON trades(ticker, status);
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_account
-                ON trades(account);
-        """)
-
-        # Price history for backtesting and benchmark derivation.
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS price_history (
-                id SERIAL PRIMARY KEY,
-                ticker TEXT NOT NULL,
-                timeframe TEXT NOT NULL,
-                timestamp TIMESTAMPTZ NOT NULL,
-                open REAL,
-                high REAL,
-                low REAL,
-                close REAL,
-                volume REAL,
-                UNIQUE(ticker, timeframe, timestamp)
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_price_ticker_tf
-                ON price_history(ticker, timeframe, timestamp);
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_price_timeframe_timestamp
-                ON price_history(timeframe, timestamp);
-        """)
-
-        # Multi-leg execution journal linked to trades.
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS trade_legs (
-                id SERIAL PRIMARY KEY,
-                trade_id INTEGER REFERENCES trades(id) NOT NULL,
-                timestamp TIMESTAMPTZ NOT NULL,
-                action TEXT NOT NULL,
-                direction TEXT NOT NULL,
-                quantity REAL NOT NULL,
-                price REAL NOT NULL,
-                strike REAL,
-                expiry DATE,
-                leg_type TEXT,
-                commission REAL DEFAULT 0,
-                notes TEXT
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_legs_trade
-                ON trade_legs(trade_id);
-        """)
-
-        # Benchmark time-series for performance comparison.
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS benchmarks (
-                id SERIAL PRIMARY KEY,
-                timestamp TIMESTAMPTZ NOT NULL,
-                benchmark TEXT NOT NULL,
-                cumulative_return REAL
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_benchmarks_ts
-                ON benchmarks(benchmark, timestamp);
-        """)
-
-        # Portfolio-level risk snapshots.
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS portfolio_snapshots (
-                id SERIAL PRIMARY KEY,
-                timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                account TEXT NOT NULL,
-                total_positions INTEGER,
-                net_delta REAL,
-                total_risk REAL,
-                risk_pct_of_account REAL,
-                largest_position_pct REAL,
-                sector_exposure JSONB DEFAULT '{}'::jsonb,
-                direction_exposure JSONB DEFAULT '{}'::jsonb,
-                correlated_positions INTEGER,
-                max_correlated_loss REAL
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_portfolio_ts
-                ON portfolio_snapshots(account, timestamp);
-        """)
-
-        # Strategy health snapshots (rolling quality scores per signal source).
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS strategy_health (
-                id SERIAL PRIMARY KEY,
-                source TEXT NOT NULL,
-                window_days INTEGER NOT NULL DEFAULT 30,
-                signals_count INTEGER NOT NULL DEFAULT 0,
-                outcomes_count INTEGER NOT NULL DEFAULT 0,
-                accuracy REAL,
-                false_signal_rate REAL,
-                expectancy REAL,
-                avg_mfe_pct REAL,
-                avg_mae_pct REAL,
-                mfe_mae_ratio REAL,
-                regime_breakdown JSONB DEFAULT '{}'::jsonb,
-                convergence_signals INTEGER DEFAULT 0,
-                convergence_accuracy REAL,
-                grade VARCHAR(2) NOT NULL,
-                computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_strategy_health_source_time
-                ON strategy_health(source, computed_at DESC);
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_strategy_health_computed_at
-                ON strategy_health(computed_at DESC);
-        """)
-
-        # Strategy health alerts for degraded grades and grade transitions.
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS health_alerts (
-                id SERIAL PRIMARY KEY,
-                source TEXT NOT NULL,
-                previous_grade VARCHAR(2),
-                new_grade VARCHAR(2) NOT NULL,
-                threshold_trigger TEXT NOT NULL,
-                message TEXT,
-                metadata JSONB DEFAULT '{}'::jsonb,
-                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                resolved_at TIMESTAMPTZ
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_health_alerts_source_created
-                ON health_alerts(source, created_at DESC);
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_health_alerts_unresolved
-                ON health_alerts(resolved_at)
-                WHERE resolved_at IS NULL;
-        """)
-
-        # Unusual Whales screenshot intelligence snapshots (vision-extracted context).
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS uw_snapshots (
-                id SERIAL PRIMARY KEY,
-                timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                dashboard_type TEXT NOT NULL,
-                time_slot TEXT,
-                extracted_data JSONB NOT NULL DEFAULT '{}'::jsonb,
-                raw_summary TEXT,
-                signal_alignment TEXT
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_uw_snap_ts
-                ON uw_snapshots(timestamp, dashboard_type);
-        """)
-        
-        # TICK history table
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS tick_history (
-                id SERIAL PRIMARY KEY,
-                date DATE UNIQUE NOT NULL,
-                tick_high INTEGER NOT NULL,
-                tick_low INTEGER NOT NULL,
-                range_type VARCHAR(20) NOT NULL,
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-        
-        # Bias history table
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS bias_history (
-                id SERIAL PRIMARY KEY,
-                timestamp TIMESTAMP NOT NULL,
-                timeframe VARCHAR(20) NOT NULL,
-                bias_level VARCHAR(50) NOT NULL,
-                supporting_data JSONB,
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
+def _schema_step_skipped(step: str, error: Exception) -> str:
+    print(f"WARNING: {step}: {error}")
+    return step
 
-        # Factor history table (Pivot factor updates)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS factor_history (
-                id SERIAL PRIMARY KEY,
-                factor_name VARCHAR(50) NOT NULL,
-                score FLOAT NOT NULL,
-                bias VARCHAR(20) NOT NULL,
-                data JSONB,
-                collected_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_factor_history_name_time
-                ON factor_history (factor_name, collected_at DESC);
-        """)
 
-        # Factor readings table (normalized history for weekly integrity audits)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS factor_readings (
-                id SERIAL PRIMARY KEY,
-                factor_id TEXT NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                score FLOAT NOT NULL,
-                signal TEXT,
-                source TEXT,
-                metadata JSONB,
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_factor_readings_factor_time
-                ON factor_readings (factor_id, timestamp DESC);
-        """)
+async def _apply_baseline_schema(conn) -> None:
+    """
+    Migration 1: the schema init_database used to run on every boot.
+    Every statement is idempotent (IF NOT EXISTS / guarded backfills).
+    Steps that fail (typically lock_timeout) are collected and reported as
+    MigrationIncomplete so the baseline is retried on the next boot instead of
+    being recorded as applied.
+    """
+    from database.migrations import MigrationIncomplete
+
+    skipped: List[str] = []
+
+    # Signals table - logs every trade recommendation
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS signals (
+            id SERIAL PRIMARY KEY,
+            signal_id VARCHAR(255) UNIQUE NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            strategy VARCHAR(100) NOT NULL,
+            ticker VARCHAR(20) NOT NULL,
+            asset_class VARCHAR(20) NOT NULL,
+            direction VARCHAR(10) NOT NULL,
+            signal_type VARCHAR(50) NOT NULL,
+            entry_price DECIMAL(10, 2),
+            stop_loss DECIMAL(10, 2),
+            target_1 DECIMAL(10, 2),
+            target_2 DECIMAL(10, 2),
+            risk_reward DECIMAL(5, 2),
+            timeframe VARCHAR(20),
+            bias_level VARCHAR(50),
+            adx DECIMAL(5, 2),
+            line_separation DECIMAL(10, 2),
+            user_action VARCHAR(20),
+            dismissed_at TIMESTAMP,
+            selected_at TIMESTAMP,
+            day_of_week INTEGER,
+            hour_of_day INTEGER,
+            is_opex_week BOOLEAN DEFAULT FALSE,
+            days_to_earnings INTEGER,
+            market_event TEXT,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    
+    # Positions table - tracks selected trades
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS positions (
+            id SERIAL PRIMARY KEY,
+            signal_id VARCHAR(255) NOT NULL,
+            ticker VARCHAR(20) NOT NULL,
+            direction VARCHAR(10) NOT NULL,
+            entry_price DECIMAL(10, 2),
+            entry_time TIMESTAMP,
+            exit_price DECIMAL(10, 2),
+            exit_time TIMESTAMP,
+            stop_loss DECIMAL(10, 2),
+            target_1 DECIMAL(10, 2),
+            quantity DECIMAL(18, 8),
+            realized_pnl DECIMAL(10, 2),
+            status VARCHAR(20),
+            broker VARCHAR(50),
+            created_at TIMESTAMP DEFAULT NOW(),
+            FOREIGN KEY (signal_id) REFERENCES signals(signal_id)
+        )
+    """)
 
-        # Composite bias history
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS bias_composite_history (
-                id SERIAL PRIMARY KEY,
-                composite_score FLOAT NOT NULL,
-                bias_level VARCHAR(20) NOT NULL,
-                bias_numeric INTEGER NOT NULL,
-                active_factors TEXT[] NOT NULL,
-                stale_factors TEXT[] NOT NULL,
-                velocity_multiplier FLOAT NOT NULL DEFAULT 1.0,
-                override VARCHAR(20),
-                confidence VARCHAR(10) NOT NULL,
-                factor_scores JSONB NOT NULL,
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
+    # Trades table - user execution archive for analytics workflows.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS trades (
+            id SERIAL PRIMARY KEY,
+            signal_id VARCHAR(255),
+            ticker VARCHAR(20) NOT NULL,
+            direction VARCHAR(10),
+            status VARCHAR(20) DEFAULT 'open',
+            account VARCHAR(50),
+            structure TEXT,
+            signal_source TEXT,
+            entry_price DECIMAL(10, 2),
+            stop_loss DECIMAL(10, 2),
+            target_1 DECIMAL(10, 2),
+            quantity DECIMAL(18, 8),
+            opened_at TIMESTAMPTZ DEFAULT NOW(),
+            closed_at TIMESTAMPTZ,
+            exit_price DECIMAL(10, 2),
+            pnl_dollars DECIMAL(12, 2),
+            pnl_percent DECIMAL(8, 3),
+            rr_achieved DECIMAL(8, 3),
+            exit_reason TEXT,
+            bias_at_entry VARCHAR(50),
+            risk_amount DECIMAL(12, 2),
+            risk_pct DECIMAL(8, 3),
+            account_balance_at_open DECIMAL(12, 2),
+            notes TEXT
+        )
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_bias_history_created
-                ON bias_composite_history(created_at);
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_trades_ticker_status
+            ON trades(ticker, status);
+    """)
 
-        # Watchlist tickers (primary source of ticker membership)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS watchlist_tickers (
-                id SERIAL PRIMARY KEY,
-                symbol VARCHAR(10) NOT NULL,
-                sector VARCHAR(100) NOT NULL DEFAULT 'Uncategorized',
-                source VARCHAR(20) NOT NULL DEFAULT 'manual',
-                muted BOOLEAN NOT NULL DEFAULT false,
-                priority VARCHAR(20) NOT NULL DEFAULT 'normal',
-                added_at TIMESTAMP DEFAULT NOW(),
-                muted_at TIMESTAMP,
-                position_id INTEGER,
-                notes VARCHAR(200),
-                UNIQUE(symbol)
-            )
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_trades_account
+            ON trades(account);
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_sector
-                ON watchlist_tickers(sector);
-        """)
+    # Price history for backtesting and benchmark derivation.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS price_history (
+            id SERIAL PRIMARY KEY,
+            ticker TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            timestamp TIMESTAMPTZ NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume REAL,
+            UNIQUE(ticker, timeframe, timestamp)
+        )
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_source
-                ON watchlist_tickers(source);
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_price_ticker_tf
+            ON price_history(ticker, timeframe, timestamp);
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_muted
-                ON watchlist_tickers(muted);
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_price_timeframe_timestamp
+            ON price_history(timeframe, timestamp);
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_priority
-                ON watchlist_tickers(priority);
-        """)
+    # Multi-leg execution journal linked to trades.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS trade_legs (
+            id SERIAL PRIMARY KEY,
+            trade_id INTEGER REFERENCES trades(id) NOT NULL,
+            timestamp TIMESTAMPTZ NOT NULL,
+            action TEXT NOT NULL,
+            direction TEXT NOT NULL,
+            quantity REAL NOT NULL,
+            price REAL NOT NULL,
+            strike REAL,
+            expiry DATE,
+            leg_type TEXT,
+            commission REAL DEFAULT 0,
+            notes TEXT
+        )
+    """)
 
-        # Signal outcomes table (historical hit rate tracking)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS signal_outcomes (
-                id SERIAL PRIMARY KEY,
-                signal_id VARCHAR(100) NOT NULL,
-                symbol VARCHAR(10) NOT NULL,
-                signal_type VARCHAR(50) NOT NULL,
-                direction VARCHAR(10) NOT NULL,
-                cta_zone VARCHAR(30),
-                entry DECIMAL(12, 2),
-                stop DECIMAL(12, 2),
-                t1 DECIMAL(12, 2),
-                t2 DECIMAL(12, 2),
-                invalidation_level DECIMAL(12, 2),
-                created_at TIMESTAMP NOT NULL,
-                outcome VARCHAR(20),
-                outcome_at TIMESTAMP,
-                outcome_price DECIMAL(12, 2),
-                max_favorable DECIMAL(12, 2),
-                max_adverse DECIMAL(12, 2),
-                days_to_outcome INTEGER,
-                UNIQUE(signal_id)
-            )
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_legs_trade
+            ON trade_legs(trade_id);
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signal_outcomes_symbol
-                ON signal_outcomes(symbol);
-        """)
+    # Benchmark time-series for performance comparison.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS benchmarks (
+            id SERIAL PRIMARY KEY,
+            timestamp TIMESTAMPTZ NOT NULL,
+            benchmark TEXT NOT NULL,
+            cumulative_return REAL
+        )
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signal_outcomes_type
-                ON signal_outcomes(signal_type);
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_benchmarks_ts
+            ON benchmarks(benchmark, timestamp);
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signal_outcomes_outcome
-                ON signal_outcomes(outcome);
-        """)
-        
-        # Add new columns to signals table for Trade Ideas enhancement
-        # These are added separately to support existing databases
-        # Wrapped in try/except: if lock_timeout fires, skip rather than crash startup
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS score DECIMAL(5, 2),
-                ADD COLUMN IF NOT EXISTS bias_alignment VARCHAR(20),
-                ADD COLUMN IF NOT EXISTS triggering_factors JSONB,
-                ADD COLUMN IF NOT EXISTS actual_entry_price DECIMAL(10, 2),
-                ADD COLUMN IF NOT EXISTS actual_exit_price DECIMAL(10, 2),
-                ADD COLUMN IF NOT EXISTS actual_stop_hit BOOLEAN,
-                ADD COLUMN IF NOT EXISTS trade_outcome VARCHAR(20),
-                ADD COLUMN IF NOT EXISTS loss_reason VARCHAR(50),
-                ADD COLUMN IF NOT EXISTS notes TEXT,
-                ADD COLUMN IF NOT EXISTS bias_at_signal JSONB,
-                ADD COLUMN IF NOT EXISTS day_of_week INTEGER,
-                ADD COLUMN IF NOT EXISTS hour_of_day INTEGER,
-                ADD COLUMN IF NOT EXISTS is_opex_week BOOLEAN DEFAULT FALSE,
-                ADD COLUMN IF NOT EXISTS days_to_earnings INTEGER,
-                ADD COLUMN IF NOT EXISTS market_event TEXT
-            """)
-        except Exception as e:
-            print(f"WARNING: signals ALTER TABLE 1 skipped (lock timeout?): {e}")
+    # Portfolio-level risk snapshots.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+            id SERIAL PRIMARY KEY,
+            timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            account TEXT NOT NULL,
+            total_positions INTEGER,
+            net_delta REAL,
+            total_risk REAL,
+            risk_pct_of_account REAL,
+            largest_position_pct REAL,
+            sector_exposure JSONB DEFAULT '{}'::jsonb,
+            direction_exposure JSONB DEFAULT '{}'::jsonb,
+            correlated_positions INTEGER,
+            max_correlated_loss REAL
+        )
+    """)
 
-        # Phase 4: Trade Ideas lifecycle columns on existing signals table
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS status VARCHAR(30) DEFAULT 'ACTIVE',
-                ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP,
-                ADD COLUMN IF NOT EXISTS enrichment_data JSONB,
-                ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP,
-                ADD COLUMN IF NOT EXISTS committee_run_id VARCHAR(100),
-                ADD COLUMN IF NOT EXISTS committee_data JSONB,
-                ADD COLUMN IF NOT EXISTS committee_requested_at TIMESTAMP,
-                ADD COLUMN IF NOT EXISTS committee_completed_at TIMESTAMP,
-                ADD COLUMN IF NOT EXISTS pending_trade_id VARCHAR(100),
-                ADD COLUMN IF NOT EXISTS decided_at TIMESTAMP,
-                ADD COLUMN IF NOT EXISTS decision_source VARCHAR(20),
-                ADD COLUMN IF NOT EXISTS source VARCHAR(50) DEFAULT 'tradingview',
-                ADD COLUMN IF NOT EXISTS regime VARCHAR(30),
-                ADD COLUMN IF NOT EXISTS confluence_score DECIMAL(5, 2),
-                ADD COLUMN IF NOT EXISTS score_v2 DECIMAL(5, 2),
-                ADD COLUMN IF NOT EXISTS score_v2_factors JSONB,
-                ADD COLUMN IF NOT EXISTS signal_category VARCHAR(20) DEFAULT 'TRADE_SETUP'
-            """)
-        except Exception as e:
-            print(f"WARNING: signals ALTER TABLE 2 skipped (lock timeout?): {e}")
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_portfolio_ts
+            ON portfolio_snapshots(account, timestamp);
+    """)
 
-        # Phase 4: Indexes for Trade Ideas feed queries
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_status ON signals(status);
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_status_score ON signals(status, score DESC NULLS LAST);
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_expires ON signals(expires_at) WHERE expires_at IS NOT NULL;
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_source ON signals(source);
-        """)
+    # Strategy health snapshots (rolling quality scores per signal source).
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS strategy_health (
+            id SERIAL PRIMARY KEY,
+            source TEXT NOT NULL,
+            window_days INTEGER NOT NULL DEFAULT 30,
+            signals_count INTEGER NOT NULL DEFAULT 0,
+            outcomes_count INTEGER NOT NULL DEFAULT 0,
+            accuracy REAL,
+            false_signal_rate REAL,
+            expectancy REAL,
+            avg_mfe_pct REAL,
+            avg_mae_pct REAL,
+            mfe_mae_ratio REAL,
+            regime_breakdown JSONB DEFAULT '{}'::jsonb,
+            convergence_signals INTEGER DEFAULT 0,
+            convergence_accuracy REAL,
+            grade VARCHAR(2) NOT NULL,
+            computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
 
-        # ZEUS Phase 5: ADX value for Artemis regime filter + outcome analysis
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS adx_value FLOAT
-            """)
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_signals_adx
-                ON signals(adx_value) WHERE adx_value IS NOT NULL
-            """)
-        except Exception as e:
-            print(f"WARNING: signals adx_value migration skipped: {e}")
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_strategy_health_source_time
+            ON strategy_health(source, computed_at DESC);
+    """)
 
-        # ZEUS Phase 5: audit columns for ADX score-ceiling and feed-tier ceiling
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS feed_tier_ceiling TEXT,
-                ADD COLUMN IF NOT EXISTS score_ceiling_reason TEXT
-            """)
-        except Exception as e:
-            print(f"WARNING: signals ceiling audit columns migration skipped: {e}")
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_strategy_health_computed_at
+            ON strategy_health(computed_at DESC);
+    """)
 
-        # One-time cleanup: expire stuck COMMITTEE_REVIEW signals from April 2026 credit outage
-        try:
-            await conn.execute("""
-                UPDATE signals
-                SET status = 'EXPIRED',
-                    notes = COALESCE(notes, '') || ' | Auto-expired 2026-04-21: stuck COMMITTEE_REVIEW (7+ days, credit outage)'
-                WHERE signal_id IN ('HG_SNOW_20260414_131507', 'ARTEMIS_CRM_20260416_141203_140577')
-                  AND status = 'COMMITTEE_REVIEW'
-            """)
-        except Exception as e:
-            print(f"WARNING: stuck-signal cleanup skipped: {e}")
+    # Strategy health alerts for degraded grades and grade transitions.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS health_alerts (
+            id SERIAL PRIMARY KEY,
+            source TEXT NOT NULL,
+            previous_grade VARCHAR(2),
+            new_grade VARCHAR(2) NOT NULL,
+            threshold_trigger TEXT NOT NULL,
+            message TEXT,
+            metadata JSONB DEFAULT '{}'::jsonb,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            resolved_at TIMESTAMPTZ
+        )
+    """)
 
-        # One-time cleanup: expire stale PENDING_REVIEW backlog (2026-04-22 threshold-raise)
-        # 156 signals stuck in pre-ZEUS PENDING_REVIEW queue, none reviewed in 7+ days
-        try:
-            await conn.execute("""
-                UPDATE signals
-                SET status = 'EXPIRED',
-                    notes = COALESCE(notes, '') || ' | Auto-expired 2026-04-22: stale PENDING_REVIEW backlog (pre-threshold-raise cleanup)'
-                WHERE status = 'PENDING_REVIEW'
-                  AND timestamp < NOW() - INTERVAL '7 days'
-            """)
-        except Exception as e:
-            print(f"WARNING: PENDING_REVIEW backlog cleanup skipped: {e}")
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_health_alerts_source_created
+            ON health_alerts(source, created_at DESC);
+    """)
 
-        # Backfill: existing signals without status get ACTIVE if undecided, DISMISSED/SELECTED if acted on
-        await conn.execute("""
-            UPDATE signals SET status = 'DISMISSED' WHERE status IS NULL AND user_action = 'DISMISSED'
-        """)
-        await conn.execute("""
-            UPDATE signals SET status = 'ACCEPTED_OPTIONS' WHERE status IS NULL AND user_action = 'SELECTED'
-        """)
-        await conn.execute("""
-            UPDATE signals SET status = 'ACTIVE' WHERE status IS NULL AND user_action IS NULL
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_health_alerts_unresolved
+            ON health_alerts(resolved_at)
+            WHERE resolved_at IS NULL;
+    """)
 
-        # Add recommendation capture fields to the trade journal table.
-        try:
-            await conn.execute("""
-                ALTER TABLE IF EXISTS trades
-                ADD COLUMN IF NOT EXISTS pivot_recommendation TEXT,
-                ADD COLUMN IF NOT EXISTS pivot_conviction TEXT,
-                ADD COLUMN IF NOT EXISTS full_context JSONB DEFAULT '{}'::jsonb
-            """)
-        except Exception as e:
-            print(f"WARNING: trades ALTER TABLE skipped: {e}")
+    # Unusual Whales screenshot intelligence snapshots (vision-extracted context).
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS uw_snapshots (
+            id SERIAL PRIMARY KEY,
+            timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            dashboard_type TEXT NOT NULL,
+            time_slot TEXT,
+            extracted_data JSONB NOT NULL DEFAULT '{}'::jsonb,
+            raw_summary TEXT,
+            signal_alignment TEXT
+        )
+    """)
 
-        await conn.execute("""
-            ALTER TABLE IF EXISTS trades
-            ADD COLUMN IF NOT EXISTS structure TEXT,
-            ADD COLUMN IF NOT EXISTS signal_source TEXT,
-            ADD COLUMN IF NOT EXISTS origin TEXT DEFAULT 'manual',
-            ADD COLUMN IF NOT EXISTS strike DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS expiry DATE,
-            ADD COLUMN IF NOT EXISTS short_strike DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS long_strike DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS exit_price DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS pnl_dollars DECIMAL(12, 2),
-            ADD COLUMN IF NOT EXISTS pnl_percent DECIMAL(8, 3),
-            ADD COLUMN IF NOT EXISTS rr_achieved DECIMAL(8, 3),
-            ADD COLUMN IF NOT EXISTS exit_reason TEXT,
-            ADD COLUMN IF NOT EXISTS bias_at_entry VARCHAR(50),
-            ADD COLUMN IF NOT EXISTS risk_amount DECIMAL(12, 2),
-            ADD COLUMN IF NOT EXISTS risk_pct DECIMAL(8, 3),
-            ADD COLUMN IF NOT EXISTS account_balance_at_open DECIMAL(12, 2)
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_uw_snap_ts
+            ON uw_snapshots(timestamp, dashboard_type);
+    """)
+    
+    # TICK history table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS tick_history (
+            id SERIAL PRIMARY KEY,
+            date DATE UNIQUE NOT NULL,
+            tick_high INTEGER NOT NULL,
+            tick_low INTEGER NOT NULL,
+            range_type VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    
+    # Bias history table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS bias_history (
+            id SERIAL PRIMARY KEY,
+            timestamp TIMESTAMP NOT NULL,
+            timeframe VARCHAR(20) NOT NULL,
+            bias_level VARCHAR(50) NOT NULL,
+            supporting_data JSONB,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
 
-        await conn.execute("""
-            UPDATE trades
-            SET origin = 'manual'
-            WHERE origin IS NULL
-        """)
-        
-        # Add new columns to positions table for enhanced tracking
-        await conn.execute("""
-            ALTER TABLE positions
-            ADD COLUMN IF NOT EXISTS strategy VARCHAR(100),
-            ADD COLUMN IF NOT EXISTS asset_class VARCHAR(20),
-            ADD COLUMN IF NOT EXISTS signal_type VARCHAR(50),
-            ADD COLUMN IF NOT EXISTS bias_level VARCHAR(50),
-            ADD COLUMN IF NOT EXISTS target_2 DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS actual_entry_price DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS actual_exit_price DECIMAL(10, 2),
-            ADD COLUMN IF NOT EXISTS trade_outcome VARCHAR(20),
-            ADD COLUMN IF NOT EXISTS loss_reason VARCHAR(50),
-            ADD COLUMN IF NOT EXISTS notes TEXT,
-            ADD COLUMN IF NOT EXISTS quantity_closed DECIMAL(18, 8) DEFAULT 0,
-            ADD COLUMN IF NOT EXISTS bias_at_open JSONB,
-            ADD COLUMN IF NOT EXISTS bias_at_close JSONB
-        """)
+    # Factor history table (Pivot factor updates)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS factor_history (
+            id SERIAL PRIMARY KEY,
+            factor_name VARCHAR(50) NOT NULL,
+            score FLOAT NOT NULL,
+            bias VARCHAR(20) NOT NULL,
+            data JSONB,
+            collected_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
 
-        # Ensure crypto position sizing supports fractional quantities.
-        await conn.execute("""
-            ALTER TABLE positions
-            ALTER COLUMN quantity TYPE DECIMAL(18, 8) USING quantity::DECIMAL(18, 8)
-        """)
-        await conn.execute("""
-            ALTER TABLE positions
-            ALTER COLUMN quantity_closed TYPE DECIMAL(18, 8) USING quantity_closed::DECIMAL(18, 8)
-        """)
-        
-        # Create indexes for efficient queries
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_score ON signals(score DESC NULLS LAST);
-            CREATE INDEX IF NOT EXISTS idx_signals_user_action ON signals(user_action);
-            CREATE INDEX IF NOT EXISTS idx_signals_created_at ON signals(created_at DESC);
-            CREATE INDEX IF NOT EXISTS idx_signals_ticker ON signals(ticker);
-            CREATE INDEX IF NOT EXISTS idx_signals_strategy ON signals(strategy);
-            CREATE INDEX IF NOT EXISTS idx_signals_calendar ON signals(day_of_week, hour_of_day);
-            CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status);
-            CREATE INDEX IF NOT EXISTS idx_positions_ticker ON positions(ticker);
-            CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status);
-            CREATE INDEX IF NOT EXISTS idx_trades_structure ON trades(structure);
-            CREATE INDEX IF NOT EXISTS idx_trades_signal_source ON trades(signal_source);
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_factor_history_name_time
+            ON factor_history (factor_name, collected_at DESC);
+    """)
 
-        # Brief 07: Account balances across all brokerages
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS account_balances (
-                id SERIAL PRIMARY KEY,
-                account_name TEXT NOT NULL UNIQUE,
-                broker TEXT NOT NULL,
-                balance NUMERIC(12,2) NOT NULL,
-                cash NUMERIC(12,2),
-                buying_power NUMERIC(12,2),
-                margin_total NUMERIC(12,2),
-                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                updated_by TEXT NOT NULL DEFAULT 'manual'
-            )
-        """)
+    # Factor readings table (normalized history for weekly integrity audits)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS factor_readings (
+            id SERIAL PRIMARY KEY,
+            factor_id TEXT NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            score FLOAT NOT NULL,
+            signal TEXT,
+            source TEXT,
+            metadata JSONB,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
 
-        # Brief 07 `open_positions` table REMOVED 2026-06-17 — superseded by
-        # unified_positions (single source of truth). Was recreated here on every
-        # boot; removed so DROP is not resurrected. See
-        # docs/codex-briefs/2026-06-17-deprecate-open-positions-table.md
-        # Brief 10: Closed positions — proper P&L analytics table
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS closed_positions (
-                id SERIAL PRIMARY KEY,
-                position_id INTEGER,
-                ticker TEXT NOT NULL,
-                position_type TEXT NOT NULL,
-                direction TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                option_type TEXT,
-                strike NUMERIC(10,2),
-                short_strike NUMERIC(10,2),
-                expiry DATE,
-                spread_type TEXT,
-                cost_basis NUMERIC(10,2),
-                exit_value NUMERIC(10,2),
-                exit_price NUMERIC(10,2),
-                pnl_dollars NUMERIC(10,2),
-                pnl_percent NUMERIC(6,2),
-                opened_at TIMESTAMPTZ,
-                closed_at TIMESTAMPTZ DEFAULT NOW(),
-                hold_days INTEGER,
-                signal_id TEXT,
-                account TEXT DEFAULT 'robinhood',
-                close_reason TEXT,
-                notes TEXT
-            )
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_closed_positions_ticker
-            ON closed_positions (ticker)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_closed_positions_signal
-            ON closed_positions (signal_id) WHERE signal_id IS NOT NULL
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_closed_positions_date
-            ON closed_positions (closed_at DESC)
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_factor_readings_factor_time
+            ON factor_readings (factor_id, timestamp DESC);
+    """)
 
-        # Brief 10: Unified positions table (replaces positions + open_positions + options_positions)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS unified_positions (
-                id SERIAL PRIMARY KEY,
-                position_id TEXT UNIQUE NOT NULL,
+    # Composite bias history
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS bias_composite_history (
+            id SERIAL PRIMARY KEY,
+            composite_score FLOAT NOT NULL,
+            bias_level VARCHAR(20) NOT NULL,
+            bias_numeric INTEGER NOT NULL,
+            active_factors TEXT[] NOT NULL,
+            stale_factors TEXT[] NOT NULL,
+            velocity_multiplier FLOAT NOT NULL DEFAULT 1.0,
+            override VARCHAR(20),
+            confidence VARCHAR(10) NOT NULL,
+            factor_scores JSONB NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
 
-                -- What
-                ticker TEXT NOT NULL,
-                asset_type TEXT NOT NULL DEFAULT 'OPTION',
-                structure TEXT,
-                direction TEXT NOT NULL,
-                legs JSONB,
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bias_history_created
+            ON bias_composite_history(created_at);
+    """)
 
-                -- Entry
-                entry_price NUMERIC,
-                entry_date TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                quantity INTEGER NOT NULL DEFAULT 1,
-                cost_basis NUMERIC,
-
-                -- Risk (auto-calculated for spreads, user-provided for equity)
-                max_loss NUMERIC,
-                max_profit NUMERIC,
-                stop_loss NUMERIC,
-                target_1 NUMERIC,
-                target_2 NUMERIC,
-                breakeven NUMERIC[],
-
-                -- Current state
-                current_price NUMERIC,
-                long_leg_price NUMERIC,
-                short_leg_price NUMERIC,
-                unrealized_pnl NUMERIC,
-                price_updated_at TIMESTAMPTZ,
-
-                -- Options-specific
-                expiry DATE,
-                dte INTEGER,
-                long_strike NUMERIC,
-                short_strike NUMERIC,
-
-                -- Metadata
-                source TEXT NOT NULL DEFAULT 'MANUAL',
-                signal_id TEXT,
-                account TEXT DEFAULT 'ROBINHOOD',
-                notes TEXT,
-                tags TEXT[],
+    # Watchlist tickers (primary source of ticker membership)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS watchlist_tickers (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(10) NOT NULL,
+            sector VARCHAR(100) NOT NULL DEFAULT 'Uncategorized',
+            source VARCHAR(20) NOT NULL DEFAULT 'manual',
+            muted BOOLEAN NOT NULL DEFAULT false,
+            priority VARCHAR(20) NOT NULL DEFAULT 'normal',
+            added_at TIMESTAMP DEFAULT NOW(),
+            muted_at TIMESTAMP,
+            position_id INTEGER,
+            notes VARCHAR(200),
+            UNIQUE(symbol)
+        )
+    """)
 
-                -- Lifecycle
-                status TEXT NOT NULL DEFAULT 'OPEN',
-                exit_price NUMERIC,
-                exit_date TIMESTAMPTZ,
-                realized_pnl NUMERIC,
-                trade_outcome TEXT,
-                trade_id INTEGER,
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_sector
+            ON watchlist_tickers(sector);
+    """)
 
-                -- Housekeeping
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                updated_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_unified_positions_status ON unified_positions(status)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_unified_positions_ticker ON unified_positions(ticker)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_unified_positions_signal ON unified_positions(signal_id)
-        """)
-        # Add leg price columns for mark-to-market display
-        await conn.execute("""
-            ALTER TABLE unified_positions
-            ADD COLUMN IF NOT EXISTS long_leg_price NUMERIC,
-            ADD COLUMN IF NOT EXISTS short_leg_price NUMERIC
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_source
+            ON watchlist_tickers(source);
+    """)
 
-        # Brief 05: Committee override tracking on signals and trades
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS is_committee_override BOOLEAN DEFAULT FALSE,
-                ADD COLUMN IF NOT EXISTS override_reason TEXT
-            """)
-        except Exception as e:
-            print(f"WARNING: signals ALTER TABLE 3 skipped: {e}")
-        await conn.execute("""
-            ALTER TABLE trades
-            ADD COLUMN IF NOT EXISTS committee_action VARCHAR(20),
-            ADD COLUMN IF NOT EXISTS committee_conviction VARCHAR(20),
-            ADD COLUMN IF NOT EXISTS is_committee_override BOOLEAN DEFAULT FALSE
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_muted
+            ON watchlist_tickers(muted);
+    """)
 
-        # Brief 05b: Fix negative entry_price for options positions
-        # Entry price should always be positive; structure determines credit vs debit PnL
-        await conn.execute("""
-            UPDATE unified_positions
-            SET entry_price = ABS(entry_price)
-            WHERE entry_price < 0
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_watchlist_tickers_priority
+            ON watchlist_tickers(priority);
+    """)
 
-        # Brief 07: Cash flow events for accurate P&L calculation
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS cash_flows (
-                id SERIAL PRIMARY KEY,
-                account_name TEXT NOT NULL DEFAULT 'Robinhood',
-                flow_type TEXT NOT NULL,
-                amount NUMERIC(10,2) NOT NULL,
-                description TEXT,
-                activity_date DATE NOT NULL,
-                imported_from TEXT DEFAULT 'csv'
-            )
-        """)
+    # Signal outcomes table (historical hit rate tracking)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS signal_outcomes (
+            id SERIAL PRIMARY KEY,
+            signal_id VARCHAR(100) NOT NULL,
+            symbol VARCHAR(10) NOT NULL,
+            signal_type VARCHAR(50) NOT NULL,
+            direction VARCHAR(10) NOT NULL,
+            cta_zone VARCHAR(30),
+            entry DECIMAL(12, 2),
+            stop DECIMAL(12, 2),
+            t1 DECIMAL(12, 2),
+            t2 DECIMAL(12, 2),
+            invalidation_level DECIMAL(12, 2),
+            created_at TIMESTAMP NOT NULL,
+            outcome VARCHAR(20),
+            outcome_at TIMESTAMP,
+            outcome_price DECIMAL(12, 2),
+            max_favorable DECIMAL(12, 2),
+            max_adverse DECIMAL(12, 2),
+            days_to_outcome INTEGER,
+            UNIQUE(signal_id)
+        )
+    """)
 
-        # Brief 07: RH trade history imported from CSV exports
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS rh_trade_history (
-                id SERIAL PRIMARY KEY,
-                activity_date DATE NOT NULL,
-                settle_date DATE,
-                ticker TEXT NOT NULL,
-                description TEXT NOT NULL,
-                trans_code TEXT NOT NULL,
-                quantity NUMERIC(10,4),
-                price NUMERIC(10,4),
-                amount NUMERIC(12,2) NOT NULL,
-                is_option BOOLEAN NOT NULL DEFAULT FALSE,
-                option_type TEXT,
-                strike NUMERIC(10,2),
-                expiry DATE,
-                trade_group_id TEXT,
-                signal_id TEXT,
-                imported_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                occurrence SMALLINT NOT NULL DEFAULT 0,
-                -- occurrence = 0-indexed copy number for identical same-day same-price
-                -- fills. Robinhood CSVs carry no fill/order ID, so two genuine identical
-                -- fills are indistinguishable by content; the importer stamps occurrence
-                -- so both persist while re-imports stay idempotent. See import_rh_csv_cli.
-                -- NULLS NOT DISTINCT so OEXP rows (price = NULL) collide correctly and
-                -- don't re-insert on every import (NULL would otherwise read as distinct).
-                UNIQUE NULLS NOT DISTINCT
-                    (activity_date, ticker, description, trans_code, quantity, price, occurrence)
-            )
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signal_outcomes_symbol
+            ON signal_outcomes(symbol);
+    """)
 
-        # Brief 07: Seed account balances — ONLY on a genuinely empty table (fresh
-        # bootstrap). DEF-SEED-RESURRECTION fix (2026-07-24): the prior per-account
-        # `WHERE NOT EXISTS (... account_name = X)` guards resurrected deliberately-
-        # deleted rows on EVERY deploy (e.g. the 2026-07-23 IBKR delete + 401A/403B ->
-        # BROKERAGE_LINK_401K merge came back as seed rows on the next restart). A single
-        # truly-empty-table guard, evaluated once before any insert, prevents that. Seed
-        # VALUES are unchanged placeholders — on a real fresh bootstrap they carry stale
-        # numbers, acceptable for placeholders (flagged in the completion doc).
-        if not await conn.fetchval("SELECT EXISTS (SELECT 1 FROM account_balances)"):
-            await conn.execute("""
-                INSERT INTO account_balances (account_name, broker, balance, updated_by)
-                SELECT 'Robinhood', 'robinhood', 4607.0, 'manual'
-                WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Robinhood')
-            """)
-            await conn.execute("""
-                INSERT INTO account_balances (account_name, broker, balance, updated_by)
-                SELECT 'Fidelity 401A', 'fidelity', 10107.90, 'manual'
-                WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Fidelity 401A')
-            """)
-            await conn.execute("""
-                INSERT INTO account_balances (account_name, broker, balance, updated_by)
-                SELECT 'Fidelity 403B', 'fidelity', 233.15, 'manual'
-                WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Fidelity 403B')
-            """)
-            await conn.execute("""
-                INSERT INTO account_balances (account_name, broker, balance, updated_by)
-                SELECT 'Fidelity Roth', 'fidelity', 8223.41, 'manual'
-                WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Fidelity Roth')
-            """)
-            await conn.execute("""
-                INSERT INTO account_balances (account_name, broker, balance, updated_by)
-                SELECT 'Interactive Brokers', 'ibkr', 0.0, 'manual'
-                WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Interactive Brokers')
-            """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signal_outcomes_type
+            ON signal_outcomes(signal_type);
+    """)
 
-        # Balance snapshots — daily EOD photo of each account for PnL tracking
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS balance_snapshots (
-                id SERIAL PRIMARY KEY,
-                snapshot_date DATE NOT NULL,
-                account_name TEXT NOT NULL,
-                balance NUMERIC(12,2) NOT NULL,
-                cash NUMERIC(12,2),
-                position_value NUMERIC(12,2),
-                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                UNIQUE(snapshot_date, account_name)
-            )
-        """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signal_outcomes_outcome
+            ON signal_outcomes(outcome);
+    """)
+    
+    # Add new columns to signals table for Trade Ideas enhancement
+    # These are added separately to support existing databases
+    # Wrapped in try/except: if lock_timeout fires, skip rather than crash startup
+    try:
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_balance_snapshots_date
-            ON balance_snapshots(account_name, snapshot_date DESC)
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS score DECIMAL(5, 2),
+            ADD COLUMN IF NOT EXISTS bias_alignment VARCHAR(20),
+            ADD COLUMN IF NOT EXISTS triggering_factors JSONB,
+            ADD COLUMN IF NOT EXISTS actual_entry_price DECIMAL(10, 2),
+            ADD COLUMN IF NOT EXISTS actual_exit_price DECIMAL(10, 2),
+            ADD COLUMN IF NOT EXISTS actual_stop_hit BOOLEAN,
+            ADD COLUMN IF NOT EXISTS trade_outcome VARCHAR(20),
+            ADD COLUMN IF NOT EXISTS loss_reason VARCHAR(50),
+            ADD COLUMN IF NOT EXISTS notes TEXT,
+            ADD COLUMN IF NOT EXISTS bias_at_signal JSONB,
+            ADD COLUMN IF NOT EXISTS day_of_week INTEGER,
+            ADD COLUMN IF NOT EXISTS hour_of_day INTEGER,
+            ADD COLUMN IF NOT EXISTS is_opex_week BOOLEAN DEFAULT FALSE,
+            ADD COLUMN IF NOT EXISTS days_to_earnings INTEGER,
+            ADD COLUMN IF NOT EXISTS market_event TEXT
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals ALTER TABLE 1 skipped (lock timeout?)", e))
 
-        # UW Flow events — persistent history for flow velocity analysis
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS flow_events (
-                id SERIAL PRIMARY KEY,
-                ticker TEXT NOT NULL,
-                pc_ratio NUMERIC(5,2),
-                call_volume BIGINT,
-                put_volume BIGINT,
-                total_premium BIGINT,
-                call_premium BIGINT,
-                put_premium BIGINT,
-                flow_sentiment TEXT,
-                price NUMERIC(10,2),
-                change_pct NUMERIC(6,2),
-                volume BIGINT,
-                source TEXT DEFAULT 'uw_watcher',
-                captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_flow_events_ticker_time ON flow_events(ticker, captured_at DESC)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_flow_events_time ON flow_events(captured_at DESC)
-        """)
-        # Auto-clean old flow events (>90 days) on deploy
+    # Phase 4: Trade Ideas lifecycle columns on existing signals table
+    try:
         await conn.execute("""
-            DELETE FROM flow_events WHERE captured_at < NOW() - INTERVAL '90 days'
-        """)
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS status VARCHAR(30) DEFAULT 'ACTIVE',
+            ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS enrichment_data JSONB,
+            ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS committee_run_id VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS committee_data JSONB,
+            ADD COLUMN IF NOT EXISTS committee_requested_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS committee_completed_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS pending_trade_id VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS decided_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS decision_source VARCHAR(20),
+            ADD COLUMN IF NOT EXISTS source VARCHAR(50) DEFAULT 'tradingview',
+            ADD COLUMN IF NOT EXISTS regime VARCHAR(30),
+            ADD COLUMN IF NOT EXISTS confluence_score DECIMAL(5, 2),
+            ADD COLUMN IF NOT EXISTS score_v2 DECIMAL(5, 2),
+            ADD COLUMN IF NOT EXISTS score_v2_factors JSONB,
+            ADD COLUMN IF NOT EXISTS signal_category VARCHAR(20) DEFAULT 'TRADE_SETUP'
+        """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals ALTER TABLE 2 skipped (lock timeout?)", e))
+
+    # Phase 4: Indexes for Trade Ideas feed queries
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signals_status ON signals(status);
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signals_status_score ON signals(status, score DESC NULLS LAST);
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signals_expires ON signals(expires_at) WHERE expires_at IS NOT NULL;
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signals_source ON signals(source);
+    """)
 
-        # Triton Step-0 (migration 021): whale-flow forward-edge shadow logger.
-        # SHADOW-ONLY — nothing reads this for scoring/pipeline. Authoritative DDL
-        # (mirrors migrations/021_triton_flow_shadow.sql — keep in sync).
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS triton_flow_shadow (
-                id                  SERIAL PRIMARY KEY,
-                uw_alert_id         TEXT UNIQUE NOT NULL,
-                fired_at            TIMESTAMPTZ,
-                ticker              TEXT NOT NULL,
-                direction           TEXT,
-                premium_usd         BIGINT,
-                is_sweep            BOOLEAN,
-                liquidity_bucket    TEXT,
-                spot_at_fire        NUMERIC(12,4),
-                chg_pct_day         NUMERIC(8,4),
-                prior_5d_ret        NUMERIC(8,4),
-                is_liquid20         BOOLEAN,
-                is_megacap_ai       BOOLEAN,
-                bias_level_at_fire  TEXT,
-                gex_regime_at_fire  TEXT,
-                fwd_ret_1d          NUMERIC(8,4),
-                fwd_ret_3d          NUMERIC(8,4),
-                fwd_ret_5d          NUMERIC(8,4),
-                graded_at           TIMESTAMPTZ,
-                raw                 JSONB,
-                created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_triton_flow_shadow_ungraded
-                ON triton_flow_shadow (fired_at) WHERE graded_at IS NULL
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_triton_flow_shadow_fired
-                ON triton_flow_shadow (fired_at DESC)
-        """)
+    # ZEUS Phase 5: ADX value for Artemis regime filter + outcome analysis
+    try:
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_triton_flow_shadow_ticker
-                ON triton_flow_shadow (ticker, fired_at DESC)
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS adx_value FLOAT
         """)
-        # Retention (Nick 2026-07-01): purge UNGRADED rows >90d; graded exempt
-        # until docs/strategy-reviews/triton-forward-edge-*.md exists. Bumped 30d->90d
-        # after Railway CLI verified the postgres volume at 816/5000 MB (16%) — the
-        # "94% full" flag (6/23) was STALE; ample headroom. (Cap was 30d out of
-        # caution when the volume % was unknown at B1.)
         await conn.execute("""
-            DELETE FROM triton_flow_shadow
-            WHERE created_at < NOW() - INTERVAL '90 days' AND graded_at IS NULL
+            CREATE INDEX IF NOT EXISTS idx_signals_adx
+            ON signals(adx_value) WHERE adx_value IS NOT NULL
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals adx_value migration skipped", e))
 
-        # UW budget watchdog (Fable 2026-07-09): durable per-day UW-burn snapshot so
-        # the 48h Redis counter TTL can never blind us (mirrors migrations/022; the
-        # snapshot job also creates this defensively). day='_TOTAL' caller = grand total.
+    # ZEUS Phase 5: audit columns for ADX score-ceiling and feed-tier ceiling
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS uw_daily_burn (
-                day             DATE NOT NULL,
-                caller          TEXT NOT NULL,
-                count           INT  NOT NULL,
-                snapshotted_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
-                PRIMARY KEY (day, caller)
-            )
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS feed_tier_ceiling TEXT,
+            ADD COLUMN IF NOT EXISTS score_ceiling_reason TEXT
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals ceiling audit columns migration skipped", e))
 
-        # Stater Swap v2 S-1 Phase 1 (migration 023): crypto vendor health-state
-        # audit trail (LIVE/DEGRADED/DEAD transitions + sanction/replace decisions).
-        # Append-only on transitions (mirrors migrations/023_crypto_vendor_health_audit.sql
-        # — keep in sync).
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_vendor_health_audit (
-                id                  SERIAL PRIMARY KEY,
-                vendor              TEXT NOT NULL,
-                feed_type           TEXT NOT NULL,
-                symbol              TEXT NOT NULL,
-                status              TEXT NOT NULL,
-                previous_status     TEXT,
-                reason              TEXT,
-                as_of               TIMESTAMPTZ,
-                data_age_seconds    NUMERIC,
-                sanction_decision   TEXT,
-                created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_vendor_health_latest
-                ON crypto_vendor_health_audit (vendor, feed_type, symbol, created_at DESC)
-        """)
+    # One-time cleanup: expire stuck COMMITTEE_REVIEW signals from April 2026 credit outage
+    try:
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_vendor_health_dead
-                ON crypto_vendor_health_audit (created_at DESC)
-                WHERE status = 'DEAD'
+            UPDATE signals
+            SET status = 'EXPIRED',
+                notes = COALESCE(notes, '') || ' | Auto-expired 2026-04-21: stuck COMMITTEE_REVIEW (7+ days, credit outage)'
+            WHERE signal_id IN ('HG_SNOW_20260414_131507', 'ARTEMIS_CRM_20260416_141203_140577')
+              AND status = 'COMMITTEE_REVIEW'
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("stuck-signal cleanup skipped", e))
 
-        # Stater Swap v2 S-1 Phase 4 (migration 024): crypto dual-write shadow
-        # evidence table. NOTHING reads this for scoring/pipeline -- inert
-        # evidence data for the F-4 cutover diff report (mirrors
-        # migrations/024_crypto_dual_write_shadow.sql -- keep in sync).
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_dual_write_shadow (
-                id                      SERIAL PRIMARY KEY,
-                shadow_signal_id        TEXT UNIQUE NOT NULL,
-                real_signal_id          TEXT NOT NULL,
-                ticker                  TEXT NOT NULL,
-                direction               TEXT,
-                signal_type             TEXT,
-                fired_at                TIMESTAMPTZ NOT NULL,
-                real_score              NUMERIC,
-                real_status             TEXT,
-                shadow_score            NUMERIC,
-                shadow_score_v2         NUMERIC,
-                shadow_status           TEXT,
-                l0_shadow_decision      JSONB,
-                l1_shadow_decision      JSONB,
-                feed_tier_v1            TEXT,
-                feed_tier_v2            TEXT,
-                feed_tier_v2_path       TEXT,
-                confluence_badge        TEXT,
-                would_flag_committee    BOOLEAN,
-                raw_shadow_signal_data  JSONB,
-                created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
+    # One-time cleanup: expire stale PENDING_REVIEW backlog (2026-04-22 threshold-raise)
+    # 156 signals stuck in pre-ZEUS PENDING_REVIEW queue, none reviewed in 7+ days
+    try:
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_dual_write_shadow_fired
-                ON crypto_dual_write_shadow (fired_at DESC)
+            UPDATE signals
+            SET status = 'EXPIRED',
+                notes = COALESCE(notes, '') || ' | Auto-expired 2026-04-22: stale PENDING_REVIEW backlog (pre-threshold-raise cleanup)'
+            WHERE status = 'PENDING_REVIEW'
+              AND timestamp < NOW() - INTERVAL '7 days'
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("PENDING_REVIEW backlog cleanup skipped", e))
+
+    # Backfill: existing signals without status get ACTIVE if undecided, DISMISSED/SELECTED if acted on
+    await conn.execute("""
+        UPDATE signals SET status = 'DISMISSED' WHERE status IS NULL AND user_action = 'DISMISSED'
+    """)
+    await conn.execute("""
+        UPDATE signals SET status = 'ACCEPTED_OPTIONS' WHERE status IS NULL AND user_action = 'SELECTED'
+    """)
+    await conn.execute("""
+        UPDATE signals SET status = 'ACTIVE' WHERE status IS NULL AND user_action IS NULL
+    """)
+
+    # Add recommendation capture fields to the trade journal table.
+    try:
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_dual_write_shadow_ticker
-                ON crypto_dual_write_shadow (ticker, fired_at DESC)
-        """)
+            ALTER TABLE IF EXISTS trades
+            ADD COLUMN IF NOT EXISTS pivot_recommendation TEXT,
+            ADD COLUMN IF NOT EXISTS pivot_conviction TEXT,
+            ADD COLUMN IF NOT EXISTS full_context JSONB DEFAULT '{}'::jsonb
+        """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("trades ALTER TABLE skipped", e))
+
+    await conn.execute("""
+        ALTER TABLE IF EXISTS trades
+        ADD COLUMN IF NOT EXISTS structure TEXT,
+        ADD COLUMN IF NOT EXISTS signal_source TEXT,
+        ADD COLUMN IF NOT EXISTS origin TEXT DEFAULT 'manual',
+        ADD COLUMN IF NOT EXISTS strike DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS expiry DATE,
+        ADD COLUMN IF NOT EXISTS short_strike DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS long_strike DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS exit_price DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS pnl_dollars DECIMAL(12, 2),
+        ADD COLUMN IF NOT EXISTS pnl_percent DECIMAL(8, 3),
+        ADD COLUMN IF NOT EXISTS rr_achieved DECIMAL(8, 3),
+        ADD COLUMN IF NOT EXISTS exit_reason TEXT,
+        ADD COLUMN IF NOT EXISTS bias_at_entry VARCHAR(50),
+        ADD COLUMN IF NOT EXISTS risk_amount DECIMAL(12, 2),
+        ADD COLUMN IF NOT EXISTS risk_pct DECIMAL(8, 3),
+        ADD COLUMN IF NOT EXISTS account_balance_at_open DECIMAL(12, 2)
+    """)
+
+    await conn.execute("""
+        UPDATE trades
+        SET origin = 'manual'
+        WHERE origin IS NULL
+    """)
+    
+    # Add new columns to positions table for enhanced tracking
+    await conn.execute("""
+        ALTER TABLE positions
+        ADD COLUMN IF NOT EXISTS strategy VARCHAR(100),
+        ADD COLUMN IF NOT EXISTS asset_class VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS signal_type VARCHAR(50),
+        ADD COLUMN IF NOT EXISTS bias_level VARCHAR(50),
+        ADD COLUMN IF NOT EXISTS target_2 DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS actual_entry_price DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS actual_exit_price DECIMAL(10, 2),
+        ADD COLUMN IF NOT EXISTS trade_outcome VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS loss_reason VARCHAR(50),
+        ADD COLUMN IF NOT EXISTS notes TEXT,
+        ADD COLUMN IF NOT EXISTS quantity_closed DECIMAL(18, 8) DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS bias_at_open JSONB,
+        ADD COLUMN IF NOT EXISTS bias_at_close JSONB
+    """)
+
+    # Ensure crypto position sizing supports fractional quantities.
+    await conn.execute("""
+        ALTER TABLE positions
+        ALTER COLUMN quantity TYPE DECIMAL(18, 8) USING quantity::DECIMAL(18, 8)
+    """)
+    await conn.execute("""
+        ALTER TABLE positions
+        ALTER COLUMN quantity_closed TYPE DECIMAL(18, 8) USING quantity_closed::DECIMAL(18, 8)
+    """)
+    
+    # Create indexes for efficient queries
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signals_score ON signals(score DESC NULLS LAST);
+        CREATE INDEX IF NOT EXISTS idx_signals_user_action ON signals(user_action);
+        CREATE INDEX IF NOT EXISTS idx_signals_created_at ON signals(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_signals_ticker ON signals(ticker);
+        CREATE INDEX IF NOT EXISTS idx_signals_strategy ON signals(strategy);
+        CREATE INDEX IF NOT EXISTS idx_signals_calendar ON signals(day_of_week, hour_of_day);
+        CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status);
+        CREATE INDEX IF NOT EXISTS idx_positions_ticker ON positions(ticker);
+        CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status);
+        CREATE INDEX IF NOT EXISTS idx_trades_structure ON trades(structure);
+        CREATE INDEX IF NOT EXISTS idx_trades_signal_source ON trades(signal_source);
+    """)
+
+    # Brief 07: Account balances across all brokerages
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS account_balances (
+            id SERIAL PRIMARY KEY,
+            account_name TEXT NOT NULL UNIQUE,
+            broker TEXT NOT NULL,
+            balance NUMERIC(12,2) NOT NULL,
+            cash NUMERIC(12,2),
+            buying_power NUMERIC(12,2),
+            margin_total NUMERIC(12,2),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            updated_by TEXT NOT NULL DEFAULT 'manual'
+        )
+    """)
+
+    # Brief 07 `open_positions` table REMOVED 2026-06-17 — superseded by
+    # unified_positions (single source of truth). Was recreated here on every
+    # boot; removed so DROP is not resurrected. See
+    # docs/codex-briefs/2026-06-17-deprecate-open-positions-table.md
+    # Brief 10: Closed positions — proper P&L analytics table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS closed_positions (
+            id SERIAL PRIMARY KEY,
+            position_id INTEGER,
+            ticker TEXT NOT NULL,
+            position_type TEXT NOT NULL,
+            direction TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            option_type TEXT,
+            strike NUMERIC(10,2),
+            short_strike NUMERIC(10,2),
+            expiry DATE,
+            spread_type TEXT,
+            cost_basis NUMERIC(10,2),
+            exit_value NUMERIC(10,2),
+            exit_price NUMERIC(10,2),
+            pnl_dollars NUMERIC(10,2),
+            pnl_percent NUMERIC(6,2),
+            opened_at TIMESTAMPTZ,
+            closed_at TIMESTAMPTZ DEFAULT NOW(),
+            hold_days INTEGER,
+            signal_id TEXT,
+            account TEXT DEFAULT 'robinhood',
+            close_reason TEXT,
+            notes TEXT
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_closed_positions_ticker
+        ON closed_positions (ticker)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_closed_positions_signal
+        ON closed_positions (signal_id) WHERE signal_id IS NOT NULL
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_closed_positions_date
+        ON closed_positions (closed_at DESC)
+    """)
+
+    # Brief 10: Unified positions table (replaces positions + open_positions + options_positions)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS unified_positions (
+            id SERIAL PRIMARY KEY,
+            position_id TEXT UNIQUE NOT NULL,
+
+            -- What
+            ticker TEXT NOT NULL,
+            asset_type TEXT NOT NULL DEFAULT 'OPTION',
+            structure TEXT,
+            direction TEXT NOT NULL,
+            legs JSONB,
+
+            -- Entry
+            entry_price NUMERIC,
+            entry_date TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            quantity INTEGER NOT NULL DEFAULT 1,
+            cost_basis NUMERIC,
+
+            -- Risk (auto-calculated for spreads, user-provided for equity)
+            max_loss NUMERIC,
+            max_profit NUMERIC,
+            stop_loss NUMERIC,
+            target_1 NUMERIC,
+            target_2 NUMERIC,
+            breakeven NUMERIC[],
+
+            -- Current state
+            current_price NUMERIC,
+            long_leg_price NUMERIC,
+            short_leg_price NUMERIC,
+            unrealized_pnl NUMERIC,
+            price_updated_at TIMESTAMPTZ,
+
+            -- Options-specific
+            expiry DATE,
+            dte INTEGER,
+            long_strike NUMERIC,
+            short_strike NUMERIC,
+
+            -- Metadata
+            source TEXT NOT NULL DEFAULT 'MANUAL',
+            signal_id TEXT,
+            account TEXT DEFAULT 'ROBINHOOD',
+            notes TEXT,
+            tags TEXT[],
+
+            -- Lifecycle
+            status TEXT NOT NULL DEFAULT 'OPEN',
+            exit_price NUMERIC,
+            exit_date TIMESTAMPTZ,
+            realized_pnl NUMERIC,
+            trade_outcome TEXT,
+            trade_id INTEGER,
+
+            -- Housekeeping
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_unified_positions_status ON unified_positions(status)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_unified_positions_ticker ON unified_positions(ticker)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_unified_positions_signal ON unified_positions(signal_id)
+    """)
+    # Add leg price columns for mark-to-market display
+    await conn.execute("""
+        ALTER TABLE unified_positions
+        ADD COLUMN IF NOT EXISTS long_leg_price NUMERIC,
+        ADD COLUMN IF NOT EXISTS short_leg_price NUMERIC
+    """)
 
-        # Stater Swap v2 S-2 (migration 025): regime/session shadow layer.
-        # Three additive tables -- crypto_regime_log (hourly heartbeat per
-        # symbol), crypto_gate_shadow (one row per shadow gate evaluation),
-        # crypto_gate_config (append-only hot-reload config versions). Zero
-        # writes to signals/signal_outcomes/unified_positions (mirrors
-        # migrations/025_crypto_regime_session.sql -- keep in sync).
+    # Brief 05: Committee override tracking on signals and trades
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_regime_log (
-                id                      BIGSERIAL PRIMARY KEY,
-                computed_at             TIMESTAMPTZ NOT NULL,
-                symbol                  TEXT NOT NULL,
-                tier                    SMALLINT NOT NULL,
-                is_master               BOOLEAN NOT NULL DEFAULT FALSE,
-                regime_state            TEXT NOT NULL,
-                price                   NUMERIC,
-                dma50                   NUMERIC,
-                price_vs_dma50_pct      NUMERIC,
-                adx14                   NUMERIC,
-                dma50_slope_pct         NUMERIC,
-                bars_source             TEXT,
-                bars_as_of              TIMESTAMPTZ,
-                bar_count               INTEGER,
-                data_age_seconds        INTEGER,
-                degraded                BOOLEAN NOT NULL DEFAULT FALSE,
-                degrade_reason          TEXT,
-                session_partition       TEXT,
-                event_windows           TEXT[],
-                weekend_holiday_flag    BOOLEAN NOT NULL DEFAULT FALSE,
-                config_version          INTEGER,
-                changed                 BOOLEAN NOT NULL DEFAULT FALSE,
-                created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS is_committee_override BOOLEAN DEFAULT FALSE,
+            ADD COLUMN IF NOT EXISTS override_reason TEXT
+        """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals ALTER TABLE 3 skipped", e))
+    await conn.execute("""
+        ALTER TABLE trades
+        ADD COLUMN IF NOT EXISTS committee_action VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS committee_conviction VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS is_committee_override BOOLEAN DEFAULT FALSE
+    """)
+
+    # Brief 05b: Fix negative entry_price for options positions
+    # Entry price should always be positive; structure determines credit vs debit PnL
+    await conn.execute("""
+        UPDATE unified_positions
+        SET entry_price = ABS(entry_price)
+        WHERE entry_price < 0
+    """)
+
+    # Brief 07: Cash flow events for accurate P&L calculation
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS cash_flows (
+            id SERIAL PRIMARY KEY,
+            account_name TEXT NOT NULL DEFAULT 'Robinhood',
+            flow_type TEXT NOT NULL,
+            amount NUMERIC(10,2) NOT NULL,
+            description TEXT,
+            activity_date DATE NOT NULL,
+            imported_from TEXT DEFAULT 'csv'
+        )
+    """)
+
+    # Brief 07: RH trade history imported from CSV exports
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS rh_trade_history (
+            id SERIAL PRIMARY KEY,
+            activity_date DATE NOT NULL,
+            settle_date DATE,
+            ticker TEXT NOT NULL,
+            description TEXT NOT NULL,
+            trans_code TEXT NOT NULL,
+            quantity NUMERIC(10,4),
+            price NUMERIC(10,4),
+            amount NUMERIC(12,2) NOT NULL,
+            is_option BOOLEAN NOT NULL DEFAULT FALSE,
+            option_type TEXT,
+            strike NUMERIC(10,2),
+            expiry DATE,
+            trade_group_id TEXT,
+            signal_id TEXT,
+            imported_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            occurrence SMALLINT NOT NULL DEFAULT 0,
+            -- occurrence = 0-indexed copy number for identical same-day same-price
+            -- fills. Robinhood CSVs carry no fill/order ID, so two genuine identical
+            -- fills are indistinguishable by content; the importer stamps occurrence
+            -- so both persist while re-imports stay idempotent. See import_rh_csv_cli.
+            -- NULLS NOT DISTINCT so OEXP rows (price = NULL) collide correctly and
+            -- don't re-insert on every import (NULL would otherwise read as distinct).
+            UNIQUE NULLS NOT DISTINCT
+                (activity_date, ticker, description, trans_code, quantity, price, occurrence)
+        )
+    """)
+
+    # Brief 07: Seed account balances — ONLY on a genuinely empty table (fresh
+    # bootstrap). DEF-SEED-RESURRECTION fix (2026-07-24): the prior per-account
+    # `WHERE NOT EXISTS (... account_name = X)` guards resurrected deliberately-
+    # deleted rows on EVERY deploy (e.g. the 2026-07-23 IBKR delete + 401A/403B ->
+    # BROKERAGE_LINK_401K merge came back as seed rows on the next restart). A single
+    # truly-empty-table guard, evaluated once before any insert, prevents that. Seed
+    # VALUES are unchanged placeholders — on a real fresh bootstrap they carry stale
+    # numbers, acceptable for placeholders (flagged in the completion doc).
+    if not await conn.fetchval("SELECT EXISTS (SELECT 1 FROM account_balances)"):
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_regime_log_symbol_computed
-                ON crypto_regime_log (symbol, computed_at DESC)
+            INSERT INTO account_balances (account_name, broker, balance, updated_by)
+            SELECT 'Robinhood', 'robinhood', 4607.0, 'manual'
+            WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Robinhood')
         """)
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_regime_log_changed
-                ON crypto_regime_log (changed) WHERE changed
+            INSERT INTO account_balances (account_name, broker, balance, updated_by)
+            SELECT 'Fidelity 401A', 'fidelity', 10107.90, 'manual'
+            WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Fidelity 401A')
         """)
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_gate_shadow (
-                id                      BIGSERIAL PRIMARY KEY,
-                evaluated_at            TIMESTAMPTZ NOT NULL,
-                signal_id               TEXT NOT NULL,
-                symbol                  TEXT NOT NULL,
-                tier                    SMALLINT,
-                strategy                TEXT,
-                strategy_canonical      TEXT,
-                direction               TEXT,
-                regime_master           TEXT,
-                regime_symbol           TEXT,
-                session_partition       TEXT,
-                event_windows           TEXT[],
-                weekend_holiday_flag    BOOLEAN NOT NULL DEFAULT FALSE,
-                alt_gate                TEXT,
-                verdict                 TEXT NOT NULL,
-                reasons                 TEXT[],
-                config_version          INTEGER,
-                created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
+            INSERT INTO account_balances (account_name, broker, balance, updated_by)
+            SELECT 'Fidelity 403B', 'fidelity', 233.15, 'manual'
+            WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Fidelity 403B')
         """)
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_gate_shadow_evaluated
-                ON crypto_gate_shadow (evaluated_at DESC)
+            INSERT INTO account_balances (account_name, broker, balance, updated_by)
+            SELECT 'Fidelity Roth', 'fidelity', 8223.41, 'manual'
+            WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Fidelity Roth')
         """)
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_gate_shadow_strategy_verdict
-                ON crypto_gate_shadow (strategy, verdict)
+            INSERT INTO account_balances (account_name, broker, balance, updated_by)
+            SELECT 'Interactive Brokers', 'ibkr', 0.0, 'manual'
+            WHERE NOT EXISTS (SELECT 1 FROM account_balances WHERE account_name = 'Interactive Brokers')
         """)
+
+    # Balance snapshots — daily EOD photo of each account for PnL tracking
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS balance_snapshots (
+            id SERIAL PRIMARY KEY,
+            snapshot_date DATE NOT NULL,
+            account_name TEXT NOT NULL,
+            balance NUMERIC(12,2) NOT NULL,
+            cash NUMERIC(12,2),
+            position_value NUMERIC(12,2),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            UNIQUE(snapshot_date, account_name)
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_balance_snapshots_date
+        ON balance_snapshots(account_name, snapshot_date DESC)
+    """)
+
+    # UW Flow events — persistent history for flow velocity analysis
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS flow_events (
+            id SERIAL PRIMARY KEY,
+            ticker TEXT NOT NULL,
+            pc_ratio NUMERIC(5,2),
+            call_volume BIGINT,
+            put_volume BIGINT,
+            total_premium BIGINT,
+            call_premium BIGINT,
+            put_premium BIGINT,
+            flow_sentiment TEXT,
+            price NUMERIC(10,2),
+            change_pct NUMERIC(6,2),
+            volume BIGINT,
+            source TEXT DEFAULT 'uw_watcher',
+            captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_flow_events_ticker_time ON flow_events(ticker, captured_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_flow_events_time ON flow_events(captured_at DESC)
+    """)
+
+    # Triton Step-0 (migration 021): whale-flow forward-edge shadow logger.
+    # SHADOW-ONLY — nothing reads this for scoring/pipeline. Authoritative DDL
+    # (mirrors migrations/021_triton_flow_shadow.sql — keep in sync).
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS triton_flow_shadow (
+            id                  SERIAL PRIMARY KEY,
+            uw_alert_id         TEXT UNIQUE NOT NULL,
+            fired_at            TIMESTAMPTZ,
+            ticker              TEXT NOT NULL,
+            direction           TEXT,
+            premium_usd         BIGINT,
+            is_sweep            BOOLEAN,
+            liquidity_bucket    TEXT,
+            spot_at_fire        NUMERIC(12,4),
+            chg_pct_day         NUMERIC(8,4),
+            prior_5d_ret        NUMERIC(8,4),
+            is_liquid20         BOOLEAN,
+            is_megacap_ai       BOOLEAN,
+            bias_level_at_fire  TEXT,
+            gex_regime_at_fire  TEXT,
+            fwd_ret_1d          NUMERIC(8,4),
+            fwd_ret_3d          NUMERIC(8,4),
+            fwd_ret_5d          NUMERIC(8,4),
+            graded_at           TIMESTAMPTZ,
+            raw                 JSONB,
+            created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_triton_flow_shadow_ungraded
+            ON triton_flow_shadow (fired_at) WHERE graded_at IS NULL
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_triton_flow_shadow_fired
+            ON triton_flow_shadow (fired_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_triton_flow_shadow_ticker
+            ON triton_flow_shadow (ticker, fired_at DESC)
+    """)
+
+    # UW budget watchdog (Fable 2026-07-09): durable per-day UW-burn snapshot so
+    # the 48h Redis counter TTL can never blind us (mirrors migrations/022; the
+    # snapshot job also creates this defensively). day='_TOTAL' caller = grand total.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS uw_daily_burn (
+            day             DATE NOT NULL,
+            caller          TEXT NOT NULL,
+            count           INT  NOT NULL,
+            snapshotted_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (day, caller)
+        )
+    """)
+
+    # Stater Swap v2 S-1 Phase 1 (migration 023): crypto vendor health-state
+    # audit trail (LIVE/DEGRADED/DEAD transitions + sanction/replace decisions).
+    # Append-only on transitions (mirrors migrations/023_crypto_vendor_health_audit.sql
+    # — keep in sync).
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_vendor_health_audit (
+            id                  SERIAL PRIMARY KEY,
+            vendor              TEXT NOT NULL,
+            feed_type           TEXT NOT NULL,
+            symbol              TEXT NOT NULL,
+            status              TEXT NOT NULL,
+            previous_status     TEXT,
+            reason              TEXT,
+            as_of               TIMESTAMPTZ,
+            data_age_seconds    NUMERIC,
+            sanction_decision   TEXT,
+            created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_vendor_health_latest
+            ON crypto_vendor_health_audit (vendor, feed_type, symbol, created_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_vendor_health_dead
+            ON crypto_vendor_health_audit (created_at DESC)
+            WHERE status = 'DEAD'
+    """)
+
+    # Stater Swap v2 S-1 Phase 4 (migration 024): crypto dual-write shadow
+    # evidence table. NOTHING reads this for scoring/pipeline -- inert
+    # evidence data for the F-4 cutover diff report (mirrors
+    # migrations/024_crypto_dual_write_shadow.sql -- keep in sync).
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_dual_write_shadow (
+            id                      SERIAL PRIMARY KEY,
+            shadow_signal_id        TEXT UNIQUE NOT NULL,
+            real_signal_id          TEXT NOT NULL,
+            ticker                  TEXT NOT NULL,
+            direction               TEXT,
+            signal_type             TEXT,
+            fired_at                TIMESTAMPTZ NOT NULL,
+            real_score              NUMERIC,
+            real_status             TEXT,
+            shadow_score            NUMERIC,
+            shadow_score_v2         NUMERIC,
+            shadow_status           TEXT,
+            l0_shadow_decision      JSONB,
+            l1_shadow_decision      JSONB,
+            feed_tier_v1            TEXT,
+            feed_tier_v2            TEXT,
+            feed_tier_v2_path       TEXT,
+            confluence_badge        TEXT,
+            would_flag_committee    BOOLEAN,
+            raw_shadow_signal_data  JSONB,
+            created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_dual_write_shadow_fired
+            ON crypto_dual_write_shadow (fired_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_dual_write_shadow_ticker
+            ON crypto_dual_write_shadow (ticker, fired_at DESC)
+    """)
+
+    # Stater Swap v2 S-2 (migration 025): regime/session shadow layer.
+    # Three additive tables -- crypto_regime_log (hourly heartbeat per
+    # symbol), crypto_gate_shadow (one row per shadow gate evaluation),
+    # crypto_gate_config (append-only hot-reload config versions). Zero
+    # writes to signals/signal_outcomes/unified_positions (mirrors
+    # migrations/025_crypto_regime_session.sql -- keep in sync).
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_regime_log (
+            id                      BIGSERIAL PRIMARY KEY,
+            computed_at             TIMESTAMPTZ NOT NULL,
+            symbol                  TEXT NOT NULL,
+            tier                    SMALLINT NOT NULL,
+            is_master               BOOLEAN NOT NULL DEFAULT FALSE,
+            regime_state            TEXT NOT NULL,
+            price                   NUMERIC,
+            dma50                   NUMERIC,
+            price_vs_dma50_pct      NUMERIC,
+            adx14                   NUMERIC,
+            dma50_slope_pct         NUMERIC,
+            bars_source             TEXT,
+            bars_as_of              TIMESTAMPTZ,
+            bar_count               INTEGER,
+            data_age_seconds        INTEGER,
+            degraded                BOOLEAN NOT NULL DEFAULT FALSE,
+            degrade_reason          TEXT,
+            session_partition       TEXT,
+            event_windows           TEXT[],
+            weekend_holiday_flag    BOOLEAN NOT NULL DEFAULT FALSE,
+            config_version          INTEGER,
+            changed                 BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_regime_log_symbol_computed
+            ON crypto_regime_log (symbol, computed_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_regime_log_changed
+            ON crypto_regime_log (changed) WHERE changed
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_gate_shadow (
+            id                      BIGSERIAL PRIMARY KEY,
+            evaluated_at            TIMESTAMPTZ NOT NULL,
+            signal_id               TEXT NOT NULL,
+            symbol                  TEXT NOT NULL,
+            tier                    SMALLINT,
+            strategy                TEXT,
+            strategy_canonical      TEXT,
+            direction               TEXT,
+            regime_master           TEXT,
+            regime_symbol           TEXT,
+            session_partition       TEXT,
+            event_windows           TEXT[],
+            weekend_holiday_flag    BOOLEAN NOT NULL DEFAULT FALSE,
+            alt_gate                TEXT,
+            verdict                 TEXT NOT NULL,
+            reasons                 TEXT[],
+            config_version          INTEGER,
+            created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_gate_shadow_evaluated
+            ON crypto_gate_shadow (evaluated_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_gate_shadow_strategy_verdict
+            ON crypto_gate_shadow (strategy, verdict)
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_gate_config (
+            id                      SERIAL PRIMARY KEY,
+            created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            created_by              TEXT NOT NULL,
+            note                    TEXT,
+            config                  JSONB NOT NULL
+        )
+    """)
+
+    # Idempotent seed: version 1, only if the table is empty. Runs every
+    # boot, no-ops after the first successful insert. gating_enabled=false
+    # (hard rule 1); event_windows carries the real Phase-0 inventory
+    # (s2-phase0-findings.md 0.4), not a placeholder.
+    existing_gate_config = await conn.fetchval("SELECT COUNT(*) FROM crypto_gate_config")
+    if not existing_gate_config:
+        from config.crypto_gate_config_seed import SEED_CONFIG_V1
+        await conn.execute(
+            "INSERT INTO crypto_gate_config (created_by, note, config) VALUES ($1, $2, $3)",
+            "SEED_S2",
+            "Initial seed, S-2 Phase 1 (gating_enabled=false)",
+            dumps_jsonb(SEED_CONFIG_V1),
+        )
+        logger.info("crypto_gate_config seeded (version 1, gating_enabled=false)")
+
+    # S-3 Phase 2 (R-2): Cycle Extremes + CVD tape-health tables
+    # Mirror of migrations/026_crypto_cycle_cvd.sql — keep in sync.
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_cycle_config (
+            id          SERIAL      PRIMARY KEY,
+            created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            created_by  TEXT        NOT NULL,
+            note        TEXT,
+            config      JSONB       NOT NULL
+        )
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_cycle_log (
+            id               BIGSERIAL   PRIMARY KEY,
+            computed_at      TIMESTAMPTZ NOT NULL,
+            symbol           TEXT        NOT NULL,
+            tier             SMALLINT    NOT NULL,
+            composite_score  NUMERIC,
+            composite_method TEXT,
+            degraded         BOOLEAN     NOT NULL DEFAULT FALSE,
+            degrade_reason   TEXT,
+            live_cell_count  INTEGER,
+            min_live_cells   INTEGER,
+            cells            JSONB       NOT NULL,
+            config_version   INTEGER,
+            created_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_cycle_log_symbol_computed
+            ON crypto_cycle_log (symbol, computed_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_cycle_log_degraded
+            ON crypto_cycle_log (degraded) WHERE degraded
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS crypto_tape_health_log (
+            id                BIGSERIAL   PRIMARY KEY,
+            computed_at       TIMESTAMPTZ NOT NULL,
+            symbol            TEXT        NOT NULL,
+            state             TEXT,
+            slope             NUMERIC,
+            spot_cvd          NUMERIC,
+            perp_cvd          NUMERIC,
+            degraded          BOOLEAN     NOT NULL DEFAULT FALSE,
+            degrade_reason    TEXT,
+            stale             BOOLEAN     NOT NULL DEFAULT FALSE,
+            staleness_seconds INTEGER,
+            config_version    INTEGER,
+            created_at        TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crypto_tape_health_log_symbol_computed
+            ON crypto_tape_health_log (symbol, computed_at DESC)
+    """)
+
+    # Idempotent seed for crypto_cycle_config
+    existing_cycle_config = await conn.fetchval("SELECT COUNT(*) FROM crypto_cycle_config")
+    if not existing_cycle_config:
+        from config.crypto_cycle_config_seed import SEED_CONFIG_V1
+        await conn.execute(
+            "INSERT INTO crypto_cycle_config (created_by, note, config) VALUES ($1, $2, $3)",
+            "SEED_S3",
+            "Initial seed, S-3 Phase 2 (dial writes zero feed rows; shadow observation only)",
+            dumps_jsonb(SEED_CONFIG_V1),
+        )
+        logger.info("crypto_cycle_config seeded (version 1, SEED_S3)")
+
+    # Brief 3A: Ariadne's Thread — outcome resolution columns on signals
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_gate_config (
-                id                      SERIAL PRIMARY KEY,
-                created_at              TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                created_by              TEXT NOT NULL,
-                note                    TEXT,
-                config                  JSONB NOT NULL
-            )
-        """)
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS outcome VARCHAR(30),
+            ADD COLUMN IF NOT EXISTS outcome_pnl_pct FLOAT,
+            ADD COLUMN IF NOT EXISTS outcome_pnl_dollars FLOAT,
+            ADD COLUMN IF NOT EXISTS outcome_resolved_at TIMESTAMPTZ,
+            ADD COLUMN IF NOT EXISTS outcome_options_metrics JSONB
+        """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals ALTER TABLE 4 skipped", e))
+
+    # Brief 3D: Hermes Dispatch — weekly performance reports
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS weekly_reports (
+            id SERIAL PRIMARY KEY,
+            week_of DATE NOT NULL,
+            report_json JSONB NOT NULL,
+            narrative TEXT,
+            lessons JSONB,
+            total_pnl FLOAT,
+            total_trades INT,
+            win_rate FLOAT,
+            created_at TIMESTAMPTZ DEFAULT NOW()
+        )
+    """)
 
-        # Idempotent seed: version 1, only if the table is empty. Runs every
-        # boot, no-ops after the first successful insert. gating_enabled=false
-        # (hard rule 1); event_windows carries the real Phase-0 inventory
-        # (s2-phase0-findings.md 0.4), not a placeholder.
-        existing_gate_config = await conn.fetchval("SELECT COUNT(*) FROM crypto_gate_config")
-        if not existing_gate_config:
-            from config.crypto_gate_config_seed import SEED_CONFIG_V1
-            await conn.execute(
-                "INSERT INTO crypto_gate_config (created_by, note, config) VALUES ($1, $2, $3)",
-                "SEED_S2",
-                "Initial seed, S-2 Phase 1 (gating_enabled=false)",
-                dumps_jsonb(SEED_CONFIG_V1),
-            )
-            logger.info("crypto_gate_config seeded (version 1, gating_enabled=false)")
+    # Phase 4E: pending_trades table (signal-to-position bridge)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS pending_trades (
+            id SERIAL PRIMARY KEY,
+            signal_id TEXT NOT NULL REFERENCES signals(signal_id),
+            trade_type TEXT NOT NULL DEFAULT 'STOCKS',
+            status TEXT NOT NULL DEFAULT 'PENDING',
+            planned_entry FLOAT,
+            planned_stop FLOAT,
+            planned_target FLOAT,
+            planned_quantity FLOAT,
+            options_structure TEXT,
+            options_legs JSONB,
+            options_net_premium FLOAT,
+            options_max_loss FLOAT,
+            options_expiry TEXT,
+            notes TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            expires_at TIMESTAMPTZ,
+            filled_at TIMESTAMPTZ,
+            expired_at TIMESTAMPTZ,
+            position_id INTEGER
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pending_trades_signal ON pending_trades(signal_id);
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pending_trades_status ON pending_trades(status);
+    """)
+
+    # Regime overrides audit table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS regime_overrides (
+            id SERIAL PRIMARY KEY,
+            regime_label TEXT NOT NULL,
+            direction TEXT NOT NULL DEFAULT 'NEUTRAL',
+            dominant_driver TEXT,
+            sectors_favored JSONB DEFAULT '[]',
+            sectors_avoided JSONB DEFAULT '[]',
+            theme_keywords JSONB DEFAULT '[]',
+            reversal_mode BOOLEAN DEFAULT FALSE,
+            expires_at TIMESTAMPTZ,
+            created_at TIMESTAMPTZ DEFAULT NOW()
+        )
+    """)
+
+    # Sector constituents table (Phase 2 — sector drill-down popup)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS sector_constituents (
+            id SERIAL PRIMARY KEY,
+            sector_etf VARCHAR(10) NOT NULL,
+            sector_name VARCHAR(50) NOT NULL,
+            ticker VARCHAR(10) NOT NULL,
+            company_name VARCHAR(100) NOT NULL,
+            market_cap BIGINT,
+            avg_volume_20d BIGINT,
+            rank_in_sector INTEGER,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            updated_at TIMESTAMPTZ DEFAULT NOW(),
+            UNIQUE(sector_etf, ticker)
+        )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sector_constituents_etf
+            ON sector_constituents(sector_etf);
+    """)
+
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sector_constituents_ticker
+            ON sector_constituents(ticker);
+    """)
+
+    # Ticker profiles cache table (Phase 3 — single ticker analyzer)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS ticker_profiles (
+            ticker VARCHAR(10) PRIMARY KEY,
+            company_name VARCHAR(200),
+            description TEXT,
+            sector VARCHAR(50),
+            industry VARCHAR(100),
+            market_cap BIGINT,
+            high_52w NUMERIC(12,2),
+            low_52w NUMERIC(12,2),
+            pe_ratio NUMERIC(8,2),
+            dividend_yield NUMERIC(6,4),
+            next_earnings_date DATE,
+            analyst_consensus VARCHAR(20),
+            analyst_count INTEGER,
+            beta_spy NUMERIC(6,3),
+            beta_sector NUMERIC(6,3),
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+    """)
 
-        # S-3 Phase 2 (R-2): Cycle Extremes + CVD tape-health tables
-        # Mirror of migrations/026_crypto_cycle_cvd.sql — keep in sync.
+    # Phase 4: Contextual Modifier columns on signals table
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_cycle_config (
-                id          SERIAL      PRIMARY KEY,
-                created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                created_by  TEXT        NOT NULL,
-                note        TEXT,
-                config      JSONB       NOT NULL
-            )
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS context_modifier INTEGER DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS context_factors JSONB DEFAULT '{}',
+            ADD COLUMN IF NOT EXISTS adjusted_score INTEGER,
+            ADD COLUMN IF NOT EXISTS is_contrarian BOOLEAN DEFAULT FALSE,
+            ADD COLUMN IF NOT EXISTS context_updated_at TIMESTAMPTZ
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals ALTER TABLE 5 skipped", e))
+
+    # Pythia Market Profile events table (P4)
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_cycle_log (
-                id               BIGSERIAL   PRIMARY KEY,
-                computed_at      TIMESTAMPTZ NOT NULL,
-                symbol           TEXT        NOT NULL,
-                tier             SMALLINT    NOT NULL,
-                composite_score  NUMERIC,
-                composite_method TEXT,
-                degraded         BOOLEAN     NOT NULL DEFAULT FALSE,
-                degrade_reason   TEXT,
-                live_cell_count  INTEGER,
-                min_live_cells   INTEGER,
-                cells            JSONB       NOT NULL,
-                config_version   INTEGER,
-                created_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            CREATE TABLE IF NOT EXISTS pythia_events (
+                id SERIAL PRIMARY KEY,
+                ticker VARCHAR(20) NOT NULL,
+                alert_type VARCHAR(50),
+                price DECIMAL(10, 2),
+                direction VARCHAR(20),
+                vah DECIMAL(10, 2),
+                val DECIMAL(10, 2),
+                poc DECIMAL(10, 2),
+                va_migration VARCHAR(20),
+                poor_high BOOLEAN DEFAULT FALSE,
+                poor_low BOOLEAN DEFAULT FALSE,
+                volume_quality VARCHAR(10),
+                ib_high DECIMAL(10, 2),
+                ib_low DECIMAL(10, 2),
+                interpretation TEXT,
+                raw_payload JSONB,
+                timestamp TIMESTAMPTZ DEFAULT NOW()
             )
         """)
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_cycle_log_symbol_computed
-                ON crypto_cycle_log (symbol, computed_at DESC)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_cycle_log_degraded
-                ON crypto_cycle_log (degraded) WHERE degraded
+            CREATE INDEX IF NOT EXISTS idx_pythia_events_ticker
+            ON pythia_events(ticker, timestamp DESC)
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("pythia_events table creation skipped", e))
+
+    # Brief C v1.1: committee_accuracy view for Phase 4 win-rate measurement
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_tape_health_log (
-                id                BIGSERIAL   PRIMARY KEY,
-                computed_at       TIMESTAMPTZ NOT NULL,
-                symbol            TEXT        NOT NULL,
-                state             TEXT,
-                slope             NUMERIC,
-                spot_cvd          NUMERIC,
-                perp_cvd          NUMERIC,
-                degraded          BOOLEAN     NOT NULL DEFAULT FALSE,
-                degrade_reason    TEXT,
-                stale             BOOLEAN     NOT NULL DEFAULT FALSE,
-                staleness_seconds INTEGER,
-                config_version    INTEGER,
-                created_at        TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            )
-        """)
+            CREATE OR REPLACE VIEW committee_accuracy AS
+            SELECT
+                s.signal_id,
+                s.ticker,
+                s.strategy,
+                s.direction,
+                s.created_at,
+                s.decided_at                                          AS committee_decided_at,
+                s.decision_source,
+                -- Structured decision (Brief C v1.1 JSON block)
+                s.committee_data -> 'decision' ->> 'recommendation'  AS committee_recommendation,
+                s.committee_data -> 'decision' ->> 'conviction'      AS committee_conviction,
+                s.committee_data -> 'decision' ->> 'key_risk'        AS committee_key_risk,
+                -- Legacy label (pre-Brief C: TAKE/PASS/WATCHING)
+                s.committee_data ->> 'action'                        AS legacy_action,
+                -- Parse failure flag
+                COALESCE(
+                    (s.committee_data -> 'decision_parse_failed')::TEXT::BOOLEAN,
+                    FALSE
+                )                                                     AS decision_parse_failed,
+                -- Nick's action (set via PATCH /api/signals/{id}/action)
+                s.enrichment_data -> 'nick_decision' ->> 'action'    AS nick_action,
+                (s.enrichment_data -> 'nick_decision' ->> 'price_at_decision')::FLOAT
+                                                                      AS nick_entry_price,
+                (s.enrichment_data -> 'nick_decision' ->> 'decided_at')::TIMESTAMPTZ
+                                                                      AS nick_decided_at,
+                -- Outcome (resolved by outcome_resolver.py)
+                s.outcome,
+                s.outcome_pnl_pct,
+                s.outcome_resolved_at,
+                -- Computed win flag (NULL = still open)
+                CASE
+                    WHEN s.outcome = 'WIN'  THEN 1
+                    WHEN s.outcome = 'LOSS' THEN 0
+                    ELSE NULL
+                END                                                   AS win_flag
+            FROM signals s
+            WHERE s.committee_data IS NOT NULL
+              AND s.committee_data != '{}'::jsonb
+        """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("committee_accuracy view creation skipped", e))
+
+    # ZEUS Phase 2: Feed tier classification column
+    try:
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_crypto_tape_health_log_symbol_computed
-                ON crypto_tape_health_log (symbol, computed_at DESC)
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS feed_tier VARCHAR(20) DEFAULT 'research_log'
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals feed_tier column skipped (lock timeout?)", e))
 
-        # Idempotent seed for crypto_cycle_config
-        existing_cycle_config = await conn.fetchval("SELECT COUNT(*) FROM crypto_cycle_config")
-        if not existing_cycle_config:
-            from config.crypto_cycle_config_seed import SEED_CONFIG_V1
-            await conn.execute(
-                "INSERT INTO crypto_cycle_config (created_by, note, config) VALUES ($1, $2, $3)",
-                "SEED_S3",
-                "Initial seed, S-3 Phase 2 (dial writes zero feed rows; shadow observation only)",
-                dumps_jsonb(SEED_CONFIG_V1),
-            )
-            logger.info("crypto_cycle_config seeded (version 1, SEED_S3)")
-
-        # Brief 3A: Ariadne's Thread — outcome resolution columns on signals
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS outcome VARCHAR(30),
-                ADD COLUMN IF NOT EXISTS outcome_pnl_pct FLOAT,
-                ADD COLUMN IF NOT EXISTS outcome_pnl_dollars FLOAT,
-                ADD COLUMN IF NOT EXISTS outcome_resolved_at TIMESTAMPTZ,
-                ADD COLUMN IF NOT EXISTS outcome_options_metrics JSONB
-            """)
-        except Exception as e:
-            print(f"WARNING: signals ALTER TABLE 4 skipped: {e}")
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_signals_feed_tier ON signals(feed_tier)
+    """)
 
-        # Brief 3D: Hermes Dispatch — weekly performance reports
+    # Raschke Phase 1 (migration 012): 3-10 Oscillator shadow-mode infrastructure
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS weekly_reports (
-                id SERIAL PRIMARY KEY,
-                week_of DATE NOT NULL,
-                report_json JSONB NOT NULL,
-                narrative TEXT,
-                lessons JSONB,
-                total_pnl FLOAT,
-                total_trades INT,
-                win_rate FLOAT,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
+            ALTER TABLE signals
+            ADD COLUMN IF NOT EXISTS gate_type VARCHAR(20)
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_signals_gate_type
+            ON signals(gate_type) WHERE gate_type IS NOT NULL
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("signals gate_type column skipped", e))
 
-        # Phase 4E: pending_trades table (signal-to-position bridge)
+    try:
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS pending_trades (
+            CREATE TABLE IF NOT EXISTS divergence_events (
                 id SERIAL PRIMARY KEY,
-                signal_id TEXT NOT NULL REFERENCES signals(signal_id),
-                trade_type TEXT NOT NULL DEFAULT 'STOCKS',
-                status TEXT NOT NULL DEFAULT 'PENDING',
-                planned_entry FLOAT,
-                planned_stop FLOAT,
-                planned_target FLOAT,
-                planned_quantity FLOAT,
-                options_structure TEXT,
-                options_legs JSONB,
-                options_net_premium FLOAT,
-                options_max_loss FLOAT,
-                options_expiry TEXT,
-                notes TEXT,
+                ticker TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                bar_timestamp TIMESTAMPTZ NOT NULL,
+                div_type TEXT NOT NULL CHECK (div_type IN ('bull', 'bear')),
+                fast_pivot_prev NUMERIC(12, 6),
+                fast_pivot_curr NUMERIC(12, 6),
+                price_pivot_prev NUMERIC(12, 6),
+                price_pivot_curr NUMERIC(12, 6),
+                threshold_used NUMERIC(5, 4),
+                lookback_used INT,
                 created_at TIMESTAMPTZ DEFAULT NOW(),
-                expires_at TIMESTAMPTZ,
-                filled_at TIMESTAMPTZ,
-                expired_at TIMESTAMPTZ,
-                position_id INTEGER
+                UNIQUE(ticker, timeframe, bar_timestamp, div_type)
             )
         """)
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_pending_trades_signal ON pending_trades(signal_id);
+            CREATE INDEX IF NOT EXISTS idx_divergence_events_ticker_time
+            ON divergence_events(ticker, bar_timestamp DESC)
         """)
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_pending_trades_status ON pending_trades(status);
+            CREATE INDEX IF NOT EXISTS idx_divergence_events_type
+            ON divergence_events(div_type, bar_timestamp DESC)
         """)
+    except Exception as e:
+        skipped.append(_schema_step_skipped("divergence_events table creation skipped", e))
 
-        # Regime overrides audit table
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS regime_overrides (
-                id SERIAL PRIMARY KEY,
-                regime_label TEXT NOT NULL,
-                direction TEXT NOT NULL DEFAULT 'NEUTRAL',
-                dominant_driver TEXT,
-                sectors_favored JSONB DEFAULT '[]',
-                sectors_avoided JSONB DEFAULT '[]',
-                theme_keywords JSONB DEFAULT '[]',
-                reversal_mode BOOLEAN DEFAULT FALSE,
-                expires_at TIMESTAMPTZ,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """)
+    if skipped:
+        raise MigrationIncomplete(f"baseline schema steps skipped: {', '.join(skipped)}")
 
-        # Sector constituents table (Phase 2 — sector drill-down popup)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS sector_constituents (
-                id SERIAL PRIMARY KEY,
-                sector_etf VARCHAR(10) NOT NULL,
-                sector_name VARCHAR(50) NOT NULL,
-                ticker VARCHAR(10) NOT NULL,
-                company_name VARCHAR(100) NOT NULL,
-                market_cap BIGINT,
-                avg_volume_20d BIGINT,
-                rank_in_sector INTEGER,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                updated_at TIMESTAMPTZ DEFAULT NOW(),
-                UNIQUE(sector_etf, ticker)
-            )
-        """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sector_constituents_etf
-                ON sector_constituents(sector_etf);
-        """)
+async def prune_retention_tables(conn) -> None:
+    """Retention deletes that used to run inline with the schema on every deploy."""
+    # Auto-clean old flow events (>90 days) on deploy
+    await conn.execute("""
+        DELETE FROM flow_events WHERE captured_at < NOW() - INTERVAL '90 days'
+    """)
+    # Retention (Nick 2026-07-01): purge UNGRADED rows >90d; graded exempt
+    # until docs/strategy-reviews/triton-forward-edge-*.md exists. Bumped 30d->90d
+    # after Railway CLI verified the postgres volume at 816/5000 MB (16%) — the
+    # "94% full" flag (6/23) was STALE; ample headroom. (Cap was 30d out of
+    # caution when the volume % was unknown at B1.)
+    await conn.execute("""
+        DELETE FROM triton_flow_shadow
+        WHERE created_at < NOW() - INTERVAL '90 days' AND graded_at IS NULL
+    """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sector_constituents_ticker
-                ON sector_constituents(ticker);
-        """)
 
-        # Ticker profiles cache table (Phase 3 — single ticker analyzer)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS ticker_profiles (
-                ticker VARCHAR(10) PRIMARY KEY,
-                company_name VARCHAR(200),
-                description TEXT,
-                sector VARCHAR(50),
-                industry VARCHAR(100),
-                market_cap BIGINT,
-                high_52w NUMERIC(12,2),
-                low_52w NUMERIC(12,2),
-                pe_ratio NUMERIC(8,2),
-                dividend_yield NUMERIC(6,4),
-                next_earnings_date DATE,
-                analyst_consensus VARCHAR(20),
-                analyst_count INTEGER,
-                beta_spy NUMERIC(6,3),
-                beta_sector NUMERIC(6,3),
-                updated_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """)
+_retention_task: Optional[asyncio.Task] = None
 
-        # Phase 4: Contextual Modifier columns on signals table
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS context_modifier INTEGER DEFAULT 0,
-                ADD COLUMN IF NOT EXISTS context_factors JSONB DEFAULT '{}',
-                ADD COLUMN IF NOT EXISTS adjusted_score INTEGER,
-                ADD COLUMN IF NOT EXISTS is_contrarian BOOLEAN DEFAULT FALSE,
-                ADD COLUMN IF NOT EXISTS context_updated_at TIMESTAMPTZ
-            """)
-        except Exception as e:
-            print(f"WARNING: signals ALTER TABLE 5 skipped: {e}")
 
-        # Pythia Market Profile events table (P4)
-        try:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS pythia_events (
-                    id SERIAL PRIMARY KEY,
-                    ticker VARCHAR(20) NOT NULL,
-                    alert_type VARCHAR(50),
-                    price DECIMAL(10, 2),
-                    direction VARCHAR(20),
-                    vah DECIMAL(10, 2),
-                    val DECIMAL(10, 2),
-                    poc DECIMAL(10, 2),
-                    va_migration VARCHAR(20),
-                    poor_high BOOLEAN DEFAULT FALSE,
-                    poor_low BOOLEAN DEFAULT FALSE,
-                    volume_quality VARCHAR(10),
-                    ib_high DECIMAL(10, 2),
-                    ib_low DECIMAL(10, 2),
-                    interpretation TEXT,
-                    raw_payload JSONB,
-                    timestamp TIMESTAMPTZ DEFAULT NOW()
-                )
-            """)
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_pythia_events_ticker
-                ON pythia_events(ticker, timestamp DESC)
-            """)
-        except Exception as e:
-            print(f"WARNING: pythia_events table creation skipped: {e}")
+async def _prune_retention_tables_background() -> None:
+    try:
+        pool = await get_postgres_client()
+        async with pool.acquire() as conn:
+            await prune_retention_tables(conn)
+    except Exception as e:
+        logger.warning("Retention prune skipped: %s", e)
 
-        # Brief C v1.1: committee_accuracy view for Phase 4 win-rate measurement
-        try:
-            await conn.execute("""
-                CREATE OR REPLACE VIEW committee_accuracy AS
-                SELECT
-                    s.signal_id,
-                    s.ticker,
-                    s.strategy,
-                    s.direction,
-                    s.created_at,
-                    s.decided_at                                          AS committee_decided_at,
-                    s.decision_source,
-                    -- Structured decision (Brief C v1.1 JSON block)
-                    s.committee_data -> 'decision' ->> 'recommendation'  AS committee_recommendation,
-                    s.committee_data -> 'decision' ->> 'conviction'      AS committee_conviction,
-                    s.committee_data -> 'decision' ->> 'key_risk'        AS committee_key_risk,
-                    -- Legacy label (pre-Brief C: TAKE/PASS/WATCHING)
-                    s.committee_data ->> 'action'                        AS legacy_action,
-                    -- Parse failure flag
-                    COALESCE(
-                        (s.committee_data -> 'decision_parse_failed')::TEXT::BOOLEAN,
-                        FALSE
-                    )                                                     AS decision_parse_failed,
-                    -- Nick's action (set via PATCH /api/signals/{id}/action)
-                    s.enrichment_data -> 'nick_decision' ->> 'action'    AS nick_action,
-                    (s.enrichment_data -> 'nick_decision' ->> 'price_at_decision')::FLOAT
-                                                                          AS nick_entry_price,
-                    (s.enrichment_data -> 'nick_decision' ->> 'decided_at')::TIMESTAMPTZ
-                                                                          AS nick_decided_at,
-                    -- Outcome (resolved by outcome_resolver.py)
-                    s.outcome,
-                    s.outcome_pnl_pct,
-                    s.outcome_resolved_at,
-                    -- Computed win flag (NULL = still open)
-                    CASE
-                        WHEN s.outcome = 'WIN'  THEN 1
-                        WHEN s.outcome = 'LOSS' THEN 0
-                        ELSE NULL
-                    END                                                   AS win_flag
-                FROM signals s
-                WHERE s.committee_data IS NOT NULL
-                  AND s.committee_data != '{}'::jsonb
-            """)
-        except Exception as e:
-            print(f"WARNING: committee_accuracy view creation skipped: {e}")
 
-        # ZEUS Phase 2: Feed tier classification column
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS feed_tier VARCHAR(20) DEFAULT 'research_log'
-            """)
-        except Exception as e:
-            print(f"WARNING: signals feed_tier column skipped (lock timeout?): {e}")
+async def init_database():
+    """
+    Bring the schema up to date via the versioned migration ledger.
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_signals_feed_tier ON signals(feed_tier)
-        """)
+    On a warm boot this is a single `SELECT MAX(version)` against
+    schema_migrations; unapplied migrations run once (see database/migrations.py).
+    Retention pruning runs in the background so it never delays startup.
+    """
+    global _retention_task
+    from database.migrations import migrate
 
-        # Raschke Phase 1 (migration 012): 3-10 Oscillator shadow-mode infrastructure
-        try:
-            await conn.execute("""
-                ALTER TABLE signals
-                ADD COLUMN IF NOT EXISTS gate_type VARCHAR(20)
-            """)
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_signals_gate_type
-                ON signals(gate_type) WHERE gate_type IS NOT NULL
-            """)
-        except Exception as e:
-            print(f"WARNING: signals gate_type column skipped: {e}")
+    pool = await get_postgres_client()
 
-        try:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS divergence_events (
-                    id SERIAL PRIMARY KEY,
-                    ticker TEXT NOT NULL,
-                    timeframe TEXT NOT NULL,
-                    bar_timestamp TIMESTAMPTZ NOT NULL,
-                    div_type TEXT NOT NULL CHECK (div_type IN ('bull', 'bear')),
-                    fast_pivot_prev NUMERIC(12, 6),
-                    fast_pivot_curr NUMERIC(12, 6),
-                    price_pivot_prev NUMERIC(12, 6),
-                    price_pivot_curr NUMERIC(12, 6),
-                    threshold_used NUMERIC(5, 4),
-                    lookback_used INT,
-                    created_at TIMESTAMPTZ DEFAULT NOW(),
-                    UNIQUE(ticker, timeframe, bar_timestamp, div_type)
-                )
-            """)
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_divergence_events_ticker_time
-                ON divergence_events(ticker, bar_timestamp DESC)
-            """)
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_divergence_events_type
-                ON divergence_events(div_type, bar_timestamp DESC)
-            """)
-        except Exception as e:
-            print(f"WARNING: divergence_events table creation skipped: {e}")
+    async with pool.acquire() as conn:
+        # migrate() sets the DDL lock/statement timeouts once it holds the
+        # migration lock, so a concurrent boot waits for it instead of failing.
+        result = await migrate(conn)
+
+    _retention_task = asyncio.create_task(_prune_retention_tables_background())
+    if result["applied"]:
+        print(f"Database schema migrated to version {result['version']} (applied {result['applied']})")
+    else:
+        print(f"Database schema up to date (version {result['version']})")
+    return result
 
-        print("Database schema initialized")
 
 async def log_signal(
     signal_data: Dict[Any, Any],
@@ -31,6 +31,8 @@ _redis_health: Dict[str, Any] = {
 
 # Global connection pool
 _redis_client: Optional[redis.Redis] = None
+# Second client without decode_responses, for binary payloads (price history).
+_redis_binary_client: Optional[redis.Redis] = None
 
 
 def _is_throttle_error(message: str) -> bool:
@@ -97,34 +99,51 @@ class TelemetryRedis(redis.Redis):
             raise
 
 
+def _redis_url() -> str:
+    # Prefer REDIS_URL (full connection string), fall back to individual vars
+    if REDIS_URL:
+        return REDIS_URL
+    if REDIS_PASSWORD:
+        # Use rediss:// for SSL (Upstash requires SSL)
+        return f"rediss://default:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+    return f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+
+
 async def get_redis_client() -> redis.Redis:
     """Get or create Redis client with connection pooling"""
     global _redis_client
     
     if _redis_client is None:
-        # Prefer REDIS_URL (full connection string), fall back to individual vars
-        if REDIS_URL:
-            redis_url = REDIS_URL
-        elif REDIS_PASSWORD:
-            # Use rediss:// for SSL (Upstash requires SSL)
-            redis_url = f"rediss://default:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
-        else:
-            redis_url = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
-        
         _redis_client = await TelemetryRedis.from_url(
-            redis_url,
+            _redis_url(),
             encoding="utf-8",
             decode_responses=True,
         )
     
     return _redis_client
 
+
+async def get_redis_binary_client() -> redis.Redis:
+    """Get or create a Redis client that returns raw bytes (no utf-8 decoding)."""
+    global _redis_binary_client
+
+    if _redis_binary_client is None:
+        _redis_binary_client = await TelemetryRedis.from_url(
+            _redis_url(),
+            decode_responses=False,
+        )
+
+    return _redis_binary_client
+
 async def close_redis_client():
     """Close Redis connection"""
-    global _redis_client
+    global _redis_client, _redis_binary_client
     if _redis_client:
         await _redis_client.close()
         _redis_client = None
+    if _redis_binary_client:
+        await _redis_binary_client.close()
+        _redis_binary_client = None
 
 # Signal cache operations
 async def cache_signal(signal_id: str, signal_data: Dict[Any, Any], ttl: int = 3600):
@@ -26,7 +26,8 @@ import sqlite3
 import aiohttp
 import time as time_module
 from collections import defaultdict, deque
-from datetime import datetime, time, timezone, timedelta, date as date_cls
+from contextlib import asynccontextmanager
+from datetime import datetime, time, timezone
 from typing import Optional, Dict, Any, List
 import pytz
 from discord_bridge.uw.parser import parse_flow_embed, parse_ticker_embed
@@ -38,6 +39,8 @@ from discord_bridge.whale_parser import (
     format_whale_hunter_for_llm,
     format_uw_embed_for_llm,
 )
+from utils.memory_cache import MemoryCache
+from utils.trading_calendar import get_calendar as get_trading_calendar
 
 # Discord.py imports
 try:
@@ -95,7 +98,38 @@ intents.members = True
 intents.guilds = True
 intents.presences = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# One pooled, keep-alive aiohttp session for every call back to the Pandora
+# API. Opening a ClientSession per request paid a fresh TCP/TLS handshake on
+# each poll and left nothing to reuse; the bot runs on a single loop, so a
+# lazily created session lives until the bot closes.
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=60),
+        )
+    return _http_session
+
+
+@asynccontextmanager
+async def _pandora_session():
+    """Drop-in for `async with aiohttp.ClientSession()` that reuses the shared session."""
+    yield _get_http_session()
+
+
+class PandoraBot(commands.Bot):
+    async def close(self):
+        global _http_session
+        if _http_session is not None and not _http_session.closed:
+            await _http_session.close()
+        _http_session = None
+        await super().close()
+
+
+bot = PandoraBot(command_prefix="!", intents=intents)
 
 # ================================
 # STATE TRACKING
@@ -230,66 +264,17 @@ def get_et_now() -> datetime:
     return datetime.now(ET)
 
 def is_market_hours() -> bool:
-    """Check if market is open (9:30 AM - 4:00 PM ET, weekdays)"""
-    now = get_et_now()
-    if now.weekday() >= 5:  # Weekend
-        return False
-    market_open = time(9, 30)
-    market_close = time(16, 0)
-    return market_open <= now.time() <= market_close
+    """Check if the regular session is open (9:30 AM - 4:00 PM ET, 1:00 PM on early closes)"""
+    return get_trading_calendar().is_session_open(get_et_now())
 
 def is_trading_day() -> bool:
-    """Check if today is a trading day (weekday)"""
-    return get_et_now().weekday() < 5
-
-
-def _nth_weekday_of_month(year: int, month: int, weekday: int, n: int) -> date_cls:
-    d = date_cls(year, month, 1)
-    while d.weekday() != weekday:
-        d += timedelta(days=1)
-    d += timedelta(days=7 * (n - 1))
-    return d
-
-
-def _last_weekday_of_month(year: int, month: int, weekday: int) -> date_cls:
-    if month == 12:
-        d = date_cls(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        d = date_cls(year, month + 1, 1) - timedelta(days=1)
-    while d.weekday() != weekday:
-        d -= timedelta(days=1)
-    return d
-
-
-def _observed_holiday(day: date_cls) -> date_cls:
-    if day.weekday() == 5:
-        return day - timedelta(days=1)
-    if day.weekday() == 6:
-        return day + timedelta(days=1)
-    return day
-
-
-def _us_market_holidays(year: int) -> set[date_cls]:
-    # Major market holidays (approximation, sufficient for reminder suppression).
-    holidays = {
-        _observed_holiday(date_cls(year, 1, 1)),                         # New Year's Day
-        _nth_weekday_of_month(year, 1, 0, 3),                            # MLK Day
-        _nth_weekday_of_month(year, 2, 0, 3),                            # Presidents Day
-        _last_weekday_of_month(year, 5, 0),                              # Memorial Day
-        _observed_holiday(date_cls(year, 7, 4)),                         # Independence Day
-        _nth_weekday_of_month(year, 9, 0, 1),                            # Labor Day
-        _nth_weekday_of_month(year, 11, 3, 4),                           # Thanksgiving
-        _observed_holiday(date_cls(year, 12, 25)),                       # Christmas
-    }
-    return holidays
+    """Check if today is a trading day (NYSE session)"""
+    return get_trading_calendar().is_trading_day(get_et_now().date())
 
 
 def is_us_market_open_day(ts: Optional[datetime] = None) -> bool:
     now = (ts or get_et_now()).astimezone(ET)
-    if now.weekday() >= 5:
-        return False
-    holidays = _us_market_holidays(now.year)
-    return now.date() not in holidays
+    return get_trading_calendar().is_trading_day(now.date())
 
 
 def _uw_time_slot(now: Optional[datetime] = None) -> str:
@@ -788,7 +773,7 @@ def parse_flow_alert(embed: discord.Embed) -> Optional[Dict[str, Any]]:
 async def send_to_pandora(endpoint: str, data: Dict[str, Any]) -> bool:
     """Send parsed data to Pandora's Box API"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _pandora_session() as session:
             url = f"{PANDORA_API_URL}{endpoint}"
             headers = {}
             if PIVOT_API_KEY:
@@ -1038,7 +1023,7 @@ async def trade_idea_poller():
     global _seen_signal_ids
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _pandora_session() as session:
             async with session.get(f"{PANDORA_API_URL}/signals/active") as resp:
                 if resp.status != 200:
                     return
@@ -1513,7 +1498,7 @@ def _format_macro_briefing_context(data: Any) -> str:
 
 async def get_strategy_health_context(days: int = 30) -> str:
     endpoint = f"/analytics/strategy-health?days={max(1, int(days))}"
-    async with aiohttp.ClientSession() as session:
+    async with _pandora_session() as session:
         payload = await _fetch_json(session, endpoint)
     return _format_strategy_health_context(payload)
 
@@ -1575,7 +1560,7 @@ async def _fetch_backend_recent_uw_alerts(ticker: str, lookback_hours: int = 4)
 
     cutoff = time_module.time() - (lookback_hours * 3600)
     alerts: List[Dict[str, Any]] = []
-    async with aiohttp.ClientSession() as session:
+    async with _pandora_session() as session:
         recent_payload = await _fetch_json(session, "/flow/recent?limit=80")
         if isinstance(recent_payload, dict):
             for alert in recent_payload.get("alerts", []) or []:
@@ -1725,7 +1710,7 @@ async def _calculate_rvol_for_whale(
         return None
 
     endpoint = f"/analytics/price-data?ticker={symbol}&timeframe=5m&days={max(10, lookback_days + 5)}&limit=20000"
-    async with aiohttp.ClientSession() as session:
+    async with _pandora_session() as session:
         payload = await _fetch_json(session, endpoint)
     rows = payload.get("rows") if isinstance(payload, dict) else None
     if not isinstance(rows, list) or not rows:
@@ -1790,7 +1775,7 @@ async def _build_tick_whale_confirmation(
     if lean not in {"BULLISH", "BEARISH"}:
         return None
 
-    async with aiohttp.ClientSession() as session:
+    async with _pandora_session() as session:
         tick_payload = await _fetch_json(session, "/bias/tick")
     if not isinstance(tick_payload, dict) or tick_payload.get("status") not in {"ok", "success"}:
         return None
@@ -1834,13 +1819,28 @@ async def build_recent_uw_context(ticker: str, lookback_hours: int = 4) -> tuple
     return _build_uw_context_block(symbol, merged, lookback_hours=lookback_hours), merged
 
 
+# The assembled context block fans out to 11+ hub endpoints; chat messages
+# arriving within the TTL for the same ticker reuse one assembly (concurrent
+# misses share one fetch). The block's "as of" stamp is the fetch time.
+MARKET_CONTEXT_TTL_SECONDS = int(os.getenv("PIVOT_MARKET_CONTEXT_TTL", "60"))
+_market_context_cache = MemoryCache(
+    "discord_bridge.market_context", ttl=MARKET_CONTEXT_TTL_SECONDS, max_entries=64,
+)
+
+
 async def build_market_context(user_text: str = "", ticker_hint: Optional[str] = None) -> str:
     target_ticker = (ticker_hint or _extract_ticker_hint(user_text) or "SPY").upper()
+    return await _market_context_cache.get_or_load(
+        target_ticker, lambda: _assemble_market_context(target_ticker),
+    )
+
+
+async def _assemble_market_context(target_ticker: str) -> str:
     symbols: List[str] = ["SPY"]
     if target_ticker != "SPY":
         symbols.append(target_ticker)
 
-    async with aiohttp.ClientSession() as session:
+    async with _pandora_session() as session:
         base_tasks = [
             _fetch_json(session, "/bias/DAILY"),
             _fetch_json(session, "/market-indicators/vix-term"),
@@ -2032,7 +2032,7 @@ async def build_crypto_market_context(ticker_hint: Optional[str] = None) -> str:
     symbol = (ticker_hint or "BTC").upper().strip()
     base_symbol = re.sub(r"(USDT|USD|PERP)$", "", symbol) or "BTC"
 
-    async with aiohttp.ClientSession() as session:
+    async with _pandora_session() as session:
         market_payload, current_session_payload, sessions_payload, hybrid_payload = await asyncio.gather(
             _fetch_json(session, "/crypto/market"),
             _fetch_json(session, "/btc/sessions/current"),
@@ -2211,7 +2211,7 @@ async def _post_uw_snapshot_to_backend(
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _pandora_session() as session:
             async with session.post(
                 f"{PANDORA_API_URL}/analytics/log-uw-snapshot",
                 json=payload,
@@ -2676,7 +2676,7 @@ async def _parse_robinhood_csv_attachment(attachment: discord.Attachment) -> Opt
         content_type=attachment.content_type or "text/csv",
     )
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _pandora_session() as session:
             async with session.post(
                 f"{PANDORA_API_URL}/analytics/parse-robinhood-csv",
                 data=form,
@@ -2756,7 +2756,7 @@ async def _execute_trade_import(payload: Dict[str, Any]) -> Optional[Dict[str, A
         "account": "robinhood",
     }
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _pandora_session() as session:
             async with session.post(
                 f"{PANDORA_API_URL}/analytics/import-trades",
                 json=import_payload,
@@ -3299,13 +3299,9 @@ async def on_message(message: discord.Message):
                         f"{options_context}"
                     )
 
-                now_et = get_et_now()
-                date_header = (
-                    f"TODAY: {now_et.strftime('%A, %B %d, %Y')} | "
-                    f"Time: {now_et.strftime('%I:%M %p')} ET"
-                )
-                market_context = f"{date_header}\n\n{market_context}"
-
+                # The current ET date/time (America/New_York, DST-aware) is added
+                # to the final user turn by llm.pivot_agent, after the cacheable
+                # system prompt + history.
                 current_user_content = (
                     "Use this current market context when answering.\n\n"
                     f"{market_context}\n\n"
@@ -3673,7 +3669,7 @@ async def log_tide_command(ctx, sentiment: str, bullish_pct: int = None):
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with _pandora_session() as session:
             async with session.post(
                 f"{PANDORA_API_URL}/bias/uw/market_tide",
                 json=tide_data
@@ -18,7 +18,10 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from database.redis_client import get_redis_client
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -58,27 +61,22 @@ def compute_atr(bars: list, period: int = 14) -> Optional[float]:
     if not bars or len(bars) < period + 1:
         return None
 
-    true_ranges = []
-    for i in range(1, len(bars)):
-        high = bars[i].get("h") or bars[i].get("high", 0)
-        low = bars[i].get("l") or bars[i].get("low", 0)
-        prev_close = bars[i - 1].get("c") or bars[i - 1].get("close", 0)
-
-        if not all([high, low, prev_close]):
-            continue
+    def _field(bar: dict, short: str, long: str) -> float:
+        value = bar.get(short) or bar.get(long, 0)
+        return float(value) if value else np.nan
 
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close),
-        )
-        true_ranges.append(tr)
+    highs = np.array([_field(b, "h", "high") for b in bars])
+    lows = np.array([_field(b, "l", "low") for b in bars])
+    closes = np.array([_field(b, "c", "close") for b in bars])
+    # Bars missing a high, low or previous close are skipped, not zero-filled.
+    true_ranges = kernels.true_range(highs, lows, closes)
+    true_ranges = true_ranges[~np.isnan(true_ranges)]
 
     if len(true_ranges) < period:
         return None
 
     # Simple average of last `period` true ranges
-    return round(sum(true_ranges[-period:]) / period, 4)
+    return round(float(kernels.sma(true_ranges, period)[-1]), 4)
 
 
 def compute_avg_volume(bars: list, period: int = 20) -> Optional[float]:
@@ -9,52 +9,106 @@ Either being exceeded triggers a rate-limit response.
 `mcp_ping` is exempt — Olympus calls it once per pass and Nick's expectation
 is that the health check never consumes the data quota.
 
-Implementation: in-process token-bucket per token-hash. For v1, in-process
-is acceptable — Railway runs a single web dyno. v2 should move to Redis
-if we ever scale horizontally.
+Implementation: approximate sliding windows over fixed sub-buckets (6 x 10s
+for the minute, 24 x 1h for the day). The count is the buckets fully inside
+the window plus the oldest bucket weighted by how much of it the window
+still overlaps, so memory per token is constant instead of one timestamp per
+call.
+
+The counters live in Redis (one key per token/window/bucket, expiring with
+the window), so every web worker and every deploy share the same quota. A
+check is one pipelined round trip. If Redis is unreachable the limiter falls
+back to the same counters in process, and retries Redis after a cooldown.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import logging
+import math
 import threading
 import time
-from collections import deque
-from typing import Deque, Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 LIMITS_PER_MINUTE = 60
 LIMITS_PER_DAY = 5_000
 
 EXEMPT_TOOLS = frozenset({"mcp_ping"})
 
+# (name, window seconds, sub-buckets)
+MINUTE_WINDOW = ("minute", 60, 6)
+DAY_WINDOW = ("day", 86_400, 24)
+
+REDIS_KEY_PREFIX = "mcp:ratelimit:"
+# A check waits at most this long on Redis before counting locally.
+REDIS_TIMEOUT_SECONDS = 0.25
+# After a Redis failure, count locally for this long before trying again.
+REDIS_RETRY_SECONDS = 30.0
+
 
 def _token_key(token: str) -> str:
     """SHA-256 truncated to 16 hex chars — enough to disambiguate, never the full token."""
     return hashlib.sha256(token.encode()).hexdigest()[:16]
 
 
+def _bucket_position(now: float, window_seconds: int, buckets: int) -> Tuple[int, float]:
+    """(current bucket index, fraction of the current bucket elapsed)."""
+    size = window_seconds / buckets
+    index = math.floor(now / size)
+    return index, now / size - index
+
+
+def _sliding_count(counts: Iterable[float], elapsed: float) -> float:
+    """Approximate window count from bucket counts ordered oldest → current.
+
+    The oldest bucket is the one the window is sliding off; it is weighted by
+    the share of it the window still covers.
+    """
+    counts = list(counts)
+    return counts[0] * (1.0 - elapsed) + sum(counts[1:])
+
+
+def _verdict(minute_count: float, day_count: float) -> Optional[str]:
+    if minute_count > LIMITS_PER_MINUTE:
+        return (
+            f"Rate limit exceeded: {LIMITS_PER_MINUTE} requests/minute. "
+            f"Retry in <60s."
+        )
+    if day_count > LIMITS_PER_DAY:
+        return (
+            f"Rate limit exceeded: {LIMITS_PER_DAY} requests/day. "
+            f"Retry tomorrow."
+        )
+    return None
+
+
 class _RollingCounter:
-    """Rolling time-window counter. Thread-safe via Lock."""
+    """Approximate sliding-window counter over fixed sub-buckets. Thread-safe via Lock."""
 
-    __slots__ = ("window_seconds", "events", "_lock")
+    __slots__ = ("window_seconds", "buckets", "counts", "_lock")
 
-    def __init__(self, window_seconds: int):
+    def __init__(self, window_seconds: int, buckets: int):
         self.window_seconds = window_seconds
-        self.events: Deque[float] = deque()
+        self.buckets = buckets
+        self.counts: Dict[int, int] = {}
         self._lock = threading.Lock()
 
-    def record_and_count(self, now: float) -> int:
-        """Append `now`, evict old entries, return count inside window."""
-        cutoff = now - self.window_seconds
+    def record_and_count(self, now: float) -> float:
+        """Count `now` in its bucket, drop buckets out of the window, return the count."""
+        index, elapsed = _bucket_position(now, self.window_seconds, self.buckets)
+        oldest = index - self.buckets
         with self._lock:
-            while self.events and self.events[0] < cutoff:
-                self.events.popleft()
-            self.events.append(now)
-            return len(self.events)
+            for stale in [i for i in self.counts if i < oldest]:
+                del self.counts[stale]
+            self.counts[index] = self.counts.get(index, 0) + 1
+            return _sliding_count((self.counts.get(i, 0) for i in range(oldest, index + 1)), elapsed)
 
 
 class RateLimiter:
-    """Per-token rate limiter with the two configured windows."""
+    """In-process per-token rate limiter with the two configured windows."""
 
     def __init__(self):
         self._per_token: Dict[str, Tuple[_RollingCounter, _RollingCounter]] = {}
@@ -66,34 +120,83 @@ class RateLimiter:
         with self._lock:
             counters = self._per_token.get(key)
             if counters is None:
-                counters = (_RollingCounter(60), _RollingCounter(86_400))
+                counters = (
+                    _RollingCounter(MINUTE_WINDOW[1], MINUTE_WINDOW[2]),
+                    _RollingCounter(DAY_WINDOW[1], DAY_WINDOW[2]),
+                )
                 self._per_token[key] = counters
             return counters
 
-    def check(self, token: str, tool_name: str) -> Optional[str]:
+    def check(self, token: str, tool_name: str, now: Optional[float] = None) -> Optional[str]:
         """Record this call. Returns None if allowed, else a rate-limit error message."""
         if tool_name in EXEMPT_TOOLS:
             return None
 
-        key = _token_key(token)
-        minute_counter, day_counter = self._get_or_create(key)
-        now = time.time()
-
-        minute_count = minute_counter.record_and_count(now)
-        day_count = day_counter.record_and_count(now)
-
-        if minute_count > LIMITS_PER_MINUTE:
-            return (
-                f"Rate limit exceeded: {LIMITS_PER_MINUTE} requests/minute. "
-                f"Retry in <60s."
-            )
-        if day_count > LIMITS_PER_DAY:
-            return (
-                f"Rate limit exceeded: {LIMITS_PER_DAY} requests/day. "
-                f"Retry tomorrow."
-            )
-        return None
-
+        minute_counter, day_counter = self._get_or_create(_token_key(token))
+        now = time.time() if now is None else now
+        return _verdict(minute_counter.record_and_count(now), day_counter.record_and_count(now))
+
+
+class RedisRateLimiter:
+    """Shared per-token rate limiter: Redis bucket counters, in-process fallback.
+
+    `redis` is for tests; by default the app's shared client is used.
+    """
+
+    def __init__(self, redis=None, fallback: Optional[RateLimiter] = None):
+        self._redis = redis
+        self.fallback = fallback or RateLimiter()
+        self._retry_at = 0.0
+        self.redis_checks = 0
+        self.fallback_checks = 0
+
+    async def _client(self):
+        if self._redis is None:
+            from database.redis_client import get_redis_client
+            self._redis = await get_redis_client()
+        return self._redis
+
+    async def _counts(self, key: str, now: float) -> Tuple[float, float]:
+        """One pipeline: INCR + EXPIRE the current bucket and MGET the window, per window."""
+        redis = await self._client()
+        pipe = redis.pipeline(transaction=False)
+        positions = []
+        for name, window_seconds, buckets in (MINUTE_WINDOW, DAY_WINDOW):
+            index, elapsed = _bucket_position(now, window_seconds, buckets)
+            prefix = f"{REDIS_KEY_PREFIX}{key}:{name}:"
+            ttl = int(window_seconds + window_seconds / buckets) + 1
+            pipe.incr(f"{prefix}{index}")
+            pipe.expire(f"{prefix}{index}", ttl)
+            pipe.mget([f"{prefix}{i}" for i in range(index - buckets, index + 1)])
+            positions.append(elapsed)
+        results = await pipe.execute()
+        minute = _sliding_count((int(v or 0) for v in results[2]), positions[0])
+        day = _sliding_count((int(v or 0) for v in results[5]), positions[1])
+        return minute, day
+
+    async def check(self, token: str, tool_name: str) -> Optional[str]:
+        """Record this call. Returns None if allowed, else a rate-limit error message."""
+        if tool_name in EXEMPT_TOOLS:
+            return None
 
-# Module-level singleton — single Railway dyno per the v1 scaling assumption.
-limiter = RateLimiter()
+        now = time.time()
+        if time.monotonic() >= self._retry_at:
+            try:
+                async with asyncio.timeout(REDIS_TIMEOUT_SECONDS):
+                    minute_count, day_count = await self._counts(_token_key(token), now)
+            except Exception as exc:
+                self._retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning(
+                    "MCP rate limit: Redis unavailable (%s) — counting in process for %.0fs",
+                    exc, REDIS_RETRY_SECONDS,
+                )
+            else:
+                self.redis_checks += 1
+                return _verdict(minute_count, day_count)
+
+        self.fallback_checks += 1
+        return self.fallback.check(token, tool_name, now)
+
+
+# Module-level singleton shared by the MCP middleware.
+limiter = RedisRateLimiter()
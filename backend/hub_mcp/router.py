@@ -142,7 +142,7 @@ class RateLimitMiddleware:
             pass
 
         if tool_name not in EXEMPT_TOOLS:
-            err = limiter.check(token, tool_name)
+            err = await limiter.check(token, tool_name)
             if err is not None:
                 await _send_json(send, 429, {"error": err})
                 return
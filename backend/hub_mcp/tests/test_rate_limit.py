@@ -1,6 +1,16 @@
 """Tests for backend/mcp/rate_limit.py."""
 
-from hub_mcp.rate_limit import EXEMPT_TOOLS, LIMITS_PER_MINUTE, RateLimiter
+import pytest
+
+from hub_mcp.rate_limit import (
+    DAY_WINDOW,
+    EXEMPT_TOOLS,
+    LIMITS_PER_MINUTE,
+    MINUTE_WINDOW,
+    RateLimiter,
+    RedisRateLimiter,
+    _token_key,
+)
 
 
 def test_under_limit_allowed():
@@ -32,3 +42,113 @@ def test_per_token_bucket_isolation():
         rl.check("token-d", "hub_get_bias_composite")
     # token-d is over; token-e should still be clean
     assert rl.check("token-e", "hub_get_bias_composite") is None
+
+
+# ─── Sub-bucket approximation ────────────────────────────────────────────
+
+def test_oldest_bucket_weighted_by_overlap():
+    rl = RateLimiter()
+    # 60 calls at the start of one 10s bucket, then the window slides on:
+    # by t=65 the old bucket still overlaps half of it (≈30 calls counted).
+    for _ in range(LIMITS_PER_MINUTE):
+        rl.check("token-f", "hub_get_bias_composite", now=1_000_000.0)
+    assert rl.check("token-f", "hub_get_bias_composite", now=1_000_030.0) is not None
+    for _ in range(28):
+        assert rl.check("token-f", "hub_get_bias_composite", now=1_000_065.0) is None
+    assert rl.check("token-f", "hub_get_bias_composite", now=1_000_075.0) is None
+
+
+def test_buckets_outside_window_are_dropped():
+    rl = RateLimiter()
+    for i in range(500):
+        rl.check("token-g", "hub_get_bias_composite", now=1_000_000.0 + i * 10)
+    minute, day = rl._per_token[_token_key("token-g")]
+    assert len(minute.counts) <= MINUTE_WINDOW[2] + 1
+    assert len(day.counts) <= DAY_WINDOW[2] + 1
+
+
+# ─── Redis-backed limiter ────────────────────────────────────────────────
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+
+    def mget(self, keys):
+        self.ops.append(("mget", keys))
+
+    async def execute(self):
+        self.redis.executes += 1
+        if self.redis.down:
+            raise ConnectionError("redis down")
+        out = []
+        for op in self.ops:
+            if op[0] == "incr":
+                self.redis.store[op[1]] = self.redis.store.get(op[1], 0) + 1
+                out.append(self.redis.store[op[1]])
+            elif op[0] == "expire":
+                self.redis.ttls[op[1]] = op[2]
+                out.append(True)
+            else:
+                out.append([None if k not in self.redis.store else str(self.redis.store[k]) for k in op[1]])
+        return out
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.executes = 0
+        self.down = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_redis_quota_shared_across_workers():
+    redis = FakeRedis()
+    worker_a, worker_b = RedisRateLimiter(redis), RedisRateLimiter(redis)
+
+    for i in range(LIMITS_PER_MINUTE):
+        assert await (worker_a if i % 2 else worker_b).check("token-h", "hub_get_bias_composite") is None
+    err = await worker_a.check("token-h", "hub_get_bias_composite")
+    assert err is not None and "minute" in err
+    assert worker_a.fallback_checks == worker_b.fallback_checks == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_one_round_trip_and_keys_expire():
+    redis = FakeRedis()
+    rl = RedisRateLimiter(redis)
+    await rl.check("token-i", "hub_get_bias_composite")
+    await rl.check("token-i", "mcp_ping")
+    assert redis.executes == 1
+    assert all("token-i" not in k for k in redis.store)
+    assert set(redis.ttls) == set(redis.store)
+    assert len(redis.store) == 2   # one minute bucket, one day bucket
+
+
+@pytest.mark.asyncio
+async def test_redis_down_falls_back_in_process():
+    redis = FakeRedis()
+    redis.down = True
+    rl = RedisRateLimiter(redis)
+
+    for _ in range(LIMITS_PER_MINUTE):
+        assert await rl.check("token-j", "hub_get_bias_composite") is None
+    assert await rl.check("token-j", "hub_get_bias_composite") is not None
+    # One failed attempt, then Redis is left alone until the retry time.
+    assert redis.executes == 1
+    assert rl.fallback_checks == LIMITS_PER_MINUTE + 1
+
+    redis.down = False
+    rl._retry_at = 0.0
+    assert await rl.check("token-j", "hub_get_bias_composite") is None
+    assert rl.redis_checks == 1
@@ -9,6 +9,8 @@ from __future__ import annotations
 
 from typing import Optional, Sequence
 
+from . import kernels
+
 
 def latest_atr(
     highs: Sequence[float],
@@ -21,17 +23,6 @@ def latest_atr(
     if n < period + 1 or len(highs) != n or len(lows) != n:
         return None
 
-    trs = []
-    for i in range(1, n):
-        tr = max(
-            highs[i] - lows[i],
-            abs(highs[i] - closes[i - 1]),
-            abs(lows[i] - closes[i - 1]),
-        )
-        trs.append(tr)
-
     # Wilder seed: mean of the first `period` true ranges, then smooth.
-    atr = sum(trs[:period]) / period
-    for i in range(period, len(trs)):
-        atr = (atr * (period - 1) + trs[i]) / period
-    return round(atr, 4)
+    atr = kernels.atr(highs, lows, closes, period)[-1]
+    return round(float(atr), 4)
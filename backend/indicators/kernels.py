@@ -0,0 +1,197 @@
+"""Vectorized indicator kernels over (tickers x bars) NumPy panels.
+
+Every kernel takes 1-D (one ticker) or 2-D (tickers x bars, oldest→newest
+along the last axis) float arrays and returns arrays of the same shape, with
+NaN where a value is not yet defined. Tickers with shorter histories are
+right-aligned and padded with leading NaN (see `panel`), so one call
+evaluates a whole universe.
+
+The tree used three smoothing conventions for the same indicators; all are
+kept, selected with `seed`:
+
+  "sma"       Wilder / classic: seeded with the simple mean of the first n
+              observations, then recursive (indicators/adx|atr|rsi|macd).
+  "adjusted"  pandas ewm(adjust=True, min_periods=n) — pandas_ta's `rma`,
+              which the scanners called (CTA, Holy Grail, Sell the Rip...).
+  "first"     pandas ewm(adjust=False) — recursive from the first
+              observation (the TradingView webhook ADX, Stable Engine ATR).
+
+The recursions run through pandas' EWM over the transposed panel, so they
+match pandas exactly (same NaN handling). Pure math: no fetch, no logging,
+no config lookups.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SEEDS = ("sma", "adjusted", "first")
+
+
+def _as_2d(x) -> Tuple[np.ndarray, bool]:
+    arr = np.asarray(x, dtype=float)
+    if arr.ndim == 1:
+        return arr[None, :], True
+    if arr.ndim != 2:
+        raise ValueError(f"expected a 1-D or 2-D array, got {arr.ndim}-D")
+    return arr, False
+
+
+def _out(arr: np.ndarray, squeeze: bool) -> np.ndarray:
+    return arr[0] if squeeze else arr
+
+
+def panel(series: Sequence[Sequence[float]], length: Optional[int] = None) -> np.ndarray:
+    """Stack per-ticker series into a (tickers x bars) panel, right-aligned on the
+    latest bar and padded with leading NaN. `length` keeps only the last bars."""
+    width = max((len(s) for s in series), default=0) if length is None else length
+    out = np.full((len(series), width), np.nan)
+    for i, s in enumerate(series):
+        tail = np.asarray(s, dtype=float)[-width:] if width else np.empty(0)
+        if len(tail):
+            out[i, width - len(tail):] = tail
+    return out
+
+
+def shift(x, periods: int = 1) -> np.ndarray:
+    """Lag along the bar axis (NaN-filled), like pandas Series.shift(periods)."""
+    arr, squeeze = _as_2d(x)
+    out = np.full_like(arr, np.nan)
+    if periods < arr.shape[1]:
+        out[:, periods:] = arr[:, :arr.shape[1] - periods]
+    return _out(out, squeeze)
+
+
+def sma(x, n: int) -> np.ndarray:
+    """Rolling mean over n bars; any NaN in the window gives NaN (pandas
+    rolling(n, min_periods=n).mean())."""
+    arr, squeeze = _as_2d(x)
+    rows, width = arr.shape
+    out = np.full_like(arr, np.nan)
+    if n < 1 or width < n:
+        return _out(out, squeeze)
+    missing = np.isnan(arr)
+    # Centre each row on its first value so the running sums stay small.
+    ref = arr[np.arange(rows), np.argmax(~missing, axis=1)]
+    ref = np.where(np.isnan(ref), 0.0, ref)
+    centred = np.where(missing, 0.0, arr - ref[:, None])
+    csum = np.concatenate([np.zeros((rows, 1)), np.cumsum(centred, axis=1)], axis=1)
+    cnan = np.concatenate([np.zeros((rows, 1)), np.cumsum(missing, axis=1)], axis=1)
+    window = (csum[:, n:] - csum[:, :-n]) / n + ref[:, None]
+    gaps = cnan[:, n:] - cnan[:, :-n]
+    out[:, n - 1:] = np.where(gaps == 0, window, np.nan)
+    return _out(out, squeeze)
+
+
+def ewma(x, alpha: float, seed: str = "sma", min_periods: int = 1, n: Optional[int] = None) -> np.ndarray:
+    """Exponentially weighted mean along the bar axis.
+
+    seed="sma" needs `n` (the seed window): bars before each ticker's n-th
+    observation are NaN, that bar holds the mean of the first n, and the rest
+    follow ewm(adjust=False). "adjusted"/"first" are pandas ewm(adjust=True/
+    False) with `min_periods`. Runs pandas' column-wise EWM over the panel,
+    so a universe costs one call rather than one per ticker.
+    """
+    if seed not in SEEDS:
+        raise ValueError(f"seed must be one of {SEEDS}, got {seed!r}")
+    arr, squeeze = _as_2d(x)
+    if seed == "sma":
+        if not n or n < 1:
+            raise ValueError("seed='sma' needs the seed window n")
+        obs = ~np.isnan(arr)
+        count = np.cumsum(obs, axis=1)
+        seeded = count >= n
+        at_seed = obs & (count == n)
+        seed_mean = np.where(obs & (count <= n), arr, 0.0).sum(axis=1) / n
+        arr = np.where(seeded, arr, np.nan)
+        arr = np.where(at_seed, seed_mean[:, None], arr)
+        frame = pd.DataFrame(arr.T).ewm(alpha=alpha, adjust=False).mean()
+        return _out(np.where(seeded, frame.to_numpy().T, np.nan), squeeze)
+
+    frame = pd.DataFrame(arr.T).ewm(alpha=alpha, adjust=seed == "adjusted", min_periods=min_periods).mean()
+    return _out(frame.to_numpy().T, squeeze)
+
+
+def ema(x, n: int, seed: str = "sma", min_periods: Optional[int] = None) -> np.ndarray:
+    """EMA with alpha = 2 / (n + 1). seed="sma" is pandas_ta's `ema` and
+    indicators/macd's convention; "first" is ewm(span=n, adjust=False)."""
+    return ewma(x, 2.0 / (n + 1), seed, n if min_periods is None else min_periods, n)
+
+
+def rma(x, n: int, seed: str = "sma", min_periods: Optional[int] = None) -> np.ndarray:
+    """Wilder's moving average: alpha = 1 / n."""
+    return ewma(x, 1.0 / n, seed, n if min_periods is None else min_periods, n)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """max(H-L, |H-prevC|, |L-prevC|); NaN on each ticker's first bar."""
+    h, squeeze = _as_2d(high)
+    lo, _ = _as_2d(low)
+    prev = shift(_as_2d(close)[0])
+    with np.errstate(invalid="ignore"):
+        tr = np.maximum(h - lo, np.maximum(np.abs(h - prev), np.abs(lo - prev)))
+    return _out(np.where(np.isnan(prev), np.nan, tr), squeeze)
+
+
+def atr(high, low, close, n: int = 14, seed: str = "sma", min_periods: Optional[int] = None) -> np.ndarray:
+    return rma(true_range(high, low, close), n, seed, min_periods)
+
+
+def adx(high, low, close, n: int = 14, seed: str = "sma",
+        min_periods: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """ADX with +DI/-DI: {"adx", "plus_di", "minus_di"}.
+
+    Directional movement per Wilder: +DM = up move when it beats the down move
+    and is positive (and vice versa). A flat range (zero ATR, or +DI + -DI = 0)
+    gives DX 0 rather than NaN, as indicators/adx always did.
+    """
+    h, squeeze = _as_2d(high)
+    lo, _ = _as_2d(low)
+    up = h - shift(h)
+    down = shift(lo) - lo
+    with np.errstate(invalid="ignore"):
+        plus_dm = np.where(np.isnan(up), np.nan, np.where((up > down) & (up > 0), up, 0.0))
+        minus_dm = np.where(np.isnan(down), np.nan, np.where((down > up) & (down > 0), down, 0.0))
+    tr = rma(true_range(h, lo, close), n, seed, min_periods)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plus_di = np.where(tr == 0, 0.0, 100.0 * rma(plus_dm, n, seed, min_periods) / tr)
+        minus_di = np.where(tr == 0, 0.0, 100.0 * rma(minus_dm, n, seed, min_periods) / tr)
+        total = plus_di + minus_di
+        dx = np.where(total == 0, 0.0, 100.0 * np.abs(plus_di - minus_di) / total)
+    line = rma(dx, n, seed, min_periods)
+    return {"adx": _out(line, squeeze), "plus_di": _out(plus_di, squeeze), "minus_di": _out(minus_di, squeeze)}
+
+
+def rsi(close, n: int = 14, seed: str = "sma") -> np.ndarray:
+    """RSI = 100 * avg_gain / (avg_gain + avg_loss); 100 when both are zero."""
+    c, squeeze = _as_2d(close)
+    delta = c - shift(c)
+    with np.errstate(invalid="ignore"):
+        gains = np.where(np.isnan(delta), np.nan, np.where(delta > 0, delta, 0.0))
+        losses = np.where(np.isnan(delta), np.nan, np.where(delta < 0, -delta, 0.0))
+    avg_gain, avg_loss = rma(gains, n, seed), rma(losses, n, seed)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        value = np.where(total == 0, 100.0, 100.0 * avg_gain / total)
+    return _out(value, squeeze)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """{"macd", "signal", "histogram"}; SMA-seeded EMAs, the signal line seeded
+    on the first `signal` MACD values."""
+    c, squeeze = _as_2d(close)
+    line = ema(c, fast) - ema(c, slow)
+    sig = ema(line, signal)
+    return {"macd": _out(line, squeeze), "signal": _out(sig, squeeze), "histogram": _out(line - sig, squeeze)}
+
+
+def three_ten(high, low) -> Dict[str, np.ndarray]:
+    """Raschke 3-10: raw = SMA3(mid) - SMA10(mid); fast = SMA3(raw), slow = SMA10(raw)."""
+    h, squeeze = _as_2d(high)
+    lo, _ = _as_2d(low)
+    mid = (h + lo) / 2.0
+    raw = sma(mid, 3) - sma(mid, 10)
+    return {"fast": _out(sma(raw, 3), squeeze), "slow": _out(sma(raw, 10), squeeze)}
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from typing import Dict, Optional, Sequence
 
+from . import kernels
 from .macd import ema_series
 
 _SMA_PERIODS = (20, 50, 120, 200)
@@ -17,7 +18,7 @@ _SMA_PERIODS = (20, 50, 120, 200)
 def _sma(values: Sequence[float], period: int) -> Optional[float]:
     if len(values) < period:
         return None
-    return round(sum(values[-period:]) / period, 4)
+    return round(float(kernels.sma(values, period)[-1]), 4)
 
 
 def latest_moving_averages(closes: Sequence[float]) -> Dict:
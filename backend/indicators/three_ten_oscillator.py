@@ -27,6 +27,8 @@ from typing import Optional
 
 import pandas as pd
 
+from . import kernels
+
 logger = logging.getLogger(__name__)
 
 # Exported column names — downstream consumers should import these constants,
@@ -114,13 +116,11 @@ def compute_3_10(
         return df
 
     # Core math
-    midpoint = (df[high_col] + df[low_col]) / 2.0
-    raw = midpoint.rolling(window=3, min_periods=3).mean() - midpoint.rolling(
-        window=10, min_periods=10
-    ).mean()
-
-    df[OSC_FAST] = raw.rolling(window=3, min_periods=3).mean()
-    df[OSC_SLOW] = raw.rolling(window=10, min_periods=10).mean()
+    osc = kernels.three_ten(
+        df[high_col].to_numpy(dtype=float), df[low_col].to_numpy(dtype=float)
+    )
+    df[OSC_FAST] = osc["fast"]
+    df[OSC_SLOW] = osc["slow"]
 
     # Crossover detection: compare current and previous fast-vs-slow sign.
     prev_fast = df[OSC_FAST].shift(1)
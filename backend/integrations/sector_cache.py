@@ -7,6 +7,10 @@ and consumed by `/sectors/{etf}/leaders` and the ticker profile endpoint.
 Envelope shape:
     {"value": <number | null>, "ts": <ISO 8601 string>, "source": "UW"}
 
+`source` is "UW" when the value comes from UW daily bars alone (the close
+snapshot) and "UW+YF" for intraday values (UW daily bars + a yfinance last
+price, see `jobs/sector_bar_panel`).
+
 The envelope is intentional. Phase C (Olympus enrichment expansion) will adopt
 the same shape for committee enrichment caching, so the popup-side fix Phase A
 ships becomes the architectural template for the next build. Keep the shape
@@ -74,6 +78,38 @@ async def write_field(
         return False
 
 
+async def write_many(
+    values: Dict[str, Dict[str, Optional[float]]],
+    source: str = "UW",
+) -> int:
+    """Write {ticker: {field: value}} envelopes in one MSET. Returns envelopes written.
+
+    Same envelope and `value=None` semantics as write_field; all envelopes in
+    one call share the same `ts`.
+    """
+    redis = await get_redis_client()
+    if not redis or not values:
+        return 0
+    ts = _now_iso()
+    mapping = {
+        _key(ticker, field): json.dumps({
+            "value": value if value is None else float(value),
+            "ts": ts,
+            "source": source,
+        })
+        for ticker, fields in values.items()
+        for field, value in fields.items()
+    }
+    if not mapping:
+        return 0
+    try:
+        await redis.mset(mapping)
+        return len(mapping)
+    except Exception as e:
+        logger.debug("sector_cache write_many MSET failed (%d keys): %s", len(mapping), e)
+        return 0
+
+
 async def read_field(ticker: str, field: str) -> Optional[Dict[str, Any]]:
     """Read a single field envelope. Returns None if the key is missing.
 
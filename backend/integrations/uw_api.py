@@ -19,6 +19,7 @@ Binding conditions from committee review:
 """
 
 import asyncio
+import json
 import logging
 import os
 import time
@@ -29,7 +30,7 @@ import httpx
 
 from integrations.uw_api_cache import (
     cache_get, cache_set, increment_daily_counter, increment_429_counter,
-    get_daily_count, get_cache_stats,
+    get_daily_count, get_cache_stats, coalesce,
 )
 from integrations.uw_governor import (
     precheck as _governor_precheck,
@@ -38,6 +39,7 @@ from integrations.uw_governor import (
     CIRCUIT_OPEN as _GOV_CIRCUIT_OPEN,
     RATE_LIMITED as _GOV_RATE_LIMITED,
 )
+from integrations.uw_rate_scheduler import TokenRequest, UWRateScheduler
 
 logger = logging.getLogger("uw_api")
 
@@ -59,11 +61,62 @@ CB_COOLDOWN_SECONDS = 300  # 5 minutes
 # loop self-paces at source) so the bucket is a backstop, not the primary
 # burst control. Reversible one-constant tighten to 30 if post-deploy
 # telemetry still shows bursts breaching 60. See 2026-06-16-uw-budget-rework.
-_bucket_tokens = 60.0
+# Tokens are handed out by UWRateScheduler: FOREGROUND callers are served
+# ahead of STANDARD/BACKGROUND when the bucket is dry, and no caller holds a
+# lock while waiting (see integrations/uw_rate_scheduler.py).
 _bucket_max = 60.0
 _bucket_refill_rate = 2.0  # tokens/sec = 120/min sustained (UNCHANGED — burst-only change)
-_bucket_last_refill = time.time()
-_bucket_lock = asyncio.Lock()
+_rate_scheduler = UWRateScheduler(_bucket_max, _bucket_refill_rate)
+# Token request of each in-flight coalesced call, by coalesce key.
+_flight_requests: Dict[str, TokenRequest] = {}
+
+# ── Shared HTTP client ───────────────────────────────────────────
+# One keep-alive client for every UW call instead of a fresh AsyncClient per
+# request (which paid a TCP + TLS handshake each time on our highest-volume
+# outbound path). HTTP/2 when `h2` is installed (httpx[http2]), HTTP/1.1
+# keep-alive otherwise. Pool sizing follows the token bucket: no more than
+# `_bucket_max` calls can be released at once, and sustained concurrency is
+# bounded by refill rate x request timeout, so that is what stays warm.
+# Created lazily on the running loop and re-created if the loop changes
+# (scripts/tests that call asyncio.run() repeatedly); closed by the FastAPI
+# lifespan via close_http_client().
+_UW_TIMEOUT_SECONDS = 15.0
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide UW client, creating it on first use."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            base_url=UW_BASE,
+            timeout=_UW_TIMEOUT_SECONDS,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=int(_bucket_max),
+                max_keepalive_connections=int(_bucket_refill_rate * _UW_TIMEOUT_SECONDS),
+                keepalive_expiry=30.0,
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared UW client (FastAPI lifespan shutdown)."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 # ── 429 Counter (Phase A.3 audit instrumentation, 2026-05-22) ────
 # Process-lifetime monotonic count of 429 responses observed by _uw_request.
@@ -125,21 +178,14 @@ async def _post_circuit_breaker_alert():
         pass
 
 
-async def _consume_token():
-    """Token bucket rate limiter. Blocks until a token is available."""
-    global _bucket_tokens, _bucket_last_refill
-    async with _bucket_lock:
-        now = time.time()
-        elapsed = now - _bucket_last_refill
-        _bucket_tokens = min(_bucket_max, _bucket_tokens + elapsed * _bucket_refill_rate)
-        _bucket_last_refill = now
+async def _consume_token(caller: str = "untagged", request: Optional[TokenRequest] = None):
+    """Wait for a rate-limit token; priority follows the caller's governor tier."""
+    await _rate_scheduler.acquire(caller, request)
 
-        if _bucket_tokens < 1:
-            wait = (1 - _bucket_tokens) / _bucket_refill_rate
-            await asyncio.sleep(wait)
-            _bucket_tokens = 0
-        else:
-            _bucket_tokens -= 1
+
+def get_rate_headroom() -> float:
+    """Current token-bucket headroom as a 0..1 ratio."""
+    return _rate_scheduler.headroom()
 
 
 async def _uw_request(path: str, params: dict = None, caller: str = "untagged") -> Optional[dict]:
@@ -168,40 +214,64 @@ async def _uw_request(path: str, params: dict = None, caller: str = "untagged")
     if _blocked is not None:
         return _blocked
 
-    await _consume_token()
+    # Singleflight on (path, params): concurrent cache misses for the same
+    # endpoint share one upstream call — one token, one budget count. Done
+    # after the per-caller gates so a blocked caller never blocks the others.
+    # A caller joining a flight raises its pending token to the caller's tier,
+    # so FOREGROUND never waits in the lane of a BACKGROUND flight it joined.
+    key = path + "?" + json.dumps(params or {}, sort_keys=True, default=str)
+    request = _flight_requests.get(key)
+    if request is not None:
+        _rate_scheduler.raise_tier(request, caller)
+        return await coalesce(key, lambda: _uw_fetch(path, params, caller, request))
+
+    request = _flight_requests[key] = TokenRequest(caller)
+
+    async def _fetch():
+        try:
+            return await _uw_fetch(path, params, caller, request)
+        finally:
+            _flight_requests.pop(key, None)
+
+    return await coalesce(key, _fetch)
+
+
+async def _uw_fetch(path: str, params: Optional[dict], caller: str,
+                    request: Optional[TokenRequest] = None) -> Optional[dict]:
+    """One upstream UW call: rate-limit token, budget count, retries."""
+    await _consume_token(caller, request)
     await increment_daily_counter(caller)
 
-    url = f"{UW_BASE}{path}"
     headers = {"Authorization": f"Bearer {UW_API_KEY}", "Accept": "application/json"}
 
     last_error = None
     for attempt in range(3):
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(url, headers=headers, params=params or {})
-                if resp.status_code == 200:
-                    _record_success()
-                    return resp.json()
-                elif resp.status_code == 429:
-                    # Do not retry 429 — our rate limiter should prevent these, and when UW
-                    # fires one anyway it means we've hit a tighter per-endpoint or burst limit.
-                    # Retrying with backoff would block the caller for 14+ seconds per ticker,
-                    # stalling the heatmap and other polling endpoints. Return None immediately
-                    # so cached data or fallbacks fire without delay. Do NOT trip the circuit
-                    # breaker — a rate limit is not a broken API.
-                    global _total_429s
-                    _total_429s += 1
-                    await increment_429_counter(caller)
-                    # B2 / AEGIS: return a typed sentinel, NOT a silent None. A
-                    # silent None on throttle is indistinguishable from "no data"
-                    # — the fake-healthy pattern that made the 2026-06-16 outage
-                    # invisible. Falsy, so existing fallback paths still fire.
-                    logger.warning("UW API %s: rate limited (429) — returning UWUnavailable(RATE_LIMITED)", path)
-                    return UWUnavailable(_GOV_RATE_LIMITED, caller=caller)
-                else:
-                    logger.error("UW API %s: HTTP %d — %s", path, resp.status_code, resp.text[:200])
-                    _record_failure()
-                    return None
+            client = _get_http_client()
+            resp = await client.get(path, headers=headers, params=params or {})
+            if resp.status_code == 200:
+                _record_success()
+                return resp.json()
+            elif resp.status_code == 429:
+                # Do not retry 429 — our rate limiter should prevent these, and when UW
+                # fires one anyway it means we've hit a tighter per-endpoint or burst limit.
+                # Retrying with backoff would block the caller for 14+ seconds per ticker,
+                # stalling the heatmap and other polling endpoints. Return None immediately
+                # so cached data or fallbacks fire without delay. Do NOT trip the circuit
+                # breaker — a rate limit is not a broken API.
+                global _total_429s
+                _total_429s += 1
+                await increment_429_counter(caller)
+                # B2 / AEGIS: return a typed sentinel, NOT a silent None. A
+                # silent None on throttle is indistinguishable from "no data"
+                # — the fake-healthy pattern that made the 2026-06-16 outage
+                # invisible. Falsy, so existing fallback paths still fire.
+                logger.warning("UW API %s: rate limited (429) — returning UWUnavailable(RATE_LIMITED)", path)
+                return UWUnavailable(_GOV_RATE_LIMITED, caller=caller)
+            else:
+                logger.error("UW API %s: HTTP %d — %s", path, resp.status_code, resp.text[:200])
+                _record_failure()
+                return None
         except Exception as e:
             last_error = e
             wait = 2 ** attempt
@@ -1205,30 +1275,34 @@ def _get_contract_greeks(contract: dict) -> dict:
     }
 
 
-async def get_spread_value(
+def _spread_option_type(structure: str) -> Optional[str]:
+    struct_lower = structure.lower()
+    if "put" in struct_lower:
+        return "put"
+    if "call" in struct_lower:
+        return "call"
+    return None
+
+
+def _underlying_price(contracts: List[dict]) -> Optional[float]:
+    for c in contracts:
+        ua = c.get("underlying_asset", {})
+        if ua and ua.get("price"):
+            return float(ua["price"])
+    return None
+
+
+def spread_value_from_chain(
+    chain: list,
     underlying: str,
     long_strike: float,
     short_strike: float,
     expiry: str,
     structure: str,
 ) -> Optional[Dict[str, Any]]:
-    """Get current spread value from UW options chain. Matches polygon_options schema."""
-    struct_lower = structure.lower()
-    if "put" in struct_lower:
-        opt_type = "put"
-    elif "call" in struct_lower:
-        opt_type = "call"
-    else:
-        return None
-
-    chain = await get_options_snapshot(
-        underlying,
-        expiration_date=str(expiry)[:10],
-        strike_gte=min(long_strike, short_strike) - 0.5,
-        strike_lte=max(long_strike, short_strike) + 0.5,
-        contract_type=opt_type,
-    )
-    if not chain:
+    """Price a vertical spread from an already-fetched chain (get_spread_value schema)."""
+    opt_type = _spread_option_type(structure)
+    if opt_type is None or not chain:
         return None
 
     long_c = _find_contract(chain, long_strike, expiry, opt_type)
@@ -1242,45 +1316,30 @@ async def get_spread_value(
     if long_mid is None or short_mid is None:
         return None
 
-    if "credit" in struct_lower:
+    if "credit" in structure.lower():
         spread_value = round(short_mid - long_mid, 4)
     else:
         spread_value = round(long_mid - short_mid, 4)
 
-    underlying_price = None
-    for c in [long_c, short_c]:
-        ua = c.get("underlying_asset", {})
-        if ua and ua.get("price"):
-            underlying_price = float(ua["price"])
-            break
-
     return {
         "spread_value": spread_value,
         "long_mid": long_mid,
         "short_mid": short_mid,
         "long_greeks": _get_contract_greeks(long_c),
         "short_greeks": _get_contract_greeks(short_c),
-        "underlying_price": underlying_price,
+        "underlying_price": _underlying_price([long_c, short_c]),
     }
 
 
-async def get_single_option_value(
-    underlying: str,
+def single_option_value_from_chain(
+    chain: list,
     strike: float,
     expiry: str,
     option_type: str,
 ) -> Optional[Dict[str, Any]]:
-    """Get current value of a single option contract. Matches polygon_options schema."""
-    chain = await get_options_snapshot(
-        underlying,
-        expiration_date=str(expiry)[:10],
-        strike_gte=strike - 0.5,
-        strike_lte=strike + 0.5,
-        contract_type=option_type,
-    )
+    """Price one contract from an already-fetched chain (get_single_option_value schema)."""
     if not chain:
         return None
-
     contract = _find_contract(chain, strike, expiry, option_type)
     if not contract:
         return None
@@ -1289,46 +1348,21 @@ async def get_single_option_value(
     if mid is None:
         return None
 
-    underlying_price = None
-    ua = contract.get("underlying_asset", {})
-    if ua and ua.get("price"):
-        underlying_price = float(ua["price"])
-
     return {
         "option_value": mid,
         "greeks": _get_contract_greeks(contract),
-        "underlying_price": underlying_price,
+        "underlying_price": _underlying_price([contract]),
     }
 
 
-async def get_multi_leg_value(
+def multi_leg_value_from_chain(
+    chain: list,
     underlying: str,
     legs: List[Dict[str, Any]],
     expiry: str,
 ) -> Optional[Dict[str, Any]]:
-    """Get net mark for a multi-leg position. Matches polygon_options schema."""
-    if not legs:
-        return None
-
-    strikes = [float(l.get("strike", 0)) for l in legs]
-    strike_lo = min(strikes) - 0.5
-    strike_hi = max(strikes) + 0.5
-
-    opt_types = set(l.get("option_type", "").lower() for l in legs)
-    ct_filter = None
-    if opt_types == {"put"}:
-        ct_filter = "put"
-    elif opt_types == {"call"}:
-        ct_filter = "call"
-
-    chain = await get_options_snapshot(
-        underlying,
-        expiration_date=str(expiry)[:10],
-        strike_gte=strike_lo,
-        strike_lte=strike_hi,
-        contract_type=ct_filter,
-    )
-    if not chain:
+    """Net mark of a multi-leg position from an already-fetched chain (get_multi_leg_value schema)."""
+    if not legs or not chain:
         return None
 
     net_mark = 0.0
@@ -1354,9 +1388,7 @@ async def get_multi_leg_value(
         net_mark += mid * sign * qty
 
         if underlying_price is None:
-            ua = contract.get("underlying_asset", {})
-            if ua and ua.get("price"):
-                underlying_price = float(ua["price"])
+            underlying_price = _underlying_price([contract])
 
         leg_details.append({
             "action": action,
@@ -1374,6 +1406,75 @@ async def get_multi_leg_value(
     }
 
 
+async def get_spread_value(
+    underlying: str,
+    long_strike: float,
+    short_strike: float,
+    expiry: str,
+    structure: str,
+) -> Optional[Dict[str, Any]]:
+    """Get current spread value from UW options chain. Matches polygon_options schema."""
+    opt_type = _spread_option_type(structure)
+    if opt_type is None:
+        return None
+
+    chain = await get_options_snapshot(
+        underlying,
+        expiration_date=str(expiry)[:10],
+        strike_gte=min(long_strike, short_strike) - 0.5,
+        strike_lte=max(long_strike, short_strike) + 0.5,
+        contract_type=opt_type,
+    )
+    return spread_value_from_chain(chain, underlying, long_strike, short_strike, expiry, structure)
+
+
+async def get_single_option_value(
+    underlying: str,
+    strike: float,
+    expiry: str,
+    option_type: str,
+) -> Optional[Dict[str, Any]]:
+    """Get current value of a single option contract. Matches polygon_options schema."""
+    chain = await get_options_snapshot(
+        underlying,
+        expiration_date=str(expiry)[:10],
+        strike_gte=strike - 0.5,
+        strike_lte=strike + 0.5,
+        contract_type=option_type,
+    )
+    return single_option_value_from_chain(chain, strike, expiry, option_type)
+
+
+async def get_multi_leg_value(
+    underlying: str,
+    legs: List[Dict[str, Any]],
+    expiry: str,
+) -> Optional[Dict[str, Any]]:
+    """Get net mark for a multi-leg position. Matches polygon_options schema."""
+    if not legs:
+        return None
+
+    strikes = [float(l.get("strike", 0)) for l in legs]
+    strike_lo = min(strikes) - 0.5
+    strike_hi = max(strikes) + 0.5
+
+    opt_types = set(l.get("option_type", "").lower() for l in legs)
+    ct_filter = None
+    if opt_types == {"put"}:
+        ct_filter = "put"
+    elif opt_types == {"call"}:
+        ct_filter = "call"
+
+    chain = await get_options_snapshot(
+        underlying,
+        expiration_date=str(expiry)[:10],
+        strike_gte=strike_lo,
+        strike_lte=strike_hi,
+        contract_type=ct_filter,
+    )
+    return multi_leg_value_from_chain(chain, underlying, legs, expiry)
+
+
 async def get_ticker_greeks_summary(
     underlying: str,
     positions: List[Dict[str, Any]],
@@ -1472,10 +1573,7 @@ async def get_health() -> Dict[str, Any]:
         "daily_requests": await get_daily_count(),
         "daily_budget": 20000,
         "cache": get_cache_stats(),
-        "rate_limiter": {
-            "tokens_available": round(_bucket_tokens, 1),
-            "max_tokens": _bucket_max,
-        },
+        "rate_limiter": _rate_scheduler.stats(),
     }
 
 
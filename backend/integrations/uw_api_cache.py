@@ -2,13 +2,16 @@
 UW API Redis Caching Layer
 
 Configurable TTL per endpoint type, daily request counter with budget alerts,
-cache hit/miss rate tracking.
+cache hit/miss rate tracking, and singleflight coalescing of identical
+in-flight upstream requests.
 """
 
+import asyncio
+import copy
 import json
 import logging
 import time
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 logger = logging.getLogger("uw_api")
 
@@ -39,8 +42,13 @@ CACHE_TTLS = {
 DAILY_BUDGET = 20000     # UW Basic plan limit
 BUDGET_ALERT_THRESHOLDS = [0.50, 0.70, 0.85, 0.90]  # Alert at each crossing — 90% is CRITICAL ceiling (drops 95% in favor of earlier-firing CRITICAL)
 
-# In-memory stats (reset on deploy)
-_stats = {"hits": 0, "misses": 0}
+# In-memory stats (reset on deploy). `upstream` counts requests that actually
+# left the process through coalesce(); `coalesced` counts callers that joined
+# one already in flight instead of sending their own.
+_stats = {"hits": 0, "misses": 0, "upstream": 0, "coalesced": 0}
+
+# Singleflight: request key -> [task, caller_count]. See coalesce().
+_inflight: Dict[str, list] = {}
 
 
 async def _get_redis():
@@ -81,6 +89,39 @@ async def cache_set(endpoint_type: str, key: str, data: Any) -> None:
         logger.debug("Cache set failed for %s: %s", key, e)
 
 
+async def coalesce(key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Run `fetch()` once for all concurrent callers that share `key`.
+
+    N pollers/committee passes missing the same cache entry at once used to
+    send N identical UW calls. The first caller starts the upstream request as
+    a task; everyone else arriving before it finishes awaits that task. The
+    task is shielded, so one caller being cancelled (scan timeouts) does not
+    cancel the request the others are waiting on. Exceptions propagate to all
+    callers. When a result was shared, each caller gets its own deep copy —
+    wrappers normalize responses in place.
+    """
+    entry = _inflight.get(key)
+    if entry is not None:
+        _stats["coalesced"] += 1
+        entry[1] += 1
+    else:
+        _stats["upstream"] += 1
+
+        async def _run():
+            try:
+                return await fetch()
+            finally:
+                # Drop the key before waiters resume so no late joiner can
+                # attach to a finished flight.
+                _inflight.pop(key, None)
+
+        entry = [asyncio.ensure_future(_run()), 1]
+        _inflight[key] = entry
+
+    result = await asyncio.shield(entry[0])
+    return copy.deepcopy(result) if entry[1] > 1 else result
+
+
 async def increment_daily_counter(caller: str = "untagged") -> int:
     """Increment daily request counter. Returns current count.
 
@@ -231,11 +272,16 @@ def get_cache_stats() -> dict:
     """Return cache hit/miss stats."""
     total = _stats["hits"] + _stats["misses"]
     hit_rate = round(_stats["hits"] / total * 100, 1) if total > 0 else 0
+    requested = _stats["upstream"] + _stats["coalesced"]
     return {
         "hits": _stats["hits"],
         "misses": _stats["misses"],
         "total": total,
         "hit_rate_pct": hit_rate,
+        "upstream": _stats["upstream"],
+        "coalesced": _stats["coalesced"],
+        "coalesced_pct": round(_stats["coalesced"] / requested * 100, 1) if requested > 0 else 0,
+        "inflight": len(_inflight),
     }
 
 
@@ -0,0 +1,275 @@
+"""UW rate scheduler — token bucket with per-tier priority lanes.
+
+Replaces the lock-held-across-sleep bucket in `uw_api._consume_token`. The old
+limiter slept *inside* `_bucket_lock`, so one caller waiting for a token
+serialized every other caller behind it, and a FOREGROUND quote/chain read
+queued FIFO behind a BACKGROUND sector refresh burst even though
+`uw_governor` already classifies callers by tier.
+
+How it works:
+
+  - Fast path: a token is available and nobody is queued → take it and go.
+    No lock, no await (single-threaded asyncio makes the check-and-take atomic).
+  - Otherwise the caller parks a future in its tier's lane and a single
+    dispatcher task hands tokens out as they refill. Only the dispatcher ever
+    sleeps; callers just await their own future, so nothing is held across a
+    sleep and a cancelled caller simply drops out of the queue.
+  - Lanes are strict priority FOREGROUND > STANDARD > BACKGROUND, with an aging
+    bound (STARVATION_SECONDS) so a lower lane is never parked forever under a
+    sustained higher-tier stream.
+  - Within a lane, callers (governor tags) are served round-robin, so one
+    chatty caller cannot monopolize its tier.
+  - Coalesced requests (uw_api._uw_request) share one token. The flight's
+    TokenRequest is raised to the highest tier among the callers waiting on
+    it, so a FOREGROUND caller that joins a BACKGROUND caller's flight moves
+    that pending token to the FOREGROUND lane instead of waiting behind it.
+
+Bucket parameters are unchanged (see the B1 note in uw_api): this only
+changes *who* gets the next token, not how many tokens there are.
+
+Telemetry via stats(): per tier queue depth, grants, immediate grants, waits,
+cancellations, max wait, and a cumulative wait-time histogram — surfaced on
+GET /api/uw/health under "rate_limiter".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from integrations.uw_governor import (
+    TIER_BACKGROUND,
+    TIER_FOREGROUND,
+    TIER_STANDARD,
+    quota_for,
+)
+
+logger = logging.getLogger("uw_api")
+
+TIER_ORDER = (TIER_FOREGROUND, TIER_STANDARD, TIER_BACKGROUND)
+
+# A waiter in a lower lane that has been queued this long is served ahead of
+# higher lanes. Keeps BACKGROUND moving (slowly) under a foreground stream.
+STARVATION_SECONDS = 30.0
+
+# Upper bounds (ms) of the wait-time histogram buckets; last bucket is +inf.
+WAIT_BUCKETS_MS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _TierStats:
+    __slots__ = ("granted", "immediate", "waited", "cancelled", "max_wait_ms", "histogram")
+
+    def __init__(self):
+        self.granted = 0
+        self.immediate = 0
+        self.waited = 0
+        self.cancelled = 0
+        self.max_wait_ms = 0.0
+        self.histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.waited += 1
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                self.histogram[i] += 1
+                return
+        self.histogram[-1] += 1
+
+
+def _rank(tier: str) -> int:
+    return TIER_ORDER.index(tier)
+
+
+def tier_for(caller: str) -> str:
+    _, tier = quota_for(caller)
+    return tier if tier in TIER_ORDER else TIER_STANDARD
+
+
+class TokenRequest:
+    """The token request behind one coalesced UW flight.
+
+    `tier` only ever rises. While the request is queued, `_queued` holds
+    (tier, caller, item) so raise_tier() can move it to a higher lane.
+    """
+
+    __slots__ = ("tier", "_queued")
+
+    def __init__(self, caller: str = "untagged"):
+        self.tier = tier_for(caller)
+        self._queued: Optional[Tuple[str, str, Tuple[float, asyncio.Future]]] = None
+
+
+class UWRateScheduler:
+    """Async token bucket that releases tokens by tier priority."""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        # tier -> OrderedDict[caller -> deque[(enqueued_at, future)]]
+        self._lanes: Dict[str, "OrderedDict[str, Deque[Tuple[float, asyncio.Future]]]"] = {
+            tier: OrderedDict() for tier in TIER_ORDER
+        }
+        self._stats: Dict[str, _TierStats] = {tier: _TierStats() for tier in TIER_ORDER}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ── bucket ───────────────────────────────────────────────────
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+
+    def tokens_available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def headroom(self) -> float:
+        """Available tokens as a 0..1 ratio of capacity."""
+        if self.capacity <= 0:
+            return 1.0
+        return max(0.0, min(1.0, self.tokens_available() / self.capacity))
+
+    # ── queue ────────────────────────────────────────────────────
+
+    def _bind_loop(self) -> None:
+        # Futures and the dispatcher belong to one loop. A new loop (tests,
+        # one-shot scripts calling asyncio.run) starts with empty lanes.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._dispatcher = None
+            for lane in self._lanes.values():
+                lane.clear()
+
+    def _queued(self) -> int:
+        return sum(len(q) for lane in self._lanes.values() for q in lane.values())
+
+    def queue_depth(self, tier: str) -> int:
+        return sum(len(q) for q in self._lanes[tier].values())
+
+    async def acquire(self, caller: str = "untagged", request: Optional[TokenRequest] = None) -> None:
+        """Wait for one token. Priority comes from the caller's governor tier,
+        or from `request` (which coalesced callers may raise while it waits)."""
+        tier = tier_for(caller)
+        if request is not None:
+            tier = request.tier = min(tier, request.tier, key=_rank)
+        self._bind_loop()
+
+        self._refill()
+        if self._tokens >= 1 and not self._queued():
+            self._tokens -= 1
+            stats = self._stats[tier]
+            stats.granted += 1
+            stats.immediate += 1
+            stats.record_wait(0.0)
+            return
+
+        enqueued = time.monotonic()
+        fut = self._loop.create_future()
+        item = (enqueued, fut)
+        self._lanes[tier].setdefault(caller, deque()).append(item)
+        if request is not None:
+            request._queued = (tier, caller, item)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = self._loop.create_task(self._dispatch())
+        try:
+            await fut
+        except asyncio.CancelledError:
+            self._stats[request.tier if request is not None else tier].cancelled += 1
+            raise
+        finally:
+            if request is not None:
+                request._queued = None
+        stats = self._stats[request.tier if request is not None else tier]
+        stats.granted += 1
+        stats.record_wait((time.monotonic() - enqueued) * 1000)
+
+    def raise_tier(self, request: TokenRequest, caller: str) -> None:
+        """A caller joined `request`'s flight: serve it at least at that caller's tier."""
+        tier = tier_for(caller)
+        if _rank(tier) >= _rank(request.tier):
+            return
+        request.tier = tier
+        if request._queued is None:
+            return
+        old_tier, owner, item = request._queued
+        if item[1].done():
+            return
+        queue = self._lanes[old_tier].get(owner)
+        if queue is None or item not in queue:
+            return
+        queue.remove(item)
+        # Keeps its original enqueue time, so its place in the new lane's
+        # aging order reflects how long it has already waited.
+        self._lanes[tier].setdefault(owner, deque()).append(item)
+        request._queued = (tier, owner, item)
+
+    def _next_waiter(self) -> Optional[Tuple[str, str]]:
+        """(tier, caller) to serve next, or None if every lane is empty."""
+        now = time.monotonic()
+        first: Optional[Tuple[str, str]] = None
+        for tier in TIER_ORDER:
+            lane = self._lanes[tier]
+            # Discard callers whose queues are empty or fully cancelled.
+            for caller in list(lane):
+                q = lane[caller]
+                while q and q[0][1].done():
+                    q.popleft()
+                if not q:
+                    del lane[caller]
+            if not lane:
+                continue
+            caller = next(iter(lane))
+            if first is None:
+                first = (tier, caller)
+            elif now - lane[caller][0][0] >= STARVATION_SECONDS:
+                return (tier, caller)
+        return first
+
+    async def _dispatch(self) -> None:
+        while True:
+            pick = self._next_waiter()
+            if pick is None:
+                return
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.refill_rate)
+                continue
+            tier, caller = pick
+            lane = self._lanes[tier]
+            _, fut = lane[caller].popleft()
+            # Round-robin: the served caller goes to the back of its lane.
+            lane.move_to_end(caller)
+            self._tokens -= 1
+            fut.set_result(None)
+
+    # ── telemetry ────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        labels: List[str] = [f"le_{b}ms" for b in WAIT_BUCKETS_MS] + ["gt_%dms" % WAIT_BUCKETS_MS[-1]]
+        tiers = {}
+        for tier in TIER_ORDER:
+            s = self._stats[tier]
+            tiers[tier] = {
+                "queue_depth": self.queue_depth(tier),
+                "granted": s.granted,
+                "immediate": s.immediate,
+                "waited": s.waited - s.immediate,
+                "cancelled": s.cancelled,
+                "max_wait_ms": round(s.max_wait_ms, 1),
+                "wait_histogram": dict(zip(labels, s.histogram)),
+            }
+        return {
+            "tokens_available": round(self.tokens_available(), 1),
+            "max_tokens": self.capacity,
+            "refill_per_sec": self.refill_rate,
+            "queued": self._queued(),
+            "tiers": tiers,
+        }
@@ -12,7 +12,7 @@ Design:
 - Direction-adjusted return stored as PERCENT (2.34 = +2.34%, negative = wrong-way).
   LONG:  fwd_return_pct = (horizon_close - entry) / entry * 100
   SHORT: fwd_return_pct = (entry - horizon_close) / entry * 100
-- Trading-day counting: Mon–Fri only (no holiday calendar in Phase 1; Phase 2 fix).
+- Trading-day counting: NYSE sessions from utils.trading_calendar (holidays skipped).
 - IS-NULL guard: signals.outcome_source only written when currently NULL.
 - Shadow mode: A3_SHADOW_MODE=true (default) → compute + log, do NOT write DB.
   Set A3_SHADOW_MODE=false to enable writes.
@@ -25,6 +25,8 @@ import os
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from utils.trading_calendar import nth_trading_day
+
 logger = logging.getLogger(__name__)
 
 A3_SHADOW_MODE = os.getenv("A3_SHADOW_MODE", "true").lower() != "false"
@@ -37,14 +39,8 @@ _SHORT_DIRS = {"SHORT", "SELL", "BEARISH"}
 
 
 def _nth_trading_day(anchor: date, n: int) -> date:
-    """Return the nth Mon–Fri day strictly after anchor."""
-    day = anchor
-    count = 0
-    while count < n:
-        day += timedelta(days=1)
-        if day.weekday() < 5:   # Mon=0 … Fri=4
-            count += 1
-    return day
+    """Return the nth NYSE session strictly after anchor."""
+    return nth_trading_day(anchor, n)
 
 
 def _build_close_index(bars: List[Dict[str, Any]]) -> Dict[date, float]:
@@ -170,7 +170,7 @@ async def _fetch_full_ohlc(base_symbol: str, use_daily: bool) -> List[Tuple[date
     # generalizes the local fix crypto_regime.py:115 applied for exactly one
     # consumer while five siblings stayed exposed (VP tool + scoring twin, the
     # CVD event engine, the crypto-state ATR). Per-consumer sorts (VP surfaces,
-    # regime, _walk_touch) remain as defense-in-depth.
+    # regime, _bar_arrays) remain as defense-in-depth.
     return sorted(bars, key=lambda b: b[0])
 
 
@@ -19,7 +19,12 @@ Fixes the silent-loss bug where intraday wicks were missed.
 
 Edge case — same bar touches both target and stop: conservative — assume stop first
 (we cannot know intra-bar ordering from OHLC alone). Shared by both the
-equity and crypto paths via _walk_touch().
+equity and crypto paths via _first_touches().
+
+Pending signals are grouped by (ticker, bar interval): each group's bars are
+fetched once, from its oldest signal onward, and every signal in the group is
+resolved against the same arrays in one vectorized first-touch search. All
+outcomes from a pass are written in a single UNNEST update.
 
 yfinance 15m history limit is ~60 days. Signals older than 55 days fall back to
 daily bars (lower precision, flagged in logs). The same 55-day threshold is
@@ -30,92 +35,105 @@ for S-1 -- the common case is signals resolved within hours/days of firing).
 
 import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Signals older than this walk daily bars (yfinance keeps ~60 days of 15m).
+INTRADAY_MAX_AGE_DAYS = 55
+# Concurrent bar downloads per pass.
+BAR_FETCH_CONCURRENCY = 4
 
-def _walk_touch(
-    bars: List[Tuple[datetime, float, float]],
-    direction: str,
-    entry: float,
-    target: float,
-    stop: float,
-    signal_ts: datetime,
-) -> Tuple[Optional[str], Optional[float], Optional[datetime]]:
-    """Shared touch-detection walk, asset-class-agnostic. `bars` is a list of
-    (bar_ts, high, low) tuples in any order (sorted here). Both the equity
-    (yfinance) and crypto paths normalize their vendor-specific bar shapes
-    into this common form before calling it, so the WIN/LOSS/same-bar-tie
-    logic lives in exactly one place.
-    """
-    for bar_ts, high, low in sorted(bars, key=lambda b: b[0]):
-        # Phase B guard: skip bars stamped before signal creation (the bar
-        # *containing* signal_ts is timestamped at its own start, before
-        # signal_ts) — without this, the resolver matches pre-signal price
-        # action and registers phantom WINs.
-        if bar_ts < signal_ts:
-            continue
+# (bar start in epoch microseconds UTC, high, low), sorted by time.
+BarArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
 
-        if direction == "LONG":
-            target_hit = high >= target
-            stop_hit = low <= stop
-            if target_hit and stop_hit:
-                # Both in same bar — conservative: stop first
-                return "LOSS", (stop - entry) / entry * 100.0, bar_ts
-            if target_hit:
-                return "WIN", (target - entry) / entry * 100.0, bar_ts
-            if stop_hit:
-                return "LOSS", (stop - entry) / entry * 100.0, bar_ts
-
-        elif direction == "SHORT":
-            target_hit = low <= target
-            stop_hit = high >= stop
-            if target_hit and stop_hit:
-                return "LOSS", (entry - stop) / entry * 100.0, bar_ts
-            if target_hit:
-                return "WIN", (entry - target) / entry * 100.0, bar_ts
-            if stop_hit:
-                return "LOSS", (entry - stop) / entry * 100.0, bar_ts
-
-    return None, None, None  # no touch yet
 
+def _epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
 
-def _walk_bars(
-    ticker: str,
-    direction: str,
-    entry: float,
-    target: float,
-    stop: float,
-    signal_ts: datetime,
-) -> Tuple[Optional[str], Optional[float], Optional[datetime]]:
+
+def _bar_arrays(bars: Sequence[Tuple[datetime, float, float]]) -> BarArrays:
+    """(ts, high, low) tuples in any order -> sorted arrays without NaN rows."""
+    rows = [(ts, hi, lo) for ts, hi, lo in bars if hi is not None and lo is not None]
+    ts = np.array([_epoch_us(r[0]) for r in rows], dtype=np.int64)
+    high = np.array([r[1] for r in rows], dtype=float)
+    low = np.array([r[2] for r in rows], dtype=float)
+    keep = ~(np.isnan(high) | np.isnan(low))
+    order = np.argsort(ts[keep], kind="stable")
+    return ts[keep][order], high[keep][order], low[keep][order]
+
+
+def _frame_arrays(bars: pd.DataFrame) -> BarArrays:
+    """yfinance frame -> sorted arrays; naive timestamps are taken as UTC."""
+    if isinstance(bars.columns, pd.MultiIndex):
+        bars.columns = bars.columns.get_level_values(0)
+    index = pd.DatetimeIndex(bars.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    ts = index.as_unit("us").asi8
+    high = pd.to_numeric(bars["High"], errors="coerce").to_numpy(dtype=float)
+    low = pd.to_numeric(bars["Low"], errors="coerce").to_numpy(dtype=float)
+    keep = ~(np.isnan(high) | np.isnan(low))
+    order = np.argsort(ts[keep], kind="stable")
+    return ts[keep][order], high[keep][order], low[keep][order]
+
+
+def _first_touches(
+    bars: BarArrays,
+    signal_ts: np.ndarray,
+    long: np.ndarray,
+    entry: np.ndarray,
+    target: np.ndarray,
+    stop: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Synchronous walk-forward (called via asyncio.to_thread). EQUITY path only.
-    Walks 15m bars from signal_ts looking for first touch of target or stop.
-    Returns (outcome, pnl_pct, resolved_at) or (None, None, None) if no touch yet.
+    Resolve a group of signals against one bar series.
+
+    Each signal only sees bars stamped at or after its own timestamp (Phase B
+    guard: the bar *containing* signal_ts starts before it and would match
+    pre-signal price action). Returns (outcome_code, pnl_pct, bar_index) per
+    signal: code 1 = WIN, -1 = LOSS, 0 = no touch yet. A bar touching both
+    levels is a LOSS (stop first).
     """
+    ts, high, low = bars
+    n = len(ts)
+    starts = np.searchsorted(ts, signal_ts, side="left")
+    live = np.arange(n)[None, :] >= starts[:, None]
+    is_long = long[:, None]
+    hi, lo = high[None, :], low[None, :]
+    target_hit = live & np.where(is_long, hi >= target[:, None], lo <= target[:, None])
+    stop_hit = live & np.where(is_long, lo <= stop[:, None], hi >= stop[:, None])
+
+    def _first(mask):
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), n)
+
+    target_idx, stop_idx = _first(target_hit), _first(stop_hit)
+    loss = (stop_idx < n) & (stop_idx <= target_idx)
+    win = ~loss & (target_idx < n)
+    code = np.where(loss, -1, np.where(win, 1, 0))
+    level = np.where(loss, stop, target)
+    sign = np.where(long, 1.0, -1.0)
+    pnl = sign * (level - entry) / entry * 100.0
+    return code, pnl, np.where(loss, stop_idx, target_idx)
+
+
+def _download_equity_bars(ticker: str, interval: str, start: datetime) -> Optional[BarArrays]:
+    """One yfinance download for a (ticker, interval) group (run in a thread)."""
     import yfinance as yf
 
-    signal_age_days = (datetime.now(timezone.utc) - signal_ts).days
-    interval = "15m" if signal_age_days <= 55 else "1d"
-
-    if interval == "1d":
-        logger.info(
-            "Signal for %s is %d days old — falling back to daily bars",
-            ticker, signal_age_days,
-        )
-
     try:
         # Phase B: do not subtract 15min — would deliberately reach pre-signal bars.
         # Note: yfinance still returns the bar-aligned bar that *contains* signal_ts
-        # (whose bar_ts is before signal_ts), so the loop below has an explicit
-        # bar_ts < signal_ts guard. See docs/codex-briefs/outcome-tracking-phase-b-resolver-fix-2026-05-08.md
+        # (whose bar_ts is before signal_ts); _first_touches skips it per signal.
+        # See docs/codex-briefs/outcome-tracking-phase-b-resolver-fix-2026-05-08.md
         bars = yf.download(
             ticker,
-            start=signal_ts,
+            start=start,
             interval=interval,
             progress=False,
             auto_adjust=False,
@@ -123,44 +141,17 @@ def _walk_bars(
         )
     except Exception as e:
         logger.warning("yfinance download failed for %s: %s", ticker, e)
-        return None, None, None
-
+        return None
     if bars is None or bars.empty:
-        return None, None, None
-
-    # Flatten if multi-index (yfinance wraps columns when ambiguous symbol)
-    if isinstance(bars.columns, pd.MultiIndex):
-        bars.columns = bars.columns.get_level_values(0)
+        return None
+    try:
+        return _frame_arrays(bars)
+    except (KeyError, ValueError, TypeError) as e:
+        logger.warning("Unusable %s bars for %s: %s", interval, ticker, e)
+        return None
 
-    bar_tuples: List[Tuple[datetime, float, float]] = []
-    for bar_ts, bar in bars.iterrows():
-        try:
-            high = float(bar["High"])
-            low = float(bar["Low"])
-        except (KeyError, ValueError, TypeError):
-            continue
 
-        try:
-            if hasattr(bar_ts, "tz_convert"):
-                bar_ts_utc = (
-                    bar_ts.tz_convert("UTC")
-                    if getattr(bar_ts, "tzinfo", None) is not None
-                    else bar_ts.tz_localize("UTC")
-                )
-            else:
-                bar_ts_utc = (
-                    bar_ts
-                    if getattr(bar_ts, "tzinfo", None) is not None
-                    else bar_ts.replace(tzinfo=timezone.utc)
-                )
-        except Exception:
-            bar_ts_utc = bar_ts
-        bar_tuples.append((bar_ts_utc, high, low))
-
-    return _walk_touch(bar_tuples, direction, entry, target, stop, signal_ts)
-
-
-async def _walk_bars_crypto(
+def _walk_bars(
     ticker: str,
     direction: str,
     entry: float,
@@ -168,36 +159,106 @@ async def _walk_bars_crypto(
     stop: float,
     signal_ts: datetime,
 ) -> Tuple[Optional[str], Optional[float], Optional[datetime]]:
-    """CRYPTO path. Normalizes `ticker` to a base symbol, fetches bars from
-    that symbol's matrix-designated bar_walk_source, and applies the same
-    _walk_touch() logic as the equity path. Returns (None, None, None) with
-    no error if the ticker can't be normalized or has no LIVE bar source —
-    the signal stays shadow-only/ungraded, per F-2 task 2.1.
     """
-    # Lazy import (matches this file's existing database.postgres_client
-    # pattern below): tests import this module as `backend.jobs.outcome_resolver`,
-    # where a top-level `from jobs.crypto_bars import ...` fails (no top-level
-    # `jobs` package from that vantage point) even though it resolves fine at
-    # runtime (uvicorn runs with cwd=backend/). Keeping this import local to
-    # the one function that needs it avoids breaking test collection for
-    # every other test in this module.
-    from jobs.crypto_bars import normalize_crypto_ticker, fetch_crypto_bars
-
-    base_symbol = normalize_crypto_ticker(ticker)
-    if base_symbol is None:
-        logger.debug("Cannot normalize crypto ticker '%s' to a tracked base symbol — shadow-only, skipping", ticker)
+    Resolve a single equity signal: (outcome, pnl_pct, resolved_at), or
+    (None, None, None) when no level has been touched yet. The batch path
+    (_resolve_group) does the same per (ticker, interval) group.
+    """
+    if signal_ts.tzinfo is None:
+        signal_ts = signal_ts.replace(tzinfo=timezone.utc)
+    age_days = (datetime.now(timezone.utc) - signal_ts).days
+    interval = "1d" if age_days > INTRADAY_MAX_AGE_DAYS else "15m"
+    bars = _download_equity_bars(ticker, interval, signal_ts)
+    if bars is None:
         return None, None, None
-
-    signal_age_days = (datetime.now(timezone.utc) - signal_ts).days
-    use_daily = signal_age_days > 55
-    if use_daily:
-        logger.info("Crypto signal for %s (%s) is %d days old — falling back to daily bars", ticker, base_symbol, signal_age_days)
-
-    bars = await fetch_crypto_bars(base_symbol, signal_ts, use_daily)
-    if not bars:
+    sig = {"direction": direction.upper(), "entry": entry, "target": target, "stop": stop, "ts": signal_ts}
+    resolved = _resolve_group(bars, [sig])
+    if not resolved:
         return None, None, None
+    _, outcome, pnl, resolved_at = resolved[0]
+    return outcome, pnl, resolved_at
 
-    return _walk_touch(bars, direction, entry, target, stop, signal_ts)
+
+async def _fetch_crypto_group(base_symbol: str, start: datetime, use_daily: bool) -> Optional[BarArrays]:
+    """CRYPTO path: bars from the symbol's matrix-designated bar_walk_source.
+    An empty result (no LIVE source) leaves the group shadow-only/ungraded,
+    per F-2 task 2.1 — it never falls back to yfinance.
+    """
+    # Lazy import: tests import this module as `backend.jobs.outcome_resolver`,
+    # where a top-level `from jobs.crypto_bars import ...` fails (no top-level
+    # `jobs` package from that vantage point) even though it resolves fine at
+    # runtime (uvicorn runs with cwd=backend/).
+    from jobs.crypto_bars import fetch_crypto_bars
+
+    bars = await fetch_crypto_bars(base_symbol, start, use_daily)
+    return _bar_arrays(bars) if bars else None
+
+
+def _group_key(sig: Dict[str, Any], now: datetime) -> Optional[Tuple[str, str, bool]]:
+    """(asset path, symbol, daily) for a pending signal, or None to skip it."""
+    age_days = (now - sig["ts"]).days
+    daily = age_days > INTRADAY_MAX_AGE_DAYS
+    if sig["asset_class"] == "CRYPTO":
+        # S-1 Phase 2 (F-2): CRYPTO uses per-symbol vendor bars (crypto_bars.py).
+        # A ticker that can't be normalized stays shadow-only/ungraded; it does
+        # not fall back to yfinance (which would silently mis-resolve on a
+        # non-equity ticker format, the exact bug Phase 0 found in Session_Sweep).
+        from jobs.crypto_bars import normalize_crypto_ticker
+
+        base = normalize_crypto_ticker(sig["ticker"])
+        if base is None:
+            logger.debug("Cannot normalize crypto ticker '%s' to a tracked base symbol — shadow-only, skipping",
+                         sig["ticker"])
+            return None
+        return "CRYPTO", base, daily
+    return "EQUITY", sig["ticker"], daily
+
+
+async def _fetch_group(key: Tuple[str, str, bool], start: datetime, gate: asyncio.Semaphore) -> Optional[BarArrays]:
+    path, symbol, daily = key
+    async with gate:
+        if path == "CRYPTO":
+            return await _fetch_crypto_group(symbol, start, daily)
+        return await asyncio.to_thread(_download_equity_bars, symbol, "1d" if daily else "15m", start)
+
+
+def _prepare(rows) -> List[Dict[str, Any]]:
+    prepared = []
+    for sig in rows:
+        direction = (sig["direction"] or "").upper()
+        entry = float(sig["entry_price"] or 0)
+        stop = float(sig["stop_loss"] or 0)
+        target = float(sig["target_1"] or 0)
+        signal_ts = sig["timestamp"]
+        if not (entry and stop and target and signal_ts):
+            continue
+        if direction not in ("LONG", "SHORT"):
+            continue
+        # Ensure signal_ts is timezone-aware for age calculation
+        if signal_ts.tzinfo is None:
+            signal_ts = signal_ts.replace(tzinfo=timezone.utc)
+        prepared.append({
+            "signal_id": sig["signal_id"], "ticker": sig["ticker"], "direction": direction,
+            "entry": entry, "stop": stop, "target": target, "ts": signal_ts,
+            "asset_class": (sig["asset_class"] or "EQUITY").upper(),
+        })
+    return prepared
+
+
+def _resolve_group(bars: BarArrays, group: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str, float, datetime]]:
+    code, pnl, idx = _first_touches(
+        bars,
+        np.array([_epoch_us(s["ts"]) for s in group], dtype=np.int64),
+        np.array([s["direction"] == "LONG" for s in group]),
+        np.array([s["entry"] for s in group]),
+        np.array([s["target"] for s in group]),
+        np.array([s["stop"] for s in group]),
+    )
+    resolved = []
+    for k in np.flatnonzero(code):
+        bar_ts = datetime.fromtimestamp(bars[0][idx[k]] / 1_000_000, tz=timezone.utc)
+        resolved.append((group[k], "WIN" if code[k] > 0 else "LOSS", float(pnl[k]), bar_ts))
+    return resolved
 
 
 async def resolve_signal_outcomes(backfill_days: int = 60, asset_class_filter: Optional[str] = None) -> None:
@@ -209,8 +270,8 @@ async def resolve_signal_outcomes(backfill_days: int = 60, asset_class_filter: O
     on user_action='SELECTED' — we measure every signal the system fires so that
     score bands have real win-rate data for URSA gates.
 
-    The resolver is idempotent: if bars don't yet show a target or stop touch,
-    it returns (None, None, None) and the signal stays unresolved until next run.
+    The resolver is idempotent: a signal whose bars don't yet show a target or
+    stop touch stays unresolved until the next run.
 
     `asset_class_filter` (S-1 Phase 2, F-2): restricts the sweep to a single
     asset_class value (e.g. 'EQUITY' or 'CRYPTO'). Lets main.py run two
@@ -262,56 +323,55 @@ async def resolve_signal_outcomes(backfill_days: int = 60, asset_class_filter: O
         logger.info("Outcome resolver: no unresolved signals found")
         return
 
-    logger.info("Outcome resolver: checking %d signals for WIN/LOSS", len(pending))
-
-    for sig in pending:
-        ticker = sig["ticker"]
-        direction = (sig["direction"] or "").upper()
-        entry = float(sig["entry_price"] or 0)
-        stop = float(sig["stop_loss"] or 0)
-        target = float(sig["target_1"] or 0)
-        signal_ts = sig["timestamp"]
-        asset_class = (sig["asset_class"] or "EQUITY").upper()
-
-        if not (entry and stop and target and signal_ts):
+    now = datetime.now(timezone.utc)
+    groups: Dict[Tuple[str, str, bool], List[Dict[str, Any]]] = {}
+    for sig in _prepare(pending):
+        key = _group_key(sig, now)
+        if key is not None:
+            groups.setdefault(key, []).append(sig)
+
+    logger.info("Outcome resolver: checking %d signals for WIN/LOSS across %d bar series",
+                len(pending), len(groups))
+    daily_groups = [k for k in groups if k[2]]
+    if daily_groups:
+        logger.info("Outcome resolver: %d series older than %d days — falling back to daily bars",
+                    len(daily_groups), INTRADAY_MAX_AGE_DAYS)
+
+    gate = asyncio.Semaphore(BAR_FETCH_CONCURRENCY)
+    keys = list(groups)
+    fetched = await asyncio.gather(
+        *(_fetch_group(k, min(s["ts"] for s in groups[k]), gate) for k in keys),
+        return_exceptions=True,
+    )
+
+    resolved: List[Tuple[Dict[str, Any], str, float, datetime]] = []
+    for key, bars in zip(keys, fetched):
+        if isinstance(bars, Exception):
+            logger.warning("Outcome resolver: bars for %s failed: %s", key[1], bars)
             continue
-        if direction not in ("LONG", "SHORT"):
+        if bars is None or not len(bars[0]):
             continue
+        resolved.extend(_resolve_group(bars, groups[key]))
 
-        # Ensure signal_ts is timezone-aware for age calculation
-        if signal_ts.tzinfo is None:
-            signal_ts = signal_ts.replace(tzinfo=timezone.utc)
+    if not resolved:
+        return
 
-        # S-1 Phase 2 (F-2): asset-class-aware dispatch. CRYPTO uses per-symbol
-        # vendor bars (crypto_bars.py); everything else keeps the unchanged
-        # yfinance equity path. A crypto ticker that can't be normalized or
-        # has no LIVE bar_walk_source returns (None, None, None) -- the
-        # signal stays shadow-only/ungraded, it does not error or fall back
-        # to yfinance (which would silently mis-resolve on a non-equity
-        # ticker format, the exact bug Phase 0 found in Session_Sweep).
-        if asset_class == "CRYPTO":
-            outcome, pnl_pct, resolved_at = await _walk_bars_crypto(
-                ticker, direction, entry, target, stop, signal_ts
-            )
-        else:
-            outcome, pnl_pct, resolved_at = await asyncio.to_thread(
-                _walk_bars, ticker, direction, entry, target, stop, signal_ts
-            )
-
-        if outcome:
-            async with pool.acquire() as conn:
-                await conn.execute("""
-                    UPDATE signals
-                    SET outcome = $1,
-                        outcome_pnl_pct = $2,
-                        outcome_resolved_at = NOW(),
-                        outcome_source = 'BAR_WALK'
-                    WHERE signal_id = $3
-                """, outcome, pnl_pct, sig["signal_id"])
-            logger.info(
-                "Resolved %s %s %s: %s (%.2f%%) — matched bar at %s",
-                ticker, direction, sig["signal_id"], outcome, pnl_pct or 0, resolved_at,
-            )
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            UPDATE signals AS s
+            SET outcome = u.outcome,
+                outcome_pnl_pct = u.pnl_pct,
+                outcome_resolved_at = NOW(),
+                outcome_source = 'BAR_WALK'
+            FROM UNNEST($1::varchar[], $2::varchar[], $3::float8[]) AS u(signal_id, outcome, pnl_pct)
+            WHERE s.signal_id = u.signal_id
+        """, [r[0]["signal_id"] for r in resolved], [r[1] for r in resolved], [r[2] for r in resolved])
+
+    for sig, outcome, pnl_pct, bar_ts in resolved:
+        logger.info(
+            "Resolved %s %s %s: %s (%.2f%%) — matched bar at %s",
+            sig["ticker"], sig["direction"], sig["signal_id"], outcome, pnl_pct, bar_ts,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,377 @@
+"""
+Background job runner with Redis-lease leader election.
+
+The long-lived loops in jobs/loops.py used to be started with
+asyncio.create_task inside main.lifespan, so every web process (and every
+replica) ran all of them. The runner hosts them instead, either in the
+dedicated worker process (worker.py) or in-process when RUN_BACKGROUND_JOBS is
+left on for single-service deploys.
+
+Leader election: one lease key per job group in Redis (SET NX PX, renewed by a
+compare-and-pexpire script). Only the instance holding the lease runs the
+jobs; the others stay on standby and retry every renew interval, so a crashed
+leader is replaced within LEASE_TTL_SECONDS. One lease for the whole group
+keeps Redis traffic at one command per renew tick regardless of job count.
+If Redis cannot be reached on the first attempt the runner runs the jobs
+locally (role "local" in its stats) but keeps trying the lease: once Redis is
+back it either takes the lease or, if another instance already holds it, steps
+down. A Redis blip while leading keeps the current leader, since nobody else
+can acquire either.
+
+Jobs broadcast through websocket.broadcaster.manager in whichever process
+holds the lease; the manager's Redis relay carries those messages to the
+WebSocket clients of every API process.
+
+Metrics: loops call job_sleep() instead of asyncio.sleep(), which closes one
+iteration and opens the next. Per job the runner records iteration duration,
+overruns (an iteration took longer than the job's nominal cadence, so the
+next run was already due — the overlap the old create_task loops hid) and
+wake lag (how late the event loop woke the job, i.e. scheduling backlog).
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY = "jobs:leader"
+STATS_KEY = "jobs:stats"
+LEASE_TTL_SECONDS = 30
+LEASE_RENEW_SECONDS = 10
+STATS_PUBLISH_SECONDS = 30
+RESTART_BACKOFF_SECONDS = 30
+# Wakes later than this count as backlogged.
+LATE_WAKE_SECONDS = 1.0
+
+# Extend the lease only if we still hold it.
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class Job:
+    __slots__ = ("name", "fn", "cadence_seconds")
+
+    def __init__(self, name: str, fn: Callable[[], Awaitable[Any]], cadence_seconds: Optional[float] = None):
+        self.name = name
+        self.fn = fn
+        # Nominal time between runs; None for one-shot or clock-aligned jobs
+        # where an overrun is not meaningful.
+        self.cadence_seconds = cadence_seconds
+
+
+class JobStats:
+    def __init__(self, job: Job):
+        self.job = job
+        self.state = "idle"
+        self.runs = 0
+        self.total_seconds = 0.0
+        self.last_seconds: Optional[float] = None
+        self.max_seconds = 0.0
+        self.overruns = 0
+        self.wakes = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.late_wakes = 0
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.last_run_at: Optional[str] = None
+        self._iteration_started: Optional[float] = None
+
+    def begin(self) -> None:
+        self._iteration_started = time.monotonic()
+
+    def end_iteration(self) -> None:
+        if self._iteration_started is None:
+            return
+        elapsed = time.monotonic() - self._iteration_started
+        self._iteration_started = None
+        self.runs += 1
+        self.total_seconds += elapsed
+        self.last_seconds = elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        self.last_run_at = datetime.now(timezone.utc).isoformat()
+        cadence = self.job.cadence_seconds
+        if cadence and elapsed > cadence:
+            self.overruns += 1
+
+    def woke(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        self.wakes += 1
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+        if lag > LATE_WAKE_SECONDS:
+            self.late_wakes += 1
+        self.begin()
+
+    def to_dict(self) -> Dict[str, Any]:
+        def _ms(seconds):
+            return round(seconds * 1000, 1) if seconds is not None else None
+
+        return {
+            "state": self.state,
+            "cadence_seconds": self.job.cadence_seconds,
+            "runs": self.runs,
+            "last_duration_ms": _ms(self.last_seconds),
+            "avg_duration_ms": _ms(self.total_seconds / self.runs) if self.runs else None,
+            "max_duration_ms": _ms(self.max_seconds) if self.runs else None,
+            "overruns": self.overruns,
+            "wake_lag_ms_avg": _ms(self.lag_total / self.wakes) if self.wakes else None,
+            "wake_lag_ms_max": _ms(self.lag_max) if self.wakes else None,
+            "late_wakes": self.late_wakes,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+            "last_run_at": self.last_run_at,
+        }
+
+
+_current: contextvars.ContextVar[Optional[JobStats]] = contextvars.ContextVar("job_stats", default=None)
+
+
+async def job_sleep(seconds: float) -> None:
+    """asyncio.sleep that closes the current job iteration and times the wake."""
+    stats = _current.get()
+    if stats is None:
+        await asyncio.sleep(seconds)
+        return
+    stats.end_iteration()
+    due = time.monotonic() + max(0.0, seconds)
+    await asyncio.sleep(seconds)
+    stats.woke(time.monotonic() - due)
+
+
+async def startup_delay(seconds: float) -> None:
+    """Initial settle delay; not counted as an iteration or as wake lag."""
+    await asyncio.sleep(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.begin()
+
+
+def _instance_id() -> str:
+    host = os.getenv("RAILWAY_REPLICA_ID") or socket.gethostname()
+    return f"{host}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobRunner:
+    def __init__(
+        self,
+        jobs: List[Job],
+        redis=None,
+        lease_key: str = LEASE_KEY,
+        instance_id: Optional[str] = None,
+        lease_ttl: float = LEASE_TTL_SECONDS,
+        renew_interval: float = LEASE_RENEW_SECONDS,
+    ):
+        self.jobs = list(jobs)
+        self.redis = redis
+        self.lease_key = lease_key
+        self.instance_id = instance_id or _instance_id()
+        self.lease_ttl = lease_ttl
+        self.renew_interval = renew_interval
+        self.role = "starting"
+        self.elections = 0
+        self.leases_lost = 0
+        self.leader_since: Optional[str] = None
+        self._stats: Dict[str, JobStats] = {job.name: JobStats(job) for job in self.jobs}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._last_publish: Optional[float] = None
+
+    # ── lease ────────────────────────────────────────────────────────
+
+    async def _try_acquire(self) -> bool:
+        ok = await self.redis.set(self.lease_key, self.instance_id, nx=True, px=int(self.lease_ttl * 1000))
+        return bool(ok)
+
+    async def _renew(self) -> bool:
+        renewed = await self.redis.eval(
+            _RENEW_SCRIPT, 1, self.lease_key, self.instance_id, int(self.lease_ttl * 1000)
+        )
+        if renewed:
+            return True
+        # The key expired (e.g. Redis restarted); take it back if it is free.
+        return await self._try_acquire()
+
+    async def _release(self) -> None:
+        try:
+            await self.redis.eval(_RELEASE_SCRIPT, 1, self.lease_key, self.instance_id)
+        except Exception as e:
+            logger.warning("Job lease release failed: %s", e)
+
+    # ── jobs ─────────────────────────────────────────────────────────
+
+    async def _supervise(self, job: Job) -> None:
+        stats = self._stats[job.name]
+        _current.set(stats)
+        while True:
+            stats.state = "running"
+            stats.begin()
+            try:
+                await job.fn()
+                stats.end_iteration()
+                stats.state = "finished"
+                return
+            except asyncio.CancelledError:
+                stats.state = "stopped"
+                raise
+            except Exception as e:
+                stats.state = "crashed"
+                stats.last_error = f"{type(e).__name__}: {e}"
+                stats.restarts += 1
+                logger.exception("Background job %s crashed; restarting in %ss", job.name, RESTART_BACKOFF_SECONDS)
+                await asyncio.sleep(RESTART_BACKOFF_SECONDS)
+
+    def _start_jobs(self) -> None:
+        for job in self.jobs:
+            task = self._tasks.get(job.name)
+            if task is None or task.done():
+                self._tasks[job.name] = asyncio.create_task(self._supervise(job), name=f"job:{job.name}")
+        logger.info("Background jobs started (%d) on %s", len(self._tasks), self.instance_id)
+
+    async def _stop_jobs(self) -> None:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for stats in self._stats.values():
+            if stats.state != "finished":
+                stats.state = "stopped"
+        self._tasks.clear()
+
+    def _become_leader(self, role: str = "leader") -> None:
+        self.role = role
+        self.elections += 1
+        self.leader_since = datetime.now(timezone.utc).isoformat()
+        self._start_jobs()
+
+    async def _step_down(self) -> None:
+        logger.warning("Job lease %s lost by %s; stopping background jobs", self.lease_key, self.instance_id)
+        self.leases_lost += 1
+        self.role = "standby"
+        self.leader_since = None
+        await self._stop_jobs()
+
+    # ── main loop ────────────────────────────────────────────────────
+
+    async def run(self) -> None:
+        self.role = "standby"
+        reached_redis = False
+        try:
+            while True:
+                try:
+                    if self.redis is None:
+                        raise ConnectionError("no Redis client")
+                    if self.role == "leader":
+                        if not await self._renew():
+                            await self._step_down()
+                    elif await self._try_acquire():
+                        logger.info("Job lease %s acquired by %s", self.lease_key, self.instance_id)
+                        if self.role == "local":
+                            # Jobs are already running; they just gained a lease.
+                            self.role = "leader"
+                        else:
+                            self._become_leader()
+                    elif self.role == "local":
+                        # Another instance took the lease while we could not see Redis.
+                        await self._step_down()
+                    reached_redis = True
+                    if self.role == "leader":
+                        await self._publish()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if self.role == "local":
+                        logger.debug("Job runner: Redis still unavailable: %s", e)
+                    elif not reached_redis:
+                        # Never reached Redis since boot: better to run the jobs
+                        # unelected than not at all. The lease is still retried
+                        # every tick, so this steps down once a leader exists.
+                        logger.warning("Job runner: Redis unavailable (%s), running %d jobs locally without a lease",
+                                       e, len(self.jobs))
+                        self._become_leader("local")
+                    else:
+                        # Nobody can acquire while Redis is down, so keep the current role.
+                        logger.warning("Job lease check failed (%s): %s", self.role, e)
+                await asyncio.sleep(self.renew_interval)
+        finally:
+            await self._stop_jobs()
+            if self.role == "leader":
+                await self._release()
+            self.role = "stopped"
+
+    async def _publish(self) -> None:
+        now = time.monotonic()
+        if self._last_publish is not None and now - self._last_publish < STATS_PUBLISH_SECONDS:
+            return
+        self._last_publish = now
+        await self.redis.set(STATS_KEY, json.dumps(self.stats(), default=str), ex=int(STATS_PUBLISH_SECONDS * 3))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "instance_id": self.instance_id,
+            "role": self.role,
+            "lease_key": self.lease_key,
+            "leader_since": self.leader_since,
+            "elections": self.elections,
+            "leases_lost": self.leases_lost,
+            "jobs": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+
+_runner: Optional[JobRunner] = None
+
+
+def run_background_jobs_in_process() -> bool:
+    """False on a web service when the dedicated worker hosts the jobs."""
+    return (os.getenv("RUN_BACKGROUND_JOBS") or "true").lower() not in ("0", "false", "no", "off")
+
+
+async def start_job_runner() -> asyncio.Task:
+    """Build the runner over the registered jobs and start it as a task."""
+    global _runner
+    from database.redis_client import get_redis_client
+    from jobs.loops import background_jobs
+
+    try:
+        redis = await get_redis_client()
+    except Exception as e:
+        logger.warning("Job runner could not create a Redis client: %s", e)
+        redis = None
+    _runner = JobRunner(background_jobs(), redis=redis)
+    return asyncio.create_task(_runner.run(), name="job-runner")
+
+
+async def get_job_stats() -> Dict[str, Any]:
+    """Local runner stats, or the leader's last published snapshot."""
+    if _runner is not None and _runner.role in ("leader", "local"):
+        return _runner.stats()
+    local = _runner.stats() if _runner is not None else None
+    published = None
+    try:
+        from database.redis_client import get_redis_client
+        redis = await get_redis_client()
+        if redis is not None:
+            raw = await redis.get(STATS_KEY)
+            published = json.loads(raw) if raw else None
+    except Exception as e:
+        logger.debug("Job stats read failed: %s", e)
+    return {"local": local, "leader": published}
@@ -7,12 +7,14 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections import defaultdict
-from datetime import datetime, timedelta, date, timezone
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from typing import Any
 
 import yfinance as yf
 
+from utils.trading_calendar import get_calendar as get_trading_calendar
+
 logger = logging.getLogger(__name__)
 
 MAX_SIGNAL_AGE_DAYS = 10
@@ -25,70 +27,8 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-def _observed_date(day: date) -> date:
-    if day.weekday() == 5:
-        return day - timedelta(days=1)
-    if day.weekday() == 6:
-        return day + timedelta(days=1)
-    return day
-
-
-def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
-    current = date(year, month, 1)
-    while current.weekday() != weekday:
-        current += timedelta(days=1)
-    return current + timedelta(weeks=n - 1)
-
-
-def _last_weekday(year: int, month: int, weekday: int) -> date:
-    if month == 12:
-        current = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        current = date(year, month + 1, 1) - timedelta(days=1)
-    while current.weekday() != weekday:
-        current -= timedelta(days=1)
-    return current
-
-
-def _easter_date(year: int) -> date:
-    a = year % 19
-    b = year // 100
-    c = year % 100
-    d = b // 4
-    e = b % 4
-    f = (b + 8) // 25
-    g = (b - f + 1) // 3
-    h = (19 * a + b - d - g + 15) % 30
-    i = c // 4
-    k = c % 4
-    l = (32 + 2 * e + 2 * i - h - k) % 7
-    m = (a + 11 * h + 22 * l) // 451
-    month = (h + l - 7 * m + 114) // 31
-    day = ((h + l - 7 * m + 114) % 31) + 1
-    return date(year, month, day)
-
-
-def _nyse_holidays(year: int) -> set[date]:
-    holidays: set[date] = set()
-    holidays.add(_observed_date(date(year, 1, 1)))
-    holidays.add(_nth_weekday(year, 1, 0, 3))
-    holidays.add(_nth_weekday(year, 2, 0, 3))
-    holidays.add(_easter_date(year) - timedelta(days=2))
-    holidays.add(_last_weekday(year, 5, 0))
-    holidays.add(_observed_date(date(year, 6, 19)))
-    holidays.add(_observed_date(date(year, 7, 4)))
-    holidays.add(_nth_weekday(year, 9, 0, 1))
-    holidays.add(_nth_weekday(year, 11, 3, 4))
-    holidays.add(_observed_date(date(year, 12, 25)))
-    return holidays
-
-
 def is_trading_day() -> bool:
-    today = datetime.now(ET).date()
-    if today.weekday() >= 5:
-        return False
-    holiday_dates = _nyse_holidays(today.year - 1) | _nyse_holidays(today.year) | _nyse_holidays(today.year + 1)
-    return today not in holiday_dates
+    return get_trading_calendar().is_trading_day(datetime.now(ET).date())
 
 
 async def _fetch_history(symbol: str, start: str):
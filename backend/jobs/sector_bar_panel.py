@@ -0,0 +1,364 @@
+"""
+Sector bar panel — WK%, MO% and RSI(14) for the whole sector constituent
+universe from locally persisted daily bars plus one batched live-price pull.
+
+The constituent refresh used to call UW `get_ohlc` and
+`get_technical_indicator` for every ticker on every tick, which is why the
+universe had to be cut to the top 3 names per sector (Phase A.3). All three
+fields only need daily closes plus the current last price, so:
+
+  - Daily bars live in `sector_daily_bars` (one row per ticker per regular
+    session) and in memory. A ticker is fetched from UW `get_ohlc` at most
+    once per completed session: the close snapshot fetches the session that
+    just ended, and a tick catches up any ticker that is still behind
+    (restart, newly seeded constituent).
+  - Each tick pulls the last price for the whole universe in one yfinance
+    batch (zero UW calls) and drops it into the current-session column.
+  - Every field for every ticker comes out of one NumPy pass over the
+    (tickers x sessions) matrix. RSI uses indicators.kernels (Wilder, seeded
+    with the SMA of the first 14 changes) over PANEL_SESSIONS sessions.
+
+Columns are NYSE sessions from utils.trading_calendar, so WK% is "vs the
+close 5 sessions ago" regardless of holidays; a session a ticker has no bar
+for carries the previous close forward.
+
+A ticker without a current-session value (no live price yet, bar not
+fetched) is left out of the result, so its last-good cache envelope and its
+aging timestamp stay in place instead of being restamped as fresh.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from indicators import kernels
+from utils.trading_calendar import ET, get_calendar
+
+logger = logging.getLogger("sector_refresh")
+
+WK_OFFSET = 5     # 5 regular sessions ago → week-to-date change
+MO_OFFSET = 21    # 21 regular sessions ago → month-to-date change
+RSI_LENGTH = 14
+
+# Matrix width. RSI(14) is recursive, so it gets ~6x its length of history
+# to settle; WK/MO only need MO_OFFSET + 1.
+PANEL_SESSIONS = 90
+# Calendar days requested from UW on a fetch — covers PANEL_SESSIONS plus
+# holidays. Rows older than this are pruned at the close snapshot.
+BAR_LOOKBACK_DAYS = 150
+
+# A session's bar is taken as final this long after the close; 16:05 ET is
+# when the close snapshot runs.
+BAR_SETTLE_SECONDS = 300
+
+# Same pacing and headroom rules the per-ticker refresh used (B3): catch-up
+# fetches self-pace at ~2 req/s and stop while the shared UW bucket is low.
+INTER_REQUEST_SLEEP = 0.5
+HEADROOM_GUARD_RATIO = 0.20
+
+FIELDS = ("wk_change_pct", "mo_change_pct", "rsi_14")
+
+SECTOR_DAILY_BARS_DDL = """
+    CREATE TABLE IF NOT EXISTS sector_daily_bars (
+        ticker      VARCHAR(10) NOT NULL,
+        session     DATE NOT NULL,
+        close       DOUBLE PRECISION NOT NULL,
+        updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (ticker, session)
+    )
+"""
+
+
+# ── pure math ────────────────────────────────────────────────────────────────
+
+def _ffill(matrix: np.ndarray) -> np.ndarray:
+    """Carry the last close forward across NaN gaps; leading NaN stay NaN."""
+    cols = np.arange(matrix.shape[1])
+    last = np.where(np.isnan(matrix), 0, cols)
+    np.maximum.accumulate(last, axis=1, out=last)
+    return matrix[np.arange(matrix.shape[0])[:, None], last]
+
+
+def _pct_back(closes: np.ndarray, offset: int) -> np.ndarray:
+    if closes.shape[1] < offset + 1:
+        return np.full(closes.shape[0], np.nan)
+    old = closes[:, -(offset + 1)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(old > 0, np.round((closes[:, -1] / old - 1) * 100, 2), np.nan)
+
+
+def compute_fields(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """Every sector_cache field for a (tickers x sessions) close matrix whose
+    last column is the current session. NaN where history is too short."""
+    closes = _ffill(np.asarray(closes, dtype=float))
+    rsi = kernels.rsi(closes, RSI_LENGTH)[:, -1] if closes.shape[1] else np.full(closes.shape[0], np.nan)
+    return {
+        "wk_change_pct": _pct_back(closes, WK_OFFSET),
+        "mo_change_pct": _pct_back(closes, MO_OFFSET),
+        "rsi_14": np.round(rsi, 2),
+    }
+
+
+def regular_session_closes(bars: Iterable[dict]) -> Dict[date, float]:
+    """{session date (ET): close} from UW `/ohlc/1d` bars, regular session only."""
+    out: Dict[date, float] = {}
+    for b in bars or []:
+        if b.get("market_time") != "r":
+            continue
+        try:
+            close = float(b["close"])
+            started = datetime.fromisoformat(str(b["start_time"]).replace("Z", "+00:00"))
+        except (KeyError, TypeError, ValueError):
+            continue
+        day = started.astimezone(ET).date() if started.tzinfo else started.date()
+        out[day] = close
+    return out
+
+
+# ── live prices ──────────────────────────────────────────────────────────────
+
+def _download_last_prices(tickers: List[str]) -> Dict[str, Tuple[date, float]]:
+    """One blocking yfinance batch: {ticker: (bar date, last price)}."""
+    import pandas as pd
+    import yfinance as yf
+
+    data = yf.download(tickers, period="5d", interval="1d",
+                       group_by="ticker", auto_adjust=False,
+                       progress=False, threads=True, actions=False)
+    out: Dict[str, Tuple[date, float]] = {}
+    if data is None or data.empty:
+        return out
+    single = len(tickers) == 1
+    for ticker in tickers:
+        try:
+            if single or not isinstance(data.columns, pd.MultiIndex):
+                sub = data
+            elif ticker in data.columns.get_level_values(0):
+                sub = data[ticker]
+            else:
+                continue
+            close = sub["Close"].dropna()
+            if not close.empty:
+                out[ticker] = (close.index[-1].date(), float(close.iloc[-1]))
+        except Exception:
+            continue
+    return out
+
+
+async def fetch_live_prices(tickers: List[str]) -> Dict[str, Tuple[date, float]]:
+    """Batched last prices for the universe (zero UW calls). {} on failure."""
+    if not tickers:
+        return {}
+    try:
+        return await asyncio.to_thread(_download_last_prices, list(tickers))
+    except Exception as e:
+        logger.warning("[sector_refresh] live price batch failed (%d tickers): %s", len(tickers), e)
+        return {}
+
+
+# ── the panel ────────────────────────────────────────────────────────────────
+
+def _check_headroom() -> float:
+    """Current UW token-bucket headroom ratio (0..1)."""
+    try:
+        from integrations.uw_api import get_rate_headroom
+        return get_rate_headroom()
+    except Exception:
+        return 1.0
+
+
+class SectorBarPanel:
+    """Daily closes per ticker, persisted to Postgres, evaluated as one matrix.
+
+    `clock` (returns an aware datetime) is for tests; default is now in ET.
+    """
+
+    def __init__(self, calendar=None, clock=None):
+        self._calendar = calendar
+        self._clock = clock or (lambda: datetime.now(ET))
+        self._bars: Dict[str, Dict[date, float]] = {}
+        # ticker -> the completed session it was last fetched for
+        self._synced: Dict[str, date] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._matrix_key = None
+        self._matrix: Optional[np.ndarray] = None
+        self._version = 0
+
+    @property
+    def calendar(self):
+        return self._calendar or get_calendar()
+
+    def current_session(self, now: Optional[datetime] = None) -> date:
+        """The session the fields end on: today when it is a session, else the last one."""
+        today = (now or self._clock()).astimezone(ET).date()
+        cal = self.calendar
+        return today if cal.is_trading_day(today) else cal.previous_trading_day(today)
+
+    def last_completed_session(self, now: Optional[datetime] = None) -> date:
+        """Most recent session whose daily bar is final (BAR_SETTLE_SECONDS after its close)."""
+        now = (now or self._clock()).astimezone(ET)
+        session = self.current_session(now)
+        close = self.calendar.session_bounds(session)[1]
+        if now >= close + timedelta(seconds=BAR_SETTLE_SECONDS):
+            return session
+        return self.calendar.previous_trading_day(session)
+
+    def stale(self, tickers: Iterable[str], through: date) -> List[str]:
+        """Tickers whose bars stop before `through` and that were not fetched for it yet."""
+        out = []
+        for ticker in tickers:
+            bars = self._bars.get(ticker)
+            if bars and max(bars) >= through:
+                continue
+            if self._synced.get(ticker) == through:
+                continue
+            out.append(ticker)
+        return out
+
+    def ingest(self, ticker: str, closes: Dict[date, float], through: date) -> List[Tuple[date, float]]:
+        """Merge completed-session closes for `ticker`; returns the rows kept."""
+        rows = sorted((d, c) for d, c in closes.items() if d <= through and c > 0)
+        if rows:
+            self._bars.setdefault(ticker, {}).update(rows)
+            self._version += 1
+        return rows
+
+    async def load(self, pool) -> int:
+        """Read the persisted panel once per process. Returns rows loaded."""
+        if self._loaded or not pool:
+            return 0
+        cutoff = self._clock().date() - timedelta(days=BAR_LOOKBACK_DAYS)
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT ticker, session, close FROM sector_daily_bars WHERE session >= $1",
+                cutoff,
+            )
+        for r in rows:
+            self._bars.setdefault(r["ticker"], {})[r["session"]] = float(r["close"])
+        self._version += 1
+        self._loaded = True
+        return len(rows)
+
+    async def sync(self, tickers: List[str], pool=None) -> dict:
+        """Fetch daily bars from UW for tickers that are behind the last completed
+        session, persist them, and fold them into the panel.
+
+        A ticker counts as fetched for the session only once UW returns bars;
+        quota blocks, errors and empty responses are retried on the next call.
+        """
+        from integrations.uw_api import get_ohlc
+        from integrations.uw_governor import is_unavailable
+
+        status = {"fetched": 0, "succeeded": 0, "quota_blocked": 0, "deferred": 0, "failures": 0}
+        async with self._lock:
+            try:
+                await self.load(pool)
+            except Exception as e:
+                logger.warning("[sector_refresh] bar panel load failed: %s", e)
+
+            through = self.last_completed_session()
+            pending = self.stale(tickers, through)
+            rows: List[Tuple[str, date, float]] = []
+            for i, ticker in enumerate(pending):
+                if _check_headroom() < HEADROOM_GUARD_RATIO:
+                    status["deferred"] = len(pending) - i
+                    break
+                status["fetched"] += 1
+                try:
+                    bars = await get_ohlc(ticker, "1d", lookback_days=BAR_LOOKBACK_DAYS, caller="ohlc_sector")
+                    if is_unavailable(bars):
+                        # B3: BACKGROUND quota exhausted — retry next tick.
+                        status["quota_blocked"] += 1
+                        continue
+                    if bars is not None:
+                        status["succeeded"] += 1
+                        kept = self.ingest(ticker, regular_session_closes(bars), through)
+                        rows.extend((ticker, d, c) for d, c in kept)
+                        self._synced[ticker] = through
+                except Exception as e:
+                    status["failures"] += 1
+                    logger.debug("[sector_refresh] bar fetch failed for %s: %s", ticker, e)
+                await asyncio.sleep(INTER_REQUEST_SLEEP)
+
+            if rows and pool:
+                try:
+                    await _write_bars(pool, rows)
+                except Exception as e:
+                    logger.warning("[sector_refresh] persisting %d daily bars failed: %s", len(rows), e)
+        return status
+
+    def _history(self, tickers: List[str], session: date) -> np.ndarray:
+        """(tickers x PANEL_SESSIONS) stored closes ending at `session`; cached until bars change."""
+        key = (tuple(tickers), session, self._version)
+        if key == self._matrix_key:
+            return self._matrix
+        end = self.calendar.session_index(session)
+        sessions = self.calendar.sessions[max(0, end - PANEL_SESSIONS + 1):end + 1]
+        matrix = np.full((len(tickers), len(sessions)), np.nan)
+        for i, ticker in enumerate(tickers):
+            bars = self._bars.get(ticker)
+            if bars:
+                matrix[i] = [bars.get(d, np.nan) for d in sessions]
+        self._matrix_key, self._matrix = key, matrix
+        return matrix
+
+    def compute(
+        self,
+        tickers: List[str],
+        live: Optional[Dict[str, Tuple[date, float]]] = None,
+        *,
+        session: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Optional[float]]]:
+        """{ticker: {field: value|None}} for every ticker that has a value for
+        `session` (default: the current one) — a live price dated that session,
+        or its stored close. One vectorized pass over the whole universe."""
+        session = session or self.current_session()
+        if not tickers:
+            return {}
+        matrix = self._history(tickers, session).copy()
+        live = live or {}
+        rows = [i for i, t in enumerate(tickers) if t in live and live[t][0] == session and live[t][1] > 0]
+        if rows:
+            matrix[rows, -1] = [live[tickers[i]][1] for i in rows]
+
+        priced = ~np.isnan(matrix[:, -1])
+        if not priced.any():
+            return {}
+        fields = compute_fields(matrix[priced])
+        out: Dict[str, Dict[str, Optional[float]]] = {}
+        for row, ticker in enumerate(t for t, ok in zip(tickers, priced) if ok):
+            out[ticker] = {
+                name: (None if np.isnan(values[row]) else float(values[row]))
+                for name, values in fields.items()
+            }
+        return out
+
+
+async def _write_bars(pool, rows: List[Tuple[str, date, float]]) -> None:
+    tickers, sessions, closes = zip(*rows)
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "INSERT INTO sector_daily_bars (ticker, session, close) "
+            "SELECT * FROM UNNEST($1::text[], $2::date[], $3::float8[]) "
+            "ON CONFLICT (ticker, session) DO UPDATE SET close = EXCLUDED.close, updated_at = NOW()",
+            list(tickers), list(sessions), list(closes),
+        )
+
+
+async def prune_bars(pool) -> None:
+    """Drop persisted rows older than the fetch window."""
+    if not pool:
+        return
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "DELETE FROM sector_daily_bars WHERE session < $1",
+            date.today() - timedelta(days=BAR_LOOKBACK_DAYS),
+        )
+
+
+# Process-wide panel shared by the fast tick and the close snapshot.
+bar_panel = SectorBarPanel()
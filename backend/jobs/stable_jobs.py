@@ -19,6 +19,9 @@ from datetime import datetime, timezone
 
 import pytz
 
+from jobs.runner import job_sleep, startup_delay
+from utils.trading_calendar import is_session_open
+
 logger = logging.getLogger(__name__)
 ET = pytz.timezone("America/New_York")
 
@@ -43,8 +46,14 @@ def _all_tickers() -> list[str]:
 def _nightly_work() -> dict:
     from stable_engine import bars_yf, metrics, scoring
     tickers = _all_tickers()
-    coverage = bars_yf.download_and_store(tickers, days=15)   # incremental refresh
-    m = metrics.compute_metrics()
+    coverage = bars_yf.download_and_store(tickers, days=metrics.REFRESH_DAYS)  # incremental refresh
+    readjusted = coverage.get("readjusted_tickers") or []
+    if readjusted:
+        # Upstream re-adjusted these histories: replace the stored bars and rebuild.
+        logger.info("[stable_jobs] full rebuild for re-adjusted tickers: %s", readjusted)
+        bars_yf.download_and_store(readjusted)
+        metrics.compute_metrics(readjusted)
+    m = metrics.compute_metrics(incremental=True)
     scores = scoring.compute_theme_scores()
     stored = scoring.store_theme_scores(scores, anchor="close", degraded=coverage["degraded"])
     return {"coverage": coverage["coverage_pct"], "degraded": coverage["degraded"],
@@ -63,11 +72,8 @@ def _strip_work() -> dict:
 
 
 def is_rth(dt: datetime) -> bool:
-    """Roughly regular trading hours 09:30-16:00 ET on weekdays (holidays best-effort)."""
-    if not is_weekday(dt):
-        return False
-    mins = dt.hour * 60 + dt.minute
-    return 9 * 60 + 30 <= mins <= 16 * 60
+    """Regular trading hours 09:30-16:00 ET on NYSE sessions (13:00 on early closes)."""
+    return is_session_open(dt)
 
 
 # ── Flatline detection: record every run on the async pool (never psycopg2) ──────
@@ -119,7 +125,7 @@ async def stable_strip_loop():
                 await _record("strip", run_index_rates_strip)
         except Exception as e:
             logger.warning("[stable_jobs] strip loop error: %s", e)
-        await asyncio.sleep(600)  # 10 minutes
+        await job_sleep(600)  # 10 minutes
 
 
 def _movers_work() -> dict:
@@ -148,7 +154,7 @@ async def stable_movers_loop():
                     fired_premarket = {k for k in fired_premarket if k.startswith(et.strftime("%Y-%m-%d"))}
         except Exception as e:
             logger.warning("[stable_jobs] movers loop error: %s", e)
-        await asyncio.sleep(600)  # 10 minutes
+        await job_sleep(600)  # 10 minutes
 
 
 async def _warm_tide() -> None:
@@ -182,14 +188,14 @@ async def stable_tide_warmer_loop():
     """Keep the v2 tide cell lit during RTH by warming the market-tide every 5 min (RTH only,
     ~1 UW call each). Matches the legacy /app market-intel cadence; board /tide prefers the
     warmed key so the cell no longer goes dark between the 60s UW cache windows."""
-    await asyncio.sleep(120)  # let the DB/redis pools settle after boot
+    await startup_delay(120)  # let the DB/redis pools settle after boot
     while True:
         try:
             if is_rth(now_et()):
                 await _warm_tide()
         except Exception as e:
             logger.warning("[stable_jobs] tide warmer error: %s", e)
-        await asyncio.sleep(300)  # 5 minutes
+        await job_sleep(300)  # 5 minutes
 
 
 async def run_nightly_close_recompute() -> dict:
@@ -232,4 +238,4 @@ async def stable_engine_loop():
                 fired = {k for k in fired if k.startswith(key_prefix)}
         except Exception as e:
             logger.warning("[stable_jobs] loop error: %s", e)
-        await asyncio.sleep(45)
+        await job_sleep(45)
@@ -12,6 +12,8 @@ import logging
 from datetime import date, datetime, timedelta
 from typing import Dict, Optional
 
+from utils.trading_calendar import get_calendar
+
 logger = logging.getLogger("triton_shadow")
 
 TRITON_CALLER = "triton_flow_shadow"
@@ -77,14 +79,8 @@ async def fetch_r_close_index(ticker: str, lookback_days: int) -> Dict[date, flo
 
 
 def nth_trading_day(anchor: date, n: int) -> date:
-    """nth Mon-Fri strictly after anchor (mirrors a3; no holiday calendar in v0)."""
-    day = anchor
-    count = 0
-    while count < n:
-        day += timedelta(days=1)
-        if day.weekday() < 5:
-            count += 1
-    return day
+    """nth NYSE session strictly after anchor (shared calendar, same as a3)."""
+    return get_calendar().next_trading_day(anchor, n)
 
 
 def close_on_or_near(idx: Dict[date, float], target: date) -> Optional[float]:
@@ -37,7 +37,7 @@ async def lifespan(app: FastAPI):
     redis_client = await get_redis_client()
     postgres_client = await get_postgres_client()
     
-    # Initialize/update database schema (adds new columns if they don't exist)
+    # Bring the schema up to date (one version check when already migrated)
     try:
         from database.postgres_client import init_database
         await init_database()
@@ -52,30 +52,8 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Could not initialize watchlist table: {e}")
 
-    # Initialize trade watchlist table
-    try:
-        from api.trade_watchlist import init_trade_watchlist_table
-        await init_trade_watchlist_table()
-        logger.info("✅ Trade watchlist table ready")
-    except Exception as e:
-        logger.warning(f"⚠️ Could not initialize trade watchlist table: {e}")
-
-    # Initialize earnings calendar table
-    try:
-        from api.chronos import init_chronos_table
-        await init_chronos_table()
-        logger.info("✅ Chronos earnings table ready")
-    except Exception as e:
-        logger.warning(f"⚠️ Could not initialize Chronos table: {e}")
-
-    # Add confirmations column to lightning_cards if missing
-    try:
-        pool = await get_postgres_client()
-        async with pool.acquire() as conn:
-            await conn.execute("ALTER TABLE lightning_cards ADD COLUMN IF NOT EXISTS confirmations JSONB DEFAULT '[]'")
-        logger.info("✅ Lightning cards confirmations column ready")
-    except Exception as e:
-        logger.debug("Lightning cards column check: %s", e)
+    # Trade watchlist, Chronos earnings, lightning_cards.confirmations and the
+    # attribution columns are created by schema migration 2 (database/migrations.py).
 
     logger.info("✅ Database connections established")
     # One-time cleanup of cached anomalous prices before schedulers consume data.
@@ -101,1064 +79,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Could not restore circuit breaker state: {e}")
     
-    # Start the bias scheduler
-    try:
-        from scheduler.bias_scheduler import start_scheduler
-        await start_scheduler()
-        logger.info("✅ Bias scheduler started")
-    except Exception as e:
-        logger.warning(f"⚠️ Could not start scheduler: {e}")
-    
-    # Start signal expiry background task
-    async def signal_expiry_loop():
-        """Expire stale signals every 5 minutes."""
-        while True:
-            try:
-                from api.trade_ideas import expire_stale_signals
-                await expire_stale_signals()
-            except Exception as e:
-                logger.warning(f"Signal expiry loop error: {e}")
-            try:
-                from database.postgres_client import expire_pending_trades
-                expired = await expire_pending_trades()
-                if expired > 0:
-                    logger.info(f"🕐 Expired {expired} stale pending trades")
-            except Exception as e:
-                logger.warning(f"Pending trade expiry error: {e}")
-            await asyncio.sleep(300)  # 5 minutes
-
-    # Universe enrichment cache refresh (every 30 min during market hours)
-    async def universe_cache_loop():
-        """Refresh universe enrichment cache during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Only refresh during extended market hours (8 AM - 5 PM ET, weekdays)
-                if et.weekday() < 5 and 8 <= et.hour < 17:
-                    from enrichment.universe_cache import refresh_universe
-                    await refresh_universe()
-                else:
-                    logger.debug("Universe cache: outside market hours, skipping")
-            except Exception as e:
-                logger.warning(f"Universe cache loop error: {e}")
-            await asyncio.sleep(1800)  # 30 minutes
-
-    # Mark-to-market: refresh position prices at :02, :17, :32, :47 past each hour
-    # during market hours (offset 2 min from quarter-hour boundaries to allow data settle)
-    async def mark_to_market_loop():
-        """Fetch live UW API prices for open positions during market hours.
-        Clock-aware: fires at :02, :17, :32, :47 past each hour (9 AM - 5 PM ET weekdays).
-        Forces a closing bell run at 4:17 PM ET to capture near-close prices.
-        """
-        import pytz
-        from datetime import datetime as dt_cls
-
-        MTM_MINUTES = [2, 17, 32, 47]  # 2 min offset from :00/:15/:30/:45 quarter-hours
-        closing_bell_fired_today = None  # Track date to fire once per day
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                today_date = et.date()
-                is_weekday = et.weekday() < 5
-                in_market_window = is_weekday and 9 <= et.hour < 17
-
-                # Closing bell run: 4:17 PM ET, once per day
-                is_closing_bell = (
-                    is_weekday
-                    and et.hour == 16 and et.minute >= 17 and et.minute < 30
-                    and closing_bell_fired_today != today_date
-                )
-
-                should_run = False
-                if in_market_window or is_closing_bell:
-                    # Check if we're at one of the target minutes
-                    if et.minute in MTM_MINUTES or is_closing_bell:
-                        should_run = True
-
-                if should_run:
-                    from api.unified_positions import run_mark_to_market
-                    result = await run_mark_to_market()
-                    updated = result.get("updated", 0)
-                    errors = result.get("errors", [])
-                    if is_closing_bell:
-                        closing_bell_fired_today = today_date
-                        logger.info("🔔 Closing bell MTM: updated %d positions", updated)
-                    elif updated > 0:
-                        logger.info("📊 Mark-to-market: updated %d positions (%02d:%02d ET)", updated, et.hour, et.minute)
-                    # Snapshot balances after MTM for PnL tracking
-                    try:
-                        from api.portfolio import snapshot_account_balances
-                        await snapshot_account_balances()
-                    except Exception as snap_err:
-                        logger.warning("Balance snapshot after MTM failed: %s", snap_err)
-                    if errors:
-                        logger.warning("📊 Mark-to-market: %d errors", len(errors))
-
-                # Sleep until next target minute
-                # Calculate seconds until next :02/:17/:32/:47
-                now_min = et.minute
-                now_sec = et.second
-                next_targets = [m for m in MTM_MINUTES if m > now_min]
-                if next_targets:
-                    next_min = next_targets[0]
-                else:
-                    next_min = MTM_MINUTES[0] + 60  # wrap to next hour
-                sleep_secs = (next_min - now_min) * 60 - now_sec
-                if sleep_secs <= 0:
-                    sleep_secs = 60  # safety floor
-                sleep_secs = min(sleep_secs, 900)  # cap at 15 min
-            except Exception as e:
-                logger.warning("Mark-to-market loop error: %s", e)
-                sleep_secs = 60  # retry in 1 min on error
-            await asyncio.sleep(sleep_secs)
-
-    # Confluence engine: group signals by ticker+direction every 15 min
-    async def confluence_engine_loop():
-        """Run confluence scan during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        # Initial delay to let other systems start first
-        await asyncio.sleep(60)
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Market hours: 9:30 AM - 4:30 PM ET, weekdays
-                if et.weekday() < 5 and 9 <= et.hour < 17:
-                    from confluence.engine import run_confluence_scan
-                    await run_confluence_scan()
-                else:
-                    logger.debug("Confluence engine: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("Confluence engine error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    # Holy Grail scanner: scan for ADX+EMA pullback setups every 15 min
-    async def holy_grail_scan_loop():
-        """Run Holy Grail scanner during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        # Offset from other scanners to spread load
-        await asyncio.sleep(180)  # 3 min after startup
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Market hours: 9:30 AM - 4:00 PM ET, weekdays
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    from scanners.holy_grail_scanner import run_holy_grail_scan, HG_SCANNER_AVAILABLE
-                    if HG_SCANNER_AVAILABLE:
-                        await run_holy_grail_scan()
-                else:
-                    logger.debug("Holy Grail scanner: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("Holy Grail scan loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    # Scout Sniper scanner: RSI hooks + reversal candles every 15 min
-    async def scout_scan_loop():
-        """Run Scout Sniper scanner during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        # Offset from Holy Grail to spread load
-        await asyncio.sleep(360)  # 6 min after startup
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Market hours: 9:30 AM - 4:00 PM ET, weekdays
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    from scanners.scout_sniper_scanner import run_scout_scan, SCOUT_SCANNER_AVAILABLE
-                    if SCOUT_SCANNER_AVAILABLE:
-                        await run_scout_scan()
-                else:
-                    logger.debug("Scout scanner: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("Scout scan loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    # Sector RS: compute daily pre-market, then check every hour
-    async def sector_rs_loop():
-        """Compute sector relative strength daily at 8:00 AM ET, recheck hourly."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(30)  # Brief startup delay
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Run at 8:00 AM ET on weekdays, or if data is stale
-                if et.weekday() < 5 and (
-                    (7 <= et.hour <= 8) or et.hour == 0  # Pre-market window or midnight catch-up
-                ):
-                    from scanners.sector_rs import compute_sector_rs, is_sector_rs_stale
-                    if await is_sector_rs_stale():
-                        await compute_sector_rs()
-            except Exception as e:
-                logger.warning("Sector RS loop error: %s", e)
-            await asyncio.sleep(3600)  # Check hourly
-
-    # Sell the Rip scanner: fade relief rallies every 5 min during market hours
-    async def sell_the_rip_scan_loop():
-        """Run Sell the Rip scanner during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        # Offset from other scanners
-        await asyncio.sleep(480)  # 8 min after startup
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Market hours: 9:35 AM - 3:55 PM ET, weekdays
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    time_decimal = et.hour + et.minute / 60.0
-                    if time_decimal >= 9.583:  # 9:35 AM
-                        from scanners.sell_the_rip_scanner import run_sell_the_rip_scan, STR_SCANNER_AVAILABLE
-                        if STR_SCANNER_AVAILABLE:
-                            await run_sell_the_rip_scan()
-                else:
-                    logger.debug("Sell the Rip scanner: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("Sell the Rip scan loop error: %s", e)
-            await asyncio.sleep(14400)  # 4 hours (daily bars don't change intraday)
-
-    # VWAP validation: compute server-side VWAP every 15 min (4-min offset) during market hours
-    async def vwap_validation_loop():
-        """Compute VWAP bands and log for TradingView comparison."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        # 4-minute offset from other 15-min loops
-        await asyncio.sleep(240)
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Market hours: 9:30 AM - 4:15 PM ET, weekdays
-                if et.weekday() < 5 and 9 <= et.hour < 17:
-                    time_decimal = et.hour + et.minute / 60.0
-                    if time_decimal >= 9.5:  # After 9:30 AM
-                        from scanners.vwap_validator import run_vwap_validation, VALIDATOR_AVAILABLE
-                        if VALIDATOR_AVAILABLE:
-                            await run_vwap_validation()
-                else:
-                    logger.debug("VWAP validation: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("VWAP validation loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    # Factor staleness monitor — check every 60 min
-    async def factor_staleness_loop():
-        """Check factor freshness and alert on stale readings."""
-        await asyncio.sleep(120)  # 2 min after startup
-        while True:
-            try:
-                from monitoring.factor_staleness import run_staleness_check
-                result = await run_staleness_check(alert=True)
-                stale_count = len(result.get("stale_factors", []))
-                missing_count = len(result.get("missing_factors", []))
-                if stale_count or missing_count:
-                    logger.warning(
-                        "Factor staleness: %d stale, %d missing", stale_count, missing_count
-                    )
-            except Exception as e:
-                logger.warning("Factor staleness loop error: %s", e)
-            await asyncio.sleep(3600)  # 60 minutes
-
-    # Crypto setup engine: scan for BTC funding/session/liquidation setups
-    async def crypto_scan_loop():
-        """Run crypto setup engine every 5 minutes (24/7 — crypto never sleeps)."""
-        await asyncio.sleep(90)  # 1.5 min after startup
-
-        while True:
-            try:
-                from strategies.crypto_setups import run_crypto_scan
-                signals = await run_crypto_scan()
-                if signals:
-                    logger.info("₿ Crypto scan: %d signal(s) generated", len(signals))
-            except Exception as e:
-                logger.warning("Crypto scan loop error: %s", e)
-            await asyncio.sleep(300)  # 5 minutes
-
-    # UW flow poller: populate flow_events every 5 min during market hours (ZEUS 1A.0)
-    async def uw_flow_poller_loop():
-        """Poll UW per-ticker flow and write to flow_events every 5 min."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(120)  # 2 min after startup (let DB connections settle)
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    from jobs.uw_flow_poller import run_flow_poller
-                    await run_flow_poller()
-                else:
-                    logger.debug("UW flow poller: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("UW flow poller loop error: %s", e)
-            await asyncio.sleep(300)  # 5 minutes
-
-    async def flow_deadfeed_watchdog_loop():
-        """L1.0 Chunk 3: RTH-gated, debounced dead-feed alarm for the uw:flow:* feed.
-
-        Independent of run_flow_poller on purpose — a stopped poller must still trip
-        this (dead-man's-switch). Evaluates uw:flow:* freshness directly each cycle;
-        fires ONCE per episode (Redis latch) and sends a recovery alert on heal.
-        """
-        import json as _json
-        from datetime import datetime as _dt, time as _t, timezone as _tz
-        from zoneinfo import ZoneInfo
-
-        STALE_S = 900            # matches the uw:flow TTL that governs flow_data_available
-        LATCH_KEY = "alarm:flow_dead:active"
-        LATCH_TTL = 7200         # ~2h — one alarm per dead episode, not per cycle
-
-        def _in_rth() -> bool:
-            # Strict 09:30–16:00 ET (NOT api/sectors._is_market_hours, which runs to
-            # ~16:30 and would false-alarm daily after the poller stops at 16:00).
-            # No half-day calendar: early-close days (~3-4/yr) may throw one false
-            # "feed dead" in the after-close window. Known, acceptable.
-            now = _dt.now(ZoneInfo("America/New_York"))
-            if now.weekday() >= 5:
-                return False
-            return _t(9, 30) <= now.time() <= _t(16, 0)
-
-        await asyncio.sleep(180)  # let the poller seed uw:flow:* first
-
-        while True:
-            try:
-                if _in_rth():
-                    redis = await get_redis_client()
-                    if redis:
-                        cursor = b"0"
-                        keys = []
-                        while True:
-                            cursor, batch = await redis.scan(cursor, match="uw:flow:*", count=200)
-                            keys.extend(batch)
-                            if cursor in (b"0", 0):
-                                break
-                        now_utc = _dt.now(_tz.utc)
-                        summaries = 0
-                        fresh = 0
-                        oldest_age = None
-                        newest_iso = None
-                        for k in keys:
-                            ks = k.decode() if isinstance(k, bytes) else k
-                            if ks.endswith(":recent"):
-                                continue  # the recent-alerts list, not a summary
-                            val = await redis.get(k)
-                            if not val:
-                                continue
-                            try:
-                                summ = _json.loads(val)
-                            except Exception:
-                                continue
-                            if not isinstance(summ, dict):
-                                continue
-                            dua = summ.get("updated_at")
-                            if not dua:
-                                continue
-                            try:
-                                age = (now_utc - _dt.fromisoformat(dua)).total_seconds()
-                            except Exception:
-                                continue
-                            summaries += 1
-                            if age <= STALE_S:
-                                fresh += 1
-                            if oldest_age is None or age > oldest_age:
-                                oldest_age = int(age)
-                            if newest_iso is None or dua > newest_iso:
-                                newest_iso = dua
-
-                        feed_dead = (fresh == 0)
-                        latched = bool(await redis.get(LATCH_KEY))
-                        if feed_dead and not latched:
-                            from bias_engine.anomaly_alerts import send_alert
-                            status = (f"No fresh uw:flow within {STALE_S}s during RTH. "
-                                      f"summaries={summaries} fresh=0 "
-                                      f"oldest_age={oldest_age}s last_write={newest_iso}")
-                            await send_alert("🚨 Flow feed dead", status, severity="warning")
-                            await redis.set(LATCH_KEY, "1", ex=LATCH_TTL)
-                            logger.warning("Flow dead-feed alarm FIRED: %s", status)
-                        elif (not feed_dead) and latched:
-                            from bias_engine.anomaly_alerts import send_alert
-                            status = (f"Flow feed healthy: {fresh} fresh tickers, "
-                                      f"oldest_age={oldest_age}s last_write={newest_iso}")
-                            await send_alert("✅ Flow feed restored", status, severity="info")
-                            await redis.delete(LATCH_KEY)
-                            logger.info("Flow dead-feed alarm CLEARED: %s", status)
-            except Exception as e:
-                logger.warning("Flow dead-feed watchdog error: %s", e)
-            await asyncio.sleep(300)  # 5-min cadence
-
-    async def signals_freshness_watchdog_loop():
-        """DEF-SIGNAL-PERSISTENCE-COLLAPSE dead-man's switch for signal persistence.
-
-        /health is the RECORD; this is the ALARM. The enumeration found ZERO clients
-        of /health in the repo, so a freshness block alone would sit on a page nobody
-        reads -- fake-healthy reproduced inside the fix for fake-healthy.
-
-        Alarms on NEW rejections (delta since last check), never on the cumulative
-        count: a cumulative gap never returns to zero within a process lifetime, so it
-        would re-fire every latch-TTL forever and make recovery unreachable. A
-        permanently-crying alarm gets muted, which restores fake-healthy by another
-        route (R-IV.46(c)).
-
-        Deliberately NOT RTH-gated: RTH gates EXPECTATIONS (staleness); a rejection is
-        EVIDENCE and alerts at any hour, any day -- the overnight webhook path is live.
-        """
-        LATCH_KEY = "alarm:signals_persistence:active"
-        LATCH_TTL = 7200
-        CLEAN_CYCLES_TO_HEAL = 3      # ~15 min of no new rejections
-
-        last_rejected: dict[str, int] = {}
-        clean_streak = 0
-        episode_open = False
-        # Classes already dark when this process first looks are a STANDING CONDITION,
-        # not a new event -- e.g. crypto_engine (last row 07-22) and crypto_cvd_engine
-        # (07-24) are correctly flatline at boot. Paging on them would page on history
-        # every restart. /health still carries the truth; only a TRANSITION to dark
-        # pages. A baseline-dark class that recovers leaves the baseline, so if it
-        # later goes dark again that IS a transition and does page.
-        baseline_dark: set[str] | None = None
-
-        await asyncio.sleep(240)  # let the pipeline seed counters after boot
-
-        while True:
-            try:
-                from stable_engine.signals_freshness import signals_freshness_summary
-                summary = await signals_freshness_summary()
-                classes = summary.get("classes", {}) or {}
-
-                new_rejections = {}
-                for cls, d in classes.items():
-                    cur = int(d.get("rejected") or 0)
-                    delta = cur - last_rejected.get(cls, cur if not episode_open else 0)
-                    last_rejected[cls] = cur
-                    if delta > 0:
-                        new_rejections[cls] = (delta, d)
-
-                dark_now = {c for c, d in classes.items()
-                            if d.get("status") in ("flatline", "no_data")
-                            and not int(d.get("rejected") or 0)}
-                if baseline_dark is None:
-                    baseline_dark = set(dark_now)   # first look: adopt, never page
-                    if baseline_dark:
-                        logger.info(
-                            "Signals watchdog baseline-dark at boot (not paged): %s",
-                            ", ".join(sorted(baseline_dark)))
-                baseline_dark -= (set(classes) - dark_now)  # recovered -> leaves baseline
-                stale_bad = {c: classes[c] for c in sorted(dark_now - baseline_dark)}
-
-                redis = await get_redis_client()
-                latched = bool(await redis.get(LATCH_KEY)) if redis else False
-
-                if new_rejections or stale_bad:
-                    clean_streak = 0
-                    if not latched:
-                        from bias_engine.anomaly_alerts import send_alert
-                        parts = [
-                            f"{c}: +{n} NEW rejections (total={d.get('rejected')}, "
-                            f"persisted={d.get('persisted')}, age={d.get('last_persist_age_s')}s)"
-                            for c, (n, d) in sorted(new_rejections.items())
-                        ] + [
-                            f"{c}: no data (age={d.get('last_persist_age_s')}s)"
-                            for c, d in sorted(stale_bad.items())
-                        ]
-                        status = "; ".join(parts)
-                        await send_alert("🚨 Signal persistence degraded", status, severity="warning")
-                        if redis:
-                            await redis.set(LATCH_KEY, "1", ex=LATCH_TTL)
-                        episode_open = True
-                        logger.error("Signal persistence alarm FIRED: %s", status)
-                elif episode_open or latched:
-                    clean_streak += 1
-                    if clean_streak >= CLEAN_CYCLES_TO_HEAL:
-                        from bias_engine.anomaly_alerts import send_alert
-                        status = (f"No new rejections for {CLEAN_CYCLES_TO_HEAL} cycles "
-                                  f"(worst={summary.get('worst_status')}, "
-                                  f"oldest_age={summary.get('oldest_persist_age_s')}s)")
-                        await send_alert("✅ Signal persistence restored", status, severity="info")
-                        if redis:
-                            await redis.delete(LATCH_KEY)
-                        episode_open = False
-                        clean_streak = 0
-                        logger.info("Signal persistence alarm CLEARED: %s", status)
-            except asyncio.CancelledError:
-                raise  # shutdown must not be swallowed by the catch-all below
-            except Exception as e:
-                logger.warning("Signals freshness watchdog error: %s", e)
-            await asyncio.sleep(300)  # 5-min cadence
-
-    async def pythia_staleness_watchdog_loop():
-        """Per-name PYTHIA MP-feed staleness alarm -- durable fix, full liquid-20 roster.
-
-        docs/codex-briefs/2026-06-29-pythia-mp-feed-reliability-titans-brief.md
-        Part 1, BUILT 2026-07-17 (10-min ATLAS freshness re-check passed --
-        config.liquid_universe.LIQUID_UNIVERSE unchanged, still the 20-ticker
-        doc-exhaustive/provisional-ratified set). Part 2 (feed-shed root-cause)
-        was already answered by Fable's 2026-07-15 TV log export (one ~240-symbol
-        watchlist alert, ~39 calc slots, survivor set reshuffles on watchlist
-        edits) -- confirms the brief's own leading hypothesis almost exactly
-        (~40-64 guessed, ~39 found). No separate Part 2 build needed.
-
-        The existing `_maybe_mp_feed_down_alarm` (config/l1_gate.py) checks GLOBAL
-        MAX(timestamp) across ALL of pythia_events -- any surviving liquid ticker
-        keeps that timestamp fresh and masks individual dead names. This is the
-        third time that exact blind spot caused an undetected outage (B4 6/10:
-        decay to 3 tickers; 6/29 review: decay to 23, SPY dark 12 days; 7/1-7/16:
-        SPY+QQQ dark 14 days). Live proof the blind spot is still active right
-        now (2026-07-17, checked before shipping this): 14 of the 20 liquid-20
-        tickers are stale by 7-95+ days (HYG since April) while SPY/QQQ/SMH/
-        TSLA/IWM/NVDA stay fresh and keep the global alarm quiet throughout.
-
-        Started as a same-evening STOPGAP (2026-07-16, SPY/QQQ only, Fable GO) --
-        promoted in-place to the full liquid-20 roster rather than standing up a
-        second parallel watchdog; same task/latch infrastructure, just the
-        roster and framing changed. The "stopgap retires" by becoming this.
-
-        Per-ticker Redis latch (mirrors flow_deadfeed_watchdog_loop exactly) --
-        each roster ticker alarms/recovers independently, not conflated.
-
-        Threshold is SESSION-aware, not a raw hour count: "no event for more than
-        1 full session" means the last event predates the previous COMPLETE
-        trading session, not "no event in the last 24-26h" -- a raw-hours
-        threshold would false-alarm every Monday morning across the weekend gap
-        (exactly the class of bug already found and fixed once this week for a
-        different feed's staleness math). Reuses the session-date helpers already
-        built and vetted for pythia_events in services/read_only/market_profile.py
-        rather than reimplementing weekday-session arithmetic a second time.
-
-        AEGIS (brief guardrail): alarm bodies carry ticker + timestamp + session-
-        gap count only -- no secrets/DSN/payloads.
-        """
-        from datetime import datetime as _dt, timezone as _tz
-        from zoneinfo import ZoneInfo
-        from config.liquid_universe import LIQUID_UNIVERSE
-
-        ROSTER = sorted(LIQUID_UNIVERSE)  # full liquid-20, per the 6/29 brief's Part 1
-        LATCH_TTL = 7200  # ~2h -- one alarm per dead episode, not per cycle
-
-        def _in_rth() -> bool:
-            from datetime import time as _t
-            now = _dt.now(ZoneInfo("America/New_York"))
-            if now.weekday() >= 5:
-                return False
-            return _t(9, 30) <= now.time() <= _t(16, 0)
-
-        await asyncio.sleep(210)  # after the flow watchdog's 180s settle
-
-        while True:
-            try:
-                if _in_rth():
-                    from services.read_only.market_profile import _current_session_date, _prev_weekday
-
-                    redis = await get_redis_client()
-                    pool = await get_postgres_client()
-                    if redis and pool:
-                        now_et = _dt.now(ZoneInfo("America/New_York"))
-                        current_session = _current_session_date(now_et)
-
-                        for ticker in ROSTER:
-                            async with pool.acquire() as conn:
-                                ts = await conn.fetchval(
-                                    "SELECT MAX(timestamp) FROM pythia_events WHERE ticker = $1", ticker
-                                )
-
-                            latch_key = f"alarm:pythia_stale:{ticker}"
-                            latched = bool(await redis.get(latch_key))
-
-                            if ts is None:
-                                gap = None  # never fired at all -- treat as stale
-                                stale = True
-                            else:
-                                if ts.tzinfo is None:
-                                    ts = ts.replace(tzinfo=_tz.utc)
-                                event_session = ts.astimezone(ZoneInfo("America/New_York")).date()
-                                gap = 0
-                                d = current_session
-                                while d > event_session:
-                                    d = _prev_weekday(d)
-                                    gap += 1
-                                stale = gap > 1  # missed MORE than 1 full session
-
-                            if stale and not latched:
-                                from bias_engine.anomaly_alerts import send_alert
-                                age_desc = "no pythia_events row ever" if ts is None else f"last event {ts.isoformat()} ({gap} sessions ago)"
-                                status = f"{ticker}: {age_desc}. Per-name liquid-20 roster alarm (6/29 brief Part 1)."
-                                await send_alert(f"🚨 PYTHIA feed dead: {ticker}", status, severity="warning")
-                                await redis.set(latch_key, "1", ex=LATCH_TTL)
-                                logger.warning("PYTHIA staleness alarm FIRED for %s: %s", ticker, status)
-                            elif (not stale) and latched:
-                                from bias_engine.anomaly_alerts import send_alert
-                                status = f"{ticker}: fresh again, last event {ts.isoformat() if ts else 'unknown'} ({gap} sessions ago)."
-                                await send_alert(f"✅ PYTHIA feed restored: {ticker}", status, severity="info")
-                                await redis.delete(latch_key)
-                                logger.info("PYTHIA staleness alarm CLEARED for %s: %s", ticker, status)
-            except Exception as e:
-                logger.warning("PYTHIA staleness watchdog error: %s", e)
-            await asyncio.sleep(1800)  # 30-min cadence -- session-day-granularity condition, no need for tighter polling
-
-    # WH-ACCUMULATION scanner: detect institutional accumulation hourly (ZEUS 1A.3)
-    async def wh_accumulation_loop():
-        """Run WH-ACCUMULATION scanner every hour during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(600)  # 10 min after startup (let flow_events seed first)
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    from scanners.wh_accumulation import run_wh_accumulation_scan
-                    await run_wh_accumulation_scan()
-                else:
-                    logger.debug("WH-ACCUMULATION scanner: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("WH-ACCUMULATION loop error: %s", e)
-            await asyncio.sleep(3600)  # 1 hour
-
-    # WH-REVERSAL scanner: detect pullbacks to VAL after accumulation (ZEUS 1B.1)
-    async def wh_reversal_loop():
-        """Run WH-REVERSAL scanner every 15 min during market hours."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(750)  # 12.5 min after startup (after wh_accumulation first run)
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    from scanners.wh_reversal import run_wh_reversal_scan
-                    await run_wh_reversal_scan()
-                else:
-                    logger.debug("WH-REVERSAL scanner: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("WH-REVERSAL loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    # Sector constituent refresh (Phase A — 2026-05-22)
-    # Populates sector:constituent:{ticker}:{field} envelope cache that the
-    # sector heatmap popup + ticker profile popup read for WK%, MO%, RSI(14).
-    async def sector_refresh_fast_loop():
-        """Refresh WK% + RSI for every sector constituent.
-
-        60s cadence during market hours; 300s off-hours (the underlying values
-        only move during the regular session). The UW token-bucket limiter
-        inside `uw_api._consume_token` paces calls; if a tick takes longer
-        than the cadence the next tick fires back-to-back.
-        """
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(150)  # 2.5 min after startup — DB pool + sector seed must be live
-
-        while True:
-            tick_started = asyncio.get_event_loop().time()
-            try:
-                from jobs.sector_constituent_refresh import refresh_fast
-                await refresh_fast()
-            except Exception as e:
-                logger.warning("[sector_refresh] fast loop error: %s", e)
-
-            et = dt_cls.now(pytz.timezone("America/New_York"))
-            in_market = et.weekday() < 5 and 9 <= et.hour < 16
-            base_interval = 180 if in_market else 300  # was 60 - UW 429 incident 2026-06-16
-            # UW 429 incident 2026-06-16: sleep a FULL interval AFTER the tick completes.
-            # Never let a 429-throttled slow tick collapse to the old 5s floor and fire
-            # the next ~66-call burst back-to-back (the self-amplification that blew the cap).
-            await asyncio.sleep(base_interval)
-
-    async def sector_refresh_slow_loop():
-        """Refresh MO% for sector constituents.
-
-        3600s (1 h) cadence; the refresh function itself no-ops during
-        market-closed hours via Phase A.3's market-hours guard.
-        """
-        await asyncio.sleep(300)  # 5 min after startup — let fast loop's first pass land
-
-        while True:
-            tick_started = asyncio.get_event_loop().time()
-            try:
-                from jobs.sector_constituent_refresh import refresh_slow
-                await refresh_slow()
-            except Exception as e:
-                logger.warning("[sector_refresh] slow loop error: %s", e)
-            elapsed = asyncio.get_event_loop().time() - tick_started
-            await asyncio.sleep(max(5, 3600 - elapsed))
-
-    # Phase A.3 (2026-05-22): single weekday run at 16:05 ET captures the
-    # official 4 PM close into the cache. The refresh_fast / refresh_slow
-    # loops above no-op during market-closed hours, so this is the only
-    # path that populates the cache once the regular session ends.
-    async def sector_refresh_close_snapshot_loop():
-        """Fire refresh_close_snapshot() once per weekday at 16:05 ET."""
-        import pytz
-        from datetime import datetime as dt_cls, timedelta as td_cls
-
-        await asyncio.sleep(60)  # startup delay — let other init settle
-
-        ny_tz = pytz.timezone("America/New_York")
-        while True:
-            try:
-                now_et = dt_cls.now(ny_tz)
-                target = now_et.replace(hour=16, minute=5, second=0, microsecond=0)
-                if now_et >= target:
-                    target = target + td_cls(days=1)
-                while target.weekday() >= 5:
-                    target = target + td_cls(days=1)
-                wait_s = max(5.0, (target - now_et).total_seconds())
-                logger.info(
-                    "[sector_refresh] close-snapshot scheduled in %.0fs (target %s ET)",
-                    wait_s, target.strftime("%Y-%m-%d %H:%M %Z"),
-                )
-                await asyncio.sleep(wait_s)
-                from jobs.sector_constituent_refresh import refresh_close_snapshot
-                await refresh_close_snapshot()
-            except Exception as e:
-                logger.warning("[sector_refresh] close-snapshot loop error: %s", e)
-                # Sleep a defensive minute before retrying scheduling math
-                await asyncio.sleep(60)
-
-    async def adx_regime_loop():
-        """sub-brief 3 Chunk 3: SPY ADX(14) → regime:spy_adx_shadow (RTH, 15-min)."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(150)  # startup offset
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # RTH only (9:30 AM – 4:00 PM ET, weekdays); 90-min TTL lets the
-                # shadow key expire overnight → 'unknown' by design.
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    if et.hour + et.minute / 60.0 >= 9.5:
-                        from jobs.adx_regime_job import compute_and_store_spy_adx
-                        await compute_and_store_spy_adx()
-            except Exception as e:
-                logger.warning("[adx_regime] loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    expiry_task = asyncio.create_task(signal_expiry_loop())
-    universe_task = asyncio.create_task(universe_cache_loop())
-    mtm_task = asyncio.create_task(mark_to_market_loop())
-    confluence_task = asyncio.create_task(confluence_engine_loop())
-    holy_grail_task = asyncio.create_task(holy_grail_scan_loop())
-    scout_task = asyncio.create_task(scout_scan_loop())
-    sector_rs_task = asyncio.create_task(sector_rs_loop())
-    sell_the_rip_task = asyncio.create_task(sell_the_rip_scan_loop())
-    staleness_task = asyncio.create_task(factor_staleness_loop())
-    signals_freshness_task = asyncio.create_task(signals_freshness_watchdog_loop())
-    vwap_task = asyncio.create_task(vwap_validation_loop())
-    crypto_scan_task = asyncio.create_task(crypto_scan_loop())
-    # RE-ENABLED 2026-06-18 (L1.0 Chunk 4): trimmed to the L0.2 liquid universe
-    # (20 tickers) and flow-only (snapshot call dropped) → ~1,680 UW calls/day
-    # (~1 call/ticker @ 5-min over the session), down from the ~6,720 that caused
-    # the 06-16 budget incident. Self-gates to 09:00–16:00 ET. Restores the
-    # flow_events feed for pipeline P2C / wh_confluence / committee briefings.
-    uw_flow_poller_task = asyncio.create_task(uw_flow_poller_loop())
-    flow_deadfeed_watchdog_task = asyncio.create_task(flow_deadfeed_watchdog_loop())  # L1.0 Chunk 3
-    pythia_staleness_watchdog_task = asyncio.create_task(pythia_staleness_watchdog_loop())  # 6/29 brief Part 1, full liquid-20 as of 2026-07-17
-    adx_regime_task = asyncio.create_task(adx_regime_loop())
-
-    # Stable Engine: nightly close recompute + provisional snapshots + index/rates
-    # strip (yfinance, zero UW).
-    try:
-        from jobs.stable_jobs import (
-            stable_engine_loop, stable_strip_loop, stable_movers_loop, stable_tide_warmer_loop,
-        )
-        stable_engine_task = asyncio.create_task(stable_engine_loop())
-        stable_strip_task = asyncio.create_task(stable_strip_loop())
-        stable_movers_task = asyncio.create_task(stable_movers_loop())
-        stable_tide_task = asyncio.create_task(stable_tide_warmer_loop())
-        logger.info("✅ Stable Engine scheduler started")
-    except Exception as e:
-        logger.warning(f"⚠️ Could not start Stable Engine scheduler: {e}")
-
-    # Triton Step-0: whale-flow shadow poller (RTH 09:30-16:00 ET, 120s cadence).
-    # SHADOW-ONLY — writes triton_flow_shadow; nothing reads it for scoring.
-    async def triton_shadow_poller_loop():
-        import os, pytz
-        from datetime import datetime as _dt, time as _t
-        if os.getenv("TRITON_SHADOW_ENABLED", "true").lower() == "false":
-            logger.info("triton_shadow: disabled via TRITON_SHADOW_ENABLED=false")
-            return
-        await asyncio.sleep(150)  # let DB connections settle
-        while True:
-            try:
-                et = _dt.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and _t(9, 30) <= et.time() <= _t(16, 0):
-                    from jobs.triton_shadow_poller import run_triton_shadow_poller
-                    await run_triton_shadow_poller()
-            except Exception as e:
-                logger.warning("triton_shadow poller loop error: %s", e)
-            await asyncio.sleep(120)
-    triton_shadow_task = asyncio.create_task(triton_shadow_poller_loop())
-
-    # Triton Step-0 grader: daily post-close direction-adjusted forward returns.
-    async def triton_grader_loop():
-        import os, pytz
-        from datetime import datetime as _dt, time as _t
-        if os.getenv("TRITON_SHADOW_ENABLED", "true").lower() == "false":
-            return
-        last_run = None
-        await asyncio.sleep(180)
-        while True:
-            try:
-                et = _dt.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and et.time() >= _t(16, 15) and last_run != et.date():
-                    from jobs.triton_shadow_grader import run_triton_shadow_grader
-                    await run_triton_shadow_grader()
-                    last_run = et.date()
-            except Exception as e:
-                logger.warning("triton_shadow grader loop error: %s", e)
-            await asyncio.sleep(1800)  # 30-min check
-    triton_grader_task = asyncio.create_task(triton_grader_loop())
-
-    # UW budget watchdog (Fable 2026-07-09): in-hub runtime circuit breaker. 24/7 as of
-    # 2026-07-13 (7/10 lesson: first real 17K crossing landed AFTER the close; the counter
-    # accumulates on the UTC day). Formerly RTH-gated
-    # ~5-min tick; daily UW total >= 17K -> set the runtime shed flag (Triton poller
-    # skips) + ONE Discord alert; >= 18K -> human-call escalation. No env var, no
-    # redeploy. Replaces the TRITON_SHADOW_ENABLED env shed (which forced a mid-session
-    # redeploy = RTH-blackout violation); env remains manual fallback only.
-    async def uw_budget_watchdog_loop():
-        await asyncio.sleep(160)
-        while True:
-            try:
-                from jobs.uw_budget_watchdog import run_budget_watchdog
-                await run_budget_watchdog()
-            except Exception as e:
-                logger.warning("uw_budget_watchdog loop error: %s", e)
-            await asyncio.sleep(300)  # 5 min
-    uw_budget_watchdog_task = asyncio.create_task(uw_budget_watchdog_loop())
-
-    # UW daily-burn snapshot: persist each completed UTC day's per-caller + grand total
-    # to uw_daily_burn so the 48h Redis counter TTL can never blind us again. Runs 24/7
-    # (not RTH-gated — the UTC rollover is at 20:00 ET); snapshots the prior day once.
-    async def uw_daily_burn_snapshot_loop():
-        from datetime import datetime as _dt, timezone as _tz
-        await asyncio.sleep(200)
-        last_snap = None
-        while True:
-            try:
-                today_utc = _dt.now(_tz.utc).date()
-                if last_snap != today_utc:
-                    from jobs.uw_budget_watchdog import run_daily_burn_snapshot
-                    await run_daily_burn_snapshot()  # snapshots yesterday
-                    last_snap = today_utc
-            except Exception as e:
-                logger.warning("uw_daily_burn snapshot loop error: %s", e)
-            await asyncio.sleep(1800)  # 30-min check
-    uw_daily_burn_snapshot_task = asyncio.create_task(uw_daily_burn_snapshot_loop())
-
-    wh_accumulation_task = asyncio.create_task(wh_accumulation_loop())
-    wh_reversal_task = asyncio.create_task(wh_reversal_loop())
-    sector_refresh_fast_task = asyncio.create_task(sector_refresh_fast_loop())
-    sector_refresh_slow_task = asyncio.create_task(sector_refresh_slow_loop())
-    sector_refresh_close_snapshot_task = asyncio.create_task(sector_refresh_close_snapshot_loop())
-
-    # Oracle insights: pre-compute analytics payload hourly
-    async def oracle_refresh_loop():
-        """Refresh Oracle insights cache every hour."""
-        await asyncio.sleep(120)  # 2 min after startup
-
-        while True:
-            try:
-                from analytics.oracle_engine import compute_oracle_payload
-                import json as _json
-
-                for asset_class in [None, "EQUITY", "CRYPTO"]:
-                    for days in [7, 30, 90]:
-                        payload = await compute_oracle_payload(
-                            days=days, asset_class=asset_class
-                        )
-                        cache_key = f"oracle:insights:{days}:ALL:{asset_class or 'ALL'}"
-                        await redis_client.set(
-                            cache_key,
-                            _json.dumps(payload, default=str),
-                            ex=3600,
-                        )
-                logger.info("🔮 Oracle insights refreshed (9 variants)")
-            except Exception as e:
-                logger.warning("Oracle refresh error: %s", e)
-            await asyncio.sleep(3600)  # 1 hour
-
-    oracle_task = asyncio.create_task(oracle_refresh_loop())
-
-    # Price collector: daily OHLCV for SPY + watchlist (backtesting + factor accuracy)
-    async def price_collector_loop():
-        """Collect daily prices for SPY + watchlist tickers."""
-        await asyncio.sleep(180)  # 3 min startup delay
-        while True:
-            try:
-                from analytics.price_collector import collect_price_history_cycle
-                result = await collect_price_history_cycle()
-                upserted = result.get("rows_upserted", 0)
-                if upserted > 0:
-                    logger.info("📈 Price collector: %d rows upserted", upserted)
-            except Exception as e:
-                logger.warning("Price collector error: %s", e)
-            await asyncio.sleep(3600)  # 1 hour
-
-    price_collector_task = asyncio.create_task(price_collector_loop())
-
-    # Watchlist price alert: check every 30 min during market hours
-    async def watchlist_price_alert_loop():
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(120)  # 2 min startup delay
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    from api.trade_watchlist import check_watchlist_price_alerts
-                    await check_watchlist_price_alerts()
-                else:
-                    logger.debug("Watchlist alerts: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("Watchlist price alert error: %s", e)
-            await asyncio.sleep(1800)  # 30 minutes
-
-    watchlist_alert_task = asyncio.create_task(watchlist_price_alert_loop())
-
-    # Chronos: refresh earnings calendar daily at 6 AM ET
-    async def chronos_earnings_loop():
-        """Daily earnings calendar refresh from FMP."""
-        import pytz
-        from datetime import datetime as dt_cls
-
-        await asyncio.sleep(60)  # 1 min startup delay
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                # Run once daily around 6 AM ET on weekdays
-                if et.weekday() < 5 and (5 <= et.hour <= 6):
-                    from jobs.chronos_ingest import run_chronos_earnings_ingest
-                    await run_chronos_earnings_ingest()
-                    # Weekly ETF component refresh (Mondays only)
-                    if et.weekday() == 0:
-                        from utils.position_overlap import refresh_etf_components
-                        await refresh_etf_components()
-                elif et.hour == 7 and et.minute < 15:
-                    # Catch-up run if 6 AM was missed
-                    from jobs.chronos_ingest import run_chronos_earnings_ingest
-                    await run_chronos_earnings_ingest()
-            except Exception as e:
-                logger.warning("Chronos earnings loop error: %s", e)
-            await asyncio.sleep(3600)  # Check every hour (only runs at 6-7 AM)
-
-    chronos_task = asyncio.create_task(chronos_earnings_loop())
-
-    # Outcome resolver: walk 15m bars for accepted signals every 15 min (market hours)
-    # S-1 Phase 2 (F-2, 2026-07-13): scoped to EQUITY only -- crypto now has its
-    # own 24/7 loop below (crypto_outcome_resolver_loop), since crypto trades
-    # around the clock and this equity-hours gate would otherwise delay a
-    # Saturday-night BTC signal's resolution until Monday morning.
-    async def outcome_resolver_loop():
-        """Resolve WIN/LOSS for accepted EQUITY signals via intraday bar walk-forward."""
-        import pytz
-        from datetime import datetime as dt_cls
-        from jobs.outcome_resolver import resolve_signal_outcomes
-
-        await asyncio.sleep(120)  # 2 min startup delay
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                if et.weekday() < 5 and 9 <= et.hour < 16:
-                    await resolve_signal_outcomes(asset_class_filter="EQUITY")
-                else:
-                    logger.debug("Outcome resolver: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("Outcome resolver loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    outcome_resolver_task = asyncio.create_task(outcome_resolver_loop())
-
-    # Crypto outcome resolver: same 15-min bar-walk, but 24/7 -- no market-hours
-    # gate. S-1 Phase 2 (F-2, 2026-07-13). Separate task from the equity loop
-    # above so neither is blocked by the other's cadence/gating, and so the
-    # two never double-process the same signal (each filters to one
-    # asset_class).
-    async def crypto_outcome_resolver_loop():
-        """Resolve WIN/LOSS for accepted CRYPTO signals via intraday bar walk-forward, 24/7."""
-        from jobs.outcome_resolver import resolve_signal_outcomes
-
-        await asyncio.sleep(135)  # offset 15s from the equity loop's 120s startup delay
-
-        while True:
-            try:
-                await resolve_signal_outcomes(asset_class_filter="CRYPTO")
-            except Exception as e:
-                logger.warning("Crypto outcome resolver loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes, 24/7
-
-    crypto_outcome_resolver_task = asyncio.create_task(crypto_outcome_resolver_loop())
-
-    # B2 options-P&L resolver: capture entry/exit marks for signal_options_expressions
-    async def b2_options_resolver_loop():
-        """Capture entry/exit marks for B2 expression rows (15 min, market hours)."""
-        import pytz
-        from datetime import datetime as dt_cls
-        from jobs.b2_options_resolver import run_b2_resolver_tick, B2_SHADOW_MODE
-
-        if B2_SHADOW_MODE:
-            logger.info("B2 options resolver: shadow mode ON (data collection, no live decisions)")
-
-        await asyncio.sleep(150)  # offset 30s from outcome_resolver's 120s startup delay
-
-        while True:
-            try:
-                et = dt_cls.now(pytz.timezone("America/New_York"))
-                in_market = (
-                    et.weekday() < 5
-                    and (
-                        (et.hour == 9 and et.minute >= 30)
-                        or (10 <= et.hour < 16)
-                    )
-                )
-                if in_market:
-                    pool = await get_postgres_client()
-                    await run_b2_resolver_tick(pool)
-                else:
-                    logger.debug("B2 resolver: outside market hours, skipping")
-            except Exception as e:
-                logger.warning("B2 options resolver loop error: %s", e)
-            await asyncio.sleep(900)  # 15 minutes
-
-    b2_resolver_task = asyncio.create_task(b2_options_resolver_loop())
-
-    # Initial Chronos data load
-    try:
-        from jobs.chronos_ingest import run_chronos_earnings_ingest
-        asyncio.create_task(run_chronos_earnings_ingest())
-        logger.info("📅 Chronos initial earnings load queued")
-    except Exception as e:
-        logger.warning("Chronos initial load error: %s", e)
+    # Deliver broadcasts from the job leader and other replicas to this
+    # process's WebSocket clients (and publish ours to them).
+    manager.start_relay(redis_client)
+
+    # Background loops (jobs/loops.py) run under the leader-elected job runner.
+    # Set RUN_BACKGROUND_JOBS=false when the dedicated worker (worker.py) hosts them.
+    job_runner_task = None
+    from jobs.runner import run_background_jobs_in_process, start_job_runner
+    if run_background_jobs_in_process():
+        try:
+            job_runner_task = await start_job_runner()
+            logger.info("✅ Background job runner started")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not start background job runner: {e}")
+    else:
+        logger.info("Background jobs disabled in the API process (RUN_BACKGROUND_JOBS=false)")
 
-    # Ensure proximity attribution columns exist
-    try:
-        from analytics.proximity_attribution import ensure_attribution_columns
-        await ensure_attribution_columns()
-    except Exception as e:
-        logger.warning("Attribution columns setup: %s", e)
+    # Crypto /market snapshots are served from this process's memory, so the
+    # refresher runs in every API process rather than under the job runner.
+    from api.crypto_market import snapshot_service as crypto_snapshot_service
+    crypto_snapshot_service.start()
 
     # ZEUS Phase 3: verify feed_tier schema after startup
     asyncio.create_task(verify_zeus_schema())
@@ -1182,32 +123,20 @@ async def lifespan(app: FastAPI):
             yield
 
     # Shutdown
-    expiry_task.cancel()
-    universe_task.cancel()
-    mtm_task.cancel()
-    confluence_task.cancel()
-    holy_grail_task.cancel()
-    scout_task.cancel()
-    sector_rs_task.cancel()
-    sell_the_rip_task.cancel()
-    staleness_task.cancel()
-    signals_freshness_task.cancel()  # DEF-SIGNAL-PERSISTENCE-COLLAPSE watchdog
-    vwap_task.cancel()
-    crypto_scan_task.cancel()
-    uw_flow_poller_task.cancel()  # RE-ENABLED 2026-06-18 (L1.0 Chunk 4) — see creation site
-    flow_deadfeed_watchdog_task.cancel()  # L1.0 Chunk 3 dead-feed watchdog
-    pythia_staleness_watchdog_task.cancel()  # PYTHIA per-name liquid-20 staleness alarm (6/29 brief Part 1)
-    triton_shadow_task.cancel()  # Triton Step-0 shadow poller
-    triton_grader_task.cancel()  # Triton Step-0 grader
-    wh_accumulation_task.cancel()
-    wh_reversal_task.cancel()
-    oracle_task.cancel()
-    price_collector_task.cancel()
-    watchlist_alert_task.cancel()
-    chronos_task.cancel()
-    outcome_resolver_task.cancel()
-    crypto_outcome_resolver_task.cancel()
+    await crypto_snapshot_service.stop()
+    await manager.stop_relay()
+    if job_runner_task is not None:
+        job_runner_task.cancel()
+        try:
+            await job_runner_task
+        except asyncio.CancelledError:
+            pass
     logger.info("🛑 Shutting down Pandora's Box...")
+    try:
+        from integrations.uw_api import close_http_client as close_uw_http_client
+        await close_uw_http_client()
+    except Exception as e:
+        logger.warning(f"UW HTTP client close failed: {e}")
     await redis_client.close()
     await postgres_client.close()
     logger.info("👋 Goodbye")
@@ -1351,6 +280,9 @@ async def health_check():
     except Exception as _sfe:
         signals_freshness_block = {"error": str(_sfe)}
 
+    # In-process caches (utils/memory_cache): per-namespace size + hit/miss/eviction.
+    from utils.memory_cache import cache_stats
+
     return {
         "status": overall,
         "server_time_et": now_et.strftime("%Y-%m-%d %H:%M:%S %Z"),
@@ -1360,6 +292,7 @@ async def health_check():
         "zeus": zeus_block,
         "stable_jobs": stable_jobs_block,
         "signals_freshness": signals_freshness_block,
+        "memory_caches": cache_stats(),
     }
 
 
@@ -1511,19 +444,31 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket endpoint for real-time signal updates
     Connects computer, laptop, and phone simultaneously
     """
-    await manager.connect(websocket)
+    await manager.connect(websocket, topics=websocket.query_params.get("topics"))
     logger.info(f"New WebSocket connection. Total: {len(manager.active_connections)}")
     
     try:
         while True:
-            # Keep connection alive with ping/pong
+            # Keep connection alive with ping/pong; also topic subscribe/unsubscribe
             data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
+            await manager.handle_client_message(websocket, data)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info(f"WebSocket disconnected. Remaining: {len(manager.active_connections)}")
 
+
+@app.get("/api/monitoring/websocket")
+async def websocket_stats_endpoint():
+    """Per-connection outbound queue depth, drops and send latency."""
+    return manager.get_stats()
+
+
+@app.get("/api/monitoring/jobs")
+async def job_stats_endpoint():
+    """Background job leader, per-job run timing, overruns and wake lag."""
+    from jobs.runner import get_job_stats
+    return await get_job_stats()
+
 # Import and include routers (webhook endpoints, API routes)
 from webhooks.tradingview import router as webhook_router
 from webhooks.circuit_breaker import router as circuit_breaker_router
@@ -0,0 +1,289 @@
+"""
+Batched multi-symbol bar loader shared by the scanners.
+
+Every scanner path used to call `yf.Ticker(t).history()` once per symbol, so a
+500-name universe cost 500 HTTP round trips per cycle (more when the CTA and
+hybrid scanners overlapped). This module loads a whole universe with one
+`yf.download(..., group_by="ticker")` per chunk of symbols and keeps the
+frames in a short-lived in-process cache the per-ticker code reads from
+(a utils.memory_cache namespace, bounded by entry count and frame bytes).
+
+  - load_bars():  await frames for a list of symbols (cache → in-flight → batch)
+  - prefetch():   same, but returns coverage stats instead of frames
+  - get_cached(): sync read for callers that run in worker threads
+
+Concurrent callers asking for an overlapping symbol set share one download:
+a symbol already being fetched by another caller is awaited, not re-requested.
+A shorter window ("6mo") is served by slicing a cached longer one ("1y") to
+the trading sessions the shorter period would have covered.
+
+Frames match the `Ticker.history()` shape (Open/High/Low/Close/Volume columns,
+DatetimeIndex in exchange time, auto-adjusted). A symbol yfinance returns nothing for is simply
+absent from the result — callers fall back to their own per-symbol fetch,
+exactly as before. Polygon grouped-daily was not used: it returns one *date*
+across all symbols, so a 1y lookback would still cost ~252 calls.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.memory_cache import MemoryCache
+from utils.trading_calendar import get_calendar
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("BAR_LOADER_BATCH_SIZE") or 100)
+DAILY_TTL_SECONDS = int(os.getenv("BAR_LOADER_DAILY_TTL") or 900)      # 15 min
+INTRADAY_TTL_SECONDS = int(os.getenv("BAR_LOADER_INTRADAY_TTL") or 120)  # 2 min
+# A 1y daily frame is ~15 KB; the budgets fit a few universes of periods/intervals.
+MAX_CACHED_FRAMES = int(os.getenv("BAR_LOADER_MAX_FRAMES") or 4000)
+MAX_CACHE_MB = int(os.getenv("BAR_LOADER_MAX_MB") or 128)
+
+# Ticker.history() indexes US listings in exchange time; yf.download returns
+# daily bars tz-naive, so batched frames are put back on this tz.
+EXCHANGE_TZ = "America/New_York"
+
+# Calendar-day span of each yfinance period string, used to serve a shorter
+# window from a cached longer one. "Nd" periods are N sessions, not days.
+_PERIOD_DAYS = {
+    "5d": 5, "1mo": 31, "3mo": 92, "4mo": 123, "6mo": 183,
+    "1y": 366, "12mo": 366, "2y": 731, "24mo": 731, "5y": 1827,
+}
+
+
+
+def _period_sessions(period: str, last_day: date) -> int:
+    """Trading sessions a `period` download ending on `last_day` covers."""
+    if period.endswith("d"):
+        return _PERIOD_DAYS[period]
+    calendar = get_calendar()
+    start = max(last_day - timedelta(days=_PERIOD_DAYS[period]), calendar.first_day)
+    return len(calendar.trading_days(start, last_day))
+
+
+def _frame_bytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=False).sum())
+
+
+# (symbol, interval, period) -> frame
+_cache = MemoryCache(
+    "scanners.bar_loader", ttl=DAILY_TTL_SECONDS, max_entries=MAX_CACHED_FRAMES,
+    max_bytes=MAX_CACHE_MB * 1024 * 1024, sizeof=_frame_bytes,
+)
+# (symbol, period, interval) -> future resolved with a frame or None
+_inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+_stats = {
+    "requested": 0,
+    "cache_hits": 0,
+    "coalesced": 0,
+    "downloaded": 0,
+    "missing": 0,
+    "batches": 0,
+    "batch_failures": 0,
+}
+
+
+def _ttl(interval: str) -> int:
+    return DAILY_TTL_SECONDS if interval in ("1d", "1wk", "1mo") else INTRADAY_TTL_SECONDS
+
+
+def _normalize(symbols: List[str]) -> List[str]:
+    """Upper-case, strip and de-duplicate while keeping first-seen order."""
+    return list(dict.fromkeys(s.upper().strip() for s in symbols if s and str(s).strip()))
+
+
+def get_cached(symbol: str, period: str = "1y", interval: str = "1d") -> Optional[pd.DataFrame]:
+    """Return a fresh cached frame for `symbol`, or None on a miss.
+
+    An exact (period, interval) entry wins; otherwise any fresh entry with a
+    longer known period is sliced down. Returns a copy — scanners add
+    indicator columns in place.
+    """
+    symbol = symbol.upper()
+    exact = _cache.get((symbol, interval, period))
+    if exact is not None:
+        return exact.copy()
+
+    want_days = _PERIOD_DAYS.get(period)
+    if want_days is None:
+        return None
+    for cached_period, have_days in _PERIOD_DAYS.items():
+        if have_days < want_days or cached_period == period:
+            continue
+        frame = _cache.get((symbol, interval, cached_period))
+        if frame is None:
+            continue
+        if frame.empty:
+            return frame.copy()
+        # Keep the last N session dates (all bars of each, for intraday).
+        days = frame.index.normalize()
+        sessions = days.unique()
+        keep = _period_sessions(period, sessions[-1].date())
+        return frame[days >= sessions[-min(max(keep, 1), len(sessions))]].copy()
+    return None
+
+
+def _store(symbol: str, period: str, interval: str, frame: pd.DataFrame) -> None:
+    _cache.set((symbol, interval, period), frame, ttl=_ttl(interval))
+
+
+def _extract_frame(data: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
+    """Pull one symbol's OHLCV frame out of a `yf.download` result."""
+    try:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                return None
+            sub = data[symbol]
+        else:
+            sub = data
+    except Exception:
+        return None
+    if sub is None or sub.empty or "Close" not in sub.columns:
+        return None
+    sub = sub.dropna(how="all")
+    sub = sub.dropna(subset=["Close"])
+    if sub.empty:
+        return None
+    index = pd.DatetimeIndex(sub.index)
+    sub = sub.copy()
+    sub.index = index.tz_localize(EXCHANGE_TZ) if index.tz is None else index.tz_convert(EXCHANGE_TZ)
+    return sub
+
+
+def _download_batch(symbols: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+    """One blocking yf.download for a chunk of symbols. Runs in a worker thread."""
+    import yfinance as yf
+
+    data = yf.download(
+        symbols, period=period, interval=interval,
+        group_by="ticker", auto_adjust=True,
+        progress=False, threads=True, actions=False,
+    )
+    out: Dict[str, pd.DataFrame] = {}
+    if data is None or data.empty:
+        return out
+    for sym in symbols:
+        frame = _extract_frame(data, sym)
+        if frame is not None:
+            out[sym] = frame
+    return out
+
+
+async def load_bars(
+    symbols: List[str],
+    period: str = "1y",
+    interval: str = "1d",
+    rate_budget: Any = None,
+) -> Dict[str, pd.DataFrame]:
+    """Return {symbol: frame} for every symbol yfinance has bars for.
+
+    Order of resolution per symbol: fresh cache → another caller's in-flight
+    download → one batched download per BATCH_SIZE chunk of the remainder.
+    `rate_budget` is any object with an async `acquire()` (e.g. the CTA
+    scanner's ScanRateBudget); one token is drawn per batch, not per symbol.
+    """
+    wanted = _normalize(symbols)
+    _stats["requested"] += len(wanted)
+    out: Dict[str, pd.DataFrame] = {}
+    waits: Dict[str, asyncio.Future] = {}
+    owned: Dict[str, asyncio.Future] = {}
+    loop = asyncio.get_running_loop()
+
+    for sym in wanted:
+        frame = get_cached(sym, period, interval)
+        if frame is not None:
+            _stats["cache_hits"] += 1
+            out[sym] = frame
+            continue
+        key = (sym, period, interval)
+        fut = _inflight.get(key)
+        if fut is not None:
+            _stats["coalesced"] += 1
+            waits[sym] = fut
+            continue
+        fut = loop.create_future()
+        _inflight[key] = fut
+        owned[sym] = fut
+
+    to_fetch = list(owned)
+    try:
+        for i in range(0, len(to_fetch), BATCH_SIZE):
+            chunk = to_fetch[i:i + BATCH_SIZE]
+            if rate_budget is not None:
+                await rate_budget.acquire()
+            _stats["batches"] += 1
+            try:
+                frames = await asyncio.to_thread(_download_batch, chunk, period, interval)
+            except Exception as exc:
+                _stats["batch_failures"] += 1
+                logger.warning("bar_loader: batch of %d (%s/%s) failed: %s",
+                               len(chunk), period, interval, exc)
+                frames = {}
+            for sym in chunk:
+                frame = frames.get(sym)
+                if frame is not None:
+                    _stats["downloaded"] += 1
+                    _store(sym, period, interval, frame)
+                    out[sym] = frame.copy()
+                else:
+                    _stats["missing"] += 1
+                owned[sym].set_result(frame)
+    finally:
+        for sym, fut in owned.items():
+            _inflight.pop((sym, period, interval), None)
+            if not fut.done():
+                fut.set_result(None)
+
+    for sym, fut in waits.items():
+        frame = await fut
+        if frame is not None:
+            out[sym] = frame.copy()
+    return out
+
+
+async def prefetch(
+    symbols: List[str],
+    period: str = "1y",
+    interval: str = "1d",
+    rate_budget: Any = None,
+) -> Dict[str, Any]:
+    """Warm the cache for a universe ahead of per-ticker logic.
+
+    Returns a coverage summary suitable for a scan's stats block.
+    """
+    wanted = _normalize(symbols)
+    batches_before = _stats["batches"]
+    t0 = time.perf_counter()
+    frames = await load_bars(wanted, period=period, interval=interval, rate_budget=rate_budget)
+    elapsed = time.perf_counter() - t0
+    summary = {
+        "requested": len(wanted),
+        "loaded": len(frames),
+        "missing": len(wanted) - len(frames),
+        "batches": _stats["batches"] - batches_before,
+        "seconds": round(elapsed, 2),
+    }
+    logger.info(
+        "bar_loader: prefetched %d/%d symbols (%s/%s) in %d batch(es), %.1fs",
+        summary["loaded"], summary["requested"], period, interval,
+        summary["batches"], elapsed,
+    )
+    return summary
+
+
+def get_bar_loader_stats() -> Dict[str, Any]:
+    """Process-lifetime counters plus current cache size."""
+    cache = _cache.stats()
+    return {**_stats, "cached_frames": cache["entries"], "cached_bytes": cache["bytes"],
+            "evicted": cache["evicted"]}
+
+
+def clear_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,407 @@
+"""
+Incremental CTA indicator state — per ticker, persisted in Redis.
+
+calculate_cta_indicators() recomputes every SMA/ATR/ADX/RSI over a full year
+of bars on every scan, even though between two hourly scans only the latest
+(in-progress) bar has changed. This module keeps the rolling-window and
+Wilder-smoothing accumulators for each ticker so a scan only has to:
+
+  1. commit the bars that completed since the last scan (O(1) each), and
+  2. evaluate the current bar against the committed state without
+     committing it (it is still moving; it is committed once the next bar
+     appears).
+
+The accumulators reproduce calculate_cta_indicators' formulas exactly
+(indicators.kernels with pandas_ta's conventions): SMA = rolling mean with
+full-window min_periods; ATR/RSI/ADX smoothing = pandas_ta `rma`
+(ewm(alpha=1/n, adjust=True, min_periods=n)) replayed with pandas' own
+online EWM recurrence, including its NaN handling.
+
+State is only trusted when it lines up with the fetched history: if the last
+committed date is missing from the frame, or its close no longer matches
+(split/dividend re-adjustment rewrites history), advance() returns None and
+the caller reseeds from a full computation.
+"""
+
+import json
+import logging
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY_PREFIX = "cta:indicator_state:"
+STATE_TTL = 7 * 86400  # a week without a scan → reseed from scratch
+STATE_VERSION = 1
+TAIL_ROWS = 10  # committed indicator rows kept for the 3-bar lookback checks
+
+ATR_PERIOD = 14
+ADX_PERIOD = 14
+RSI_PERIOD = 14
+VOL_AVG_PERIOD = 30
+SMA_WINDOWS = (20, 50, 120, 200)
+HIGH_WINDOW = 60
+
+_NAN = float("nan")
+
+INDICATOR_COLUMNS = [
+    "sma20", "sma50", "sma120", "sma200", "atr", "vol_avg", "vol_ratio",
+    "vwap_20", "adx", "rsi", "vol_avg_20", "rvol", "rolling_high_60",
+    "correction_pct", "above_120", "days_above_120", "dist_to_20_pct",
+    "dist_to_50_pct", "dist_to_120_pct", "close_above_50", "close_above_20",
+]
+
+
+def classify_cta_zones(close, sma20, sma50, sma120) -> np.ndarray:
+    """Vectorized get_cta_zone() over whole columns (zone names only).
+
+    Branch order mirrors the scalar version exactly: missing SMA → UNKNOWN,
+    then CAPITULATION, MAX_LONG, DE_LEVERAGING, WATERFALL, else TRANSITION.
+    """
+    p = np.asarray(close, dtype=float)
+    s20 = np.asarray(sma20, dtype=float)
+    s50 = np.asarray(sma50, dtype=float)
+    s120 = np.asarray(sma120, dtype=float)
+    with np.errstate(invalid="ignore"):
+        conditions = [
+            np.isnan(s20) | np.isnan(s50) | np.isnan(s120),
+            s20 < s120,
+            (p > s20) & (p > s50) & (p > s120),
+            (p < s20) & (p >= s50),
+            p < s50,
+        ]
+    choices = ["UNKNOWN", "CAPITULATION", "MAX_LONG", "DE_LEVERAGING", "WATERFALL"]
+    return np.select(conditions, choices, default="TRANSITION").astype(object)
+
+
+def _div(a: float, b: float) -> float:
+    """Float division with pandas semantics (x/0 → ±inf, 0/0 → NaN)."""
+    if b == 0:
+        if a == 0 or a != a:
+            return _NAN
+        return math.inf if a > 0 else -math.inf
+    return a / b
+
+
+def _date_key(ts: Any) -> str:
+    return pd.Timestamp(ts).date().isoformat()
+
+
+class _Ewm:
+    """Online pandas ewm(alpha=1/length, adjust=True, min_periods=length).mean()."""
+
+    __slots__ = ("alpha", "min_periods", "weighted", "old_wt", "nobs")
+
+    def __init__(self, length: int, weighted: float = _NAN, old_wt: float = 1.0, nobs: int = 0):
+        self.alpha = 1.0 / length
+        self.min_periods = length
+        self.weighted = weighted
+        self.old_wt = old_wt
+        self.nobs = nobs
+
+    def _next(self, x: float) -> Tuple[float, float, int]:
+        weighted, old_wt, nobs = self.weighted, self.old_wt, self.nobs
+        is_obs = x == x
+        nobs += is_obs
+        if weighted == weighted:
+            old_wt *= 1.0 - self.alpha
+            if is_obs:
+                if weighted != x:
+                    weighted = (old_wt * weighted + x) / (old_wt + 1.0)
+                old_wt += 1.0
+        elif is_obs:
+            weighted = x
+        return weighted, old_wt, nobs
+
+    def step(self, x: float, commit: bool) -> float:
+        weighted, old_wt, nobs = self._next(x)
+        if commit:
+            self.weighted, self.old_wt, self.nobs = weighted, old_wt, nobs
+        return weighted if nobs >= self.min_periods else _NAN
+
+    def to_list(self) -> List[float]:
+        return [self.weighted, self.old_wt, self.nobs]
+
+    @classmethod
+    def from_list(cls, length: int, raw: List[float]) -> "_Ewm":
+        return cls(length, float(raw[0]), float(raw[1]), int(raw[2]))
+
+
+class CtaIndicatorState:
+    """Rolling accumulators for one ticker's CTA indicator columns."""
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker.upper()
+        self.last_date: Optional[str] = None
+        self.last_close: Optional[float] = None
+        self.bar_index = -1  # index of the last committed bar
+        self.prev_high = _NAN
+        self.prev_low = _NAN
+        self.prev_close = _NAN
+        self.closes: Deque[float] = deque(maxlen=max(SMA_WINDOWS))
+        self.close_sums = {w: 0.0 for w in SMA_WINDOWS}
+        self.volumes: Deque[float] = deque(maxlen=VOL_AVG_PERIOD)
+        self.vol_sums = {20: 0.0, VOL_AVG_PERIOD: 0.0}
+        self.tpv: Deque[float] = deque(maxlen=20)
+        self.tpv_sum = 0.0
+        self.high_max: Deque[Tuple[int, float]] = deque()  # monotonic, decreasing highs
+        self.atr = _Ewm(ATR_PERIOD)
+        self.dm_plus = _Ewm(ADX_PERIOD)
+        self.dm_minus = _Ewm(ADX_PERIOD)
+        self.adx = _Ewm(ADX_PERIOD)
+        self.rsi_gain = _Ewm(RSI_PERIOD)
+        self.rsi_loss = _Ewm(RSI_PERIOD)
+        self.days_above_120 = 0
+        self.tail: List[Dict[str, Any]] = []
+
+    # ── rolling windows ──────────────────────────────────────────
+
+    @staticmethod
+    def _window_mean(buf: Deque[float], total: float, window: int, x: float) -> Tuple[float, float]:
+        """(new running sum, mean-or-NaN) after appending x to the last `window` values."""
+        n = len(buf)
+        new_total = total + x - (buf[-window] if n >= window else 0.0)
+        mean = new_total / window if n + 1 >= window else _NAN
+        return new_total, mean
+
+    def _rolling_high(self, idx: int, high: float) -> float:
+        m = high
+        for i, h in self.high_max:
+            if i > idx - HIGH_WINDOW:
+                m = max(m, h)
+                break
+        return m if idx + 1 >= HIGH_WINDOW else _NAN
+
+    def _commit_high(self, idx: int, high: float) -> None:
+        dq = self.high_max
+        while dq and dq[0][0] <= idx - HIGH_WINDOW:
+            dq.popleft()
+        while dq and dq[-1][1] <= high:
+            dq.pop()
+        dq.append((idx, high))
+
+    # ── one bar ──────────────────────────────────────────────────
+
+    def step(self, date: str, o: float, h: float, l: float, c: float, v: float, commit: bool) -> Dict[str, Any]:
+        """Indicator row for one bar; mutates state only when `commit`."""
+        idx = self.bar_index + 1
+        row: Dict[str, Any] = {"date": date}
+
+        new_close_sums = {}
+        for w in SMA_WINDOWS:
+            new_close_sums[w], row[f"sma{w}"] = self._window_mean(self.closes, self.close_sums[w], w, c)
+
+        pc, ph, pl = self.prev_close, self.prev_high, self.prev_low
+        tr = max(abs(h - l), abs(h - pc), abs(pc - l)) if pc == pc else _NAN
+        atr = self.atr.step(tr, commit)
+        row["atr"] = atr
+
+        vol30_sum, row["vol_avg"] = self._window_mean(self.volumes, self.vol_sums[VOL_AVG_PERIOD], VOL_AVG_PERIOD, v)
+        vol20_sum, row["vol_avg_20"] = self._window_mean(self.volumes, self.vol_sums[20], 20, v)
+        row["vol_ratio"] = _div(v, row["vol_avg"])
+        row["rvol"] = _div(v, row["vol_avg_20"])
+
+        tp = (h + l + c) / 3
+        tpv_sum, _ = self._window_mean(self.tpv, self.tpv_sum, 20, tp * v)
+        row["vwap_20"] = _div(tpv_sum, vol20_sum) if idx + 1 >= 20 else _NAN
+
+        if ph == ph:
+            up, dn = h - ph, pl - l
+            pos = up if (up > dn and up > 0) else 0.0
+            neg = dn if (dn > up and dn > 0) else 0.0
+        else:
+            pos = neg = _NAN
+        k = _div(100.0, atr)
+        dmp = k * self.dm_plus.step(pos, commit)
+        dmn = k * self.dm_minus.step(neg, commit)
+        dx = _div(100.0 * abs(dmp - dmn), dmp + dmn)
+        row["adx"] = self.adx.step(dx, commit)
+
+        diff = c - pc
+        gain = (diff if diff > 0 else 0.0) if diff == diff else _NAN
+        loss = (diff if diff < 0 else 0.0) if diff == diff else _NAN
+        avg_gain = self.rsi_gain.step(gain, commit)
+        avg_loss = self.rsi_loss.step(loss, commit)
+        row["rsi"] = _div(100.0 * avg_gain, avg_gain + abs(avg_loss))
+
+        rh = self._rolling_high(idx, h)
+        row["rolling_high_60"] = rh
+        row["correction_pct"] = _div(rh - c, rh) * 100
+
+        sma20, sma50, sma120 = row["sma20"], row["sma50"], row["sma120"]
+        above = bool(c > sma120)
+        days_above = self.days_above_120 + 1 if above else 0
+        row["above_120"] = above
+        row["days_above_120"] = days_above
+        row["dist_to_20_pct"] = _div(c - sma20, sma20) * 100
+        row["dist_to_50_pct"] = _div(c - sma50, sma50) * 100
+        row["dist_to_120_pct"] = _div(c - sma120, sma120) * 100
+        row["close_above_50"] = bool(c > sma50)
+        row["close_above_20"] = bool(c > sma20)
+
+        if commit:
+            self.closes.append(c)
+            self.close_sums = new_close_sums
+            self.volumes.append(v)
+            self.vol_sums = {20: vol20_sum, VOL_AVG_PERIOD: vol30_sum}
+            self.tpv.append(tp * v)
+            self.tpv_sum = tpv_sum
+            self._commit_high(idx, h)
+            self.days_above_120 = days_above
+            self.prev_high, self.prev_low, self.prev_close = h, l, c
+            self.bar_index = idx
+            self.last_date = date
+            self.last_close = c
+            self.tail.append(row)
+            if len(self.tail) > TAIL_ROWS:
+                del self.tail[0]
+        return row
+
+    # ── frame-level API ─────────────────────────────────────────
+
+    @classmethod
+    def seed(cls, ticker: str, df: pd.DataFrame) -> "CtaIndicatorState":
+        """Replay every bar but the last (possibly in-progress) one."""
+        state = cls(ticker)
+        for date, o, h, l, c, v in _iter_bars(df.iloc[:-1]):
+            state.step(date, o, h, l, c, v, commit=True)
+        return state
+
+    def advance(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Commit newly completed bars, evaluate the latest, return the frame.
+
+        Returns None when the state cannot be lined up with `df`; the caller
+        must then reseed. The returned frame holds only the last TAIL_ROWS +
+        new bars — the signal checks read at most the last three rows.
+        """
+        if self.last_date is None or len(df) < 2:
+            return None
+        # Walk back from the newest bar — only the bars since the last scan
+        # (plus the retained tail) are ever touched, never the whole history.
+        index = df.index
+        pos = len(index) - 1
+        while pos >= 0 and _date_key(index[pos]) > self.last_date:
+            pos -= 1
+        if pos < 0 or _date_key(index[pos]) != self.last_date or pos >= len(df) - 1:
+            return None
+        close_then = float(df["Close"].iloc[pos])
+        if not math.isclose(close_then, self.last_close, rel_tol=1e-9, abs_tol=1e-9):
+            return None
+        if pos + 1 < len(self.tail):
+            return None
+        tail_dates = [_date_key(ts) for ts in index[pos - len(self.tail) + 1:pos + 1]]
+        if tail_dates != [r["date"] for r in self.tail]:
+            return None
+
+        new_bars = list(_iter_bars(df.iloc[pos + 1:]))
+        if any(any(x != x for x in bar[1:]) for bar in new_bars):
+            return None
+        rows = list(self.tail)
+        for bar in new_bars[:-1]:
+            rows.append(self.step(*bar, commit=True))
+        rows.append(self.step(*new_bars[-1], commit=False))
+        return attach_rows(df, rows)
+
+    # ── persistence ────────────────────────────────────────────
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "v": STATE_VERSION,
+            "ticker": self.ticker,
+            "last_date": self.last_date,
+            "last_close": self.last_close,
+            "bar_index": self.bar_index,
+            "prev": [self.prev_high, self.prev_low, self.prev_close],
+            "closes": list(self.closes),
+            "close_sums": {str(k): v for k, v in self.close_sums.items()},
+            "volumes": list(self.volumes),
+            "vol_sums": {str(k): v for k, v in self.vol_sums.items()},
+            "tpv": list(self.tpv),
+            "tpv_sum": self.tpv_sum,
+            "high_max": [list(x) for x in self.high_max],
+            "ewm": {
+                "atr": self.atr.to_list(),
+                "dm_plus": self.dm_plus.to_list(),
+                "dm_minus": self.dm_minus.to_list(),
+                "adx": self.adx.to_list(),
+                "rsi_gain": self.rsi_gain.to_list(),
+                "rsi_loss": self.rsi_loss.to_list(),
+            },
+            "days_above_120": self.days_above_120,
+            "tail": self.tail,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> Optional["CtaIndicatorState"]:
+        if not raw or raw.get("v") != STATE_VERSION:
+            return None
+        state = cls(raw["ticker"])
+        state.last_date = raw["last_date"]
+        state.last_close = raw["last_close"]
+        state.bar_index = int(raw["bar_index"])
+        state.prev_high, state.prev_low, state.prev_close = (float(x) for x in raw["prev"])
+        state.closes.extend(raw["closes"])
+        state.close_sums = {int(k): float(v) for k, v in raw["close_sums"].items()}
+        state.volumes.extend(raw["volumes"])
+        state.vol_sums = {int(k): float(v) for k, v in raw["vol_sums"].items()}
+        state.tpv.extend(raw["tpv"])
+        state.tpv_sum = float(raw["tpv_sum"])
+        state.high_max.extend((int(i), float(h)) for i, h in raw["high_max"])
+        ewm = raw["ewm"]
+        state.atr = _Ewm.from_list(ATR_PERIOD, ewm["atr"])
+        state.dm_plus = _Ewm.from_list(ADX_PERIOD, ewm["dm_plus"])
+        state.dm_minus = _Ewm.from_list(ADX_PERIOD, ewm["dm_minus"])
+        state.adx = _Ewm.from_list(ADX_PERIOD, ewm["adx"])
+        state.rsi_gain = _Ewm.from_list(RSI_PERIOD, ewm["rsi_gain"])
+        state.rsi_loss = _Ewm.from_list(RSI_PERIOD, ewm["rsi_loss"])
+        state.days_above_120 = int(raw["days_above_120"])
+        state.tail = list(raw["tail"])
+        return state
+
+
+def _iter_bars(df: pd.DataFrame):
+    cols = [df["Open"].to_numpy(float), df["High"].to_numpy(float), df["Low"].to_numpy(float),
+            df["Close"].to_numpy(float), df["Volume"].to_numpy(float)]
+    for i, ts in enumerate(df.index):
+        yield (_date_key(ts), *(float(col[i]) for col in cols))
+
+
+def attach_rows(df: pd.DataFrame, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Last len(rows) bars of df with the indicator rows joined on."""
+    bars = df.iloc[-len(rows):]
+    data = {col: bars[col].to_numpy() for col in bars.columns}
+    for col in INDICATOR_COLUMNS:
+        data[col] = [r[col] for r in rows]
+    data["cta_zone"] = classify_cta_zones(data["Close"], data["sma20"], data["sma50"], data["sma120"])
+    return pd.DataFrame(data, index=bars.index)
+
+
+# ── Redis persistence ───────────────────────────────────────────
+
+async def load_state(ticker: str) -> Optional[CtaIndicatorState]:
+    try:
+        from database.redis_client import get_redis_client
+        client = await get_redis_client()
+        if not client:
+            return None
+        raw = await client.get(f"{STATE_KEY_PREFIX}{ticker.upper()}")
+        if not raw:
+            return None
+        return CtaIndicatorState.from_dict(json.loads(raw))
+    except Exception as e:
+        logger.debug(f"CTA indicator state load failed for {ticker}: {e}")
+        return None
+
+
+async def save_state(state: CtaIndicatorState) -> None:
+    try:
+        from database.redis_client import get_redis_client
+        client = await get_redis_client()
+        if client:
+            await client.setex(f"{STATE_KEY_PREFIX}{state.ticker}", STATE_TTL, json.dumps(state.to_dict()))
+    except Exception as e:
+        logger.debug(f"CTA indicator state save failed for {state.ticker}: {e}")
@@ -11,7 +11,7 @@ Scans for:
 
 Output: Actionable signals with Entry, Stop, Target prices
 
-Requirements: yfinance, pandas, pandas_ta
+Requirements: yfinance, pandas
 """
 
 import pandas as pd
@@ -23,9 +23,18 @@ import uuid
 import asyncio
 import os
 import json
+import time
 
 logger = logging.getLogger(__name__)
 
+from indicators import kernels
+from scanners import bar_loader
+from scanners.cta_indicator_state import (
+    CtaIndicatorState,
+    classify_cta_zones,
+    load_state as load_indicator_state,
+    save_state as save_indicator_state,
+)
 from scanners.universe import SP500_EXPANDED, RUSSELL_HIGH_VOLUME, build_scan_universe
 from config.signal_profiles import get_rr_profile
 from config.sectors import detect_sector, SECTOR_ETF_MAP
@@ -55,18 +64,63 @@ def convert_numpy_types(obj):
 # Try to import optional dependencies
 try:
     import yfinance as yf
-    import pandas_ta as ta
     CTA_SCANNER_AVAILABLE = True
 except ImportError:
     CTA_SCANNER_AVAILABLE = False
-    logger.warning("CTA Scanner dependencies not installed. Run: pip install yfinance pandas_ta")
+    logger.warning("CTA Scanner dependencies not installed. Run: pip install yfinance")
 
 
-async def _fetch_history_async(ticker: str, period: str = "1y") -> pd.DataFrame:
+class ScanRateBudget:
+    """Shared pacing budget for the outbound data calls of one scan run.
+
+    Reservation-based: `acquire()` claims the next send slot under the lock
+    and sleeps *outside* it, so a worker waiting for its slot never blocks
+    other workers from reserving theirs. Up to `burst` calls may go out
+    back-to-back after an idle period; beyond that calls are spaced
+    1/`rate_per_sec` apart regardless of how many workers are running.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self.burst = max(1, int(burst))
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+        self.calls = 0
+        self.waited_seconds = 0.0
+
+    async def acquire(self) -> None:
+        if self.interval <= 0:
+            self.calls += 1
+            return
+        async with self._lock:
+            now = time.monotonic()
+            # Unused capacity accrues up to `burst` slots, no further.
+            slot = max(self._next_slot, now - (self.burst - 1) * self.interval)
+            self._next_slot = slot + self.interval
+            self.calls += 1
+        delay = slot - now
+        if delay > 0:
+            self.waited_seconds += delay
+            await asyncio.sleep(delay)
+
+
+async def _fetch_history_async(
+    ticker: str,
+    period: str = "1y",
+    rate_budget: Optional[ScanRateBudget] = None,
+) -> pd.DataFrame:
     def _sync_fetch() -> pd.DataFrame:
         stock = yf.Ticker(ticker)
         return stock.history(period=period)
 
+    # Served from the universe prefetch when run_cta_scan has batched it;
+    # only symbols the batch missed fall through to a per-ticker request.
+    cached = bar_loader.get_cached(ticker, period=period)
+    if cached is not None:
+        return cached
+
+    if rate_budget is not None:
+        await rate_budget.acquire()
     return await asyncio.to_thread(_sync_fetch)
 
 
@@ -125,7 +179,21 @@ CTA_CONFIG = {
         "volume_breakout": 60,
         "pullback_entry": 50,
         "zone_upgrade": 40,
-    }
+    },
+
+    # Concurrent universe scan (run_cta_scan). Replaces the old strictly
+    # sequential walk + fixed 0.05s per-ticker sleep. `workers` bounds how
+    # many tickers are in flight at once; `requests_per_second` / `burst`
+    # size the single rate budget every worker draws from before an outbound
+    # data call; `ticker_timeout_seconds` caps one ticker so a hung yfinance
+    # request can't stall a worker for the rest of the run. workers=1 is the
+    # legacy sequential behaviour.
+    "concurrency": {
+        "workers": int(os.getenv("CTA_SCAN_WORKERS") or 8),
+        "requests_per_second": float(os.getenv("CTA_SCAN_RPS") or 10.0),
+        "burst": int(os.getenv("CTA_SCAN_BURST") or 10),
+        "ticker_timeout_seconds": float(os.getenv("CTA_SCAN_TICKER_TIMEOUT") or 45.0),
+    },
 }
 
 # H11: Signal type categories for distinct risk profiles
@@ -237,14 +305,18 @@ def calculate_cta_indicators(df: pd.DataFrame) -> pd.DataFrame:
         return df
     
     try:
-        # Core SMAs
-        df['sma20'] = ta.sma(df['Close'], length=20)
-        df['sma50'] = ta.sma(df['Close'], length=50)
-        df['sma120'] = ta.sma(df['Close'], length=120)
-        df['sma200'] = ta.sma(df['Close'], length=200)
+        # Core SMAs (indicators.kernels; RSI/ATR/ADX use pandas_ta's `rma`
+        # smoothing so CtaIndicatorState's online replay still matches)
+        high = df['High'].to_numpy(dtype=float)
+        low = df['Low'].to_numpy(dtype=float)
+        close = df['Close'].to_numpy(dtype=float)
+        df['sma20'] = kernels.sma(close, 20)
+        df['sma50'] = kernels.sma(close, 50)
+        df['sma120'] = kernels.sma(close, 120)
+        df['sma200'] = kernels.sma(close, 200)
         
         # ATR for stop calculation
-        df['atr'] = ta.atr(df['High'], df['Low'], df['Close'], length=CTA_CONFIG["risk"]["atr_period"])
+        df['atr'] = kernels.atr(high, low, close, CTA_CONFIG["risk"]["atr_period"], seed="adjusted")
         
         # Volume metrics
         vol_period = CTA_CONFIG["volume"]["avg_period"]
@@ -255,13 +327,9 @@ def calculate_cta_indicators(df: pd.DataFrame) -> pd.DataFrame:
         typical_price = (df['High'] + df['Low'] + df['Close']) / 3
         df['vwap_20'] = (typical_price * df['Volume']).rolling(20).sum() / df['Volume'].rolling(20).sum()
 
-        adx_data = ta.adx(df['High'], df['Low'], df['Close'], length=14)
-        if adx_data is not None and 'ADX_14' in adx_data.columns:
-            df['adx'] = adx_data['ADX_14']
-        else:
-            df['adx'] = None
+        df['adx'] = kernels.adx(high, low, close, 14, seed="adjusted")["adx"]
 
-        df['rsi'] = ta.rsi(df['Close'], length=14)
+        df['rsi'] = kernels.rsi(close, 14, seed="adjusted")
 
         df['vol_avg_20'] = df['Volume'].rolling(20).mean()
         df['rvol'] = df['Volume'] / df['vol_avg_20']
@@ -283,11 +351,8 @@ def calculate_cta_indicators(df: pd.DataFrame) -> pd.DataFrame:
         df['close_above_50'] = df['Close'] > df['sma50']
         df['close_above_20'] = df['Close'] > df['sma20']
         
-        # CTA Zone
-        df['cta_zone'] = df.apply(
-            lambda row: get_cta_zone(row['Close'], row['sma20'], row['sma50'], row['sma120'])[0],
-            axis=1
-        )
+        # CTA Zone (vectorized — same branch order as get_cta_zone)
+        df['cta_zone'] = classify_cta_zones(df['Close'], df['sma20'], df['sma50'], df['sma120'])
         
     except Exception as e:
         logger.error(f"Error calculating CTA indicators: {e}")
@@ -295,6 +360,36 @@ def calculate_cta_indicators(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+async def calculate_cta_indicators_incremental(ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Incremental variant of calculate_cta_indicators for the recurring scan.
+
+    Advances the ticker's persisted indicator state (scanners/cta_indicator_state)
+    by only the bars that completed since the last scan, then evaluates the
+    current bar. Falls back to the full computation — and reseeds the state —
+    when there is no state yet or it no longer lines up with the history.
+    The incremental path returns only the recent bars the signal checks read.
+    """
+    if df is None or df.empty:
+        return df
+
+    state = await load_indicator_state(ticker)
+    out = None
+    if state is not None:
+        try:
+            out = state.advance(df)
+        except Exception as e:
+            logger.debug(f"{ticker}: incremental CTA indicators failed, reseeding: {e}")
+            out = None
+
+    if out is None:
+        out = calculate_cta_indicators(df.copy())
+        state = CtaIndicatorState.seed(ticker, df)
+
+    await save_indicator_state(state)
+    return out
+
+
 PREFERRED_STOP_ANCHORS = {
     "MAX_LONG": "sma20",
     "TRANSITION": "sma50",   # Scanner zone label for SMA50 transition state
@@ -1378,8 +1473,16 @@ def check_resistance_rejection(df: pd.DataFrame, ticker: str) -> Optional[Dict]:
     return None
 
 
-async def scan_ticker_cta(ticker: str, allow_shorts: bool = False) -> List[Dict]:
-    """Scan a single ticker for all CTA signals"""
+async def scan_ticker_cta(
+    ticker: str,
+    allow_shorts: bool = False,
+    rate_budget: Optional[ScanRateBudget] = None,
+) -> List[Dict]:
+    """Scan a single ticker for all CTA signals.
+
+    `rate_budget` is the run-wide pacing budget handed in by run_cta_scan;
+    standalone callers leave it None and fetch unpaced.
+    """
     if not CTA_SCANNER_AVAILABLE:
         return []
 
@@ -1390,14 +1493,14 @@ async def scan_ticker_cta(ticker: str, allow_shorts: bool = False) -> List[Dict]
 
     try:
         # Fetch data
-        df = await _fetch_history_async(ticker, period="1y")
+        df = await _fetch_history_async(ticker, period="1y", rate_budget=rate_budget)
         
         if df.empty or len(df) < 150:
             logger.debug(f"{ticker}: Insufficient data for CTA scan")
             return []
         
-        # Calculate indicators
-        df = calculate_cta_indicators(df)
+        # Calculate indicators (incremental against the persisted per-ticker state)
+        df = await calculate_cta_indicators_incremental(ticker, df)
 
         # Write CTA zone to Redis for watchlist enrichment
         try:
@@ -1982,7 +2085,19 @@ async def build_dynamic_universe(sector_strength: Dict[str, Any] = None) -> List
     return filtered
 
 
-async def run_cta_scan(tickers: List[str] = None, include_watchlist: bool = True, use_dynamic_universe: bool = True) -> Dict:
+def _latency_percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Percentile of per-ticker scan times in seconds (None when empty)."""
+    if not samples:
+        return None
+    return round(float(np.percentile(samples, pct)), 3)
+
+
+async def run_cta_scan(
+    tickers: List[str] = None,
+    include_watchlist: bool = True,
+    use_dynamic_universe: bool = True,
+    workers: Optional[int] = None,
+) -> Dict:
     """
     Run full CTA scan on multiple tickers
     
@@ -1990,6 +2105,7 @@ async def run_cta_scan(tickers: List[str] = None, include_watchlist: bool = True
         tickers: Optional list of specific tickers to scan
         include_watchlist: If True, prioritize user's watchlist
         use_dynamic_universe: If True, build optimized universe with filters
+        workers: Concurrent scan workers (defaults to CTA_CONFIG["concurrency"]["workers"])
     
     Returns signals sorted by priority with entry/stop/target
     """
@@ -2094,29 +2210,91 @@ async def run_cta_scan(tickers: List[str] = None, include_watchlist: bool = True
         "watchlist_scanned": 0,
         "filtered_out": 0
     }
-    
-    for ticker in all_tickers:
+
+    # ── Bounded-parallel scan ─────────────────────────────────
+    # N workers pull tickers off a shared queue; every outbound fetch draws
+    # from one run-wide rate budget (replaces the fixed per-ticker sleep) and
+    # each ticker is capped by a timeout. Results land in a slot per ticker so
+    # the downstream ordering matches the universe order exactly as before.
+    concurrency = CTA_CONFIG.get("concurrency", {})
+    n_workers = max(1, int(workers or concurrency.get("workers", 8)))
+    ticker_timeout = float(concurrency.get("ticker_timeout_seconds", 45.0))
+    rate_budget = ScanRateBudget(
+        float(concurrency.get("requests_per_second", 10.0)),
+        burst=int(concurrency.get("burst", 10)),
+    )
+
+    # Warm the VIX regime cache once so the workers don't all race to refresh it.
+    await _refresh_vix_regime()
+
+    # Load the whole universe's daily bars in a handful of batched downloads
+    # before any per-ticker work; scan_ticker_cta then reads from the cache.
+    try:
+        prefetch_stats = await bar_loader.prefetch(all_tickers, period="1y", rate_budget=rate_budget)
+    except Exception as e:
+        logger.warning(f"CTA bar prefetch failed, falling back to per-ticker fetch: {e}")
+        prefetch_stats = {"requested": len(all_tickers), "loaded": 0, "error": str(e)}
+
+    per_ticker_signals: List[Optional[List[Dict]]] = [None] * len(all_tickers)
+    ticker_seconds: List[float] = []
+    timed_out: List[str] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for idx, ticker in enumerate(all_tickers):
+        queue.put_nowait((idx, ticker))
+
+    async def _scan_worker() -> None:
+        while True:
+            try:
+                idx, ticker = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            try:
+                per_ticker_signals[idx] = await asyncio.wait_for(
+                    scan_ticker_cta(ticker, allow_shorts=True, rate_budget=rate_budget),
+                    timeout=ticker_timeout,
+                )
+            except asyncio.TimeoutError:
+                timed_out.append(ticker)
+                logger.warning("CTA scan: %s timed out after %.0fs", ticker, ticker_timeout)
+            except Exception as e:
+                logger.error(f"Error scanning {ticker}: {e}")
+            finally:
+                ticker_seconds.append(time.perf_counter() - t0)
+
+    scan_t0 = time.perf_counter()
+    await asyncio.gather(*(_scan_worker() for _ in range(min(n_workers, len(all_tickers)))))
+    wall_clock = time.perf_counter() - scan_t0
+
+    for ticker, signals in zip(all_tickers, per_ticker_signals):
+        if signals is None:
+            continue
         is_watchlist = ticker in watchlist
-        
-        try:
-            signals = await scan_ticker_cta(ticker, allow_shorts=True)
-            for signal in signals:
-                signal["from_watchlist"] = is_watchlist
-                all_signals.append(signal)
-            
-            # Track stats
-            if is_watchlist:
-                scan_stats["watchlist_scanned"] += 1
-            elif ticker in RUSSELL_HIGH_VOLUME:
-                scan_stats["russell_scanned"] += 1
-            else:
-                scan_stats["sp500_scanned"] += 1
-                
-        except Exception as e:
-            logger.error(f"Error scanning {ticker}: {e}")
-        
-        await asyncio.sleep(0.05)  # Faster rate limiting (was 0.1)
-    
+        for signal in signals:
+            signal["from_watchlist"] = is_watchlist
+            all_signals.append(signal)
+
+        # Track stats
+        if is_watchlist:
+            scan_stats["watchlist_scanned"] += 1
+        elif ticker in RUSSELL_HIGH_VOLUME:
+            scan_stats["russell_scanned"] += 1
+        else:
+            scan_stats["sp500_scanned"] += 1
+
+    scan_stats.update({
+        "workers": n_workers,
+        "wall_clock_seconds": round(wall_clock, 2),
+        "ticker_p50_seconds": _latency_percentile(ticker_seconds, 50),
+        "ticker_p95_seconds": _latency_percentile(ticker_seconds, 95),
+        "throughput_tickers_per_sec": round(len(all_tickers) / wall_clock, 2) if wall_clock > 0 else None,
+        "timed_out": len(timed_out),
+        "timed_out_tickers": timed_out[:20],
+        "rate_budget_calls": rate_budget.calls,
+        "rate_budget_wait_seconds": round(rate_budget.waited_seconds, 2),
+        "bar_prefetch": prefetch_stats,
+    })
+
     elapsed = (datetime.now() - start_time).total_seconds()
 
     # ── M15: TICK breadth cross-reference ──────────────────────
@@ -2188,6 +2366,11 @@ async def run_cta_scan(tickers: List[str] = None, include_watchlist: bool = True
     
     logger.info(f"✅ CTA Scan complete: {len(all_signals)} signals in {elapsed:.1f}s")
     logger.info(f"   Universe: {scan_stats['watchlist_scanned']} WL, {scan_stats['sp500_scanned']} S&P, {scan_stats['russell_scanned']} Russell")
+    logger.info(
+        "   Throughput: %s tickers/s with %d workers (p50 %ss, p95 %ss, %d timed out)",
+        scan_stats["throughput_tickers_per_sec"], n_workers,
+        scan_stats["ticker_p50_seconds"], scan_stats["ticker_p95_seconds"], len(timed_out),
+    )
     logger.info(f"   Signals: Golden {len(golden_touch)}, Two-Close {len(two_close)}, Pullbacks {len(pullbacks)}")
     
     return result
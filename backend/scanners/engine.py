@@ -0,0 +1,388 @@
+"""
+Scanner engine — one bar load per cycle, every strategy detector on top of it.
+
+Holy Grail, Scout Sniper and Sell the Rip used to run their own loops in
+main.py, each calling `yf.Ticker(t).history()` per ticker with a 0.05s sleep,
+so SPY/QQQ/mega-cap bars were downloaded once per strategy per cycle. Now:
+
+  - Each strategy is a Detector plugin (declared bar spec, market window,
+    cadence, universe, per-ticker evaluate, end-of-cycle finalize) registered
+    with register_detector().
+  - run_scan_cycle() picks the detectors that are due, unions their universes
+    per bar spec and loads every spec once through scanners.bar_loader
+    (batched yf.download, cached, coalesced with concurrent callers). A
+    shorter daily window is sliced from a longer cached one, so CTA's 1y
+    prefetch also serves Sell the Rip's 4mo bars.
+  - Per (ticker, spec) a SharedFrame memoizes indicator series (EMA, SMA,
+    RSI, ATR, ADX), so detectors on the same spec compute each one once.
+  - Per-detector evaluation cost (total/avg/p95 per ticker) is reported in the
+    cycle result and via get_engine_stats().
+
+Symbols the batch returns nothing for fall back to one per-symbol fetch
+(shared by every detector on that spec), as the scanners did before.
+The CTA scanner keeps its own concurrent runner (run_cta_scan) and reads the
+same bar_loader cache.
+"""
+
+import abc
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicators import kernels
+from scanners import bar_loader
+
+logger = logging.getLogger(__name__)
+
+# How often the main.py loop asks the engine for due detectors.
+ENGINE_TICK_SECONDS = 60
+
+
+class SkipCycle(Exception):
+    """Raised from Detector.prepare() to skip a detector for this cycle."""
+
+    def __init__(self, reason: str, **extra: Any):
+        super().__init__(reason)
+        self.reason = reason
+        self.extra = extra
+
+
+class SharedFrame:
+    """One ticker's bars for one spec plus memoized indicator series."""
+
+    def __init__(self, ticker: str, bars: pd.DataFrame):
+        self.ticker = ticker
+        self._bars = bars
+        self._memo: Dict[Tuple, Any] = {}
+        self.computed = 0
+        self.reused = 0
+
+    @classmethod
+    def of(cls, df: pd.DataFrame, ticker: str = "") -> "SharedFrame":
+        return cls(ticker, df)
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def bars(self) -> pd.DataFrame:
+        """A private copy of the OHLCV frame — detectors add columns in place."""
+        return self._bars.copy()
+
+    def indicator(self, key: Tuple, fn: Callable[[pd.DataFrame], Any]) -> Any:
+        if key in self._memo:
+            self.reused += 1
+            return self._memo[key]
+        value = fn(self._bars)
+        self._memo[key] = value
+        self.computed += 1
+        return value
+
+    # Common indicators, from indicators.kernels with pandas_ta's conventions
+    # (SMA-seeded EMA, `rma` = adjusted EWM for RSI/ATR/ADX) so values are
+    # unchanged from when the scanners called pandas_ta.
+    def ema(self, length: int):
+        return self.indicator(("ema", length), lambda b: _series(b, kernels.ema(_col(b, "Close"), length)))
+
+    def sma(self, length: int):
+        return self.indicator(("sma", length), lambda b: _series(b, kernels.sma(_col(b, "Close"), length)))
+
+    def rsi(self, length: int):
+        return self.indicator(
+            ("rsi", length), lambda b: _series(b, kernels.rsi(_col(b, "Close"), length, seed="adjusted"))
+        )
+
+    def atr(self, length: int):
+        return self.indicator(("atr", length), lambda b: _series(b, kernels.atr(
+            _col(b, "High"), _col(b, "Low"), _col(b, "Close"), length, seed="adjusted")))
+
+    def adx(self, length: int):
+        """DataFrame with pandas_ta's column names: ADX_n, DMP_n, DMN_n."""
+        def _adx(b):
+            out = kernels.adx(_col(b, "High"), _col(b, "Low"), _col(b, "Close"), length, seed="adjusted")
+            return pd.DataFrame({
+                f"ADX_{length}": out["adx"],
+                f"DMP_{length}": out["plus_di"],
+                f"DMN_{length}": out["minus_di"],
+            }, index=b.index)
+        return self.indicator(("adx", length), _adx)
+
+
+def _col(bars: pd.DataFrame, name: str) -> np.ndarray:
+    return bars[name].to_numpy(dtype=float)
+
+
+def _series(bars: pd.DataFrame, values: np.ndarray) -> pd.Series:
+    return pd.Series(values, index=bars.index)
+
+
+class Detector(abc.ABC):
+    """Base class for a strategy plugin. Subclasses must implement `evaluate`
+    and override whatever else they need."""
+
+    name: str = ""
+    label: str = ""
+    period: str = "1y"
+    interval: str = "1d"
+    min_bars: int = 1
+    cadence_seconds: int = 900
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def in_window(self, et: datetime) -> bool:
+        """Market hours (ET): 9:00-16:00 weekdays, like the old scan loops."""
+        return et.weekday() < 5 and 9 <= et.hour < 16
+
+    async def prepare(self) -> Dict[str, Any]:
+        """Per-cycle context (bias, VIX, sector data...). Raise SkipCycle to sit out."""
+        return {}
+
+    async def universe(self) -> List[str]:
+        from scanners.universe import build_scan_universe
+        return await build_scan_universe(max_tickers=200, include_scanner_universe=True, respect_muted=True)
+
+    @abc.abstractmethod
+    async def evaluate(self, ticker: str, frame: SharedFrame, ctx: Dict[str, Any]) -> List[Dict]:
+        """Signals for one ticker from its shared bars."""
+
+    async def finalize(self, signals: List[Dict], ctx: Dict[str, Any]) -> Dict[str, Any]:
+        """Hand signals downstream; returns extra fields for the cycle summary."""
+        return {}
+
+
+_registry: Dict[str, Detector] = {}
+_last_run: Dict[str, float] = {}      # scheduled runs only: drives the cadence
+_last_forced: Dict[str, str] = {}     # manual/API runs, kept off the schedule
+_last_cycle: Dict[str, Any] = {}
+_defaults_loaded = False
+
+
+def register_detector(detector: Detector) -> Detector:
+    _registry[detector.name] = detector
+    return detector
+
+
+def _load_default_detectors() -> None:
+    """Import the built-in scanner modules; each registers its detector."""
+    global _defaults_loaded
+    if _defaults_loaded:
+        return
+    _defaults_loaded = True
+    for module in (
+        "scanners.holy_grail_scanner",
+        "scanners.scout_sniper_scanner",
+        "scanners.sell_the_rip_scanner",
+    ):
+        try:
+            __import__(module)
+        except Exception as e:
+            logger.warning("Scanner engine: could not load %s: %s", module, e)
+
+
+def get_detectors() -> Dict[str, Detector]:
+    _load_default_detectors()
+    return dict(_registry)
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def _fetch_single(ticker: str, period: str, interval: str) -> pd.DataFrame:
+    """Per-symbol fallback (blocking — call via asyncio.to_thread)."""
+    import yfinance as yf
+    return yf.Ticker(ticker).history(period=period, interval=interval)
+
+
+async def _load_spec(tickers: List[str], period: str, interval: str) -> Tuple[Dict[str, pd.DataFrame], Dict]:
+    t0 = time.perf_counter()
+    batches_before = bar_loader.get_bar_loader_stats()["batches"]
+    try:
+        frames = await bar_loader.load_bars(tickers, period=period, interval=interval)
+    except Exception as e:
+        logger.warning("Scanner engine: %s/%s batch load failed: %s", period, interval, e)
+        frames = {}
+    fallbacks = 0
+    for ticker in tickers:
+        if ticker in frames:
+            continue
+        fallbacks += 1
+        try:
+            df = await asyncio.to_thread(_fetch_single, ticker, period, interval)
+        except Exception as e:
+            logger.debug("Scanner engine: fallback fetch failed for %s: %s", ticker, e)
+            continue
+        if df is not None and not df.empty:
+            frames[ticker] = df
+    return frames, {
+        "requested": len(tickers),
+        "loaded": len(frames),
+        "batches": bar_loader.get_bar_loader_stats()["batches"] - batches_before,
+        "fallback_fetches": fallbacks,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def _due(detector: Detector, now: float, et: datetime, force: bool) -> bool:
+    if force:
+        return True
+    if not detector.in_window(et):
+        return False
+    last = _last_run.get(detector.name)
+    return last is None or now - last >= detector.cadence_seconds
+
+
+def _now_et() -> datetime:
+    import pytz
+    return datetime.now(pytz.timezone("America/New_York"))
+
+
+async def run_scan_cycle(
+    names: Optional[Iterable[str]] = None,
+    tickers: Optional[List[str]] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run every due detector (or just `names`) over one shared bar load.
+
+    `tickers` overrides each detector's universe; `force` ignores market
+    window and cadence (manual/API runs) and leaves the regular schedule
+    where it was. Returns a cycle summary with one
+    entry per detector under "detectors".
+    """
+    detectors = get_detectors()
+    if names is not None:
+        wanted = list(names)
+        detectors = {n: detectors[n] for n in wanted if n in detectors}
+
+    start = datetime.utcnow()
+    now = time.monotonic()
+    et = _now_et()
+    summary: Dict[str, Any] = {"scan_time": None, "detectors": {}, "bar_loads": {}}
+    active: List[Tuple[Detector, Dict[str, Any]]] = []
+
+    for det in detectors.values():
+        if not det.available:
+            summary["detectors"][det.name] = {"error": "Scanner dependencies not installed"}
+            continue
+        if not _due(det, now, et, force):
+            continue
+        if force:
+            _last_forced[det.name] = start.isoformat()
+        else:
+            _last_run[det.name] = now
+        try:
+            ctx = await det.prepare()
+        except SkipCycle as skip:
+            logger.debug("%s: %s, skipping scan", det.label or det.name, skip.reason)
+            summary["detectors"][det.name] = {"skipped": True, "reason": skip.reason, **skip.extra}
+            continue
+        active.append((det, ctx))
+
+    # Universes, then one bar load per distinct (period, interval)
+    universes: Dict[str, List[str]] = {}
+    for det, _ in active:
+        if tickers is not None:
+            universes[det.name] = bar_loader._normalize(tickers)
+        else:
+            try:
+                universes[det.name] = bar_loader._normalize(await det.universe())
+            except Exception as e:
+                logger.warning("Scanner engine: universe for %s failed: %s", det.name, e)
+                universes[det.name] = []
+
+    specs: Dict[Tuple[str, str], List[Tuple[Detector, Dict[str, Any]]]] = {}
+    for det, ctx in active:
+        specs.setdefault((det.period, det.interval), []).append((det, ctx))
+
+    results: Dict[str, List[Dict]] = {det.name: [] for det, _ in active}
+    costs: Dict[str, List[float]] = {det.name: [] for det, _ in active}
+    scanned: Dict[str, int] = {det.name: 0 for det, _ in active}
+    indicator_stats = {"computed": 0, "reused": 0}
+
+    for (period, interval), members in specs.items():
+        spec_tickers = list(dict.fromkeys(t for det, _ in members for t in universes[det.name]))
+        frames, load_stats = await _load_spec(spec_tickers, period, interval)
+        summary["bar_loads"][f"{period}/{interval}"] = load_stats
+
+        member_sets = {det.name: set(universes[det.name]) for det, _ in members}
+        for ticker in spec_tickers:
+            df = frames.get(ticker)
+            shared = SharedFrame(ticker, df) if df is not None else None
+            for det, ctx in members:
+                if ticker not in member_sets[det.name]:
+                    continue
+                scanned[det.name] += 1
+                if shared is None or df.empty or len(shared) < det.min_bars:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    results[det.name].extend(await det.evaluate(ticker, shared, ctx))
+                except Exception as e:
+                    logger.error("%s scan error for %s: %s", det.label or det.name, ticker, e)
+                finally:
+                    costs[det.name].append(time.perf_counter() - t0)
+            if shared is not None:
+                indicator_stats["computed"] += shared.computed
+                indicator_stats["reused"] += shared.reused
+
+    elapsed = (datetime.utcnow() - start).total_seconds()
+    for det, ctx in active:
+        signals = results[det.name]
+        try:
+            extra = await det.finalize(signals, ctx) or {}
+        except Exception as e:
+            logger.error("%s: finalize failed: %s", det.label or det.name, e)
+            extra = {}
+        cost = costs[det.name]
+        summary["detectors"][det.name] = {
+            "scan_time": datetime.utcnow().isoformat(),
+            "tickers_scanned": scanned[det.name],
+            "signals_found": len(signals),
+            "duration_seconds": round(elapsed, 1),
+            "eval_seconds": round(sum(cost), 3),
+            "eval_avg_ms": round(1000 * sum(cost) / len(cost), 2) if cost else None,
+            "eval_p95_ms": round(1000 * _percentile(cost, 95), 2) if cost else None,
+            **extra,
+        }
+        logger.info(
+            "%s scan: %d signals from %d tickers (eval %.2fs)",
+            det.label or det.name, len(signals), scanned[det.name], sum(cost),
+        )
+
+    summary["scan_time"] = datetime.utcnow().isoformat()
+    summary["duration_seconds"] = round((datetime.utcnow() - start).total_seconds(), 1)
+    summary["indicators"] = indicator_stats
+    if active:
+        _last_cycle.clear()
+        _last_cycle.update(summary)
+    return summary
+
+
+async def run_detector(name: str, tickers: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run one detector now (no window/cadence check) and return its summary."""
+    detectors = get_detectors()
+    if name not in detectors:
+        return {"error": f"unknown detector {name}"}
+    result = await run_scan_cycle([name], tickers=tickers, force=True)
+    return result["detectors"].get(name, {})
+
+
+def get_engine_stats() -> Dict[str, Any]:
+    """Last cycle summary plus registered detectors and bar loader counters."""
+    return {
+        "detectors": sorted(get_detectors()),
+        "last_cycle": dict(_last_cycle),
+        "last_forced": dict(_last_forced),
+        "bar_loader": bar_loader.get_bar_loader_stats(),
+    }
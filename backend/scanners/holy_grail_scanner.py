@@ -3,26 +3,20 @@ Holy Grail Pullback Scanner — Server-Side
 Replicates the TradingView Holy Grail Webhook v1 PineScript.
 Scans watchlist + universe for ADX >= 25 + 20 EMA pullback + confirmation.
 
-Runs every 15 minutes during market hours.
-Uses yfinance 1H bars (switch to Polygon if accuracy needs improvement).
+Runs every 15 minutes during market hours as a detector on the scanner engine
+(scanners/engine.py), which batch-loads the 1H bars (yfinance, 3mo) once per
+cycle for every detector on that spec.
 """
 
 import pandas as pd
 import numpy as np
 import logging
-import asyncio
 from typing import Dict, List, Optional
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
-
-try:
-    import pandas_ta as ta
-    HG_SCANNER_AVAILABLE = True
-except ImportError:
-    HG_SCANNER_AVAILABLE = False
-    logger.warning("Holy Grail Scanner: pandas_ta not installed")
+from scanners.engine import Detector, SharedFrame, register_detector, run_detector
 
+logger = logging.getLogger(__name__)
 
 # Configuration
 HG_CONFIG = {
@@ -63,36 +57,28 @@ async def _refresh_hg_vix_adjustments() -> None:
     _hg_touch_tolerance = HG_CONFIG["touch_tolerance_pct"]
 
 
-def _fetch_1h_bars(ticker: str) -> pd.DataFrame:
-    """Fetch 1H bars via yfinance (blocking — call via asyncio.to_thread)."""
-    import yfinance as yf
-    stock = yf.Ticker(ticker)
-    df = stock.history(period="3mo", interval="1h")
-    return df
-
-
-async def _fetch_1h_bars_async(ticker: str) -> pd.DataFrame:
-    """Async wrapper around yfinance 1H bar fetch."""
-    return await asyncio.to_thread(_fetch_1h_bars, ticker)
+def calculate_holy_grail_indicators(df: pd.DataFrame, shared: Optional[SharedFrame] = None) -> pd.DataFrame:
+    """Calculate ADX, DI+, DI-, 20 EMA, RSI for Holy Grail detection.
 
-
-def calculate_holy_grail_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate ADX, DI+, DI-, 20 EMA, RSI for Holy Grail detection."""
+    `shared` is the engine's per-ticker indicator memo for the same bars;
+    without it the series are computed from `df` directly.
+    """
     if df is None or df.empty:
         return df
+    ind = shared if shared is not None else SharedFrame.of(df)
 
     # 20 EMA
-    df["ema20"] = ta.ema(df["Close"], length=HG_CONFIG["ema_length"])
+    df["ema20"] = ind.ema(HG_CONFIG["ema_length"])
 
     # ADX + DI
-    adx_data = ta.adx(df["High"], df["Low"], df["Close"], length=HG_CONFIG["adx_length"])
+    adx_data = ind.adx(HG_CONFIG["adx_length"])
     if adx_data is not None:
         df["adx"] = adx_data[f'ADX_{HG_CONFIG["adx_length"]}']
         df["di_plus"] = adx_data[f'DMP_{HG_CONFIG["adx_length"]}']
         df["di_minus"] = adx_data[f'DMN_{HG_CONFIG["adx_length"]}']
 
     # RSI
-    df["rsi"] = ta.rsi(df["Close"], length=HG_CONFIG["rsi_length"])
+    df["rsi"] = ind.rsi(HG_CONFIG["rsi_length"])
 
     # 3-10 Oscillator (Raschke) — shadow-mode dual-gate companion to RSI
     try:
@@ -274,13 +260,23 @@ def check_holy_grail_signals(df: pd.DataFrame, ticker: str) -> List[Dict]:
     return signals
 
 
-async def scan_ticker_holy_grail(ticker: str) -> List[Dict]:
-    """Scan a single ticker for Holy Grail setups."""
-    await _refresh_hg_vix_adjustments()
-    try:
-        # Redis cooldown check (survives deploys)
+class HolyGrailDetector(Detector):
+    name = "holy_grail"
+    label = "Holy Grail"
+    period = "3mo"
+    interval = "1h"
+    min_bars = 40
+    cadence_seconds = 900
+
+    async def prepare(self) -> Dict:
+        await _refresh_hg_vix_adjustments()
         from database.redis_client import get_redis_client
-        redis = await get_redis_client()
+        return {"redis": await get_redis_client()}
+
+    async def evaluate(self, ticker: str, frame: SharedFrame, ctx: Dict) -> List[Dict]:
+        """Scan a single ticker for Holy Grail setups."""
+        # Redis cooldown check (survives deploys)
+        redis = ctx.get("redis")
         cooldown_key = f"scanner:hg:cooldown:{ticker}"
         if redis and await redis.exists(cooldown_key):
             return []
@@ -293,12 +289,7 @@ async def scan_ticker_holy_grail(ticker: str) -> List[Dict]:
             if daily_count and int(daily_count) >= HG_DAILY_CAP:
                 return []
 
-        df = await _fetch_1h_bars_async(ticker)
-
-        if df.empty or len(df) < 40:
-            return []
-
-        df = calculate_holy_grail_indicators(df)
+        df = calculate_holy_grail_indicators(frame.bars(), frame)
 
         # Persist any 3-10 divergences detected on this scan for frequency-cap
         # monitoring and future Turtle Soup consumption. Safe on failure —
@@ -319,49 +310,20 @@ async def scan_ticker_holy_grail(ticker: str) -> List[Dict]:
 
         return signals
 
-    except Exception as e:
-        logger.error("Holy Grail scan error for %s: %s", ticker, e)
-        return []
-
-
-async def run_holy_grail_scan(tickers: List[str] = None) -> Dict:
-    """Run Holy Grail scan across ticker universe."""
-    if not HG_SCANNER_AVAILABLE:
-        return {"error": "Scanner dependencies not installed (pandas_ta)"}
-
-    if tickers is None:
-        from scanners.universe import build_scan_universe
-        tickers = await build_scan_universe(max_tickers=200, include_scanner_universe=True, respect_muted=True)
-
-    start = datetime.utcnow()
-    all_signals = []
+    async def finalize(self, signals: List[Dict], ctx: Dict) -> Dict:
+        # Feed each signal through the unified pipeline (scoring, DB, Redis, WS, committee)
+        for signal in signals:
+            try:
+                from signals.pipeline import process_signal_unified
+                await process_signal_unified(signal, source="server_scanner")
+            except Exception as e:
+                logger.error("Failed to process Holy Grail signal for %s: %s", signal.get("ticker"), e)
+        return {}
 
-    for ticker in tickers:
-        try:
-            signals = await scan_ticker_holy_grail(ticker)
-            all_signals.extend(signals)
-        except Exception as e:
-            logger.error("Error scanning %s: %s", ticker, e)
-        await asyncio.sleep(0.05)  # Rate limiting
 
-    elapsed = (datetime.utcnow() - start).total_seconds()
+register_detector(HolyGrailDetector())
 
-    # Feed each signal through the unified pipeline (scoring, DB, Redis, WS, committee)
-    for signal in all_signals:
-        try:
-            from signals.pipeline import process_signal_unified
-            await process_signal_unified(signal, source="server_scanner")
-        except Exception as e:
-            logger.error("Failed to process Holy Grail signal for %s: %s", signal.get("ticker"), e)
 
-    logger.info(
-        "Holy Grail scan: %d signals from %d tickers in %.1fs",
-        len(all_signals), len(tickers), elapsed,
-    )
-
-    return {
-        "scan_time": datetime.utcnow().isoformat(),
-        "tickers_scanned": len(tickers),
-        "signals_found": len(all_signals),
-        "duration_seconds": round(elapsed, 1),
-    }
+async def run_holy_grail_scan(tickers: List[str] = None) -> Dict:
+    """Run Holy Grail scan across ticker universe (one engine cycle, HG only)."""
+    return await run_detector("holy_grail", tickers)
@@ -21,6 +21,8 @@ import asyncio
 
 import pandas as pd
 
+from scanners import bar_loader
+
 logger = logging.getLogger(__name__)
 
 # Try to import optional dependencies
@@ -48,6 +50,11 @@ REFRESH_HOUR = 9
 REFRESH_MINUTE = 45
 
 
+def _fallback_history_period(interval: str) -> str:
+    """Daily-bar lookback the yfinance fallback needs for a given interval."""
+    return "24mo" if interval in {"1W", "1M"} else "6mo"
+
+
 class TechnicalSignal(str, Enum):
     """TradingView technical analysis signals"""
     STRONG_BUY = "STRONG_BUY"
@@ -467,9 +474,11 @@ class HybridScanner:
             }
 
         try:
-            stock = yf.Ticker(ticker)
-            history_period = "24mo" if interval in {"1W", "1M"} else "6mo"
-            df = stock.history(period=history_period, interval="1d")
+            history_period = _fallback_history_period(interval)
+            df = bar_loader.get_cached(ticker, period=history_period)
+            if df is None:
+                stock = yf.Ticker(ticker)
+                df = stock.history(period=history_period, interval="1d")
 
             if not df.empty and interval in {"1W", "1M"}:
                 rule = "W-FRI" if interval == "1W" else "ME"
@@ -760,6 +769,14 @@ class HybridScanner:
     # SCANNER FUNCTIONS
     # =========================================================================
     
+    async def _prefetch_fallback_bars(self, tickers: List[str], interval: str) -> bool:
+        """Batch-load the yfinance fallback's daily bars for `tickers`."""
+        try:
+            await bar_loader.prefetch(tickers, period=_fallback_history_period(interval))
+        except Exception as e:
+            logger.warning(f"Hybrid scanner bar prefetch failed: {e}")
+        return True
+
     async def scan_universe(
         self,
         tickers: List[str] = None,
@@ -793,11 +810,22 @@ class HybridScanner:
         
         logger.info(f"🔍 Scanning {len(scan_list)} tickers...")
         start_time = datetime.now()
-        
-        for ticker in scan_list:
+
+        # Batch-load the daily bars the yfinance fallback needs, but only once
+        # yfinance is the source in use: up front when tradingview-ta is not
+        # installed, otherwise for the rest of the list after the first ticker
+        # falls back (a TradingView outage), so it costs a few batched
+        # downloads instead of one history() call per ticker.
+        prefetched = not YFINANCE_AVAILABLE
+        if not TRADINGVIEW_TA_AVAILABLE and not prefetched:
+            prefetched = await self._prefetch_fallback_bars(scan_list, interval)
+
+        for i, ticker in enumerate(scan_list):
             try:
                 # Get technical analysis
                 tech = self.get_technical_analysis(ticker, interval)
+                if not prefetched and tech.get("source") == "yfinance_fallback" and not tech.get("from_cache"):
+                    prefetched = await self._prefetch_fallback_bars(scan_list[i + 1:], interval)
                 
                 if tech.get("signal") == TechnicalSignal.ERROR.value:
                     continue
@@ -3,25 +3,19 @@ Scout Sniper Scanner — Server-Side
 Replicates Scout Sniper v3.1 PineScript logic.
 15-min reversal detection: RSI hooks + RVOL + candle patterns + VWAP position.
 
-Runs every 15 minutes during market hours.
+Runs every 15 minutes during market hours as a detector on the scanner engine
+(scanners/engine.py), which batch-loads the 15-min bars once per cycle.
 """
 
 import pandas as pd
 import numpy as np
 import logging
-import asyncio
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
-
-try:
-    import pandas_ta as ta
-    SCOUT_SCANNER_AVAILABLE = True
-except ImportError:
-    SCOUT_SCANNER_AVAILABLE = False
-    logger.warning("Scout Sniper Scanner: pandas_ta not installed")
+from scanners.engine import Detector, SharedFrame, register_detector, run_detector
 
+logger = logging.getLogger(__name__)
 
 SCOUT_CONFIG = {
     "rsi_length": 14,
@@ -67,19 +61,6 @@ async def _refresh_scout_bias() -> None:
     _scout_bias_cache["expires"] = now + 60
 
 
-def _fetch_15m_bars(ticker: str) -> pd.DataFrame:
-    """Fetch 15-min bars via yfinance (blocking — call via asyncio.to_thread)."""
-    import yfinance as yf
-    stock = yf.Ticker(ticker)
-    df = stock.history(period="5d", interval="15m")
-    return df
-
-
-async def _fetch_15m_bars_async(ticker: str) -> pd.DataFrame:
-    """Async wrapper around yfinance 15m bar fetch."""
-    return await asyncio.to_thread(_fetch_15m_bars, ticker)
-
-
 def _compute_daily_vwap(df: pd.DataFrame) -> pd.Series:
     """
     Compute intraday VWAP that resets each trading day.
@@ -97,13 +78,17 @@ def _compute_daily_vwap(df: pd.DataFrame) -> pd.Series:
     return vwap
 
 
-def calculate_scout_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate all indicators needed for Scout Sniper detection."""
+def calculate_scout_indicators(df: pd.DataFrame, shared: Optional[SharedFrame] = None) -> pd.DataFrame:
+    """Calculate all indicators needed for Scout Sniper detection.
+
+    `shared` is the engine's per-ticker indicator memo for the same bars.
+    """
     if df is None or df.empty:
         return df
+    ind = shared if shared is not None else SharedFrame.of(df)
 
     # RSI
-    df["rsi"] = ta.rsi(df["Close"], length=SCOUT_CONFIG["rsi_length"])
+    df["rsi"] = ind.rsi(SCOUT_CONFIG["rsi_length"])
     df["rsi_prev"] = df["rsi"].shift(1)
 
     # Volume
@@ -111,14 +96,14 @@ def calculate_scout_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df["rvol"] = df["Volume"] / df["vol_ma"]
 
     # ATR
-    df["atr"] = ta.atr(df["High"], df["Low"], df["Close"], length=14)
+    df["atr"] = ind.atr(14)
 
     # VWAP (daily reset)
     df["vwap"] = _compute_daily_vwap(df)
 
     # SMAs for regime
     for length in SCOUT_CONFIG["sma_lengths"]:
-        df[f"sma{length}"] = ta.sma(df["Close"], length=length)
+        df[f"sma{length}"] = ind.sma(length)
 
     # Candle anatomy
     df["body"] = (df["Close"] - df["Open"]).abs()
@@ -337,76 +322,57 @@ def check_scout_signals(df: pd.DataFrame, ticker: str) -> List[Dict]:
     return signals
 
 
-async def scan_ticker_scout(ticker: str) -> List[Dict]:
-    """Scan a single ticker for Scout Sniper setups using 15-min bars."""
-    await _refresh_scout_bias()
-    try:
-        df = await _fetch_15m_bars_async(ticker)
+class ScoutSniperDetector(Detector):
+    name = "scout"
+    label = "Scout"
+    period = "5d"
+    interval = "15m"
+    min_bars = 30
+    cadence_seconds = 900
 
-        if df.empty or len(df) < 30:
-            return []
+    async def prepare(self) -> Dict:
+        await _refresh_scout_bias()
+        return {}
 
-        df = calculate_scout_indicators(df)
+    async def evaluate(self, ticker: str, frame: SharedFrame, ctx: Dict) -> List[Dict]:
+        """Scan a single ticker for Scout Sniper setups using 15-min bars."""
+        df = calculate_scout_indicators(frame.bars(), frame)
         return check_scout_signals(df, ticker)
 
-    except Exception as e:
-        logger.error("Scout scan error for %s: %s", ticker, e)
-        return []
+    async def finalize(self, signals: List[Dict], ctx: Dict) -> Dict:
+        # Quality gate (Olympus/URSA): only process signals >= min_quality_score
+        min_score = SCOUT_CONFIG.get("min_quality_score", 3)
+        quality_signals = [s for s in signals if s.get("score", 0) >= min_score]
+        dropped = len(signals) - len(quality_signals)
+        if dropped > 0:
+            logger.info("Scout quality gate: dropped %d/%d signals below score %d", dropped, len(signals), min_score)
+
+        # Feed quality signals through the unified pipeline
+        # skip_scoring=True because Scout has its own quality score (0-6)
+        for signal in quality_signals:
+            try:
+                from signals.pipeline import process_signal_unified
+                await process_signal_unified(
+                    signal,
+                    source="server_scanner",
+                    skip_scoring=True,
+                    cache_ttl=1800,          # 30-min TTL
+                    priority_threshold=0,
+                )
+            except Exception as e:
+                logger.error("Failed to process Scout signal for %s: %s", signal.get("ticker"), e)
+
+        logger.info(
+            "Scout scan: %d signals (%d passed quality gate) (RSI %d/%d, lookback %d)",
+            len(signals), len(quality_signals),
+            SCOUT_CONFIG["rsi_oversold"], SCOUT_CONFIG["rsi_overbought"], SCOUT_CONFIG.get("lookback_bars", 1),
+        )
+        return {}
 
 
-async def run_scout_scan(tickers: List[str] = None) -> Dict:
-    """Run Scout Sniper scan across ticker universe."""
-    if not SCOUT_SCANNER_AVAILABLE:
-        return {"error": "Scanner dependencies not installed (pandas_ta)"}
+register_detector(ScoutSniperDetector())
 
-    if tickers is None:
-        from scanners.universe import build_scan_universe
-        tickers = await build_scan_universe(max_tickers=200, include_scanner_universe=True, respect_muted=True)
 
-    start = datetime.utcnow()
-    all_signals = []
-
-    for ticker in tickers:
-        try:
-            sigs = await scan_ticker_scout(ticker)
-            all_signals.extend(sigs)
-        except Exception as e:
-            logger.error("Error scanning %s: %s", ticker, e)
-        await asyncio.sleep(0.05)  # Rate limiting
-
-    elapsed = (datetime.utcnow() - start).total_seconds()
-
-    # Quality gate (Olympus/URSA): only process signals >= min_quality_score
-    min_score = SCOUT_CONFIG.get("min_quality_score", 3)
-    quality_signals = [s for s in all_signals if s.get("score", 0) >= min_score]
-    dropped = len(all_signals) - len(quality_signals)
-    if dropped > 0:
-        logger.info("Scout quality gate: dropped %d/%d signals below score %d", dropped, len(all_signals), min_score)
-
-    # Feed quality signals through the unified pipeline
-    # skip_scoring=True because Scout has its own quality score (0-6)
-    for signal in quality_signals:
-        try:
-            from signals.pipeline import process_signal_unified
-            await process_signal_unified(
-                signal,
-                source="server_scanner",
-                skip_scoring=True,
-                cache_ttl=1800,          # 30-min TTL
-                priority_threshold=0,
-            )
-        except Exception as e:
-            logger.error("Failed to process Scout signal for %s: %s", signal.get("ticker"), e)
-
-    logger.info(
-        "Scout scan: %d signals (%d passed quality gate) from %d tickers in %.1fs (RSI %d/%d, lookback %d)",
-        len(all_signals), len(quality_signals), len(tickers), elapsed,
-        SCOUT_CONFIG["rsi_oversold"], SCOUT_CONFIG["rsi_overbought"], SCOUT_CONFIG.get("lookback_bars", 1),
-    )
-
-    return {
-        "scan_time": datetime.utcnow().isoformat(),
-        "tickers_scanned": len(tickers),
-        "signals_found": len(all_signals),
-        "duration_seconds": round(elapsed, 1),
-    }
+async def run_scout_scan(tickers: List[str] = None) -> Dict:
+    """Run Scout Sniper scan across ticker universe (one engine cycle, Scout only)."""
+    return await run_detector("scout", tickers)
@@ -6,10 +6,10 @@ Two modes:
 2. Early Detection — Sector in ACTIVE_DISTRIBUTION, relaxed ADX >= 15, EMA rejection.
 
 Options-first design with convexity grading, time stops, and spread suggestions.
-Runs every 5 minutes during market hours (9:35 AM - 3:55 PM ET).
+Runs every 4 hours during market hours (from 9:35 AM ET) as a detector on the
+scanner engine (scanners/engine.py), which batch-loads the daily bars.
 """
 
-import asyncio
 import json
 import logging
 import numpy as np
@@ -17,15 +17,9 @@ import pandas as pd
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
-logger = logging.getLogger(__name__)
-
-try:
-    import pandas_ta as ta
-    STR_SCANNER_AVAILABLE = True
-except ImportError:
-    STR_SCANNER_AVAILABLE = False
-    logger.warning("Sell the Rip Scanner: pandas_ta not installed")
+from scanners.engine import Detector, SharedFrame, SkipCycle, register_detector, run_detector
 
+logger = logging.getLogger(__name__)
 
 # ── Configuration ──
 
@@ -58,43 +52,33 @@ SELL_RIP_FILTERS = {
 STR_COOLDOWN_SECONDS = 86400  # 24 hours
 
 
-# ── Data fetching ──
-
-def _fetch_daily_bars(ticker: str) -> pd.DataFrame:
-    """Fetch 80 trading days of daily bars via yfinance (blocking)."""
-    import yfinance as yf
-    stock = yf.Ticker(ticker)
-    df = stock.history(period="4mo", interval="1d")
-    return df
-
-
-async def _fetch_daily_bars_async(ticker: str) -> pd.DataFrame:
-    return await asyncio.to_thread(_fetch_daily_bars, ticker)
-
-
 # ── Indicator computation ──
 
-def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute all indicators needed for sell-the-rip detection."""
+def compute_indicators(df: pd.DataFrame, shared: Optional[SharedFrame] = None) -> pd.DataFrame:
+    """Compute all indicators needed for sell-the-rip detection.
+
+    `shared` is the engine's per-ticker indicator memo for the same bars.
+    """
     if df is None or df.empty or len(df) < 60:
         return df
+    ind = shared if shared is not None else SharedFrame.of(df)
 
     # Moving averages
-    df["ema20"] = ta.ema(df["Close"], length=STR_CONFIG["ema_length"])
-    df["sma50"] = ta.sma(df["Close"], length=STR_CONFIG["sma_length"])
+    df["ema20"] = ind.ema(STR_CONFIG["ema_length"])
+    df["sma50"] = ind.sma(STR_CONFIG["sma_length"])
 
     # ADX + Directional indicators
-    adx_data = ta.adx(df["High"], df["Low"], df["Close"], length=STR_CONFIG["adx_length"])
+    adx_data = ind.adx(STR_CONFIG["adx_length"])
     if adx_data is not None:
         df["adx"] = adx_data[f'ADX_{STR_CONFIG["adx_length"]}']
         df["di_plus"] = adx_data[f'DMP_{STR_CONFIG["adx_length"]}']
         df["di_minus"] = adx_data[f'DMN_{STR_CONFIG["adx_length"]}']
 
     # RSI
-    df["rsi"] = ta.rsi(df["Close"], length=STR_CONFIG["rsi_length"])
+    df["rsi"] = ind.rsi(STR_CONFIG["rsi_length"])
 
     # ATR
-    df["atr"] = ta.atr(df["High"], df["Low"], df["Close"], length=STR_CONFIG["atr_length"])
+    df["atr"] = ind.atr(STR_CONFIG["atr_length"])
 
     # VWAP (daily — use cumulative intraday approach on daily bars)
     # For daily bars, approximate VWAP as typical price weighted by volume
@@ -559,113 +543,113 @@ async def _get_current_vix() -> Optional[float]:
     return None
 
 
-# ── Main scan runner ──
+# ── Engine detector ──
 
-async def run_sell_the_rip_scan(tickers: List[str] = None) -> Dict:
-    """Run Sell the Rip scan across ticker universe."""
-    if not STR_SCANNER_AVAILABLE:
-        return {"error": "Scanner dependencies not installed (pandas_ta)"}
-
-    # Bias filter
-    if not await _check_bias_allows_shorts():
-        logger.info("Sell the Rip: bias regime doesn't support shorts, skipping scan")
-        return {"skipped": True, "reason": "bias_regime"}
-
-    # VIX filter
-    vix = await _get_current_vix()
-    if vix and vix > SELL_RIP_FILTERS["max_vix"]:
-        logger.info("Sell the Rip: VIX %.1f > %d, skipping scan", vix, SELL_RIP_FILTERS["max_vix"])
-        return {"skipped": True, "reason": "vix_too_high"}
-
-    if tickers is None:
+class SellTheRipDetector(Detector):
+    name = "sell_the_rip"
+    label = "Sell the Rip"
+    period = "4mo"
+    interval = "1d"
+    min_bars = 60
+    cadence_seconds = 14400  # 4 hours (daily bars don't change intraday)
+
+    def in_window(self, et: datetime) -> bool:
+        # Market hours: 9:35 AM - 4:00 PM ET, weekdays
+        return et.weekday() < 5 and 9 <= et.hour < 16 and et.hour + et.minute / 60.0 >= 9.583
+
+    async def universe(self) -> List[str]:
         from scanners.universe import build_scan_universe
-        tickers = await build_scan_universe(max_tickers=200)
-
-    # Load sector RS data (check staleness)
-    from scanners.sector_rs import get_all_sector_rs, is_sector_rs_stale
-    sector_rs_stale = await is_sector_rs_stale()
-    if sector_rs_stale:
-        logger.warning("Sell the Rip: sector RS data is stale — running absolute-only mode")
-
-    all_sector_rs = {} if sector_rs_stale else await get_all_sector_rs()
-
-    # Build ticker → sector ETF mapping from config
-    from config.sectors import SECTOR_ETF_MAP
-    ticker_to_etf = {}
-    for sector_name, data in SECTOR_ETF_MAP.items():
-        etf = data["etf"]
-        for t in data["tickers"]:
-            ticker_to_etf[t] = etf
-
-    start = datetime.utcnow()
-    all_signals = []
-
-    from database.redis_client import get_redis_client
-    redis = await get_redis_client()
-
-    for ticker in tickers:
-        try:
-            # Redis cooldown check (survives deploys)
-            cooldown_key = f"scanner:str:cooldown:{ticker}"
-            if redis and await redis.exists(cooldown_key):
-                continue
+        return await build_scan_universe(max_tickers=200)
+
+    async def prepare(self) -> Dict:
+        # Bias filter
+        if not await _check_bias_allows_shorts():
+            logger.info("Sell the Rip: bias regime doesn't support shorts, skipping scan")
+            raise SkipCycle("bias_regime")
+
+        # VIX filter
+        vix = await _get_current_vix()
+        if vix and vix > SELL_RIP_FILTERS["max_vix"]:
+            logger.info("Sell the Rip: VIX %.1f > %d, skipping scan", vix, SELL_RIP_FILTERS["max_vix"])
+            raise SkipCycle("vix_too_high")
+
+        # Load sector RS data (check staleness)
+        from scanners.sector_rs import get_all_sector_rs, is_sector_rs_stale
+        sector_rs_stale = await is_sector_rs_stale()
+        if sector_rs_stale:
+            logger.warning("Sell the Rip: sector RS data is stale — running absolute-only mode")
+
+        # Build ticker → sector ETF mapping from config
+        from config.sectors import SECTOR_ETF_MAP
+        ticker_to_etf = {}
+        for sector_name, data in SECTOR_ETF_MAP.items():
+            etf = data["etf"]
+            for t in data["tickers"]:
+                ticker_to_etf[t] = etf
 
-            df = await _fetch_daily_bars_async(ticker)
-            if df.empty or len(df) < 60:
-                continue
+        from database.redis_client import get_redis_client
+        return {
+            "vix": vix,
+            "sector_rs_stale": sector_rs_stale,
+            "all_sector_rs": {} if sector_rs_stale else await get_all_sector_rs(),
+            "ticker_to_etf": ticker_to_etf,
+            "redis": await get_redis_client(),
+        }
+
+    async def evaluate(self, ticker: str, frame: SharedFrame, ctx: Dict) -> List[Dict]:
+        # Redis cooldown check (survives deploys)
+        redis = ctx["redis"]
+        cooldown_key = f"scanner:str:cooldown:{ticker}"
+        if redis and await redis.exists(cooldown_key):
+            return []
+
+        df = compute_indicators(frame.bars(), frame)
+
+        # Get sector context for this ticker
+        sector_etf = ctx["ticker_to_etf"].get(ticker)
+        sector_rs = ctx["all_sector_rs"].get(sector_etf) if sector_etf else None
+
+        signals = check_sell_the_rip(df, ticker, sector_etf, sector_rs)
+        if signals and redis:
+            await redis.set(cooldown_key, "1", ex=STR_COOLDOWN_SECONDS)
+        return signals
 
-            df = compute_indicators(df)
-
-            # Get sector context for this ticker
-            sector_etf = ticker_to_etf.get(ticker)
-            sector_rs = all_sector_rs.get(sector_etf) if sector_etf else None
-
-            signals = check_sell_the_rip(df, ticker, sector_etf, sector_rs)
-            if signals and redis:
-                await redis.set(cooldown_key, "1", ex=STR_COOLDOWN_SECONDS)
-            all_signals.extend(signals)
-        except Exception as e:
-            logger.error("Sell the Rip scan error for %s: %s", ticker, e)
-        await asyncio.sleep(0.05)  # Rate limiting
-
-    elapsed = (datetime.utcnow() - start).total_seconds()
-
-    # Process signals through pipeline
-    vix_warning = vix is not None and vix > 30
-    for signal in all_signals:
-        try:
-            # Holy Grail dedup
-            hg_signal_id = await _check_holy_grail_dedup(signal["ticker"])
-            if hg_signal_id:
-                # Boost existing HG signal instead of emitting duplicate
-                logger.info(
-                    "Sell the Rip: %s confirms Holy Grail %s — skipping, boosting HG +8",
-                    signal["ticker"], hg_signal_id,
-                )
-                signal["confluence_holy_grail"] = True
-                # Note: actual HG score boost happens in the scorer via confluence_holy_grail flag
-                continue
+    async def finalize(self, signals: List[Dict], ctx: Dict) -> Dict:
+        # Process signals through pipeline
+        vix = ctx["vix"]
+        vix_warning = vix is not None and vix > 30
+        for signal in signals:
+            try:
+                # Holy Grail dedup
+                hg_signal_id = await _check_holy_grail_dedup(signal["ticker"])
+                if hg_signal_id:
+                    # Boost existing HG signal instead of emitting duplicate
+                    logger.info(
+                        "Sell the Rip: %s confirms Holy Grail %s — skipping, boosting HG +8",
+                        signal["ticker"], hg_signal_id,
+                    )
+                    signal["confluence_holy_grail"] = True
+                    # Note: actual HG score boost happens in the scorer via confluence_holy_grail flag
+                    continue
 
-            # Add VIX warning to signal metadata
-            if vix_warning:
-                signal["vix_warning"] = True
-                signal["vix_level"] = vix
+                # Add VIX warning to signal metadata
+                if vix_warning:
+                    signal["vix_warning"] = True
+                    signal["vix_level"] = vix
 
-            from signals.pipeline import process_signal_unified
-            await process_signal_unified(signal, source="server_scanner")
-        except Exception as e:
-            logger.error("Failed to process Sell the Rip signal for %s: %s", signal.get("ticker"), e)
+                from signals.pipeline import process_signal_unified
+                await process_signal_unified(signal, source="server_scanner")
+            except Exception as e:
+                logger.error("Failed to process Sell the Rip signal for %s: %s", signal.get("ticker"), e)
 
-    logger.info(
-        "Sell the Rip scan: %d signals from %d tickers in %.1fs",
-        len(all_signals), len(tickers), elapsed,
-    )
+        return {"sector_rs_stale": ctx["sector_rs_stale"], "bias_regime": "bearish"}
 
-    return {
-        "scan_time": datetime.utcnow().isoformat(),
-        "tickers_scanned": len(tickers),
-        "signals_found": len(all_signals),
-        "duration_seconds": round(elapsed, 1),
-        "sector_rs_stale": sector_rs_stale,
-        "bias_regime": "bearish",
-    }
+
+register_detector(SellTheRipDetector())
+
+
+# ── Main scan runner ──
+
+async def run_sell_the_rip_scan(tickers: List[str] = None) -> Dict:
+    """Run Sell the Rip scan across ticker universe (one engine cycle, STR only)."""
+    return await run_detector("sell_the_rip", tickers)
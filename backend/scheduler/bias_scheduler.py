@@ -16,12 +16,13 @@ import json
 import logging
 import asyncio
 import pytz
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from enum import Enum
 
 from signals.pipeline import process_signal_unified
 from jobs.crypto_bars import normalize_crypto_ticker as _normalize_crypto_ticker
+from utils.trading_calendar import get_calendar as get_trading_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -2066,94 +2067,29 @@ async def refresh_cyclical_bias() -> Dict[str, Any]:
 # =========================================================================
 
 _scheduler_started = False
+# Handles kept so the job runner can stop the scheduler when it loses the lease.
+_apscheduler = None
+_scheduler_tasks: List[asyncio.Task] = []
 
-def is_trading_day() -> bool:
-    """Check if today is a trading day (Mon-Fri, not a holiday) in Eastern Time"""
-    today = get_eastern_now().date()
-    if today.weekday() >= 5:
-        return False
-
-    holiday_dates = (
-        _nyse_holidays(today.year - 1)
-        | _nyse_holidays(today.year)
-        | _nyse_holidays(today.year + 1)
-    )
-    return today not in holiday_dates
-
-
-def _observed_date(day: date) -> date:
-    if day.weekday() == 5:
-        return day - timedelta(days=1)
-    if day.weekday() == 6:
-        return day + timedelta(days=1)
-    return day
 
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _scheduler_tasks.append(task)
+    return task
 
-def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
-    current = date(year, month, 1)
-    while current.weekday() != weekday:
-        current += timedelta(days=1)
-    return current + timedelta(weeks=n - 1)
 
-
-def _last_weekday(year: int, month: int, weekday: int) -> date:
-    if month == 12:
-        current = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        current = date(year, month + 1, 1) - timedelta(days=1)
-    while current.weekday() != weekday:
-        current -= timedelta(days=1)
-    return current
-
-
-def _easter_date(year: int) -> date:
-    a = year % 19
-    b = year // 100
-    c = year % 100
-    d = b // 4
-    e = b % 4
-    f = (b + 8) // 25
-    g = (b - f + 1) // 3
-    h = (19 * a + b - d - g + 15) % 30
-    i = c // 4
-    k = c % 4
-    l = (32 + 2 * e + 2 * i - h - k) % 7
-    m = (a + 11 * h + 22 * l) // 451
-    month = (h + l - 7 * m + 114) // 31
-    day = ((h + l - 7 * m + 114) % 31) + 1
-    return date(year, month, day)
-
-
-def _nyse_holidays(year: int) -> set[date]:
-    holidays: set[date] = set()
-
-    holidays.add(_observed_date(date(year, 1, 1)))      # New Year's Day
-    holidays.add(_nth_weekday(year, 1, 0, 3))           # MLK Day (3rd Monday Jan)
-    holidays.add(_nth_weekday(year, 2, 0, 3))           # Presidents Day (3rd Monday Feb)
-
-    good_friday = _easter_date(year) - timedelta(days=2)
-    holidays.add(good_friday)
-
-    holidays.add(_last_weekday(year, 5, 0))             # Memorial Day (last Monday May)
-    holidays.add(_observed_date(date(year, 6, 19)))     # Juneteenth
-    holidays.add(_observed_date(date(year, 7, 4)))      # Independence Day
-    holidays.add(_nth_weekday(year, 9, 0, 1))           # Labor Day (1st Monday Sep)
-    holidays.add(_nth_weekday(year, 11, 3, 4))          # Thanksgiving (4th Thursday Nov)
-    holidays.add(_observed_date(date(year, 12, 25)))    # Christmas
-
-    return holidays
+def is_trading_day() -> bool:
+    """Check if today is a trading day (NYSE session) in Eastern Time"""
+    return get_trading_calendar().is_trading_day(get_eastern_now().date())
 
 
 def is_first_trading_day_of_month() -> bool:
     """Check if today is the first trading day of the month (Eastern Time)"""
-    today = get_eastern_now()
-    
-    # Find first weekday of month
-    first_day = today.replace(day=1, tzinfo=ET)
-    while first_day.weekday() >= 5:  # Saturday or Sunday
-        first_day += timedelta(days=1)
-    
-    return today.date() == first_day.date()
+    today = get_eastern_now().date()
+    calendar = get_trading_calendar()
+    return calendar.is_trading_day(today) and (
+        calendar.previous_trading_day(today).month != today.month
+    )
 
 
 async def run_signal_scoring_job() -> None:
@@ -2563,7 +2499,7 @@ async def run_flow_confluence_job():
 
 async def start_scheduler():
     """Start the background scheduler"""
-    global _scheduler_started, _weekly_baseline, _scheduler_status
+    global _scheduler_started, _weekly_baseline, _scheduler_status, _apscheduler
     
     if _scheduler_started:
         logger.info("Scheduler already running")
@@ -2607,7 +2543,7 @@ async def start_scheduler():
     # Kick off startup price-history backfill asynchronously (optional).
     if ENABLE_PRICE_HISTORY_COLLECTION and ENABLE_PRICE_HISTORY_BACKFILL:
         try:
-            asyncio.create_task(run_price_collection_job(backfill=True))
+            _spawn(run_price_collection_job(backfill=True))
             logger.info("  Price history backfill task started")
         except Exception as e:
             logger.warning(f"  Could not start price history backfill task: {e}")
@@ -2858,6 +2794,7 @@ async def start_scheduler():
         )
 
         scheduler.start()
+        _apscheduler = scheduler
         logger.info("âœ… APScheduler started - bias refresh scheduled for 9:45 AM ET")
         logger.info("âœ… Savita auto-search scheduled for 8:00 AM ET (days 12-23)")
         logger.info("âœ… BTC Bottom Signals refresh scheduled every 5 minutes")
@@ -2873,13 +2810,13 @@ async def start_scheduler():
         logger.info("âœ… Correlation collapse scan scheduled daily at 4:35 PM ET")
 
         # Run initial correlation scan on startup
-        asyncio.create_task(run_correlation_scan_job())
+        _spawn(run_correlation_scan_job())
 
         # ALSO start the scanner loop (APScheduler doesn't handle the variable-interval scanners)
-        asyncio.create_task(_scanner_loop())
+        _spawn(_scanner_loop())
         logger.info("âœ… Scanner loop started (CTA + Crypto)")
 
-        asyncio.create_task(_sector_refresh_loop())
+        _spawn(_sector_refresh_loop())
         logger.info("âœ… Sector refresh loop started (15s interval, market hours)")
 
         # DISABLED L1.0 Path A: get_flow_recent yields no usable writes, and leaving this
@@ -2888,13 +2825,29 @@ async def start_scheduler():
         # asyncio.create_task(_uw_flow_polling_loop())
         # logger.info("UW flow polling loop DISABLED (L1.0 Path A — poller is sole writer)")
 
-        asyncio.create_task(_sector_3_10_refresh_loop())
+        _spawn(_sector_3_10_refresh_loop())
         logger.info("âœ… Sector 3-10 cache loop started (15 min interval, market hours)")
 
     except ImportError:
         logger.warning("APScheduler not installed, using fallback scheduler")
         # Fallback: Simple asyncio-based scheduler (handles both bias refresh AND scanners)
-        asyncio.create_task(_fallback_scheduler())
+        _spawn(_fallback_scheduler())
+
+
+async def stop_scheduler():
+    """Stop APScheduler and the loops start_scheduler spawned."""
+    global _scheduler_started, _apscheduler
+    if _apscheduler is not None:
+        _apscheduler.shutdown(wait=False)
+        _apscheduler = None
+    tasks = [t for t in _scheduler_tasks if not t.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    _scheduler_tasks.clear()
+    _scheduler_started = False
+    logger.info("Bias scheduler stopped")
 
 
 async def _uw_flow_polling_loop():
@@ -0,0 +1,107 @@
+"""
+Benchmark — /crypto/market: single-slot cache vs the per-(symbol, limit)
+snapshot service (api/crypto_market.CryptoSnapshotService).
+
+Replays a simulated polling trace through both:
+
+  stater    every tracked symbol (bare base, e.g. "BTC") every 30s
+  app.js    one symbol ("BTCUSDT") every 5s
+
+  legacy    one global slot with a 4s TTL: a hit needs the same key as the
+            previous build, so interleaved symbols rebuild every time
+  service   snapshots per key from memory, refreshed in the background
+            (hot keys every 5s, idle tracked keys every 30s)
+
+Counts exchange fan-outs (one fan-out = 9-11 HTTP calls) and the requests
+that had to wait on one. Simulated clock; no network.
+
+    cd backend
+    python scripts/bench_crypto_snapshot.py [--dashboards 1 5 20] [--minutes 10] [--fanout-ms 400]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import crypto_market as cm  # noqa: E402
+from config.crypto_symbol_matrix import CRYPTO_SYMBOL_MATRIX  # noqa: E402
+
+CALLS_PER_FANOUT = 11
+
+
+def _trace(dashboards, seconds):
+    """(t, symbol) requests: half the dashboards are stater, half app.js (offset starts)."""
+    requests = []
+    for d in range(dashboards):
+        offset = (d * 1.37) % 5
+        if d % 2 == 0:
+            requests += [(t + offset, base) for t in range(0, seconds, 30) for base in CRYPTO_SYMBOL_MATRIX]
+        else:
+            requests += [(t + offset, "BTCUSDT") for t in range(0, seconds, 5)]
+    return sorted(requests)
+
+
+def _legacy(requests):
+    slot = None     # (key, built_at)
+    fanouts = waited = 0
+    for t, symbol in requests:
+        key = (cm._canonical_symbol(symbol), cm.DEFAULT_SNAPSHOT_LIMIT)
+        if slot is None or slot[0] != key or t - slot[1] >= 4:
+            fanouts += 1
+            waited += 1
+            slot = (key, t)
+    return fanouts, waited
+
+
+async def _service(requests, seconds):
+    clock = {"t": 0.0}
+    fanouts = {"n": 0}
+
+    async def _build(symbol, limit):
+        fanouts["n"] += 1
+        return {"symbol": symbol}
+
+    cm._build_market_snapshot = _build
+    svc = cm.CryptoSnapshotService(clock=lambda: clock["t"])
+    ticks = [(float(t), None) for t in range(0, seconds, int(cm.SNAPSHOT_REFRESH_SECONDS))]
+    waited = 0
+    for t, symbol in sorted(ticks + requests, key=lambda e: (e[0], e[1] is not None)):
+        clock["t"] = t
+        if symbol is None:
+            await svc.refresh_due()
+        else:
+            before = fanouts["n"]
+            await svc.get(symbol, cm.DEFAULT_SNAPSHOT_LIMIT)
+            waited += fanouts["n"] > before
+        await asyncio.sleep(0)      # let behind-the-request refreshes run
+    return fanouts["n"], waited
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dashboards", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--minutes", type=int, default=10)
+    parser.add_argument("--fanout-ms", type=float, default=400)
+    args = parser.parse_args()
+
+    seconds = args.minutes * 60
+    print(f"{args.minutes} simulated minutes, {CALLS_PER_FANOUT} exchange calls per fan-out, "
+          f"{args.fanout_ms:.0f} ms per fan-out\n")
+    print(f"{'dashboards':>10} {'requests':>9}   {'exchange calls/min':>22}   {'requests waiting':>24}")
+    print(f"{'':>10} {'':>9}   {'legacy':>10} {'service':>11}   {'legacy':>11} {'service':>12}")
+    for dashboards in args.dashboards:
+        requests = _trace(dashboards, seconds)
+        old_fanouts, old_waited = _legacy(requests)
+        new_fanouts, new_waited = asyncio.run(_service(requests, seconds))
+        per_min = CALLS_PER_FANOUT / args.minutes
+        print(f"{dashboards:>10} {len(requests):>9}   {old_fanouts * per_min:>10.0f} {new_fanouts * per_min:>11.0f}   "
+              f"{old_waited / len(requests):>10.0%} {new_waited / len(requests):>12.1%}")
+    print(f"\nA waiting request costs ~{args.fanout_ms:.0f} ms; one served from memory costs no exchange time.")
+
+
+if __name__ == "__main__":
+    main()
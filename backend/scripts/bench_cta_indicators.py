@@ -0,0 +1,107 @@
+"""
+Micro-benchmark — CTA indicator computation, old vs new.
+
+Synthetic universe of 500 tickers x 252 daily bars. Compares:
+
+  1. CTA zone column: row-wise df.apply(get_cta_zone) vs classify_cta_zones
+     (np.select over the SMA columns).
+  2. Per-scan indicator cost: full calculate_cta_indicators() recompute vs
+     CtaIndicatorState.advance() with one new bar (the steady-state hourly
+     scan), plus the JSON round trip the Redis persistence adds.
+
+No network, Redis or Postgres.
+
+    cd backend
+    python scripts/bench_cta_indicators.py [--tickers 500] [--bars 252]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scanners.cta_scanner as cta  # noqa: E402
+from scanners.cta_indicator_state import CtaIndicatorState, classify_cta_zones  # noqa: E402
+
+
+def _universe(n_tickers: int, n_bars: int):
+    rng = np.random.default_rng(42)
+    idx = pd.bdate_range("2025-01-02", periods=n_bars + 1)
+    frames = []
+    for _ in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, n_bars + 1)))
+        high = close * (1 + rng.uniform(0, 0.02, n_bars + 1))
+        low = close * (1 - rng.uniform(0, 0.02, n_bars + 1))
+        vol = rng.integers(500_000, 5_000_000, n_bars + 1).astype(float)
+        frames.append(pd.DataFrame(
+            {"Open": (high + low) / 2, "High": high, "Low": low, "Close": close, "Volume": vol},
+            index=idx,
+        ))
+    return frames
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=252)
+    args = parser.parse_args()
+
+    frames = _universe(args.tickers, args.bars)
+    prev_scan = [f.iloc[:-1] for f in frames]   # what the previous scan saw
+    this_scan = [f.iloc[1:] for f in frames]    # 1y window slid by one bar
+    print(f"Universe: {args.tickers} tickers x {args.bars} bars\n")
+
+    with_smas = [cta.calculate_cta_indicators(f.copy()) for f in this_scan]
+
+    t_apply, _ = _timed(lambda: [
+        f.apply(lambda r: cta.get_cta_zone(r["Close"], r["sma20"], r["sma50"], r["sma120"])[0], axis=1)
+        for f in with_smas
+    ])
+    t_select, _ = _timed(lambda: [
+        classify_cta_zones(f["Close"], f["sma20"], f["sma50"], f["sma120"]) for f in with_smas
+    ])
+
+    t_full, _ = _timed(lambda: [cta.calculate_cta_indicators(f.copy()) for f in this_scan])
+
+    t_seed, states = _timed(lambda: [CtaIndicatorState.seed(f"T{i}", f) for i, f in enumerate(prev_scan)])
+    payloads = [json.dumps(s.to_dict()) for s in states]
+    t_load, states = _timed(lambda: [CtaIndicatorState.from_dict(json.loads(p)) for p in payloads])
+    t_incr, outs = _timed(lambda: [s.advance(f) for s, f in zip(states, this_scan)])
+    t_save, _ = _timed(lambda: [json.dumps(s.to_dict()) for s in states])
+    assert all(o is not None for o in outs), "incremental path fell back to a reseed"
+
+    n = args.tickers
+
+    def row(label, seconds):
+        print(f"  {label:<44} {seconds * 1000:9.1f} ms  ({seconds / n * 1e6:8.1f} us/ticker)")
+
+    print("CTA zone column")
+    row("df.apply(get_cta_zone, axis=1)", t_apply)
+    row("classify_cta_zones (np.select)", t_select)
+    print(f"  speedup: {t_apply / t_select:.0f}x\n")
+
+    print("Per-scan indicator computation")
+    row("full calculate_cta_indicators", t_full)
+    row("incremental advance (1 new bar)", t_incr)
+    row("  + state JSON load/save", t_incr + t_load + t_save)
+    row("one-off seed (first scan per ticker)", t_seed)
+    print(f"  speedup (compute only): {t_full / t_incr:.1f}x")
+    print(f"  speedup (with persistence): {t_full / (t_incr + t_load + t_save):.1f}x")
+    print(f"  state size: {sum(map(len, payloads)) / n / 1024:.1f} KiB/ticker")
+
+
+if __name__ == "__main__":
+    main()
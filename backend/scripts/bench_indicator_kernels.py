@@ -0,0 +1,145 @@
+"""
+Benchmark — indicators.kernels, per-ticker vs one multi-ticker panel.
+
+Synthetic universe of 500 tickers x 252 daily bars (a tenth of them with a
+shorter listing history). For SMA / EMA / ATR / ADX / RSI / MACD / 3-10 it
+times:
+
+  1. pandas per ticker: the formulas the scanners ran through pandas_ta
+     (rolling mean, SMA-seeded EMA, `rma` = ewm(alpha=1/n, adjust=True)).
+  2. kernels per ticker: the same kernels called on each 1-D series.
+  3. kernels on a panel: one call over the (tickers x bars) array.
+
+No network, Redis or Postgres.
+
+    cd backend
+    python scripts/bench_indicator_kernels.py [--tickers 500] [--bars 252]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import kernels  # noqa: E402
+
+
+def _rma(s, length):
+    return s.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+
+def _atr(high, low, close, length=14):
+    prev = close.shift(1)
+    tr = pd.concat([high - low, high - prev, prev - low], axis=1).abs().max(axis=1)
+    tr.iloc[:1] = np.nan
+    return _rma(tr, length)
+
+
+def _adx(high, low, close, length=14):
+    atr = _atr(high, low, close, length)
+    up, dn = high - high.shift(1), low.shift(1) - low
+    k = 100 / atr
+    dmp = k * _rma(((up > dn) & (up > 0)) * up, length)
+    dmn = k * _rma(((dn > up) & (dn > 0)) * dn, length)
+    return _rma(100 * (dmp - dmn).abs() / (dmp + dmn), length)
+
+
+def _rsi(close, length=14):
+    neg = close.diff(1)
+    pos = neg.copy()
+    pos[pos < 0] = 0
+    neg[neg > 0] = 0
+    p, n = _rma(pos, length), _rma(neg, length)
+    return 100 * p / (p + n.abs())
+
+
+def _ema(close, length):
+    seeded = close.copy()
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = close.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False).mean()
+
+
+def _macd(close):
+    line = _ema(close, 12) - _ema(close, 26)
+    valid = line.dropna()
+    return line, _ema(valid, 9)
+
+
+def _three_ten(high, low):
+    mid = (high + low) / 2
+    raw = mid.rolling(3).mean() - mid.rolling(10).mean()
+    return raw.rolling(3).mean(), raw.rolling(10).mean()
+
+
+PANDAS = {
+    "sma(50)": lambda h, l, c: c.rolling(50).mean(),
+    "ema(20)": lambda h, l, c: _ema(c, 20),
+    "atr(14)": lambda h, l, c: _atr(h, l, c),
+    "adx(14)": lambda h, l, c: _adx(h, l, c),
+    "rsi(14)": lambda h, l, c: _rsi(c),
+    "macd(12/26/9)": lambda h, l, c: _macd(c),
+    "3-10": lambda h, l, c: _three_ten(h, l),
+}
+
+KERNELS = {
+    "sma(50)": lambda h, l, c: kernels.sma(c, 50),
+    "ema(20)": lambda h, l, c: kernels.ema(c, 20),
+    "atr(14)": lambda h, l, c: kernels.atr(h, l, c, 14, seed="adjusted"),
+    "adx(14)": lambda h, l, c: kernels.adx(h, l, c, 14, seed="adjusted"),
+    "rsi(14)": lambda h, l, c: kernels.rsi(c, 14, seed="adjusted"),
+    "macd(12/26/9)": lambda h, l, c: kernels.macd(c),
+    "3-10": lambda h, l, c: kernels.three_ten(h, l),
+}
+
+
+def _universe(n_tickers: int, n_bars: int):
+    rng = np.random.default_rng(11)
+    out = []
+    for i in range(n_tickers):
+        bars = n_bars if i % 10 else n_bars // 3   # recent listings
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, bars)))
+        high = close * (1 + rng.uniform(0, 0.02, bars))
+        low = close * (1 - rng.uniform(0, 0.02, bars))
+        out.append((high, low, close))
+    return out
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=252)
+    args = parser.parse_args()
+
+    universe = _universe(args.tickers, args.bars)
+    series = [tuple(pd.Series(a) for a in t) for t in universe]
+    high, low, close = (kernels.panel([t[k] for t in universe], args.bars) for k in range(3))
+    print(f"Universe: {args.tickers} tickers x {args.bars} bars\n")
+    print(f"  {'indicator':<14} {'pandas/ticker':>14} {'kernel/ticker':>14} {'kernel panel':>13} {'speedup':>8}")
+
+    totals = [0.0, 0.0, 0.0]
+    for name in PANDAS:
+        t_pd = _timed(lambda: [PANDAS[name](*s) for s in series])
+        t_1d = _timed(lambda: [KERNELS[name](*t) for t in universe])
+        t_2d = _timed(lambda: KERNELS[name](high, low, close))
+        for k, t in enumerate((t_pd, t_1d, t_2d)):
+            totals[k] += t
+        print(f"  {name:<14} {t_pd * 1000:11.1f} ms {t_1d * 1000:11.1f} ms {t_2d * 1000:10.1f} ms {t_pd / t_2d:7.0f}x")
+    print(f"  {'total':<14} {totals[0] * 1000:11.1f} ms {totals[1] * 1000:11.1f} ms "
+          f"{totals[2] * 1000:10.1f} ms {totals[0] / totals[2]:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
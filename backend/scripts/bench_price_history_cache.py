@@ -0,0 +1,82 @@
+"""
+Micro-benchmark — price-history cache encoding, JSON vs binary.
+
+Compares the old `df.to_json(orient="split")` / `pd.read_json` round trip with
+the binary codec in bias_engine/price_history_cache.py, and the Redis
+footprint of per-(symbol, days) keys vs one key per symbol. No network.
+
+    cd backend
+    python scripts/bench_price_history_cache.py [--symbols 15] [--reads 40]
+"""
+
+import argparse
+import os
+import sys
+import time
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bias_engine.price_history_cache import (  # noqa: E402
+    PriceHistoryEntry,
+    SLICE_ROWS,
+    decode_history,
+    encode_history,
+)
+
+# Windows bias filters request today (see get_price_history call sites).
+WINDOWS = (5, 10, 15, 20, 25, 30, 60, 70, 80, 250, 365)
+
+
+def _frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    idx = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=rows, name="Date")
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+         "volume": rng.integers(1_000_000, 9_000_000, rows).astype(float)},
+        index=idx,
+    )
+
+
+def _timed(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=15)
+    parser.add_argument("--reads", type=int, default=40)
+    args = parser.parse_args()
+
+    full = _frame(max(WINDOWS), 1)
+    json_payload = full.to_json(orient="split")
+    bin_payload = encode_history(PriceHistoryEntry(full, max(WINDOWS), SLICE_ROWS, time.time()))
+
+    t_json = _timed(lambda: pd.read_json(StringIO(json_payload), orient="split"), args.reads)
+    t_bin = _timed(lambda: decode_history(bin_payload).frame, args.reads)
+    t_slice = _timed(lambda: decode_history(bin_payload).window(30), args.reads)
+
+    print(f"Decode one {len(full)}-row frame")
+    print(f"  pd.read_json(orient='split')     {t_json * 1e3:8.3f} ms")
+    print(f"  decode_history (np.frombuffer)   {t_bin * 1e3:8.3f} ms   ({t_json / t_bin:.0f}x)")
+    print(f"  decode_history + 30d window      {t_slice * 1e3:8.3f} ms\n")
+
+    old_bytes = sum(len(_frame(w, 1).to_json(orient="split")) for w in WINDOWS)
+    new_bytes = len(bin_payload)
+    print(f"Redis footprint per symbol ({len(WINDOWS)} windows requested)")
+    print(f"  JSON, one key per (symbol, days) {old_bytes / 1024:8.1f} KiB")
+    print(f"  binary, one key per symbol       {new_bytes / 1024:8.1f} KiB   ({old_bytes / new_bytes:.0f}x smaller)")
+    print(f"  x {args.symbols} symbols: {old_bytes * args.symbols / 1024:.0f} KiB -> "
+          f"{new_bytes * args.symbols / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
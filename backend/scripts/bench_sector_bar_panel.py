@@ -0,0 +1,88 @@
+"""
+Benchmark — sector constituent refresh: per-ticker UW calls vs the local
+daily-bar panel (jobs/sector_bar_panel).
+
+UW call budget for one regular session (180s fast cadence, hourly MO loop,
+16:05 close snapshot):
+
+  legacy   get_ohlc + get_technical_indicator per ticker per fast tick,
+           get_ohlc per ticker per slow tick, 2 per ticker at the close
+  panel    one get_ohlc per ticker per completed session (close snapshot);
+           ticks pull live prices from one yfinance batch
+
+plus the compute cost of one tick: every field for the whole universe in one
+vectorized pass vs a per-ticker Python loop over the same bars. No network,
+Redis or Postgres.
+
+    cd backend
+    python scripts/bench_sector_bar_panel.py [--tickers 220] [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import kernels  # noqa: E402
+from jobs.sector_bar_panel import MO_OFFSET, PANEL_SESSIONS, WK_OFFSET, compute_fields  # noqa: E402
+
+SESSION_MINUTES = 390
+FAST_CADENCE_S = 180
+SLOW_TICKS = 7
+
+
+def _legacy_pct(closes, offset):
+    if len(closes) < offset + 1:
+        return None
+    old = closes[-(offset + 1)]
+    return round((closes[-1] / old - 1) * 100, 2) if old else None
+
+
+def _legacy_tick(histories):
+    out = []
+    for closes in histories:
+        rsi = kernels.rsi(np.asarray(closes), 14)[-1]
+        out.append((_legacy_pct(closes, WK_OFFSET), _legacy_pct(closes, MO_OFFSET), round(float(rsi), 2)))
+    return out
+
+
+def _timed(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=220)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    fast_ticks = SESSION_MINUTES * 60 // FAST_CADENCE_S
+    print(f"UW calls per session ({fast_ticks} fast ticks, {SLOW_TICKS} slow ticks, 1 close snapshot):")
+    for universe in (33, args.tickers):
+        legacy = universe * (2 * fast_ticks + SLOW_TICKS + 2)
+        print(f"  {universe:>4} tickers   legacy {legacy:>7,}   panel {universe:>5,}   "
+              f"({legacy / universe:.0f}x fewer)")
+
+    rng = np.random.default_rng(7)
+    matrix = 100 * np.cumprod(1 + rng.normal(0, 0.015, (args.tickers, PANEL_SESSIONS)), axis=1)
+    histories = [list(row) for row in matrix]
+
+    t_old, old = _timed(lambda: _legacy_tick(histories), args.repeat)
+    t_new, new = _timed(lambda: compute_fields(matrix), args.repeat)
+    for i, (wk, mo, rsi) in enumerate(old):
+        assert new["wk_change_pct"][i] == wk and new["mo_change_pct"][i] == mo
+        assert new["rsi_14"][i] == rsi
+    print(f"\nCompute one tick ({args.tickers} tickers x {PANEL_SESSIONS} sessions):")
+    print(f"  per-ticker loop {t_old * 1000:8.2f} ms   panel {t_new * 1000:6.2f} ms   {t_old / t_new:5.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark — Stable Engine metrics, full rebuild vs incremental.
+
+Runs compute_metrics over the full theme universe (stable_engine/data/
+universe.csv plus the benchmark symbols) against synthetic bars held in
+memory, so it measures the pandas work and the rows that would be written,
+not Postgres. The incremental run is the nightly case: one new session per
+ticker since the last stored metric row.
+
+    cd backend
+    python scripts/bench_stable_metrics.py [--years 5] [--new-days 1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_engine import config, metrics  # noqa: E402
+
+
+def _universe() -> list:
+    tickers = pd.read_csv(config.UNIVERSE_PATH)["ticker"].str.strip().str.upper().tolist()
+    return sorted(set(tickers) | set(config.BENCHMARK_SYMBOLS))
+
+
+def _bars(tickers: list, sessions: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=sessions).date
+    frames = []
+    for t in tickers:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, sessions)))
+        frames.append(pd.DataFrame({
+            "ticker": t, "date": dates, "open": close, "high": close * 1.01,
+            "low": close * 0.99, "close": close,
+            "volume": rng.integers(1_000_000, 9_000_000, sessions),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class _MemoryDb:
+    """Answers the two bar queries compute_metrics issues; stores last dates only."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.last = {}
+        self.rows = 0
+
+    def read_df(self, sql, params=None):
+        if "WITH last" in sql:
+            window = params[0]
+            out = self.bars.assign(last_date=self.bars["ticker"].map(self.last))
+            cutoff = pd.to_datetime(out["last_date"]) - pd.Timedelta(days=window)
+            keep = out["last_date"].isna() | (pd.to_datetime(out["date"]) > cutoff)
+            return out[keep].reset_index(drop=True)
+        if params:
+            return self.bars[self.bars["ticker"].isin(params)].reset_index(drop=True)
+        return self.bars
+
+    def execute_values(self, cur, sql, rows, page_size=None):
+        self.rows += len(rows)
+        for row in rows:
+            self.last[row[0]] = max(self.last.get(row[0], row[1]), row[1])
+
+    def connect(self):
+        class _Cur:
+            def execute(self, *a):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *a):
+                return False
+
+        class _Conn:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *a):
+                return False
+
+            def cursor(self):
+                return _Cur()
+
+        return _Conn()
+
+
+def _run(memdb: _MemoryDb, **kwargs):
+    memdb.rows = 0
+    t0 = time.perf_counter()
+    summary = metrics.compute_metrics(**kwargs)
+    return time.perf_counter() - t0, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=config.HISTORY_YEARS)
+    parser.add_argument("--new-days", type=int, default=1)
+    args = parser.parse_args()
+
+    tickers = _universe()
+    sessions = args.years * 252
+    all_bars = _bars(tickers, sessions + args.new_days)
+    dates = sorted(all_bars["date"].unique())
+
+    memdb = _MemoryDb(all_bars[all_bars["date"] <= dates[sessions - 1]])
+    metrics.db.read_df = memdb.read_df
+    metrics.db.connect = memdb.connect
+    metrics.db.init_schema = lambda: None
+    metrics.execute_values = memdb.execute_values
+
+    t_full, full = _run(memdb)
+    memdb.bars = all_bars
+    t_inc, inc = _run(memdb, incremental=True)
+
+    print(f"Universe: {len(tickers)} tickers x {sessions} sessions, {args.new_days} new session(s)")
+    print(f"  full rebuild        {t_full:8.2f} s   rows written {full['rows_written']:>9,}")
+    print(f"  incremental         {t_inc:8.2f} s   rows written {inc['rows_written']:>9,}"
+          f"   ({t_full / t_inc:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark — utils.trading_calendar vs the per-call holiday logic it replaced.
+
+Legacy paths (as they ran in the scheduler / scorer / resolvers):
+
+  1. is_trading_day: rebuild the NYSE holiday sets for year-1..year+1 on
+     every call, then a set membership test (special closures added so both
+     sides agree).
+  2. nth trading day after: step one calendar day at a time (a3 / Triton
+     stepped Mon–Fri only; here each step also checks holidays so both
+     sides return the same dates).
+  3. sessions between two session dates: walk back session by session (the
+     PYTHIA staleness watchdog).
+
+versus the precomputed index (O(1) array lookups). No network, Redis or
+Postgres.
+
+    cd backend
+    python scripts/bench_trading_calendar.py [--queries 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# Allow imports from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.trading_calendar import SPECIAL_CLOSURES, TradingCalendar, nyse_holidays  # noqa: E402
+
+
+def _legacy_is_trading_day(day: date) -> bool:
+    if day.weekday() >= 5:
+        return False
+    holidays = nyse_holidays(day.year - 1) | nyse_holidays(day.year) | nyse_holidays(day.year + 1)
+    return day not in holidays and day not in SPECIAL_CLOSURES
+
+
+def _legacy_nth_after(anchor: date, n: int) -> date:
+    day, count = anchor, 0
+    while count < n:
+        day += timedelta(days=1)
+        if _legacy_is_trading_day(day):
+            count += 1
+    return day
+
+
+def _legacy_sessions_between(start: date, end: date) -> int:
+    gap, day = 0, end
+    while day > start:
+        day -= timedelta(days=1)
+        while not _legacy_is_trading_day(day):
+            day -= timedelta(days=1)
+        gap += 1
+    return gap
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    span = (date(2035, 12, 31) - date(2010, 1, 1)).days
+    days = [date(2010, 1, 1) + timedelta(days=rng.randrange(span)) for _ in range(args.queries)]
+    horizons = [rng.choice((1, 5, 20)) for _ in days]
+
+    t_build, cal = _timed(TradingCalendar)
+    # The watchdog compares two session dates (event session, current session).
+    starts = [cal.next_trading_day(d) for d in days]
+    ends = [cal.next_trading_day(d, rng.randrange(0, 10) + 1) for d in starts]
+    print(f"Calendar build ({cal.first_day.year}-{cal.last_day.year}, "
+          f"{len(cal.sessions)} sessions): {t_build * 1000:.1f} ms\n")
+    print(f"  {'query':<26} {'legacy':>12} {'calendar':>12} {'speedup':>8}   ({args.queries} queries)")
+
+    cases = [
+        ("is_trading_day",
+         lambda: [_legacy_is_trading_day(d) for d in days],
+         lambda: [cal.is_trading_day(d) for d in days]),
+        ("nth trading day after",
+         lambda: [_legacy_nth_after(d, n) for d, n in zip(days, horizons)],
+         lambda: [cal.next_trading_day(d, n) for d, n in zip(days, horizons)]),
+        ("sessions between",
+         lambda: [_legacy_sessions_between(d, e) for d, e in zip(starts, ends)],
+         lambda: [cal.sessions_between(d, e) for d, e in zip(starts, ends)]),
+    ]
+    for name, legacy, indexed in cases:
+        t_old, old = _timed(legacy)
+        t_new, new = _timed(indexed)
+        assert old == new, f"{name}: results differ"
+        print(f"  {name:<26} {t_old * 1000:9.1f} ms {t_new * 1000:9.1f} ms {t_old / t_new:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
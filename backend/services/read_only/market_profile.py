@@ -29,6 +29,8 @@ from typing import Any, Dict, Optional
 
 import pytz
 
+from utils.trading_calendar import get_calendar as get_trading_calendar
+
 logger = logging.getLogger(__name__)
 
 _ET = pytz.timezone("America/New_York")
@@ -50,28 +52,22 @@ def _num_or_none(v: Any) -> Optional[float]:
     return f if (f is not None and f != 0) else None
 
 
-def _prev_weekday(d: date) -> date:
-    """Most recent weekday strictly before d (skips Sat/Sun). Holidays not handled."""
-    cur = d - timedelta(days=1)
-    while cur.weekday() >= 5:  # Mon=0 … Fri=4, Sat=5, Sun=6
-        cur -= timedelta(days=1)
-    return cur
+def _prev_session(d: date) -> date:
+    """Most recent NYSE session strictly before d (weekends and holidays skipped)."""
+    return get_trading_calendar().previous_trading_day(d)
 
 
 def _current_session_date(now_et: datetime) -> date:
     """The trading date whose RTH session is current/most-recent as of now_et.
 
-    Weekday at/after 09:30 ET → today (developing session).
-    Weekday before 09:30 ET, or weekend → the last completed weekday session.
-    Holiday calendar not modeled (approximation; acceptable — a holiday just
-    means the "current" session label may lead by one day, which surfaces as
-    'stale', the safe direction).
+    Session day at/after 09:30 ET → today (developing session).
+    Before 09:30 ET, weekend or holiday → the last completed session.
     """
     d = now_et.date()
     after_open = (now_et.hour, now_et.minute) >= (9, 30)
-    if now_et.weekday() < 5 and after_open:
+    if after_open and get_trading_calendar().is_trading_day(d):
         return d
-    return _prev_weekday(d) if now_et.weekday() >= 5 or not after_open else d
+    return _prev_session(d)
 
 
 async def get_market_profile(ticker: str) -> Optional[Dict[str, Any]]:
@@ -9,12 +9,14 @@ This replaces the duplicated log/score/cache/broadcast logic across handlers.
 import json
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 
 from database.postgres_client import log_signal, update_signal_with_score
 from database.redis_client import cache_signal
 from scoring.trade_ideas_scorer import calculate_signal_score, get_score_tier
+from signals.stage_graph import Stage, run_stages, slowest_stage
 from websocket.broadcaster import manager
 from utils.bias_snapshot import get_bias_snapshot
 
@@ -226,23 +228,232 @@ async def write_signal_outcome(signal_data: Dict[str, Any]) -> None:
         logger.warning(f"Failed to record signal outcome: {e}")
 
 
+# ── apply_scoring stage graph ───────────────────────────────────────────────
+# Every independent lookup apply_scoring needs runs concurrently through
+# signals.stage_graph; the score arithmetic afterwards stays sequential and in
+# the original order. Per-stage budgets (seconds): a stage that overruns falls
+# back to its default exactly as if the lookup had failed.
+SCORING_STAGE_TIMEOUTS = {
+    "composite":       2.0,
+    "sector_strength": 1.0,
+    "regime_context":  1.0,
+    "regime_data":     1.0,
+    "adx_shadow":      1.0,
+    "price_range":     5.0,   # Polygon → yfinance fallback
+    "flow_data":       5.0,   # yfinance options chain
+    "darkpool":        4.0,
+    "squeeze":         2.0,
+    "flow_events":     3.0,
+    "wh_confluence":   3.0,
+    "pythia_profile":  3.0,
+    "vix_percentiles": 3.0,
+}
+
+_ENRICHMENT_STAGES = ("price_range", "flow_data", "darkpool")
+
+
+async def _read_redis_json(key: str) -> Optional[Any]:
+    from database.redis_client import get_redis_client
+    redis = await get_redis_client()
+    if not redis:
+        return None
+    raw = await redis.get(key)
+    return json.loads(raw) if raw else None
+
+
+def _metadata_dict(signal_data: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = signal_data.get("metadata") or {}
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except Exception:
+            metadata = {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+async def _run_enricher(enrich_fn, signal_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run a metadata enricher on a shallow copy carrying its own metadata dict.
+
+    The enrichers read signal_data["metadata"], await, then assign it back, so
+    running them concurrently on the same dict would let the last writer drop
+    the others' keys. Each gets a private copy; _merge_enriched_metadata folds
+    the results back in the original price → flow → darkpool order.
+    """
+    view = {**signal_data, "metadata": dict(_metadata_dict(signal_data))}
+    out = await enrich_fn(view)
+    return (out or view).get("metadata")
+
+
+async def _stage_price_range(signal_data):
+    from signals.price_enrichment import enrich_price_range
+    return await _run_enricher(enrich_price_range, signal_data)
+
+
+async def _stage_flow_data(signal_data):
+    from signals.flow_enrichment import enrich_flow_data
+    return await _run_enricher(enrich_flow_data, signal_data)
+
+
+async def _stage_darkpool(signal_data):
+    from signals.darkpool_enrichment import enrich_darkpool_data
+    try:
+        return await _run_enricher(enrich_darkpool_data, signal_data)
+    except Exception as dp_err:
+        # WARNING not debug — a persistent failure here means the whole
+        # shadow validation window produces no darkpool data silently.
+        logger.warning("Darkpool enrichment failed (shadow): %s", dp_err)
+        raise
+
+
+def _merge_enriched_metadata(signal_data: Dict[str, Any], results: Dict[str, Any]) -> None:
+    updates: Dict[str, Any] = {}
+    for name in _ENRICHMENT_STAGES:
+        enriched = results.get(name)
+        if isinstance(enriched, dict):
+            updates.update(enriched)
+    if not updates:
+        return
+    current = signal_data.get("metadata")
+    if isinstance(current, dict):
+        current.update(updates)
+    else:
+        merged = _metadata_dict(signal_data)
+        merged.update(updates)
+        signal_data["metadata"] = merged
+
+
+async def _stage_squeeze(ticker: str):
+    from database.postgres_client import get_postgres_client
+    pool = await get_postgres_client()
+    async with pool.acquire() as conn:
+        return await conn.fetchrow(
+            "SELECT composite_score, squeeze_tier, short_pct_float, "
+            "days_to_cover FROM squeeze_scores WHERE ticker = $1",
+            ticker,
+        )
+
+
+async def _stage_flow_events(ticker: str, direction: str) -> Dict[str, Any]:
+    """P4A flow row (+ cross-asset check) and the latest-row read for the
+    flow reconciliation shadow, on one pooled connection."""
+    from database.postgres_client import get_postgres_client
+    out: Dict[str, Any] = {"p4a": None, "ca_bonus": 0, "latest": None}
+    pool = await get_postgres_client()
+    async with pool.acquire() as conn:
+        fl_row = await conn.fetchrow(
+            "SELECT total_premium, call_premium, put_premium, "
+            "flow_sentiment, pc_ratio "
+            "FROM flow_events WHERE ticker = $1 "
+            "AND captured_at > NOW() - INTERVAL '4 hours' "
+            "ORDER BY captured_at DESC LIMIT 1",
+            ticker,
+        )
+        out["p4a"] = fl_row
+        if fl_row:
+            sentiment = (fl_row["flow_sentiment"] or "").upper()
+            out["ca_bonus"] = await _check_cross_asset_flow_alignment(
+                conn, ticker, sentiment,
+                direction in ("LONG", "BUY", "BULLISH"),
+                direction in ("SHORT", "SELL", "BEARISH"),
+            )
+        try:
+            out["latest"] = await conn.fetchrow(
+                "SELECT call_premium, put_premium, flow_sentiment, "
+                "EXTRACT(EPOCH FROM (NOW() - captured_at))/60.0 AS age_min "
+                "FROM flow_events WHERE ticker=$1 ORDER BY captured_at DESC LIMIT 1",
+                ticker,
+            )
+        except Exception:
+            pass
+    return out
+
+
+async def _stage_wh_confluence(ticker: str, direction: str):
+    from enrichment.wh_confluence import check_wh_confluence
+    return await check_wh_confluence(ticker, direction)
+
+
+async def _stage_pythia_profile(ticker: str, price, direction: str):
+    from webhooks.pythia_events import get_pythia_profile_position
+    if not ticker or not price or float(price) <= 0:
+        return None
+    return await get_pythia_profile_position(ticker, float(price), direction)
+
+
+def _composite_vix(composite) -> Optional[float]:
+    if composite and composite.factors:
+        iv_reading = composite.factors.get("iv_regime")
+        if iv_reading and iv_reading.raw_data:
+            return iv_reading.raw_data.get("vix")
+    return None
+
+
+async def _stage_vix_percentiles(composite):
+    if _composite_vix(composite) is None:
+        return None
+    return await _compute_vix_percentiles(VIX_REGIME_PERCENTILE_LOOKBACK)
+
+
+def _build_scoring_stages(signal_data: Dict[str, Any]) -> list:
+    """The apply_scoring lookup graph. Only vix_percentiles has a dependency
+    (it needs the composite's VIX reading); everything else starts at once."""
+    from bias_engine.composite import get_cached_composite
+
+    t = SCORING_STAGE_TIMEOUTS
+    ticker = (signal_data.get("ticker") or "").upper()
+    direction = (signal_data.get("direction") or "").upper()
+    strategy = (signal_data.get("strategy") or "").strip()
+
+    stages = [
+        Stage("composite", get_cached_composite, timeout=t["composite"]),
+        Stage("sector_strength", lambda: _read_redis_json("sector:strength"),
+              timeout=t["sector_strength"]),
+        Stage("regime_context", lambda: _read_redis_json("regime:current_override"),
+              timeout=t["regime_context"]),
+        Stage("regime_data", lambda: _read_redis_json("regime:spy_adx"),
+              timeout=t["regime_data"]),
+        Stage("adx_shadow", lambda: _read_redis_json("regime:spy_adx_shadow"),
+              timeout=t["adx_shadow"]),
+        Stage("price_range", lambda: _stage_price_range(signal_data), timeout=t["price_range"]),
+        Stage("flow_data", lambda: _stage_flow_data(signal_data), timeout=t["flow_data"]),
+        Stage("darkpool", lambda: _stage_darkpool(signal_data), timeout=t["darkpool"]),
+        Stage("squeeze", lambda: _stage_squeeze(ticker), timeout=t["squeeze"]),
+        Stage("flow_events", lambda: _stage_flow_events(ticker, direction),
+              timeout=t["flow_events"]),
+        Stage("wh_confluence", lambda: _stage_wh_confluence(ticker, direction),
+              timeout=t["wh_confluence"]),
+        Stage("pythia_profile",
+              lambda: _stage_pythia_profile(ticker, signal_data.get("entry_price"), direction),
+              timeout=t["pythia_profile"]),
+    ]
+    if strategy in TREND_CONTINUATION_STRATEGIES and VIX_REGIME_USE_PERCENTILE:
+        stages.append(Stage("vix_percentiles", _stage_vix_percentiles,
+                            deps=("composite",), timeout=t["vix_percentiles"]))
+    return stages
+
+
 async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Apply Trade Ideas Scorer to a signal.
 
     Extracted from tradingview.py.apply_signal_scoring() for shared use.
     Includes composite bias lookup, contrarian qualification, and sector rotation.
+
+    Lookups run concurrently via _build_scoring_stages(); per-stage latency is
+    recorded in enrichment_data["scoring_timing"].
     """
     try:
+        scoring_t0 = time.perf_counter()
+        # All independent lookups (composite, Redis regime/sector keys, price/
+        # flow/darkpool enrichment, squeeze/flow rows, WH confluence, Pythia)
+        # run concurrently; a failed or timed-out stage yields None.
+        stage_results, stage_timings = await run_stages(_build_scoring_stages(signal_data))
+        _merge_enriched_metadata(signal_data, stage_results)
+
         # Get composite bias score
-        composite_score = None
-        try:
-            from bias_engine.composite import get_cached_composite
-            cached = await get_cached_composite()
-            if cached:
-                composite_score = cached.composite_score
-        except Exception as comp_err:
-            logger.warning(f"Composite bias unavailable: {comp_err}")
+        cached_composite = stage_results.get("composite")
+        composite_score = cached_composite.composite_score if cached_composite else None
 
         # Build bias data
         if composite_score is not None:
@@ -256,79 +467,21 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
                 "cyclical": bias_status.get("cyclical", {}),
             }
 
-        # Fetch sector strength from Redis (refreshed every 15s by sector_refresh_loop)
-        sector_strength = None
-        try:
-            from database.redis_client import get_redis_client
-            import json as _json
-            redis = await get_redis_client()
-            if redis:
-                raw = await redis.get("sector:strength")
-                if raw:
-                    sector_strength = _json.loads(raw)
-        except Exception as sect_err:
-            logger.debug(f"Sector strength unavailable for scoring: {sect_err}")
-
-        # Fetch regime context for catalyst-alignment + reversal mode scoring
-        regime_context = None
-        try:
-            from database.redis_client import get_redis_client as _get_rc
-            _rc = await _get_rc()
-            if _rc:
-                regime_raw = await _rc.get("regime:current_override")
-                if regime_raw:
-                    import json as _rj
-                    regime_context = _rj.loads(regime_raw)
-        except Exception:
-            pass
+        # Sector strength (refreshed every 15s by sector_refresh_loop) and
+        # regime context for catalyst-alignment + reversal mode scoring
+        sector_strength = stage_results.get("sector_strength")
+        regime_context = stage_results.get("regime_context")
 
-        # P1A hotfix: fetch 10-day price range for freshness penalty
-        try:
-            from signals.price_enrichment import enrich_price_range
-            signal_data = await enrich_price_range(signal_data)
-        except Exception as enrich_err:
-            logger.debug("Price range enrichment skipped: %s", enrich_err)
-
-        # P2: Flow enrichment — yfinance options chain for P/C ratio + premium direction
-        try:
-            from signals.flow_enrichment import enrich_flow_data
-            signal_data = await enrich_flow_data(signal_data)
-        except Exception as flow_err:
-            logger.debug("Flow enrichment skipped: %s", flow_err)
-
-        # B3: Darkpool confluence enrichment — shadow mode (no score effect)
-        try:
-            from signals.darkpool_enrichment import enrich_darkpool_data
-            signal_data = await enrich_darkpool_data(signal_data)
-        except Exception as dp_err:
-            # WARNING not debug — a persistent failure here means the whole
-            # shadow validation window produces no darkpool data silently.
-            logger.warning("Darkpool enrichment failed (shadow): %s", dp_err)
-
-        # Fetch SPY ADX regime data for chop penalty
-        regime_data = {}
-        try:
-            from database.redis_client import get_redis_client as _get_regime_rc
-            import json as _regime_json
-            _rrc = await _get_regime_rc()
-            if _rrc:
-                _regime_raw = await _rrc.get("regime:spy_adx")
-                if _regime_raw:
-                    regime_data = _regime_json.loads(_regime_raw)
-        except Exception:
-            pass
+        # SPY ADX regime data for chop penalty
+        regime_data = stage_results.get("regime_data") or {}
 
         # sub-brief 3 Chunk 3 (SHADOW): compare the new UW-bars ADX regime against
         # the live default-25 path WITHOUT touching live scoring. Live gate below
         # still reads regime:spy_adx (absent → default-25 → 'trending') unchanged.
         try:
             from scoring.adx_regime import classify_adx_regime as _classify_adx
-            from database.redis_client import get_redis_client as _get_adx_rc
-            import json as _adx_json
-            _arc = await _get_adx_rc()
-            _adx_raw = await _arc.get("regime:spy_adx_shadow") if _arc else None
-            if _adx_raw:
-                _adx_payload = _adx_json.loads(_adx_raw)
+            _adx_payload = stage_results.get("adx_shadow")
+            if _adx_payload:
                 _new = _classify_adx(_adx_payload.get("adx"))
             else:
                 _new = _classify_adx(None)  # absent shadow key → 'unknown'
@@ -387,15 +540,8 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
 
         # P2B: Squeeze score cross-reference (post-score bonus)
         try:
-            from database.postgres_client import get_postgres_client
-            pool = await get_postgres_client()
             sq_ticker = (signal_data.get("ticker") or "").upper()
-            async with pool.acquire() as conn:
-                sq_row = await conn.fetchrow(
-                    "SELECT composite_score, squeeze_tier, short_pct_float, "
-                    "days_to_cover FROM squeeze_scores WHERE ticker = $1",
-                    sq_ticker,
-                )
+            sq_row = stage_results.get("squeeze")
             if sq_row and (sq_row["composite_score"] or 0) >= 20:
                 cs = float(sq_row["composite_score"] or 0)
                 squeeze_bonus = 8 if cs >= 30 else 4
@@ -412,80 +558,69 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
         except Exception as sq_err:
             logger.debug("Squeeze cross-reference skipped: %s", sq_err)
 
+        flow_events = stage_results.get("flow_events") or {}
+
         # P2C / P4A: UW flow cross-reference — directional + premium-tiered (ZEUS 1A.1)
         try:
-            from database.postgres_client import get_postgres_client as _gpc
-            _pool = await _gpc()
             fl_ticker = (signal_data.get("ticker") or "").upper()
-            async with _pool.acquire() as conn:
-                fl_row = await conn.fetchrow(
-                    "SELECT total_premium, call_premium, put_premium, "
-                    "flow_sentiment, pc_ratio "
-                    "FROM flow_events WHERE ticker = $1 "
-                    "AND captured_at > NOW() - INTERVAL '4 hours' "
-                    "ORDER BY captured_at DESC LIMIT 1",
-                    fl_ticker,
-                )
-
-                if fl_row:
-                    call_prem = float(fl_row["call_premium"] or 0)
-                    put_prem  = float(fl_row["put_premium"] or 0)
-                    total     = float(fl_row["total_premium"] or 0)
-                    sentiment = (fl_row["flow_sentiment"] or "").upper()
-                    pc_ratio  = float(fl_row["pc_ratio"] or 0) if fl_row["pc_ratio"] else None
-
-                    direction = (signal_data.get("direction") or "").upper()
-                    is_long   = direction in ("LONG", "BUY", "BULLISH")
-                    is_short  = direction in ("SHORT", "SELL", "BEARISH")
-
-                    flow_bonus  = 0
-                    flow_reason = []
-
-                    # Premium-tiered directional scoring
-                    if call_prem > 2_000_000 and sentiment == "BULLISH":
-                        if is_long:
-                            flow_bonus += 6
-                            flow_reason.append(f"bullish flow ${call_prem/1e6:.1f}M calls")
-                        elif is_short:
-                            flow_bonus -= 3
-                            flow_reason.append(f"WARN: short vs bullish flow ${call_prem/1e6:.1f}M calls")
-
-                    if put_prem > 2_000_000 and sentiment == "BEARISH":
-                        if is_short:
-                            flow_bonus += 6
-                            flow_reason.append(f"bearish flow ${put_prem/1e6:.1f}M puts")
-                        elif is_long:
-                            flow_bonus -= 3
-                            flow_reason.append(f"WARN: long vs bearish flow ${put_prem/1e6:.1f}M puts")
-
-                    # Legacy small-premium bonus (backward compat, downgraded +5→+2)
-                    if total > 1_000_000 and flow_bonus == 0:
-                        flow_bonus = 2
-                        flow_reason.append(f"flow ${total/1e6:.1f}M total, direction-neutral")
-
-                    # Cross-asset alignment bonus
-                    ca_bonus = await _check_cross_asset_flow_alignment(
-                        conn, fl_ticker, sentiment, is_long, is_short,
+            fl_row = flow_events.get("p4a")
+            if fl_row:
+                call_prem = float(fl_row["call_premium"] or 0)
+                put_prem  = float(fl_row["put_premium"] or 0)
+                total     = float(fl_row["total_premium"] or 0)
+                sentiment = (fl_row["flow_sentiment"] or "").upper()
+                pc_ratio  = float(fl_row["pc_ratio"] or 0) if fl_row["pc_ratio"] else None
+
+                direction = (signal_data.get("direction") or "").upper()
+                is_long   = direction in ("LONG", "BUY", "BULLISH")
+                is_short  = direction in ("SHORT", "SELL", "BEARISH")
+
+                flow_bonus  = 0
+                flow_reason = []
+
+                # Premium-tiered directional scoring
+                if call_prem > 2_000_000 and sentiment == "BULLISH":
+                    if is_long:
+                        flow_bonus += 6
+                        flow_reason.append(f"bullish flow ${call_prem/1e6:.1f}M calls")
+                    elif is_short:
+                        flow_bonus -= 3
+                        flow_reason.append(f"WARN: short vs bullish flow ${call_prem/1e6:.1f}M calls")
+
+                if put_prem > 2_000_000 and sentiment == "BEARISH":
+                    if is_short:
+                        flow_bonus += 6
+                        flow_reason.append(f"bearish flow ${put_prem/1e6:.1f}M puts")
+                    elif is_long:
+                        flow_bonus -= 3
+                        flow_reason.append(f"WARN: long vs bearish flow ${put_prem/1e6:.1f}M puts")
+
+                # Legacy small-premium bonus (backward compat, downgraded +5→+2)
+                if total > 1_000_000 and flow_bonus == 0:
+                    flow_bonus = 2
+                    flow_reason.append(f"flow ${total/1e6:.1f}M total, direction-neutral")
+
+                # Cross-asset alignment bonus (queried in the flow_events stage)
+                ca_bonus = flow_events.get("ca_bonus") or 0
+                if ca_bonus:
+                    flow_bonus += ca_bonus
+                    flow_reason.append(f"cross-asset align +{ca_bonus}")
+
+                if flow_bonus != 0:
+                    score = max(0, min(100, score + flow_bonus))
+                    triggering_factors["flow"] = {
+                        "bonus": flow_bonus,
+                        "sentiment": sentiment,
+                        "total_premium": total,
+                        "call_premium": call_prem,
+                        "put_premium": put_prem,
+                        "pc_ratio": pc_ratio,
+                        "reasons": flow_reason,
+                    }
+                    logger.info(
+                        "Flow enrichment %s %s: %+d (%s)",
+                        fl_ticker, direction, flow_bonus, "; ".join(flow_reason),
                     )
-                    if ca_bonus:
-                        flow_bonus += ca_bonus
-                        flow_reason.append(f"cross-asset align +{ca_bonus}")
-
-                    if flow_bonus != 0:
-                        score = max(0, min(100, score + flow_bonus))
-                        triggering_factors["flow"] = {
-                            "bonus": flow_bonus,
-                            "sentiment": sentiment,
-                            "total_premium": total,
-                            "call_premium": call_prem,
-                            "put_premium": put_prem,
-                            "pc_ratio": pc_ratio,
-                            "reasons": flow_reason,
-                        }
-                        logger.info(
-                            "Flow enrichment %s %s: %+d (%s)",
-                            fl_ticker, direction, flow_bonus, "; ".join(flow_reason),
-                        )
         except Exception as _fe:
             logger.debug("P4A flow enrichment skipped: %s", _fe)
 
@@ -496,23 +631,12 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
             _p2 = triggering_factors.get("flow_data") or {}
             _p4a_live = triggering_factors.get("flow") or {}
             _p4a_age = None; _p4a_call = 0.0; _p4a_put = 0.0; _p4a_sent = None
-            try:
-                from database.postgres_client import get_postgres_client as _gpc2
-                _pool2 = await _gpc2()
-                async with _pool2.acquire() as _c2:
-                    _fr = await _c2.fetchrow(
-                        "SELECT call_premium, put_premium, flow_sentiment, "
-                        "EXTRACT(EPOCH FROM (NOW() - captured_at))/60.0 AS age_min "
-                        "FROM flow_events WHERE ticker=$1 ORDER BY captured_at DESC LIMIT 1",
-                        (signal_data.get("ticker") or "").upper(),
-                    )
-                if _fr:
-                    _p4a_call = float(_fr["call_premium"] or 0)
-                    _p4a_put = float(_fr["put_premium"] or 0)
-                    _p4a_sent = ((_fr["flow_sentiment"] or "").upper() or None)
-                    _p4a_age = float(_fr["age_min"]) if _fr["age_min"] is not None else None
-            except Exception:
-                pass
+            _fr = flow_events.get("latest")
+            if _fr:
+                _p4a_call = float(_fr["call_premium"] or 0)
+                _p4a_put = float(_fr["put_premium"] or 0)
+                _p4a_sent = ((_fr["flow_sentiment"] or "").upper() or None)
+                _p4a_age = float(_fr["age_min"]) if _fr["age_min"] is not None else None
             signal_data["flow_reconciled"] = _reconcile_flow(
                 signal_direction=signal_data.get("direction"),
                 p4a_sentiment=_p4a_sent,
@@ -528,10 +652,9 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
         # WH-CONFLUENCE enrichment: check for WH-ACC backing + fresh darkpool blocks
         # Must run BEFORE apply_tier3_confluence_bonus so the wh_confluence key is present.
         try:
-            from enrichment.wh_confluence import check_wh_confluence
             wh_ticker = (signal_data.get("ticker") or "").upper()
             wh_dir    = (signal_data.get("direction") or "").upper()
-            wh_conf = await check_wh_confluence(wh_ticker, wh_dir)
+            wh_conf = stage_results.get("wh_confluence") or {}
             if wh_conf.get("confluence_found"):
                 wh_acc_bonus = wh_conf.get("bonus", 0)
                 if wh_acc_bonus:
@@ -556,12 +679,9 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
         # P4B: Pythia market profile position cross-reference
         # Phase 0.3.2 — Option B: no Pythia coverage = watchlist ceiling (never top_feed)
         try:
-            from webhooks.pythia_events import get_pythia_profile_position
             pp_ticker = (signal_data.get("ticker") or "").upper()
-            pp_price = signal_data.get("entry_price")
-            pp_dir = (signal_data.get("direction") or "").upper()
-            if pp_ticker and pp_price and float(pp_price) > 0:
-                pp = await get_pythia_profile_position(pp_ticker, float(pp_price), pp_dir)
+            pp = stage_results.get("pythia_profile")
+            if pp is not None:
                 pp_total = pp.get("total_pythia_adjustment", pp.get("profile_bonus", 0))
                 if pp_total != 0:
                     score = min(100, max(0, score + pp_total))
@@ -596,8 +716,7 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
             strategy = (signal_data.get("strategy") or "").strip()
 
             if strategy in TREND_CONTINUATION_STRATEGIES:
-                from bias_engine.composite import get_cached_composite
-                cached = await get_cached_composite()
+                cached = cached_composite
                 if cached and cached.factors:
                     iv_reading = cached.factors.get("iv_regime")
                     if iv_reading and iv_reading.raw_data:
@@ -614,7 +733,7 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
                             v2_meta: dict = {}
 
                             if VIX_REGIME_USE_PERCENTILE:
-                                pct = await _compute_vix_percentiles(VIX_REGIME_PERCENTILE_LOOKBACK)
+                                pct = stage_results.get("vix_percentiles")
                                 if pct:
                                     low, high = pct["p5_value"], pct["p90_value"]
                                     v2_meta = {"p5": low, "p90": high, "n_days": pct["n_days"], "mode": "percentile"}
@@ -749,6 +868,14 @@ async def apply_scoring(signal_data: Dict[str, Any]) -> Dict[str, Any]:
             signal_data["confidence"] = "LOW"
             signal_data["priority"] = "LOW"
 
+        # Per-stage latency rides along in enrichment_data (persisted with the
+        # signal) so slow webhook-to-broadcast paths can be traced to a stage.
+        signal_data.setdefault("enrichment_data", {})["scoring_timing"] = {
+            "total_ms": round((time.perf_counter() - scoring_t0) * 1000, 1),
+            "slowest_stage": slowest_stage(stage_timings),
+            "stages": stage_timings,
+        }
+
         logger.info(f"📊 Scored: {signal_data.get('ticker')} = {score} ({bias_alignment})")
         return signal_data
 
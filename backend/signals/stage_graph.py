@@ -0,0 +1,130 @@
+"""Stage graph — run independent pipeline I/O concurrently with per-stage budgets.
+
+apply_scoring used to await every lookup (composite, sector/regime Redis keys,
+price/flow/darkpool enrichment, squeeze + flow Postgres rows, WH confluence,
+Pythia profile) one after another, so webhook-to-broadcast latency was the
+*sum* of all of them. Almost none depend on each other.
+
+A stage is a named coroutine function with optional dependencies. run_stages()
+starts every stage as soon as its dependencies have finished, bounds each one
+with its own timeout, and never raises: a stage that times out or errors
+yields its default, and the failure is recorded alongside its latency.
+
+Dependent stages receive their dependencies' results as keyword arguments:
+
+    Stage("composite", get_cached_composite, timeout=2.0)
+    Stage("vix_pct", lambda composite: ..., deps=("composite",))
+
+Timings (ms, measured from when the stage itself started, so dependency wait
+is excluded) are returned as {name: {"ms": float, "status": "ok"|"timeout"|
+"error"|"skipped"}} — a stage is "skipped" when a dependency failed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """One node of the graph."""
+
+    __slots__ = ("name", "fn", "deps", "timeout", "default")
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        deps: Sequence[str] = (),
+        timeout: float = 2.0,
+        default: Any = None,
+    ):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.default = default
+
+
+def _check_graph(stages: Iterable[Stage]) -> Dict[str, Stage]:
+    by_name: Dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"duplicate stage {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in by_name.values():
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"stage {stage.name!r} depends on unknown stage {dep!r}")
+
+    # Cycle check (DFS); a cycle would otherwise deadlock the gather below.
+    state: Dict[str, int] = {}
+
+    def visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"stage graph has a cycle through {name!r}")
+        state[name] = 1
+        for dep in by_name[name].deps:
+            visit(dep)
+        state[name] = 2
+
+    for name in by_name:
+        visit(name)
+    return by_name
+
+
+async def run_stages(
+    stages: Iterable[Stage],
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Run a stage graph. Returns (results, timings), both keyed by stage name."""
+    by_name = _check_graph(stages)
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, Any]] = {}
+    ok: Dict[str, bool] = {}
+    tasks: Dict[str, "asyncio.Task[None]"] = {}
+
+    async def run_one(stage: Stage) -> None:
+        if stage.deps:
+            await asyncio.gather(*(tasks[d] for d in stage.deps))
+            if not all(ok[d] for d in stage.deps):
+                results[stage.name] = stage.default
+                timings[stage.name] = {"ms": 0.0, "status": "skipped"}
+                ok[stage.name] = False
+                return
+        kwargs = {d: results[d] for d in stage.deps}
+        t0 = time.perf_counter()
+        status = "ok"
+        try:
+            value = await asyncio.wait_for(stage.fn(**kwargs), timeout=stage.timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            value = stage.default
+            logger.info("stage %s timed out after %.1fs", stage.name, stage.timeout)
+        except Exception as exc:
+            status = "error"
+            value = stage.default
+            logger.debug("stage %s failed: %s", stage.name, exc)
+        results[stage.name] = value
+        ok[stage.name] = status == "ok"
+        timings[stage.name] = {
+            "ms": round((time.perf_counter() - t0) * 1000, 1),
+            "status": status,
+        }
+
+    for stage in by_name.values():
+        tasks[stage.name] = asyncio.ensure_future(run_one(stage))
+    await asyncio.gather(*tasks.values())
+    return results, timings
+
+
+def slowest_stage(timings: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Name of the stage with the highest latency, or None for an empty graph."""
+    if not timings:
+        return None
+    return max(timings, key=lambda n: timings[n].get("ms") or 0.0)
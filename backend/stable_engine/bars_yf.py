@@ -25,6 +25,38 @@ logger = logging.getLogger(__name__)
 # artificial gaps — standard for technical metrics.
 _AUTO_ADJUST = True
 
+# Relative change in a stored close that counts as a re-adjusted history.
+READJUST_TOLERANCE = 1e-6
+
+
+def _stored_closes(tickers: list[str], start: date) -> dict[str, tuple[date, float]]:
+    """Each ticker's earliest stored (date, close) on or after `start`."""
+    if not tickers:
+        return {}
+    ph = ",".join(["%s"] * len(tickers))
+    df = db.read_df(
+        f"SELECT DISTINCT ON (ticker) ticker, date, c FROM stable_daily_bars "
+        f"WHERE date >= %s AND ticker IN ({ph}) ORDER BY ticker, date",
+        [start, *tickers],
+    )
+    return {r.ticker: (r.date, float(r.c)) for r in df.itertuples(index=False) if pd.notna(r.c)}
+
+
+def _readjusted(stored: tuple[date, float] | None, frame: pd.DataFrame) -> bool:
+    """True when the refreshed close for the oldest stored date in the window moved.
+
+    Auto-adjusted history is rescaled as a whole on a dividend or split, so a
+    changed close at the start of the refresh window means every stored bar
+    before it is stale too; the window alone would leave a seam in the series.
+    """
+    if stored is None:
+        return False
+    day, close = stored
+    fresh = frame.loc[frame["date"] == day, "c"]
+    if fresh.empty or not close:
+        return False
+    return abs(float(fresh.iloc[0]) / close - 1.0) > READJUST_TOLERANCE
+
 
 def _extract_ticker_frame(data: pd.DataFrame, ticker: str, single: bool) -> pd.DataFrame | None:
     """Pull a single ticker's OHLCV frame out of a yfinance download result."""
@@ -109,6 +141,8 @@ def download_and_store(
             request entirely (degraded-run test), never fabricated.
 
     Returns a coverage summary. degraded=True when coverage < 90% of the request.
+    On an incremental refresh, `readjusted_tickers` lists tickers whose stored
+    history was re-adjusted upstream and needs a full backfill.
     """
     end = end or (date.today() + timedelta(days=1))  # yfinance end is exclusive
     if days is not None:
@@ -125,11 +159,13 @@ def download_and_store(
 
     fetched: list[str] = []
     missing: list[str] = []
+    readjusted: list[str] = []
     rows_written = 0
 
     for i in range(0, len(requested), batch_size):
         batch = requested[i:i + batch_size]
         result = fetch_batch(batch, start, end)
+        stored = _stored_closes([t for t in batch if t in result], start) if days is not None else {}
         batch_rows = []
         for t in batch:
             frame = result.get(t)
@@ -137,6 +173,8 @@ def download_and_store(
                 missing.append(t)
                 continue
             fetched.append(t)
+            if _readjusted(stored.get(t), frame):
+                readjusted.append(t)
             for r in frame.itertuples(index=False, name=None):
                 # r = (date, o, h, l, c, v)
                 d, o, h, l, c, v = r
@@ -167,6 +205,7 @@ def download_and_store(
         "degraded": degraded,
         "missing_tickers": sorted(missing),
         "blocked_tickers": sorted(skipped_blocked),
+        "readjusted_tickers": sorted(readjusted),
         "start": start.isoformat(),
         "end": end.isoformat(),
     }
@@ -20,6 +20,8 @@ from datetime import datetime, timezone
 
 import pytz
 
+from utils.trading_calendar import is_session_open
+
 logger = logging.getLogger(__name__)
 ET = pytz.timezone("America/New_York")
 
@@ -47,11 +49,7 @@ def now_et() -> datetime:
 
 
 def is_market_hours(dt_et: datetime | None = None) -> bool:
-    dt = dt_et or now_et()
-    if dt.weekday() >= 5:
-        return False
-    mins = dt.hour * 60 + dt.minute
-    return 9 * 60 + 30 <= mins <= 16 * 60
+    return is_session_open(dt_et or now_et())
 
 
 def feed_flatline(feed: str, age_seconds: float | None, dt_et: datetime | None = None) -> bool:
@@ -68,7 +66,14 @@ def feed_flatline(feed: str, age_seconds: float | None, dt_et: datetime | None =
     return age_seconds > slo
 
 
+_table_ready = False
+
+
 async def _ensure_table(conn) -> None:
+    """Create the table once per process (schema migration 2 normally has)."""
+    global _table_ready
+    if _table_ready:
+        return
     await conn.execute(
         """CREATE TABLE IF NOT EXISTS stable_job_status (
                job_name TEXT PRIMARY KEY,
@@ -80,6 +85,7 @@ async def _ensure_table(conn) -> None:
                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
            )"""
     )
+    _table_ready = True
 
 
 async def mark_success(job_name: str) -> None:
@@ -6,11 +6,19 @@ Math unchanged; data layer swapped Polygon->yfinance and DuckDB->Postgres.
 The MA periods to compute are configurable via settings. The metrics table always
 has columns for all five possible periods (10, 20, 21, 50, 200); periods not in the
 configured set are written as NULL.
+
+compute_metrics(incremental=True) is the nightly path: per ticker it reads only
+the bars from REFRESH_DAYS before its last stored metric row plus a WARMUP_BARS
+tail, computes the same series over that tail and upserts the dates the nightly
+bar refresh may have rewritten (re-adjusted or corrected prints) along with the
+new ones. A full run (the default, and the CLI without --incremental) rebuilds
+every row; use it after changing ma_periods or backfilling history.
 """
 
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 from typing import Optional
 
 import numpy as np
@@ -24,6 +32,16 @@ logger = logging.getLogger(__name__)
 BENCHMARKS = ("QQQ", "RSP")
 ALL_MA_PERIODS = [10, 20, 21, 50, 200]
 
+# Bars of history an incremental run recomputes ahead of the first new date.
+# The longest window is high_52w (252); the rest covers ATR's Wilder EWM, whose
+# start-up weight decays as (13/14)^n, so ~70 extra bars put it below 1e-9.
+WARMUP_BARS = 320
+# Calendar days that safely contain WARMUP_BARS trading sessions.
+WARMUP_DAYS = WARMUP_BARS * 7 // 5 + 30
+# Calendar days the nightly bar refresh re-downloads; an incremental run
+# recomputes at least this far back so revised bars reach the metrics.
+REFRESH_DAYS = 15
+
 _OUT_COLS = [
     "ticker", "date",
     "ret_1d", "ret_5d", "ret_20d", "ret_60d",
@@ -50,19 +68,23 @@ def _compute_for_ticker(
     if ma_periods is None:
         ma_periods = list(ALL_MA_PERIODS)
 
-    df = prices.copy().sort_values("date").reset_index(drop=True)
+    df = prices.sort_values("date").reset_index(drop=True)
+    # Columns are collected in a dict and framed once: ~35 DataFrame inserts
+    # per ticker cost more than the rolling math itself.
+    out: dict = {"ticker": prices["ticker"].iloc[0], "date": df["date"]}
 
     close = df["close"]
     high = df["high"]
     low = df["low"]
     vol = df["volume"]
     prev_close = close.shift(1)
+    n = len(df)
 
     # ---- Returns ----
-    df["ret_1d"] = close.pct_change(1)
-    df["ret_5d"] = close.pct_change(5)
-    df["ret_20d"] = close.pct_change(20)
-    df["ret_60d"] = close.pct_change(60)
+    out["ret_1d"] = close.pct_change(1)
+    out["ret_5d"] = close.pct_change(5)
+    out["ret_20d"] = close.pct_change(20)
+    out["ret_60d"] = close.pct_change(60)
 
     # ---- Moving averages: compute the configured set, NULL the others ----
     for period in ALL_MA_PERIODS:
@@ -70,13 +92,13 @@ def _compute_for_ticker(
         col_dist = f"dist_ma{period}_pct"
         col_above = f"above_ma{period}"
         if period in ma_periods:
-            df[col_ma] = close.rolling(period, min_periods=period).mean()
-            df[col_dist] = (close / df[col_ma] - 1.0)
-            df[col_above] = (close > df[col_ma]).astype("Int8")
+            out[col_ma] = close.rolling(period, min_periods=period).mean()
+            out[col_dist] = (close / out[col_ma] - 1.0)
+            out[col_above] = (close > out[col_ma]).astype("Int8")
         else:
-            df[col_ma] = np.nan
-            df[col_dist] = np.nan
-            df[col_above] = pd.array([pd.NA] * len(df), dtype="Int8")
+            out[col_ma] = np.full(n, np.nan)
+            out[col_dist] = np.full(n, np.nan)
+            out[col_above] = pd.array([pd.NA] * n, dtype="Int8")
 
     # ---- ATR(14) Wilder ----
     tr = pd.concat([
@@ -84,43 +106,41 @@ def _compute_for_ticker(
         (high - prev_close).abs(),
         (low - prev_close).abs(),
     ], axis=1).max(axis=1)
-    df["atr_14"] = tr.ewm(alpha=1/14, adjust=False, min_periods=14).mean()
+    out["atr_14"] = tr.ewm(alpha=1/14, adjust=False, min_periods=14).mean()
 
     # ATR extension references the 50DMA; ensure we have it even if 50 isn't
     # in the configured set (compute on the fly without storing if needed)
     if 50 in ma_periods:
-        ma50 = df["ma_50"]
+        ma50 = out["ma_50"]
     else:
         ma50 = close.rolling(50, min_periods=50).mean()
-    df["atr_ext_50ma"] = (close - ma50) / df["atr_14"]
+    out["atr_ext_50ma"] = (close - ma50) / out["atr_14"]
 
     # ---- Volume ----
-    df["vol_ma_20"] = vol.rolling(20, min_periods=20).mean()
-    df["vol_ratio"] = vol / df["vol_ma_20"]
+    out["vol_ma_20"] = vol.rolling(20, min_periods=20).mean()
+    out["vol_ratio"] = vol / out["vol_ma_20"]
 
     # ---- Highs / breakouts ----
-    df["high_20d"] = high.rolling(20, min_periods=20).max()
-    df["high_52w"] = high.rolling(252, min_periods=200).max()
-    df["new_high_20d"] = (high >= df["high_20d"]).astype("int8")
-    df["new_high_52w"] = (high >= df["high_52w"]).astype("int8")
+    out["high_20d"] = high.rolling(20, min_periods=20).max()
+    out["high_52w"] = high.rolling(252, min_periods=200).max()
+    out["new_high_20d"] = (high >= out["high_20d"]).astype("int8")
+    out["new_high_52w"] = (high >= out["high_52w"]).astype("int8")
 
     # ---- Relative strength ----
     for bench_name in BENCHMARKS:
         bench = benches.get(bench_name)
         if bench is None or bench.empty:
-            df[f"rs_{bench_name.lower()}_20d"] = np.nan
-            df[f"rs_{bench_name.lower()}_60d"] = np.nan
+            out[f"rs_{bench_name.lower()}_20d"] = np.full(n, np.nan)
+            out[f"rs_{bench_name.lower()}_60d"] = np.full(n, np.nan)
             continue
         bench_idx = bench.set_index("date")["close"]
         aligned = bench_idx.reindex(df["date"]).reset_index(drop=True)
         bench_ret_20 = aligned.pct_change(20)
         bench_ret_60 = aligned.pct_change(60)
-        df[f"rs_{bench_name.lower()}_20d"] = df["ret_20d"] - bench_ret_20
-        df[f"rs_{bench_name.lower()}_60d"] = df["ret_60d"] - bench_ret_60
+        out[f"rs_{bench_name.lower()}_20d"] = out["ret_20d"] - bench_ret_20
+        out[f"rs_{bench_name.lower()}_60d"] = out["ret_60d"] - bench_ret_60
 
-    df["ticker"] = prices["ticker"].iloc[0]
-
-    return df[_OUT_COLS]
+    return pd.DataFrame(out, index=df.index)[_OUT_COLS]
 
 
 def _read_prices(tickers: Optional[list] = None) -> pd.DataFrame:
@@ -133,33 +153,46 @@ def _read_prices(tickers: Optional[list] = None) -> pd.DataFrame:
     return db.read_df(f"{base} ORDER BY ticker, date")
 
 
-def _to_pyval(v):
-    """Coerce numpy/pandas scalars to plain Python (NaN/NA -> None) for psycopg2."""
-    if v is None:
-        return None
-    try:
-        if pd.isna(v):
-            return None
-    except (TypeError, ValueError):
-        pass
-    if isinstance(v, (np.integer,)):
-        return int(v)
-    if isinstance(v, (np.floating,)):
-        return float(v)
-    if hasattr(v, "isoformat"):
-        return v
-    return v
-
-
-def compute_metrics(tickers: Optional[list] = None) -> dict:
-    """Compute metrics for all tickers (or a subset) and write to stable_metrics."""
+def _read_new_prices(tickers: Optional[list] = None) -> pd.DataFrame:
+    """Bars an incremental run needs, with each ticker's last stored metric date.
+
+    Tickers with no metrics yet come back in full (last_date NULL); the rest
+    only from REFRESH_DAYS + WARMUP_DAYS before their last metric row.
+    """
+    sql = (
+        "WITH last AS (SELECT ticker, MAX(date) AS last_date FROM stable_metrics GROUP BY ticker) "
+        "SELECT b.ticker, b.date, b.o AS open, b.h AS high, b.l AS low, b.c AS close, b.v AS volume, "
+        "       last.last_date "
+        "FROM stable_daily_bars b LEFT JOIN last ON last.ticker = b.ticker "
+        "WHERE (last.last_date IS NULL OR b.date > last.last_date - %s)"
+    )
+    params: list = [REFRESH_DAYS + WARMUP_DAYS]
+    if tickers:
+        sql += f" AND b.ticker IN ({','.join(['%s'] * len(tickers))})"
+        params.extend(tickers)
+    return db.read_df(sql + " ORDER BY b.ticker, b.date", params)
+
+
+def _records(df: pd.DataFrame) -> list:
+    """Rows as tuples of plain Python values (NaN/NA -> None) for psycopg2."""
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
+
+def compute_metrics(tickers: Optional[list] = None, incremental: bool = False) -> dict:
+    """Compute metrics for all tickers (or a subset) and write to stable_metrics.
+
+    incremental=True computes and upserts only dates within REFRESH_DAYS of each
+    ticker's last stored row or after it; otherwise every row of the affected
+    tickers is rewritten.
+    """
     db.init_schema()
 
     cfg = settings_mod.load()
     ma_periods = cfg["metrics"]["ma_periods"]
-    logger.info("[stable_metrics] Using MA periods: %s", ma_periods)
+    logger.info("[stable_metrics] Using MA periods: %s (%s)", ma_periods,
+                "incremental" if incremental else "full")
 
-    prices = _read_prices(tickers)
+    prices = _read_new_prices(tickers) if incremental else _read_prices(tickers)
     bench_frames = {}
     for b in BENCHMARKS:
         bench_frames[b] = _read_prices([b])
@@ -168,42 +201,61 @@ def compute_metrics(tickers: Optional[list] = None) -> dict:
         logger.warning("[stable_metrics] No prices found. Run ingestion first.")
         return {"tickers_processed": 0, "rows_written": 0}
 
-    all_tickers = prices["ticker"].unique().tolist()
     out_frames: list = []
-    for t in all_tickers:
-        sub = prices[prices["ticker"] == t]
+    current = 0
+    for t, sub in prices.groupby("ticker", sort=False):
         if len(sub) < 20:
             continue
+        since = None
+        if incremental:
+            last_date = sub["last_date"].iloc[0]
+            if pd.notna(last_date):
+                if sub["date"].iloc[-1] <= last_date:
+                    current += 1
+                # Bars are ordered by date: keep the warm-up tail before the first
+                # date the refresh may have revised.
+                since = last_date - timedelta(days=REFRESH_DAYS)
+                first_new = int((sub["date"] <= since).sum())
+                sub = sub.iloc[max(0, first_new - WARMUP_BARS):]
         try:
-            out_frames.append(_compute_for_ticker(sub, bench_frames, ma_periods))
+            out = _compute_for_ticker(sub, bench_frames, ma_periods)
         except Exception as e:
             logger.error("[stable_metrics] error computing metrics for %s: %s", t, e)
+            continue
+        if since is not None:
+            out = out[out["date"] > since]
+        out_frames.append(out)
 
     if not out_frames:
-        return {"tickers_processed": 0, "rows_written": 0}
+        return {"tickers_processed": 0, "rows_written": 0, "tickers_current": current,
+                "incremental": incremental}
 
     metrics_df = pd.concat(out_frames, ignore_index=True)[_OUT_COLS]
 
     affected = metrics_df["ticker"].unique().tolist()
-    rows = [tuple(_to_pyval(v) for v in rec) for rec in metrics_df.itertuples(index=False, name=None)]
+    rows = _records(metrics_df)
     col_list = ", ".join(_OUT_COLS)
     update_set = ", ".join(f"{c} = EXCLUDED.{c}" for c in _OUT_COLS if c not in ("ticker", "date"))
     with db.connect() as conn:
         with conn.cursor() as cur:
-            ph = ",".join(["%s"] * len(affected))
-            cur.execute(f"DELETE FROM stable_metrics WHERE ticker IN ({ph})", affected)
-            execute_values(
-                cur,
-                f"INSERT INTO stable_metrics ({col_list}) VALUES %s "
-                f"ON CONFLICT (ticker, date) DO UPDATE SET {update_set}",
-                rows,
-                page_size=5000,
-            )
+            if not incremental:
+                ph = ",".join(["%s"] * len(affected))
+                cur.execute(f"DELETE FROM stable_metrics WHERE ticker IN ({ph})", affected)
+            if rows:
+                execute_values(
+                    cur,
+                    f"INSERT INTO stable_metrics ({col_list}) VALUES %s "
+                    f"ON CONFLICT (ticker, date) DO UPDATE SET {update_set}",
+                    rows,
+                    page_size=5000,
+                )
 
     summary = {
         "tickers_processed": len(out_frames),
+        "tickers_current": current,
         "rows_written": len(metrics_df),
         "ma_periods_computed": ma_periods,
+        "incremental": incremental,
     }
     logger.info("[stable_metrics] Done. %d tickers, %d metric rows written.",
                 summary["tickers_processed"], summary["rows_written"])
@@ -215,5 +267,8 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     p = argparse.ArgumentParser(description="Compute per-ticker metrics from stable_daily_bars")
     p.add_argument("--tickers", nargs="*", help="Specific tickers to recompute (default: all).")
+    p.add_argument("--incremental", action="store_true",
+                   help="Only recompute the refresh window and dates after each ticker's last metric row.")
     args = p.parse_args()
-    compute_metrics([t.upper() for t in args.tickers] if args.tickers else None)
+    compute_metrics([t.upper() for t in args.tickers] if args.tickers else None,
+                    incremental=args.incremental)
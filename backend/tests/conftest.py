@@ -95,12 +95,16 @@ def client():
         patch("database.redis_client.get_redis_client", new_callable=AsyncMock, return_value=mock_redis),
         patch("database.redis_client.get_redis_status", return_value={"status": "ok", "consecutive_errors": 0}),
         patch("database.postgres_client.get_postgres_client", new_callable=AsyncMock, return_value=mock_pool),
+        # Bound by name at import; a test module may have imported it before this fixture.
+        patch("api.unified_positions.get_postgres_client", new_callable=AsyncMock, return_value=mock_pool),
         patch("database.postgres_client.init_database", new_callable=AsyncMock),
         patch("api.watchlist.init_watchlist_table", new_callable=AsyncMock),
         patch("bias_engine.factor_utils.purge_suspicious_cache_entries", new_callable=AsyncMock, return_value={"scanned": 0, "purged": 0}),
         patch("webhooks.circuit_breaker.restore_circuit_breaker_state", new_callable=AsyncMock, return_value=False),
         patch("scheduler.bias_scheduler.start_scheduler", new_callable=AsyncMock),
-        patch("websocket.broadcaster.manager", MagicMock(active_connections=set())),
+        patch("jobs.runner.run_background_jobs_in_process", return_value=False),
+        patch("api.crypto_market.snapshot_service.refresh_enabled", False),
+        patch("websocket.broadcaster.manager", MagicMock(active_connections=set(), stop_relay=AsyncMock())),
     ]
 
     for p in patches:
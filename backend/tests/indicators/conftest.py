@@ -0,0 +1,13 @@
+"""Path bootstrap for the indicator tests.
+
+These modules import backend packages top-level (`indicators`, `enrichment`)
+the way uvicorn resolves them with cwd=backend/. Add backend/ to sys.path so
+they also collect when pytest runs from the repo root.
+"""
+
+import sys
+from pathlib import Path
+
+_BACKEND = Path(__file__).resolve().parent.parent.parent
+if str(_BACKEND) not in sys.path:
+    sys.path.insert(0, str(_BACKEND))
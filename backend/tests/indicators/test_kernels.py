@@ -0,0 +1,255 @@
+"""
+Parity tests for indicators.kernels against the implementations it replaced.
+
+References:
+    1. The pure-Python Wilder loops that indicators/adx, atr, rsi and macd
+       carried before they became wrappers (copied here verbatim).
+    2. pandas_ta's formulas as the scanners called them (sma / ema / atr /
+       adx / rsi with the default `rma` smoothing), in plain pandas.
+    3. pandas rolling / ewm for SMA, the 3-10 oscillator and adjust=False EMAs.
+
+Each kernel is checked on one ticker (1-D) and on a ragged multi-ticker panel,
+where every row must equal the 1-D result for that ticker alone.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from enrichment.universe_cache import compute_atr
+from indicators import kernels
+from indicators.adx import wilder_adx_series
+from indicators.atr import latest_atr
+from indicators.macd import ema_series, latest_macd
+from indicators.rsi import latest_rsi
+
+
+def _ohlc(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    return high, low, close
+
+
+# ── legacy pure-Python references ─────────────────────────────────────
+
+def _legacy_adx(highs, lows, closes, period=14):
+    n = len(closes)
+    plus_dm, minus_dm, tr = [0.0] * n, [0.0] * n, [0.0] * n
+    for i in range(1, n):
+        up = highs[i] - highs[i - 1]
+        down = lows[i - 1] - lows[i]
+        plus_dm[i] = up if (up > down and up > 0) else 0.0
+        minus_dm[i] = down if (down > up and down > 0) else 0.0
+        tr[i] = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+    smoothed_tr = sum(tr[1:period + 1])
+    smoothed_p = sum(plus_dm[1:period + 1])
+    smoothed_m = sum(minus_dm[1:period + 1])
+    dxs = []
+    for i in range(period, n):
+        if i > period:
+            smoothed_tr = smoothed_tr - smoothed_tr / period + tr[i]
+            smoothed_p = smoothed_p - smoothed_p / period + plus_dm[i]
+            smoothed_m = smoothed_m - smoothed_m / period + minus_dm[i]
+        if smoothed_tr == 0:
+            dxs.append(0.0)
+            continue
+        plus_di = 100.0 * smoothed_p / smoothed_tr
+        minus_di = 100.0 * smoothed_m / smoothed_tr
+        denom = plus_di + minus_di
+        dxs.append(0.0 if denom == 0 else 100.0 * abs(plus_di - minus_di) / denom)
+    adx = sum(dxs[:period]) / period
+    out = [adx]
+    for k in range(period, len(dxs)):
+        adx = (adx * (period - 1) + dxs[k]) / period
+        out.append(adx)
+    return out
+
+
+def _legacy_atr(highs, lows, closes, period=14):
+    trs = [max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+           for i in range(1, len(closes))]
+    atr = sum(trs[:period]) / period
+    for i in range(period, len(trs)):
+        atr = (atr * (period - 1) + trs[i]) / period
+    return atr
+
+
+def _legacy_rsi(closes, period=14):
+    gains, losses = [], []
+    for i in range(1, len(closes)):
+        ch = closes[i] - closes[i - 1]
+        gains.append(ch if ch > 0 else 0.0)
+        losses.append(-ch if ch < 0 else 0.0)
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    for i in range(period, len(gains)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    if avg_loss == 0:
+        return 100.0
+    if avg_gain == 0:
+        return 0.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _legacy_ema(values, period):
+    out = [None] * len(values)
+    k = 2.0 / (period + 1)
+    prev = sum(values[:period]) / period
+    out[period - 1] = prev
+    for i in range(period, len(values)):
+        prev = values[i] * k + prev * (1.0 - k)
+        out[i] = prev
+    return out
+
+
+# ── pandas_ta formulas (as the scanners called them) ─────────────────
+
+def _rma(s, length):
+    return s.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+
+def _ta_atr(high, low, close, length=14):
+    prev = close.shift(1)
+    tr = pd.concat([high - low, high - prev, prev - low], axis=1).abs().max(axis=1)
+    tr.iloc[:1] = np.nan
+    return _rma(tr, length)
+
+
+def _ta_adx(high, low, close, length=14):
+    atr = _ta_atr(high, low, close, length)
+    up = high - high.shift(1)
+    dn = low.shift(1) - low
+    k = 100 / atr
+    dmp = k * _rma(((up > dn) & (up > 0)) * up, length)
+    dmn = k * _rma(((dn > up) & (dn > 0)) * dn, length)
+    return _rma(100 * (dmp - dmn).abs() / (dmp + dmn), length), dmp, dmn
+
+
+def _ta_rsi(close, length=14):
+    neg = close.diff(1)
+    pos = neg.copy()
+    pos[pos < 0] = 0
+    neg[neg > 0] = 0
+    p, n = _rma(pos, length), _rma(neg, length)
+    return 100 * p / (p + n.abs())
+
+
+def _ta_ema(close, length):
+    seeded = close.copy()
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = close.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False).mean()
+
+
+# ── legacy parity ─────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_wilder_wrappers_match_legacy_loops(seed):
+    h, l, c = (list(a) for a in _ohlc(seed=seed))
+    assert wilder_adx_series(h, l, c) == pytest.approx(_legacy_adx(h, l, c), rel=1e-10)
+    assert latest_atr(h, l, c) == round(_legacy_atr(h, l, c), 4)
+    assert latest_rsi(c)["value"] == round(_legacy_rsi(c), 2)
+    ema = ema_series(c, 20)
+    legacy = _legacy_ema(c, 20)
+    assert ema[:19] == legacy[:19] == [None] * 19
+    assert ema[19:] == pytest.approx(legacy[19:], rel=1e-12)
+
+
+def test_macd_matches_legacy_two_pass():
+    c = list(_ohlc(seed=4)[2])
+    fast, slow = _legacy_ema(c, 12), _legacy_ema(c, 26)
+    line = [a - b for a, b in zip(fast, slow) if a is not None and b is not None]
+    sig = _legacy_ema(line, 9)
+    m = latest_macd(c)
+    assert m["macd"] == round(line[-1], 4)
+    assert m["signal_line"] == round(sig[-1], 4)
+    assert m["histogram"] == round(line[-1] - sig[-1], 4)
+
+
+def test_flat_bars_keep_legacy_zero_dx():
+    h, l, c = [10.0] * 40, [10.0] * 40, [10.0] * 40
+    assert wilder_adx_series(h, l, c) == _legacy_adx(h, l, c)
+    assert latest_rsi(c)["value"] == 100.0
+
+
+# ── pandas_ta parity ──────────────────────────────────────────────────
+
+def test_adjusted_seed_matches_pandas_ta_formulas():
+    h, l, c = (pd.Series(a) for a in _ohlc(seed=5))
+    np.testing.assert_allclose(kernels.atr(h, l, c, 14, seed="adjusted"), _ta_atr(h, l, c), rtol=1e-12)
+    adx, dmp, dmn = _ta_adx(h, l, c)
+    out = kernels.adx(h, l, c, 14, seed="adjusted")
+    np.testing.assert_allclose(out["adx"], adx, rtol=1e-10)
+    np.testing.assert_allclose(out["plus_di"], dmp, rtol=1e-10)
+    np.testing.assert_allclose(out["minus_di"], dmn, rtol=1e-10)
+    np.testing.assert_allclose(kernels.rsi(c, 14, seed="adjusted"), _ta_rsi(c), rtol=1e-12)
+    np.testing.assert_allclose(kernels.ema(c, 20), _ta_ema(c, 20), rtol=1e-12)
+    np.testing.assert_allclose(kernels.sma(c, 50), c.rolling(50).mean(), rtol=1e-12)
+
+
+def test_first_seed_matches_pandas_adjust_false():
+    c = pd.Series(_ohlc(seed=6)[2])
+    np.testing.assert_allclose(kernels.ema(c, 9, seed="first", min_periods=1),
+                               c.ewm(span=9, adjust=False).mean(), rtol=1e-12)
+    np.testing.assert_allclose(kernels.rma(c, 14, seed="first"),
+                               c.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean(), rtol=1e-12)
+
+
+def test_three_ten_matches_pandas_rolling():
+    h, l, _ = (pd.Series(a) for a in _ohlc(seed=7))
+    mid = (h + l) / 2
+    raw = mid.rolling(3).mean() - mid.rolling(10).mean()
+    out = kernels.three_ten(h, l)
+    np.testing.assert_allclose(out["fast"], raw.rolling(3).mean(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(out["slow"], raw.rolling(10).mean(), rtol=1e-9, atol=1e-12)
+
+
+def test_sma_gaps_are_nan_like_pandas():
+    c = pd.Series(_ohlc(seed=8)[2])
+    c.iloc[[30, 31, 100]] = np.nan
+    np.testing.assert_allclose(kernels.sma(c, 10), c.rolling(10).mean(), rtol=1e-12)
+
+
+def test_universe_atr_skips_incomplete_bars():
+    h, l, c = _ohlc(n=40, seed=9)
+    bars = [{"h": a, "l": b, "c": d} for a, b, d in zip(h, l, c)]
+    bars[20] = {"high": h[20], "low": 0, "close": c[20]}   # no low: its TR is skipped
+    trs = []
+    for i in range(1, len(bars)):
+        high = bars[i].get("h") or bars[i].get("high", 0)
+        low = bars[i].get("l") or bars[i].get("low", 0)
+        prev = bars[i - 1].get("c") or bars[i - 1].get("close", 0)
+        if all([high, low, prev]):
+            trs.append(max(high - low, abs(high - prev), abs(low - prev)))
+    assert compute_atr(bars, 14) == round(sum(trs[-14:]) / 14, 4)
+    assert compute_atr(bars[:10], 14) is None
+
+
+# ── multi-ticker panels ───────────────────────────────────────────────
+
+@pytest.mark.parametrize("seed", ["sma", "adjusted", "first"])
+def test_panel_rows_match_single_ticker_calls(seed):
+    series = [_ohlc(n=n, seed=i) for i, n in enumerate([300, 180, 60, 300])]
+    h, l, c = (kernels.panel([s[k] for s in series]) for k in range(3))
+    assert h.shape == (4, 300) and np.isnan(h[2, :240]).all()
+
+    adx = kernels.adx(h, l, c, 14, seed=seed)["adx"]
+    rsi = kernels.rsi(c, 14, seed=seed)
+    ema = kernels.ema(c, 20, seed=seed)
+    sma = kernels.sma(c, 20)
+    for row, (hi, lo, cl) in enumerate(series):
+        tail = slice(300 - len(cl), None)
+        np.testing.assert_allclose(adx[row, tail], kernels.adx(hi, lo, cl, 14, seed=seed)["adx"], rtol=1e-12)
+        np.testing.assert_allclose(rsi[row, tail], kernels.rsi(cl, 14, seed=seed), rtol=1e-12)
+        np.testing.assert_allclose(ema[row, tail], kernels.ema(cl, 20, seed=seed), rtol=1e-12)
+        np.testing.assert_allclose(sma[row, tail], kernels.sma(cl, 20), rtol=1e-12)
+
+
+def test_short_input_and_bad_seed():
+    assert np.isnan(kernels.sma([1.0, 2.0], 5)).all()
+    assert np.isnan(kernels.rma([1.0, 2.0], 5)).all()
+    with pytest.raises(ValueError):
+        kernels.ema([1.0, 2.0, 3.0], 2, seed="wilder")
@@ -0,0 +1,130 @@
+"""
+Vectorized backtest engine (analytics/backtest_engine.py).
+
+Exits must match the per-bar loop /analytics/backtest used before: stop
+checked before target on the same bar, target next, otherwise time exit at
+the last close; missing OHLC values fall back to entry. Sweeps must equal
+running each stop/target pair on its own.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from analytics.backtest_engine import (
+    EXIT_REASONS,
+    BacktestLeg,
+    index_bars,
+    simulate,
+    summarize_columns,
+)
+
+WINDOW = timedelta(days=5)
+T0 = datetime(2026, 3, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _bars(n, seed, start=100.0, gap_every=0):
+    rng = random.Random(seed)
+    price = start
+    rows = []
+    for i in range(n):
+        price *= 1 + rng.uniform(-0.004, 0.004)
+        hi = price * (1 + rng.uniform(0, 0.003))
+        lo = price * (1 - rng.uniform(0, 0.003))
+        row = {"timestamp": T0 + timedelta(minutes=5 * i), "high": hi, "low": lo, "close": price}
+        if gap_every and i % gap_every == 0:
+            row["high"] = None
+        rows.append(row)
+    return rows
+
+
+def _loop_reference(rows, entry, stop, target, bullish):
+    """The pre-engine per-bar walk from run_backtest."""
+    def f(v):
+        return entry if v is None else float(v)
+
+    exit_reason, exit_price, last_ts = "time_exit", f(rows[-1]["close"]), None
+    for bar in rows:
+        last_ts = bar["timestamp"]
+        high, low, close = f(bar["high"]), f(bar["low"]), f(bar["close"])
+        if bullish:
+            if low <= stop:
+                return stop, "stop_hit", last_ts
+            if high >= target:
+                return target, "target_hit", last_ts
+        else:
+            if high >= stop:
+                return stop, "stop_hit", last_ts
+            if low <= target:
+                return target, "target_hit", last_ts
+        exit_price = close
+    return exit_price, exit_reason, last_ts
+
+
+def test_single_pair_matches_loop():
+    rng = random.Random(7)
+    bars_by_ticker = {"AAA": _bars(600, 1), "BBB": _bars(600, 2, start=50.0, gap_every=17)}
+    bars = index_bars(bars_by_ticker)
+    legs = []
+    for i in range(200):
+        ticker = rng.choice(["AAA", "BBB"])
+        k = rng.randrange(0, 550)
+        entry = bars_by_ticker[ticker][k]["close"]
+        bullish = rng.random() < 0.5
+        s, t = rng.uniform(0.002, 0.02), rng.uniform(0.002, 0.03)
+        stop, target = (entry * (1 - s), entry * (1 + t)) if bullish else (entry * (1 + s), entry * (1 - t))
+        legs.append(BacktestLeg({}, ticker, bars_by_ticker[ticker][k]["timestamp"], entry, bullish, stop, target))
+
+    sim = simulate(legs, bars, 235.0, WINDOW)
+    assert len(sim.legs) == len(legs)
+    for i, leg in enumerate(sim.legs):
+        window = [r for r in bars_by_ticker[leg.ticker] if leg.ts <= r["timestamp"] <= leg.ts + WINDOW]
+        price, reason, ts = _loop_reference(window, leg.entry, leg.stop, leg.target, leg.bullish)
+        assert EXIT_REASONS[sim.exit_code[i, 0]] == reason
+        assert abs(sim.exit_price[i, 0] - price) < 1e-9
+        assert sim.exit_stamp[i][0] == ts
+
+
+def test_stop_wins_when_bar_touches_both():
+    rows = [{"timestamp": T0, "high": 110.0, "low": 90.0, "close": 100.0}]
+    leg = BacktestLeg({}, "X", T0, 100.0, True, 95.0, 105.0)
+    sim = simulate([leg], index_bars({"X": rows}), 100.0, WINDOW)
+    assert EXIT_REASONS[sim.exit_code[0, 0]] == "stop_hit"
+    assert sim.pnl[0, 0] == -100.0
+
+
+def test_legs_without_bars_are_dropped():
+    rows = [{"timestamp": T0, "high": 101.0, "low": 99.0, "close": 100.0}]
+    legs = [
+        BacktestLeg({}, "X", T0 + timedelta(days=10), 100.0, True, 95.0, 105.0),
+        BacktestLeg({}, "MISSING", T0, 100.0, True, 95.0, 105.0),
+    ]
+    sim = simulate(legs, index_bars({"X": rows}), 100.0, WINDOW)
+    assert sim.legs == [] and sim.pnl.shape == (0, 1)
+
+
+def test_sweep_columns_equal_individual_runs():
+    bars_by_ticker = {"AAA": _bars(400, 3)}
+    bars = index_bars(bars_by_ticker)
+    legs = [
+        BacktestLeg({}, "AAA", bars_by_ticker["AAA"][k]["timestamp"], bars_by_ticker["AAA"][k]["close"], k % 2 == 0)
+        for k in range(0, 300, 7)
+    ]
+    grid = [(s, t) for s in (0.3, 0.5, 1.0) for t in (0.5, 1.0, 2.0)]
+    sweep = simulate(legs, bars, 235.0, WINDOW,
+                     stop_pcts=[s / 100 for s, _ in grid], target_pcts=[t / 100 for _, t in grid])
+    stats = summarize_columns(sweep, 235.0)
+    assert len(stats) == len(grid)
+
+    for j, (s, t) in enumerate(grid):
+        single_legs = []
+        for leg in legs:
+            e = leg.entry
+            stop, target = (e * (1 - s / 100), e * (1 + t / 100)) if leg.bullish else (e * (1 + s / 100), e * (1 - t / 100))
+            single_legs.append(BacktestLeg({}, leg.ticker, leg.ts, e, leg.bullish, stop, target))
+        single = simulate(single_legs, bars, 235.0, WINDOW)
+        assert np.allclose(single.pnl[:, 0], sweep.pnl[:, j])
+        only = summarize_columns(single, 235.0)[0]
+        assert only == stats[j]
+        assert stats[j]["stop_hits"] + stats[j]["target_hits"] + stats[j]["time_exits"] == len(legs)
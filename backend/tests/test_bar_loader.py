@@ -0,0 +1,113 @@
+"""Batched multi-symbol bar loader (scanners/bar_loader).
+
+yf.download is replaced by a fake batch function, so these run offline and
+count exactly how many batched requests a load costs.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanners import bar_loader
+from utils.trading_calendar import get_calendar
+
+
+def _frame(days=300):
+    idx = pd.bdate_range("2024-10-01", periods=days)
+    close = np.linspace(100, 130, days)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                         "Close": close, "Volume": 1_000_000}, index=idx)
+
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    calls = []
+
+    def _fake(symbols, period, interval):
+        calls.append(list(symbols))
+        return {s: _frame() for s in symbols if s != "NODATA"}
+
+    bar_loader.clear_cache()
+    monkeypatch.setattr(bar_loader, "_download_batch", _fake)
+    monkeypatch.setattr(bar_loader, "BATCH_SIZE", 3)
+    yield calls
+    bar_loader.clear_cache()
+
+
+def test_universe_loads_in_batches_and_dedupes(fake_download):
+    frames = asyncio.run(bar_loader.load_bars(["aapl", "MSFT", "AAPL", "NVDA", "AMD", "NODATA"]))
+    assert fake_download == [["AAPL", "MSFT", "NVDA"], ["AMD", "NODATA"]]
+    assert sorted(frames) == ["AAPL", "AMD", "MSFT", "NVDA"]
+    assert "NODATA" not in frames
+
+
+def test_cached_frames_are_not_refetched_and_are_copies(fake_download):
+    asyncio.run(bar_loader.prefetch(["SPY"]))
+    a = bar_loader.get_cached("SPY")
+    a["sma20"] = 1.0
+    b = bar_loader.get_cached("SPY")
+    assert "sma20" not in b.columns
+    asyncio.run(bar_loader.load_bars(["SPY"]))
+    assert fake_download == [["SPY"]]
+
+
+def test_shorter_window_sliced_from_longer_cached_period(fake_download):
+    asyncio.run(bar_loader.prefetch(["SPY"], period="1y"))
+    six_mo = bar_loader.get_cached("SPY", period="6mo")
+    assert six_mo is not None
+    assert (six_mo.index[-1] - six_mo.index[0]).days <= 183
+    # Sliced to the number of NYSE sessions in the period, "Nd" to N bars.
+    last = six_mo.index[-1].date()
+    assert len(six_mo) == len(get_calendar().trading_days(last - timedelta(days=183), last))
+    assert len(bar_loader.get_cached("SPY", period="5d")) == 5
+    assert bar_loader.get_cached("SPY", period="2y") is None
+
+
+def test_concurrent_callers_share_one_download(monkeypatch):
+    calls = []
+
+    def _slow(symbols, period, interval):
+        import time
+        calls.append(list(symbols))
+        time.sleep(0.05)
+        return {s: _frame() for s in symbols}
+
+    bar_loader.clear_cache()
+    monkeypatch.setattr(bar_loader, "_download_batch", _slow)
+
+    async def _run():
+        return await asyncio.gather(
+            bar_loader.load_bars(["SPY", "QQQ"]),
+            bar_loader.load_bars(["QQQ", "SPY", "IWM"]),
+        )
+
+    first, second = asyncio.run(_run())
+    bar_loader.clear_cache()
+    assert sorted(first) == ["QQQ", "SPY"]
+    assert sorted(second) == ["IWM", "QQQ", "SPY"]
+    fetched = [s for batch in calls for s in batch]
+    assert sorted(fetched) == ["IWM", "QQQ", "SPY"]
+
+
+def test_cache_is_bounded_by_frame_budget(fake_download, monkeypatch):
+    monkeypatch.setattr(bar_loader._cache, "max_entries", 3)
+    asyncio.run(bar_loader.load_bars(["AAPL", "MSFT", "NVDA", "AMD", "TSLA"]))
+    stats = bar_loader.get_bar_loader_stats()
+    assert stats["cached_frames"] == 3 and stats["evicted"] >= 2
+    assert stats["cached_bytes"] == 3 * bar_loader._frame_bytes(_frame())
+    assert bar_loader.get_cached("AAPL") is None and bar_loader.get_cached("TSLA") is not None
+
+
+def test_batched_frames_use_the_exchange_timezone():
+    idx = pd.date_range("2025-03-03", periods=3, freq="D")
+    data = pd.concat({"SPY": _frame(3).set_axis(idx)}, axis=1)
+    frame = bar_loader._extract_frame(data, "SPY")
+    assert str(frame.index.tz) == bar_loader.EXCHANGE_TZ
+    assert frame.index[0] == pd.Timestamp("2025-03-03", tz=bar_loader.EXCHANGE_TZ)
+
+    utc = _frame(3).set_axis(pd.date_range("2025-03-03 14:30", periods=3, freq="h", tz="UTC"))
+    frame = bar_loader._extract_frame(utc, "SPY")
+    assert frame.index[0] == pd.Timestamp("2025-03-03 09:30", tz=bar_loader.EXCHANGE_TZ)
@@ -0,0 +1,172 @@
+"""
+Batched Redis reads for the composite bias engine.
+
+compute_composite must load every factor's latest reading, the 24h-ago
+readings for the velocity check and the previous composite in one pipelined
+round trip, and report that in result.metadata["timing"]. A fake Redis
+counts round trips; no network.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import bias_engine.composite as comp
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def mget(self, keys):
+        self.ops.append(("mget", keys))
+
+    def get(self, key):
+        self.ops.append(("get", key))
+
+    def zrevrangebyscore(self, key, max, min, start=0, num=1):
+        self.ops.append(("zrev", key, max))
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        out = []
+        for op in self.ops:
+            if op[0] == "mget":
+                out.append([self.redis.kv.get(k) for k in op[1]])
+            elif op[0] == "get":
+                out.append(self.redis.kv.get(op[1]))
+            else:
+                rows = sorted(
+                    (score, member) for member, score in self.redis.zsets.get(op[1], {}).items()
+                    if score <= op[2]
+                )
+                out.append([rows[-1][1]] if rows else [])
+        return out
+
+
+class FakeRedis:
+    def __init__(self):
+        self.kv = {}
+        self.zsets = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.kv.get(k) for k in keys]
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.kv.get(key)
+
+
+def _reading(factor_id, score, ts):
+    return comp.FactorReading(
+        factor_id=factor_id, score=score, signal="NEUTRAL", detail="", timestamp=ts, source="test",
+    )
+
+
+def _seed(fake, now):
+    factor_ids = list(comp.FACTOR_CONFIG)
+    for factor_id in factor_ids:
+        latest = _reading(factor_id, -0.5, now - timedelta(minutes=5))
+        fake.kv[comp.REDIS_KEY_FACTOR_LATEST.format(factor_id=factor_id)] = latest.model_dump_json()
+    # Three factors dropped >= 0.3 since yesterday → velocity multiplier kicks in.
+    for factor_id in factor_ids[:3]:
+        old = _reading(factor_id, 0.2, now - timedelta(hours=30))
+        key = comp.REDIS_KEY_FACTOR_HISTORY.format(factor_id=factor_id)
+        fake.zsets[key] = {old.model_dump_json(): old.timestamp.timestamp()}
+    return factor_ids
+
+
+def _patch(monkeypatch, fake):
+    async def _client():
+        return fake
+
+    async def _noop(*a, **k):
+        return None
+
+    async def _rvol(score, conf):
+        return 1.0, {}
+
+    monkeypatch.setattr(comp, "get_redis_client", _client)
+    monkeypatch.setattr(comp, "compute_rvol_modifier", _rvol)
+    monkeypatch.setattr(comp, "get_active_override", _noop)
+    monkeypatch.setattr(comp, "cache_composite", _noop)
+    monkeypatch.setattr(comp, "log_composite", _noop)
+    monkeypatch.setattr(comp, "broadcast_bias_update", _noop)
+    monkeypatch.setattr(comp, "send_alert", _noop)
+    monkeypatch.setattr(comp, "_COMPOSITE_MEM_CACHE", {"payload": None, "expires_at": None})
+
+
+def test_get_latest_readings_is_one_mget(monkeypatch):
+    fake = FakeRedis()
+    now = datetime.utcnow()
+    factor_ids = _seed(fake, now)
+    _patch(monkeypatch, fake)
+
+    readings = asyncio.run(comp.get_latest_readings())
+    assert fake.round_trips == 1
+    assert set(readings) == set(factor_ids)
+    assert all(r is not None and r.score == -0.5 for r in readings.values())
+
+
+def test_get_readings_before_is_one_pipeline(monkeypatch):
+    fake = FakeRedis()
+    now = datetime.utcnow()
+    factor_ids = _seed(fake, now)
+    _patch(monkeypatch, fake)
+
+    before = asyncio.run(comp.get_readings_before(factor_ids, now - timedelta(hours=24)))
+    assert fake.round_trips == 1
+    assert [f for f, r in before.items() if r is not None] == factor_ids[:3]
+
+
+def test_count_bearish_shifts_batches_when_not_given_readings(monkeypatch):
+    fake = FakeRedis()
+    _seed(fake, datetime.utcnow())
+    _patch(monkeypatch, fake)
+
+    assert asyncio.run(comp.count_bearish_shifts(hours=24)) == 3
+    assert fake.round_trips == 2
+
+
+def test_compute_composite_uses_one_round_trip(monkeypatch):
+    fake = FakeRedis()
+    now = datetime.utcnow()
+    _seed(fake, now)
+    _patch(monkeypatch, fake)
+
+    result = asyncio.run(comp.compute_composite())
+    assert fake.round_trips == 1
+    assert result.velocity_multiplier == 1.3
+    assert len(result.active_factors) == len(comp.FACTOR_CONFIG)
+    timing = result.metadata["timing"]
+    assert timing["redis_round_trips"] == 1
+    assert timing["redis_load_ms"] >= 0
+    assert timing["compute_ms"] >= timing["redis_load_ms"]
+
+
+def test_compute_composite_reads_previous_from_pipeline(monkeypatch):
+    fake = FakeRedis()
+    now = datetime.utcnow()
+    _seed(fake, now)
+    _patch(monkeypatch, fake)
+    first = asyncio.run(comp.compute_composite())
+    fake.kv[comp.REDIS_KEY_COMPOSITE_LATEST] = json.dumps(
+        {**json.loads(first.model_dump_json()), "bias_level": "TORO_MAJOR"}
+    )
+
+    broadcasts = []
+
+    async def _broadcast(result, changed_from=None):
+        broadcasts.append(changed_from)
+
+    monkeypatch.setattr(comp, "broadcast_bias_update", _broadcast)
+    fake.round_trips = 0
+    asyncio.run(comp.compute_composite())
+    assert fake.round_trips == 1
+    assert broadcasts == ["TORO_MAJOR"]
@@ -0,0 +1,115 @@
+"""Correlation engine (analysis/correlation_engine) and the monitor built on it."""
+
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import correlation_monitor
+from analysis.correlation_engine import CorrelationEngine, align_closes
+
+
+def _closes(tickers, days=90, seed=0, start=date(2026, 1, 5)):
+    rng = np.random.default_rng(seed)
+    sessions = [d.date() for d in pd.bdate_range(start, periods=days)]
+    common = rng.normal(0, 0.01, days)
+    out = {}
+    for k, t in enumerate(tickers):
+        beta = 1.0 - 0.3 * k
+        rets = beta * common + rng.normal(0, 0.01, days)
+        out[t] = dict(zip(sessions, 400 * np.exp(np.cumsum(rets))))
+    return out
+
+
+def test_matrix_matches_numpy_on_the_trailing_windows():
+    closes = _closes(["SPY", "QQQ", "TLT", "GLD"])
+    engine = CorrelationEngine.from_closes(closes, window=20, baseline_window=60)
+    panel = pd.DataFrame(closes)
+    np.testing.assert_allclose(engine.current(), np.corrcoef(panel.tail(20).T.values), atol=1e-9)
+    np.testing.assert_allclose(engine.baseline(), np.corrcoef(panel.tail(60).T.values), atol=1e-9)
+
+    rolling = engine.rolling()
+    expected = panel["SPY"].rolling(20).corr(panel["TLT"]).values
+    i, j = engine.tickers.index("SPY"), engine.tickers.index("TLT")
+    np.testing.assert_allclose(rolling[:, i, j], expected, atol=1e-9, equal_nan=True)
+
+
+def test_gaps_are_pairwise_and_sparse_pairs_are_nan():
+    closes = _closes(["SPY", "QQQ", "IBIT"])
+    sessions = sorted(closes["SPY"])
+    for d in sessions[-3:]:
+        del closes["QQQ"][d]                    # 3 missing in the 20-day window: still counts
+    closes["IBIT"] = {d: closes["IBIT"][d] for d in sessions[-10:]}   # listed 10 days ago
+    closes["BTC"] = {d + timedelta(days=1): 1.0 for d in sessions}    # off-calendar: dropped
+
+    dates, tickers, panel = align_closes(closes)
+    assert dates == sessions and panel.shape == (len(sessions), 4)
+
+    engine = CorrelationEngine.from_closes(closes, window=20, baseline_window=60)
+    spy = pd.Series(closes["SPY"])
+    qqq = pd.Series(closes["QQQ"])
+    window = spy.index[-20:]
+    both = [d for d in window if d in closes["QQQ"]]
+    expected = np.corrcoef(spy[both], qqq[both])[0, 1]
+    assert engine.pair("SPY", "QQQ")["current"] == round(expected, 3)
+    assert engine.pair("SPY", "IBIT") is None
+    assert engine.matrix(["SPY", "IBIT"])["values"][0][1] is None
+
+
+def test_append_matches_a_fresh_load_and_replaces_same_day():
+    closes = _closes(["SPY", "XLK", "TLT"], days=120)
+    sessions = sorted(closes["SPY"])
+    head = {t: {d: v for d, v in s.items() if d <= sessions[79]} for t, s in closes.items()}
+    engine = CorrelationEngine.from_closes(head, window=20, baseline_window=60)
+
+    for d in sessions[80:]:
+        engine.append(d, {"SPY": closes["SPY"][d] * 1.05, "XLK": closes["XLK"][d], "NEW": 1.0})
+        engine.append(d, {t: closes[t][d] for t in closes})   # revision of the same bar
+    engine.append(sessions[0], {"SPY": 1.0})                   # stale bar: ignored
+
+    fresh = CorrelationEngine.from_closes(closes, window=20, baseline_window=60)
+    np.testing.assert_allclose(engine.current(), fresh.current(), atol=1e-9)
+    np.testing.assert_allclose(engine.baseline(), fresh.baseline(), atol=1e-9)
+    assert engine.dates[-1] == sessions[-1]
+
+
+def test_scan_fetches_each_ticker_once(monkeypatch):
+    universe = sorted({t for a, b, _ in correlation_monitor.CORRELATION_PAIRS + correlation_monitor.SECTOR_PAIRS
+                       for t in (a, b)})
+    data = _closes(universe, days=90)
+    calls = []
+
+    async def _fetch(ticker, days=correlation_monitor.LOOKBACK_DAYS):
+        calls.append(ticker)
+        if ticker == "IBIT":
+            return None
+        return data[ticker]
+
+    class _Redis:
+        async def setex(self, key, ttl, value):
+            self.value = value
+
+    async def _redis():
+        return _Redis()
+
+    monkeypatch.setattr(correlation_monitor, "fetch_closes", _fetch)
+    monkeypatch.setattr("database.redis_client.get_redis_client", _redis)
+    payload = asyncio.run(correlation_monitor.run_correlation_scan())
+
+    assert sorted(calls) == universe
+    assert len(payload["pairs"]) == len(correlation_monitor.CORRELATION_PAIRS)
+    assert all(p["status"] in ("normal", "collapse", "decorrelated") for p in payload["pairs"])
+    sector = {p["pair"]: p for p in payload["sector_pairs"]}
+    assert len(sector) == 11 * 4
+    assert sector["XLK vs BTC"]["status"] == "no_data"
+    assert sector["XLK vs SPY"]["current"] is not None
+    assert "IBIT" not in payload["matrix"]["tickers"]
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_empty_and_single_ticker_panels(n):
+    engine = CorrelationEngine.from_closes(_closes(["SPY"][:n]))
+    assert engine.current().shape == (n, n)
+    assert engine.pair("SPY", "QQQ") is None
@@ -0,0 +1,211 @@
+"""Per-(symbol, limit) crypto market snapshots (api/crypto_market.CryptoSnapshotService).
+
+/crypto/market used to rebuild on every miss of a single global cache slot,
+and its last-good fallbacks and CVD hysteresis were single global dicts, so
+alternating BTC/ETH requests missed every time and could serve one symbol's
+prices as the other's. The exchange fan-out is faked (no network); the
+service clock is a dict the tests advance.
+"""
+
+import asyncio
+
+import pytest
+
+from api import crypto_market as cm
+
+
+@pytest.fixture
+def service(monkeypatch):
+    builds = []
+    counter = iter(range(1, 1000))
+
+    async def _build(symbol, limit):
+        builds.append((symbol, limit))
+        return {"symbol": symbol, "limit": limit, "build": next(counter)}
+
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(cm, "_build_market_snapshot", _build)
+    svc = cm.CryptoSnapshotService(clock=lambda: clock["t"], refresh_enabled=True)
+    return svc, builds, clock
+
+
+def test_alternating_symbols_are_separate_keys(service):
+    svc, builds, _ = service
+
+    async def run():
+        out = []
+        for symbol in ["BTCUSDT", "ETHUSDT", "BTC", "ETHUSDT", "btcusdt"]:
+            out.append(await svc.get(symbol, 200))
+        out.append(await svc.get("BTCUSDT", 500))
+        return out
+
+    snapshots = asyncio.run(run())
+    assert [s["symbol"] for s in snapshots] == ["BTCUSDT", "ETHUSDT", "BTCUSDT", "ETHUSDT", "BTCUSDT", "BTCUSDT"]
+    assert builds == [("BTCUSDT", 200), ("ETHUSDT", 200), ("BTCUSDT", 500)]
+
+
+def test_concurrent_cold_requests_share_one_fan_out(service):
+    svc, builds, _ = service
+
+    async def run():
+        return await asyncio.gather(*(svc.get("SOL", 200) for _ in range(8)))
+
+    assert {s["build"] for s in asyncio.run(run())} == {1}
+    assert builds == [("SOLUSDT", 200)]
+
+
+def test_refresher_cadence_hot_vs_idle(service):
+    svc, builds, clock = service
+    tracked = svc.tracked_keys()
+    assert ("BTCUSDT", 200) in tracked and ("FARTCOINUSDT", 200) in tracked
+
+    # First pass warms every tracked symbol at the default limit.
+    assert asyncio.run(svc.refresh_due()) == len(tracked)
+
+    # BTC is being watched; the rest are idle.
+    asyncio.run(svc.get("BTCUSDT", 200))
+    builds.clear()
+    clock["t"] += cm.SNAPSHOT_REFRESH_SECONDS
+    asyncio.run(svc.refresh_due())
+    assert builds == [("BTCUSDT", 200)]
+
+    builds.clear()
+    clock["t"] += cm.SNAPSHOT_IDLE_REFRESH_SECONDS
+    asyncio.run(svc.refresh_due())
+    assert sorted(builds) == sorted(tracked)
+
+
+def test_hot_key_refreshes_about_as_often_as_it_is_polled(service):
+    svc, builds, clock = service
+    asyncio.run(svc.refresh_due())
+    for _ in range(3):                  # one stater-style dashboard: every 30s
+        asyncio.run(svc.get("SOL", 200))
+        clock["t"] += 30
+    (sol,) = [k for k in svc.stats()["keys"] if k["symbol"] == "SOLUSDT"]
+    assert sol["hot"] and sol["refresh_seconds"] == cm.SNAPSHOT_IDLE_REFRESH_SECONDS
+
+    for _ in range(6):                  # app.js-style: every 2s, clamped to the floor
+        asyncio.run(svc.get("SOL", 200))
+        clock["t"] += 2
+    (sol,) = [k for k in svc.stats()["keys"] if k["symbol"] == "SOLUSDT"]
+    assert sol["refresh_seconds"] == cm.SNAPSHOT_REFRESH_SECONDS
+
+
+def test_warm_idle_key_is_served_from_memory_then_refreshed(service):
+    svc, builds, clock = service
+    asyncio.run(svc.refresh_due())
+    builds.clear()
+    clock["t"] += 20                    # idle tracked key, snapshot 20s old
+
+    async def run():
+        served = await svc.get("ETHUSDT", 200)
+        await asyncio.gather(*svc._background)
+        return served
+
+    served = asyncio.run(run())
+    assert served["build"] == 2         # ETH's warm-up build, no wait on the exchanges
+    assert builds == [("ETHUSDT", 200)]  # ...refreshed behind the request
+    assert asyncio.run(svc.get("ETHUSDT", 200))["build"] == len(svc.tracked_keys()) + 1
+
+
+def test_untracked_keys_are_forgotten_when_idle(service):
+    svc, builds, clock = service
+    asyncio.run(svc.get("DOGEUSDT", 200))
+    cm._last_good[("DOGEUSDT", 200)] = {"perp_price": 0.1}
+    clock["t"] += cm.SNAPSHOT_HOT_SECONDS + 1
+    asyncio.run(svc.refresh_due())
+    assert ("DOGEUSDT", 200) not in {(k["symbol"], k["limit"]) for k in svc.stats()["keys"]}
+    assert ("DOGEUSDT", 200) not in cm._last_good
+
+
+def test_without_refresher_snapshots_expire_and_idle_keys_are_pruned(service):
+    _, builds, clock = service
+    svc = cm.CryptoSnapshotService(clock=lambda: clock["t"], refresh_enabled=False)
+    svc.start()                         # no-op: nothing would refresh in the background
+    assert svc.stats()["refresher_running"] is False
+
+    asyncio.run(svc.get("BTCUSDT", 200))
+    clock["t"] += cm.SNAPSHOT_UNREFRESHED_TTL_SECONDS - 1
+    asyncio.run(svc.get("BTCUSDT", 200))
+    assert builds == [("BTCUSDT", 200)]
+    clock["t"] += 1
+    assert asyncio.run(svc.get("BTCUSDT", 200))["build"] == 2
+
+    asyncio.run(svc.get("DOGEUSDT", 200))
+    cm._last_good[("DOGEUSDT", 200)] = {"perp_price": 0.1}
+    clock["t"] += cm.SNAPSHOT_HOT_SECONDS + 1
+    asyncio.run(svc.get("BTCUSDT", 200))
+    assert ("DOGEUSDT", 200) not in {(k["symbol"], k["limit"]) for k in svc.stats()["keys"]}
+    assert ("DOGEUSDT", 200) not in cm._last_good
+
+
+# ---------------------------------------------------------------------------
+# Real snapshot builder over a faked fan-out: per-key fallbacks + venue stats
+# ---------------------------------------------------------------------------
+
+def _fake_exchanges(monkeypatch, prices, down=()):
+    """Serve `prices[symbol]` from every venue except the ones in `down`."""
+    async def _fetch(client, url, params=None):
+        params = params or {}
+        raw = params.get("symbol") or params.get("instId") or url.rsplit("/", 2)[-2]
+        base = raw.replace("-USDT-SWAP", "").replace("-USDT", "").replace("-USD", "").replace("USDT", "")
+        venue = "binance" if "binance" in url else "okx" if "okx" in url else "coinbase" if "coinbase" in url else "bybit"
+        if venue in down:
+            return {"ok": False, "error": "geo_restricted_451" if venue == "binance" else "timeout"}
+        price = prices[base]
+        if "coinbase" in url:
+            return {"ok": True, "data": {"data": {"amount": str(price)}}}
+        if "binance" in url and url.endswith("/trades"):
+            return {"ok": True, "data": [{"price": str(price), "qty": "2", "isBuyerMaker": False, "time": 1}]}
+        if "binance" in url and url.endswith("/premiumIndex"):
+            return {"ok": True, "data": {"lastFundingRate": "0.0001", "nextFundingTime": 0}}
+        if "binance" in url:
+            return {"ok": True, "data": {"price": str(price)}}
+        if "okx" in url and url.endswith("/trades"):
+            return {"ok": True, "data": {"data": [{"px": str(price), "sz": "1", "side": "sell", "ts": 1}]}}
+        if "okx" in url:
+            return {"ok": True, "data": {"data": [{"last": str(price), "fundingRate": "0.0002", "fundingTime": 0}]}}
+        return {"ok": True, "data": {"result": {"list": []}}}
+
+    monkeypatch.setattr(cm, "_fetch_json", _fetch)
+    monkeypatch.setattr(cm, "BYBIT_ENABLED", False)
+
+
+@pytest.fixture
+def clean_state(monkeypatch):
+    monkeypatch.setattr(cm, "_last_good", {})
+    monkeypatch.setattr(cm, "_cvd_trend_state", {})
+    monkeypatch.setattr(cm, "_venue_stats", cm.defaultdict(cm._VenueStats))
+
+
+def test_fallbacks_and_cvd_state_do_not_leak_across_symbols(monkeypatch, clean_state):
+    _fake_exchanges(monkeypatch, {"BTC": 60000.0, "ETH": 3000.0})
+    btc = asyncio.run(cm._build_market_snapshot("BTCUSDT", 200))
+    assert btc["prices"]["perps"]["binance"] == 60000.0
+
+    # ETH with every venue down: no ETH fallback exists, and BTC's must not be used.
+    _fake_exchanges(monkeypatch, {"BTC": 60000.0, "ETH": 3000.0}, down={"binance", "okx", "coinbase"})
+    eth = asyncio.run(cm._build_market_snapshot("ETHUSDT", 200))
+    assert eth["prices"]["perps"]["source"] is None
+    assert eth["prices"]["binance_spot"] is None and eth["prices"]["coinbase_spot"] is None
+    assert eth["cvd"]["source"] is None
+
+    # BTC with everything down falls back to its own last-good values.
+    btc_again = asyncio.run(cm._build_market_snapshot("BTCUSDT", 200))
+    assert btc_again["prices"]["binance_spot"] == 60000.0
+    assert "perp_price: using cached fallback" in btc_again["errors"]
+    assert set(cm._cvd_trend_state) == {("BTCUSDT", 200)}
+
+
+def test_venue_latency_and_failure_rates(monkeypatch, clean_state):
+    _fake_exchanges(monkeypatch, {"BTC": 60000.0})
+    asyncio.run(cm._build_market_snapshot("BTCUSDT", 200))
+    _fake_exchanges(monkeypatch, {"BTC": 60000.0}, down={"binance"})
+    asyncio.run(cm._build_market_snapshot("BTCUSDT", 200))
+
+    venues = cm.CryptoSnapshotService().stats()["venues"]
+    assert set(venues) == {"binance_spot", "binance_perp", "coinbase", "okx"}
+    assert venues["binance_perp"]["calls"] == 6 and venues["binance_perp"]["failures"] == 3
+    assert venues["binance_perp"]["failure_rate"] == 0.5 and venues["binance_perp"]["geo_blocked"] == 3
+    assert venues["okx"]["calls"] == 8 and venues["okx"]["failure_rate"] == 0.0
+    assert venues["okx"]["latency_ms_p95"] is not None
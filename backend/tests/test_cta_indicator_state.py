@@ -0,0 +1,92 @@
+"""Vectorized CTA zones + incremental CTA indicator state parity.
+
+The full-recompute reference is calculate_cta_indicators, which computes its
+columns with indicators.kernels using pandas_ta's `rma` smoothing.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+import scanners.cta_scanner as cta
+from scanners.cta_indicator_state import (
+    INDICATOR_COLUMNS,
+    CtaIndicatorState,
+    classify_cta_zones,
+)
+
+
+def _bars(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    open_ = (high + low) / 2
+    vol = rng.integers(500_000, 5_000_000, n).astype(float)
+    idx = pd.bdate_range("2025-01-02", periods=n)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": vol}, index=idx)
+
+
+def _assert_tail_matches(incremental, full, rows=3):
+    for col in INDICATOR_COLUMNS + ["cta_zone"]:
+        got = incremental[col].iloc[-rows:].tolist()
+        want = full[col].iloc[-rows:].tolist()
+        if col in ("cta_zone", "above_120", "close_above_50", "close_above_20", "days_above_120"):
+            assert [bool(x) if isinstance(x, (bool, np.bool_)) else x for x in got] == \
+                   [bool(x) if isinstance(x, (bool, np.bool_)) else x for x in want], col
+        else:
+            np.testing.assert_allclose(np.array(got, float), np.array(want, float), rtol=1e-8, err_msg=col)
+
+
+def test_vectorized_zones_match_scalar_classifier():
+    rng = np.random.default_rng(1)
+    n = 2000
+    cols = [rng.uniform(90, 110, n) for _ in range(4)]
+    for c in cols[1:]:
+        c[rng.random(n) < 0.05] = np.nan
+    # exercise the equality edges (price == sma50 etc.)
+    cols[0][:50] = cols[2][:50]
+    zones = classify_cta_zones(*cols)
+    expected = [cta.get_cta_zone(p, a, b, c)[0] for p, a, b, c in zip(*cols)]
+    assert list(zones) == expected
+
+
+def test_incremental_state_matches_full_recompute_across_scans():
+    df = _bars()
+    state = CtaIndicatorState.seed("TEST", df.iloc[:250])
+
+    for end in (251, 252, 260, 261, 300):
+        # persisted between scans as JSON, exactly like Redis
+        state = CtaIndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+        window = df.iloc[:end]
+        incremental = state.advance(window)
+        assert incremental is not None, end
+        full = cta.calculate_cta_indicators(window.copy())
+        _assert_tail_matches(incremental, full)
+
+
+def test_moving_last_bar_is_evaluated_not_committed():
+    df = _bars()
+    state = CtaIndicatorState.seed("TEST", df.iloc[:260])
+    committed = state.last_date
+
+    intraday = df.iloc[:260].copy()
+    intraday.iloc[-1, intraday.columns.get_loc("Close")] *= 1.03
+    first = state.advance(intraday)
+    assert state.last_date == committed
+    _assert_tail_matches(first, cta.calculate_cta_indicators(intraday.copy()), rows=1)
+
+    # the final print for that bar differs again — still exact
+    second = state.advance(df.iloc[:260])
+    _assert_tail_matches(second, cta.calculate_cta_indicators(df.iloc[:260].copy()), rows=1)
+
+
+def test_restated_history_forces_reseed():
+    df = _bars()
+    state = CtaIndicatorState.seed("TEST", df.iloc[:250])
+    adjusted = df.iloc[:255].copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.98  # dividend re-adjustment
+    assert state.advance(adjusted) is None
+    # a frame that no longer contains the committed date cannot be lined up either
+    assert state.advance(df.iloc[:100]) is None
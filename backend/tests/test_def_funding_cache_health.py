@@ -141,6 +141,6 @@ def test_cache_and_return_are_consistent():
                new=AsyncMock(return_value="LIVE")):
         returned = _run(get_funding_rate("BTC"))
 
-    cached = cc._cache["funding_rate:BTC"]["data"]
+    cached = cc._cache.get("funding_rate:BTC")
     assert cached.get("health_status") == returned.get("health_status") == "LIVE"
     assert cached["funding_rate"] == returned["funding_rate"]
@@ -0,0 +1,67 @@
+"""Hybrid scanner (scanners/hybrid_scanner): yfinance bar prefetch gating.
+
+The batched bar prefetch only serves the yfinance fallback, so it must not
+run while TradingView answers. TradingView, fundamentals and state files are
+faked; bar_loader.prefetch is recorded instead of downloading.
+"""
+
+import asyncio
+
+import pytest
+
+from scanners import bar_loader, hybrid_scanner as hs
+
+TICKERS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+@pytest.fixture
+def scanner(monkeypatch):
+    prefetched = []
+
+    async def _prefetch(tickers, period="1y", **kw):
+        prefetched.append(list(tickers))
+        return {}
+
+    monkeypatch.setattr(bar_loader, "prefetch", _prefetch)
+    monkeypatch.setattr(hs.HybridScanner, "_load_state", lambda self: {})
+    monkeypatch.setattr(hs.HybridScanner, "_save_state", lambda self: None)
+    monkeypatch.setattr(hs.HybridScanner, "_load_technical_cache", lambda self: {})
+    monkeypatch.setattr(hs, "YFINANCE_AVAILABLE", True)
+    s = hs.HybridScanner(universe=TICKERS)
+    monkeypatch.setattr(s, "get_fundamental_analysis", lambda ticker: {})
+    return s, prefetched
+
+
+def _technicals(monkeypatch, scanner, fallback_from=None):
+    def _tech(ticker, interval="1d"):
+        tech = {"ticker": ticker, "signal": "BUY", "signal_score": {"buy": 1}}
+        if fallback_from and ticker >= fallback_from:
+            tech["source"] = "yfinance_fallback"
+        return tech
+
+    monkeypatch.setattr(scanner, "get_technical_analysis", _tech)
+
+
+def test_no_prefetch_while_tradingview_answers(scanner, monkeypatch):
+    s, prefetched = scanner
+    monkeypatch.setattr(hs, "TRADINGVIEW_TA_AVAILABLE", True)
+    _technicals(monkeypatch, s)
+    result = asyncio.run(s.scan_universe(detect_changes=False))
+    assert result["results_count"] == 4
+    assert prefetched == []
+
+
+def test_tradingview_outage_prefetches_the_rest_once(scanner, monkeypatch):
+    s, prefetched = scanner
+    monkeypatch.setattr(hs, "TRADINGVIEW_TA_AVAILABLE", True)
+    _technicals(monkeypatch, s, fallback_from="BBB")
+    asyncio.run(s.scan_universe(detect_changes=False))
+    assert prefetched == [["CCC", "DDD"]]
+
+
+def test_without_tradingview_prefetches_up_front(scanner, monkeypatch):
+    s, prefetched = scanner
+    monkeypatch.setattr(hs, "TRADINGVIEW_TA_AVAILABLE", False)
+    _technicals(monkeypatch, s, fallback_from="AAA")
+    asyncio.run(s.scan_universe(detect_changes=False))
+    assert prefetched == [TICKERS]
@@ -0,0 +1,227 @@
+"""Background job runner (jobs/runner): Redis-lease leader election and metrics.
+
+FakeRedis implements just the lease commands (SET NX, the renew/release
+scripts, GET); expiry is simulated by deleting the key.
+"""
+
+import asyncio
+
+import pytest
+
+from jobs import runner
+from jobs.runner import Job, JobRunner, job_sleep, startup_delay
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if self.down:
+            raise ConnectionError("redis down")
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def eval(self, script, numkeys, key, owner, *args):
+        if self.down:
+            raise ConnectionError("redis down")
+        if self.data.get(key) != owner:
+            return 0
+        if "DEL" in script:
+            del self.data[key]
+        return 1
+
+
+def _counting_job(name, counter, cadence=None, work=0.0):
+    async def loop():
+        await startup_delay(0)
+        while True:
+            counter.append(name)
+            if work:
+                await asyncio.sleep(work)
+            await job_sleep(0.001)
+    return Job(name, loop, cadence)
+
+
+async def _ticks(n=5):
+    for _ in range(n):
+        await asyncio.sleep(0.005)
+
+
+def test_only_the_lease_holder_runs_jobs_and_standby_takes_over():
+    async def _run():
+        redis = FakeRedis()
+        runs = []
+        a = JobRunner([_counting_job("j", runs)], redis=redis, instance_id="a", renew_interval=0.005)
+        b = JobRunner([_counting_job("j", runs)], redis=redis, instance_id="b", renew_interval=0.005)
+        task_a = asyncio.create_task(a.run())
+        await asyncio.sleep(0)
+        task_b = asyncio.create_task(b.run())
+        await _ticks()
+        assert (a.role, b.role) == ("leader", "standby")
+        assert runs and redis.data[runner.LEASE_KEY] == "a"
+        assert b.stats()["jobs"]["j"]["runs"] == 0
+
+        # Clean shutdown releases the lease; the standby picks it up.
+        task_a.cancel()
+        await asyncio.gather(task_a, return_exceptions=True)
+        await _ticks()
+        assert b.role == "leader" and redis.data[runner.LEASE_KEY] == "b"
+        assert b.stats()["jobs"]["j"]["runs"] > 0
+        task_b.cancel()
+        await asyncio.gather(task_b, return_exceptions=True)
+        assert runner.LEASE_KEY not in redis.data
+
+    asyncio.run(_run())
+
+
+def test_leader_that_loses_the_lease_stops_its_jobs():
+    async def _run():
+        redis = FakeRedis()
+        runs = []
+        a = JobRunner([_counting_job("j", runs)], redis=redis, instance_id="a", renew_interval=0.005)
+        task = asyncio.create_task(a.run())
+        await _ticks()
+        redis.data[runner.LEASE_KEY] = "someone-else"  # expired and re-acquired elsewhere
+        await _ticks()
+        assert a.role == "standby" and a.leases_lost == 1
+        assert a.stats()["jobs"]["j"]["state"] == "stopped"
+        count = len(runs)
+        await _ticks()
+        assert len(runs) == count
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert redis.data[runner.LEASE_KEY] == "someone-else"
+
+    asyncio.run(_run())
+
+
+def test_redis_blip_keeps_the_leader_and_unreachable_redis_runs_locally():
+    async def _run():
+        redis = FakeRedis()
+        runs = []
+        a = JobRunner([_counting_job("j", runs)], redis=redis, instance_id="a", renew_interval=0.005)
+        task = asyncio.create_task(a.run())
+        await _ticks()
+        redis.down = True
+        await _ticks()
+        assert a.role == "leader"
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        down = FakeRedis()
+        down.down = True
+        b = JobRunner([_counting_job("k", runs)], redis=down, instance_id="b", renew_interval=0.005)
+        task = asyncio.create_task(b.run())
+        await _ticks()
+        assert b.role == "local" and "k" in runs
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(_run())
+
+
+def test_local_runner_keeps_retrying_the_lease():
+    async def _run():
+        runs = []
+        # Redis unreachable at boot, then back with another leader: step down.
+        redis = FakeRedis()
+        redis.down = True
+        a = JobRunner([_counting_job("j", runs)], redis=redis, instance_id="a", renew_interval=0.005)
+        task = asyncio.create_task(a.run())
+        await _ticks()
+        assert a.role == "local" and runs
+        redis.data[runner.LEASE_KEY] = "b"
+        redis.down = False
+        await _ticks()
+        assert a.role == "standby" and a.stats()["jobs"]["j"]["state"] == "stopped"
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        # Redis back with the lease free: take it without restarting the jobs.
+        redis = FakeRedis()
+        redis.down = True
+        c = JobRunner([_counting_job("k", runs)], redis=redis, instance_id="c", renew_interval=0.005)
+        task = asyncio.create_task(c.run())
+        await _ticks()
+        assert c.role == "local"
+        redis.down = False
+        await _ticks()
+        assert c.role == "leader" and redis.data[runner.LEASE_KEY] == "c"
+        assert c.elections == 1 and c.stats()["jobs"]["k"]["restarts"] == 0
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert runner.LEASE_KEY not in redis.data
+
+    asyncio.run(_run())
+
+
+def test_iteration_timing_and_overruns():
+    async def _run():
+        runs = []
+        slow = _counting_job("slow", runs, cadence=0.001, work=0.01)
+        fast = _counting_job("fast", runs, cadence=60)
+        r = JobRunner([slow, fast], redis=None, renew_interval=0.005)
+        task = asyncio.create_task(r.run())
+        await asyncio.sleep(0.08)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        stats = r.stats()["jobs"]
+        assert stats["slow"]["runs"] >= 2
+        assert stats["slow"]["overruns"] == stats["slow"]["runs"]
+        assert stats["slow"]["avg_duration_ms"] >= 10
+        assert stats["fast"]["overruns"] == 0
+        assert stats["fast"]["wake_lag_ms_max"] is not None
+        assert stats["fast"]["state"] == "stopped"
+
+    asyncio.run(_run())
+
+
+def test_crashed_job_is_restarted(monkeypatch):
+    monkeypatch.setattr(runner, "RESTART_BACKOFF_SECONDS", 0)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("boom")
+
+    async def _run():
+        r = JobRunner([Job("flaky", flaky)], redis=FakeRedis(), instance_id="a", renew_interval=0.005)
+        task = asyncio.create_task(r.run())
+        await _ticks()
+        stats = r.stats()["jobs"]["flaky"]
+        assert len(attempts) == 3
+        assert stats["restarts"] == 2 and stats["state"] == "finished"
+        assert stats["last_error"] == "RuntimeError: boom"
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(_run())
+
+
+def test_job_sleep_outside_the_runner_is_a_plain_sleep():
+    asyncio.run(job_sleep(0))
+
+
+@pytest.mark.parametrize("value,expected", [(None, True), ("false", False), ("0", False), ("true", True)])
+def test_in_process_flag(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("RUN_BACKGROUND_JOBS", raising=False)
+    else:
+        monkeypatch.setenv("RUN_BACKGROUND_JOBS", value)
+    assert runner.run_background_jobs_in_process() is expected
+
+
+def test_registry_names_are_unique():
+    from jobs.loops import background_jobs
+    names = [job.name for job in background_jobs()]
+    assert len(names) == len(set(names))
+    assert "bias_scheduler" in names and "scanner_engine" in names
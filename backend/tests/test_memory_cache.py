@@ -0,0 +1,134 @@
+"""Unit tests for utils/memory_cache.py (bounded TTL + LRU in-process cache)."""
+
+import asyncio
+
+import pytest
+
+import utils.memory_cache as mc
+from utils.memory_cache import MISSING, MemoryCache, cache_stats
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(mc.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_ttl_expiry_and_per_entry_ttl(clock):
+    cache = MemoryCache("test.ttl", ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    clock["t"] += 9.9
+    assert cache.get("a") == 1
+    clock["t"] += 0.1
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"], stats["entries"]) == (2, 1, 1, 1)
+
+
+def test_cached_none_is_distinct_from_a_miss(clock):
+    cache = MemoryCache("test.none", ttl=10)
+    cache.set("adx", None)
+    assert cache.get("adx", MISSING) is None
+    assert cache.get("other", MISSING) is MISSING
+
+
+def test_lru_eviction_by_entry_budget(clock):
+    cache = MemoryCache("test.lru", ttl=60, max_entries=3)
+    for key in "abc":
+        cache.set(key, key)
+    assert cache.get("a") == "a"          # a is now most recently used
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in "acd"] == ["a", "c", "d"]
+    assert cache.stats()["evicted"] == 1
+
+
+def test_expired_entries_go_before_live_ones(clock):
+    cache = MemoryCache("test.sweep", ttl=60, max_entries=2)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+    clock["t"] += 5
+    cache.set("new", 3)
+    assert cache.get("long") == 2 and cache.get("new") == 3
+    stats = cache.stats()
+    assert stats["evicted"] == 0 and stats["expired"] == 1
+
+
+def test_byte_budget(clock):
+    cache = MemoryCache("test.bytes", ttl=60, max_entries=None, max_bytes=1000, sizeof=len)
+    cache.set("a", "x" * 400)
+    cache.set("b", "x" * 400)
+    cache.set("c", "x" * 400)
+    assert cache.get("a") is None and len(cache) == 2
+    assert cache.stats()["bytes"] == 800
+    cache.set("b", "x" * 10)              # overwrite re-counts the size
+    assert cache.stats()["bytes"] == 410
+
+
+def test_get_or_load_coalesces_concurrent_misses():
+    cache = MemoryCache("test.coalesce", ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"v": len(calls)}
+
+    async def run():
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+        again = await cache.get_or_load("k", loader)
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert calls == [1]
+    assert all(r == {"v": 1} for r in results) and again == {"v": 1}
+    stats = cache.stats()
+    assert stats["loads"] == 1 and stats["coalesced"] == 4
+
+
+def test_get_or_load_does_not_cache_failures_or_none():
+    cache = MemoryCache("test.errors", ttl=60)
+    outcomes = iter([RuntimeError("venue down"), None, {"ok": True}])
+
+    async def loader():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_load("k", loader))
+    assert asyncio.run(cache.get_or_load("k", loader)) is None
+    assert asyncio.run(cache.get_or_load("k", loader)) == {"ok": True}
+    assert cache.stats()["load_errors"] == 1
+
+
+def test_load_refreshes_a_fresh_entry_and_joins_inflight():
+    cache = MemoryCache("test.load", ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def run():
+        first = await cache.get_or_load("k", loader)
+        refreshed = await asyncio.gather(cache.load("k", loader), cache.get_or_load("k", loader),
+                                         cache.load("k", loader))
+        return first, refreshed
+
+    first, refreshed = asyncio.run(run())
+    assert first == 1
+    assert refreshed == [2, 1, 2]        # get_or_load still hits the fresh entry
+    assert cache.get("k") == 2 and cache.stats()["coalesced"] == 1
+
+
+def test_registry_reports_every_namespace():
+    MemoryCache("test.registry", ttl=5).set("x", 1)
+    stats = cache_stats()
+    assert stats["test.registry"]["entries"] == 1
+    assert stats["test.registry"]["ttl_seconds"] == 5
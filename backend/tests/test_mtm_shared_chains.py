@@ -0,0 +1,197 @@
+"""Mark-to-market over shared (ticker, expiry) chain snapshots (api/unified_positions).
+
+get_options_snapshot is replaced by a fake that serves a synthetic chain and
+counts requests; a fake pool records the single bulk UPDATE. Each mark is
+checked against the per-position get_*_value helpers the cycle used to call.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import integrations.uw_api as uw
+from api import unified_positions as up
+
+EXPIRY = "2026-12-18"
+
+
+def _contract(ticker, expiry, opt_type, strike):
+    bid = round(abs(500 - strike) / 40 + (1.3 if opt_type == "put" else 0.7), 2)
+    return {
+        "details": {"contract_type": opt_type, "strike_price": strike,
+                    "expiration_date": expiry, "ticker": f"{ticker}{strike}{opt_type}"},
+        "last_quote": {"bid": bid, "ask": round(bid + 0.1, 2)},
+        "last_trade": {"price": bid},
+        "day": {"close": bid, "vwap": bid},
+        "greeks": {"delta": 0.4, "gamma": 0.01, "theta": -0.05, "vega": 0.1},
+        "implied_volatility": 0.2,
+    }
+
+
+class FakeUW:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    async def snapshot(self, underlying, expiration_date=None, strike_gte=None,
+                       strike_lte=None, contract_type=None):
+        self.calls.append((underlying, expiration_date, contract_type))
+        if underlying in self.fail:
+            raise RuntimeError(f"UW 429 for {underlying}")
+        types = [contract_type] if contract_type else ["call", "put"]
+        chain = [_contract(underlying, expiration_date, t, float(k))
+                 for t in types for k in range(440, 561, 5)]
+        return [c for c in chain
+                if (strike_gte is None or c["details"]["strike_price"] >= strike_gte)
+                and (strike_lte is None or c["details"]["strike_price"] <= strike_lte)]
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executes = []
+
+    async def fetch(self, sql, *args):
+        return self.rows
+
+    async def execute(self, sql, *args):
+        self.executes.append((sql, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *a):
+                return False
+
+        return _Ctx()
+
+
+def _row(position_id, ticker, structure, entry, long_strike=None, short_strike=None,
+         legs=None, asset_type="OPTION", direction="LONG", expiry=EXPIRY):
+    return {
+        "position_id": position_id, "ticker": ticker, "structure": structure,
+        "asset_type": asset_type, "direction": direction, "entry_price": entry,
+        "quantity": 2, "expiry": expiry, "long_strike": long_strike,
+        "short_strike": short_strike, "legs": legs, "notes": "",
+    }
+
+
+CONDOR = [
+    {"action": "SELL", "option_type": "put", "strike": 470, "quantity": 1},
+    {"action": "BUY", "option_type": "put", "strike": 460, "quantity": 1},
+    {"action": "SELL", "option_type": "call", "strike": 530, "quantity": 1},
+    {"action": "BUY", "option_type": "call", "strike": 540, "quantity": 1},
+]
+
+ROWS = [
+    _row("P1", "SPY", "put_debit_spread", 2.0, 500, 490),
+    _row("P2", "SPY", "long_call", 3.0, 510),
+    _row("P3", "SPY", "iron_condor", 1.5, legs=json.dumps(CONDOR), direction="SHORT"),
+    _row("P4", "SPY", "call_credit_spread", 1.0, 520, 515),
+    _row("P5", "QQQ", "long_put", 4.0, 480),
+    _row("P6", "QQQ", "long_put", 4.0, 481.5),        # strike not listed -> unpriced
+    _row("P7", "AAPL", "stock", 190.0, asset_type="EQUITY", expiry=None),
+    _row("P8", "IWM", "long_call", 1.0, 500),
+]
+
+
+@pytest.fixture
+def world(monkeypatch):
+    fake = FakeUW()
+    conn = FakeConn(ROWS)
+
+    async def _pool():
+        return FakePool(conn)
+
+    monkeypatch.setattr(uw, "get_options_snapshot", fake.snapshot)
+    monkeypatch.setattr(uw, "UW_API_KEY", "test-key")
+    monkeypatch.setattr(up, "get_postgres_client", _pool)
+    monkeypatch.setattr(up, "_equity_last_price", lambda ticker: 200.0)
+    return fake, conn
+
+
+async def _legacy_mark(row):
+    """What the per-position cycle computed for one row."""
+    structure = row["structure"]
+    if row["legs"]:
+        r = await uw.get_multi_leg_value(row["ticker"], json.loads(row["legs"]), row["expiry"])
+        return abs(r["net_mark"]) if r else None
+    if row["short_strike"]:
+        long_strike, short_strike = up.normalize_spread_strikes(row["long_strike"], row["short_strike"], structure)
+        r = await uw.get_spread_value(row["ticker"], long_strike, short_strike, row["expiry"], structure)
+        return r["spread_value"] if r else None
+    opt_type = "put" if "put" in structure else "call"
+    r = await uw.get_single_option_value(row["ticker"], row["long_strike"], row["expiry"], opt_type)
+    return r["option_value"] if r else None
+
+
+def _marks(conn):
+    (sql, args), = [e for e in conn.executes if "UNNEST" in e[0]]
+    return sql, {pid: (price, pnl, long_leg, short_leg) for pid, price, pnl, long_leg, short_leg in zip(*args)}
+
+
+def test_one_chain_fetch_per_group_and_type(world):
+    fake, conn = world
+    result = asyncio.run(up.run_mark_to_market())
+
+    requested = sorted(fake.calls)
+    assert requested == sorted([
+        ("SPY", EXPIRY, "call"), ("SPY", EXPIRY, "put"),
+        ("QQQ", EXPIRY, "put"), ("IWM", EXPIRY, "call"),
+    ])
+    assert result["chain_groups"] == 3
+    assert result["chain_requests"] == 4
+    assert result["uw_calls_saved"] == 7 - 4      # P1..P6 + P8 each read a chain before
+    assert result["updated"] == 7                  # everything but P6
+    assert result["latency_ms"] >= 0
+
+
+def test_marks_match_per_position_pricing(world):
+    fake, conn = world
+    asyncio.run(up.run_mark_to_market())
+    sql, marks = _marks(conn)
+    assert sql.count("UPDATE unified_positions") == 1
+    assert len(conn.executes) == 1
+    assert "P6" not in marks
+
+    for row in ROWS:
+        if row["position_id"] in ("P6", "P7"):
+            continue
+        expected = asyncio.run(_legacy_mark(row))
+        price, pnl, long_leg, short_leg = marks[row["position_id"]]
+        assert price == pytest.approx(expected)
+        assert pnl == up._compute_unrealized_pnl(
+            row["entry_price"], expected, row["quantity"], row["structure"],
+            direction=row["direction"].upper())
+
+    assert marks["P7"][:2] == (200.0, 20.0)
+    assert marks["P2"][2] == marks["P2"][0]       # single leg: long leg price = mark
+    assert marks["P1"][2] is not None and marks["P1"][3] is not None
+
+
+def test_failed_group_keeps_other_groups(world):
+    fake, conn = world
+    fake.fail = {"SPY"}
+    result = asyncio.run(up.run_mark_to_market())
+    failed = {e["position_id"] for e in result["errors"]}
+    assert failed == {"P1", "P2", "P3", "P4"}
+    _, marks = _marks(conn)
+    assert set(marks) == {"P5", "P7", "P8"}
+
+
+def test_no_uw_key_prices_equity_only(world, monkeypatch):
+    fake, conn = world
+    monkeypatch.setattr(uw, "UW_API_KEY", "")
+    result = asyncio.run(up.run_mark_to_market())
+    assert fake.calls == []
+    assert result["source"] == "yfinance" and result["updated"] == 1
@@ -0,0 +1,171 @@
+"""Batched outcome resolution (jobs/outcome_resolver).
+
+yf.download is replaced by a fake that serves one synthetic 15m series per
+ticker and counts calls; a fake pool records the single UNNEST update.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jobs import outcome_resolver as resolver
+
+NOW = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+
+def _walk(bars, direction, entry, target, stop, signal_ts):
+    """Bar-by-bar reference: stop wins a same-bar tie, pre-signal bars skipped."""
+    for ts, high, low in sorted(bars):
+        if ts < signal_ts:
+            continue
+        long = direction == "LONG"
+        t_hit = high >= target if long else low <= target
+        s_hit = low <= stop if long else high >= stop
+        sign = 1.0 if long else -1.0
+        if s_hit:
+            return "LOSS", sign * (stop - entry) / entry * 100.0, ts
+        if t_hit:
+            return "WIN", sign * (target - entry) / entry * 100.0, ts
+    return None, None, None
+
+
+def _series(seed, n=400):
+    rng = np.random.default_rng(seed)
+    start = NOW - timedelta(days=10)
+    index = pd.date_range(start, periods=n, freq="15min", tz="UTC")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    spread = np.abs(rng.normal(0, 0.003, n)) * close
+    return pd.DataFrame({"High": close + spread, "Low": close - spread, "Close": close}, index=index)
+
+
+def _signals(frames, per_ticker=30, seed=1):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for ticker, frame in frames.items():
+        for k in range(per_ticker):
+            i = int(rng.integers(0, len(frame) - 20))
+            # Half the signals land mid-bar so the containing bar must be skipped.
+            ts = frame.index[i].to_pydatetime() + timedelta(minutes=7 * (k % 2))
+            entry = float(frame["Close"].iloc[i])
+            direction = "LONG" if k % 3 else "SHORT"
+            width = float(rng.uniform(0.005, 0.03))
+            sign = 1 if direction == "LONG" else -1
+            rows.append({
+                "signal_id": f"{ticker}-{k}", "ticker": ticker, "direction": direction,
+                "entry_price": entry, "stop_loss": entry * (1 - sign * width),
+                "target_1": entry * (1 + sign * width * 1.5), "timestamp": ts,
+                "asset_class": "EQUITY",
+            })
+    return rows
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executes = []
+
+    async def fetch(self, sql, *args):
+        return self.rows
+
+    async def fetchval(self, sql, *args):
+        return 0
+
+    async def execute(self, sql, *args):
+        self.executes.append((sql, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *a):
+                return False
+
+        return _Ctx()
+
+
+@pytest.fixture
+def world(monkeypatch):
+    frames = {t: _series(i) for i, t in enumerate(["SPY", "QQQ", "IWM"])}
+    rows = _signals(frames)
+    conn = FakeConn(rows)
+    downloads = []
+
+    def _download(ticker, start=None, interval=None, **kwargs):
+        downloads.append((ticker, interval, start))
+        return frames[ticker].copy()
+
+    async def _pool():
+        return FakePool(conn)
+
+    monkeypatch.setattr("yfinance.download", _download)
+    monkeypatch.setattr("database.postgres_client.get_postgres_client", _pool)
+    return frames, rows, conn, downloads
+
+
+def test_one_download_per_ticker_and_one_update(world):
+    frames, rows, conn, downloads = world
+    asyncio.run(resolver.resolve_signal_outcomes())
+
+    assert sorted(t for t, _, _ in downloads) == sorted(frames)
+    assert all(interval == "15m" for _, interval, _ in downloads)
+    for ticker, _, start in downloads:
+        assert start == min(r["timestamp"] for r in rows if r["ticker"] == ticker)
+
+    assert len(conn.executes) == 1
+    sql, (ids, outcomes, pnls) = conn.executes[0]
+    assert "UNNEST" in sql
+    got = dict(zip(ids, zip(outcomes, pnls)))
+
+    expected = {}
+    for r in rows:
+        frame = frames[r["ticker"]]
+        bars = [(ts.to_pydatetime(), h, lo) for ts, h, lo in zip(frame.index, frame["High"], frame["Low"])]
+        outcome, pnl, _ = _walk(bars, r["direction"], r["entry_price"], r["target_1"],
+                                r["stop_loss"], r["timestamp"])
+        if outcome:
+            expected[r["signal_id"]] = (outcome, pnl)
+
+    assert got.keys() == expected.keys()
+    assert {o for o, _ in got.values()} == {"WIN", "LOSS"}
+    for sid, (outcome, pnl) in expected.items():
+        assert got[sid][0] == outcome
+        assert got[sid][1] == pytest.approx(pnl)
+
+
+def test_first_touches_tie_and_pre_signal_bars():
+    ts = np.array([0, 10, 20, 30], dtype=np.int64)
+    high = np.array([200.0, 101.0, 103.0, 110.0])
+    low = np.array([50.0, 99.0, 94.0, 90.0])
+    code, pnl, idx = resolver._first_touches(
+        (ts, high, low),
+        signal_ts=np.array([5, 5, 25, 31]),
+        long=np.array([True, False, True, True]),
+        entry=np.array([100.0, 100.0, 100.0, 100.0]),
+        target=np.array([102.0, 98.0, 105.0, 105.0]),
+        stop=np.array([95.0, 102.0, 95.0, 95.0]),
+    )
+    # Bar 0 touches everything but precedes every signal.
+    # Long: bar 2 hits both 102 and 95 -> stop wins. Short: bar 2 hits the stop.
+    assert code.tolist() == [-1, -1, -1, 0]
+    assert pnl[:3] == pytest.approx([-5.0, -2.0, -5.0])
+    assert idx[:3].tolist() == [2, 2, 3]
+
+
+def test_unresolved_signals_issue_no_update(world):
+    frames, rows, conn, downloads = world
+    for r in rows:
+        r["timestamp"] = NOW + timedelta(days=1)
+    asyncio.run(resolver.resolve_signal_outcomes())
+    assert len(downloads) == len(frames)
+    assert conn.executes == []
@@ -0,0 +1,181 @@
+"""Pivot LLM payload keeps a stable, cacheable prompt prefix (pivot/llm/pivot_agent.py).
+
+The current ET date/time used to lead the system prompt, so the prefix of
+every request changed once a minute and provider-side prompt caching of the
+large PIVOT_SYSTEM_PROMPT never hit. The system prompt is now byte-identical
+on every call and the clock line rides on the final user turn.
+
+pivot/ is deployed on its own (not part of backend/), so this file appends it
+to sys.path -- appended, not inserted, so pivot's `scheduler` package never
+shadows backend's. OpenRouter is replaced by a local stub HTTP server that
+records each request body; no external calls.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+PIVOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "pivot"))
+if PIVOT_DIR not in sys.path:
+    sys.path.append(PIVOT_DIR)
+
+from llm import pivot_agent  # noqa: E402
+from llm.prompts import PIVOT_SYSTEM_PROMPT  # noqa: E402
+
+
+class _StubLLM(BaseHTTPRequestHandler):
+    requests = []
+    status = 200
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append(body)
+        n = len(type(self).requests)
+        if type(self).status != 200:
+            payload = {"error": {"message": "upstream down"}}
+        else:
+            payload = {
+                "choices": [{"message": {"content": f"reply {n}"}}],
+                "usage": {"prompt_tokens": 4000, "prompt_tokens_details": {"cached_tokens": 3700}},
+            }
+        raw = json.dumps(payload).encode()
+        self.send_response(type(self).status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    _StubLLM.requests = []
+    _StubLLM.status = 200
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubLLM)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    clock = {"minute": 0}
+    monkeypatch.setattr(pivot_agent, "OPENROUTER_URL", f"http://127.0.0.1:{server.server_port}/v1/chat/completions")
+    monkeypatch.setattr(pivot_agent, "LLM_API_KEY", "test-key")
+    monkeypatch.setattr(pivot_agent, "LLM_MODEL", "anthropic/claude-haiku-4-5")
+    monkeypatch.setattr(pivot_agent, "_clock_line", lambda: _clock_for({"clock": clock}))
+    pivot_agent._response_cache.clear()
+    yield {"requests": _StubLLM.requests, "clock": clock}
+    server.shutdown()
+    server.server_close()
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def _clock_for(stub):
+    return f"TODAY: Friday, October 16, 2026 | Time: 10:{stub['clock']['minute']:02d} AM ET"
+
+
+def test_system_prompt_prefix_is_stable_across_minutes(stub):
+    asyncio.run(pivot_agent.call_llm("Quick market read?"))
+    stub["clock"]["minute"] = 7
+    asyncio.run(pivot_agent.call_llm("Quick market read?"))
+
+    first, second = stub["requests"]
+    assert first["messages"][0] == second["messages"][0]
+    assert first["messages"][0]["content"][0]["text"] == PIVOT_SYSTEM_PROMPT
+    assert first["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+    # The whole system prompt sits inside the shared request prefix; only the
+    # final user turn differs (it carries the clock).
+    shared = _common_prefix(json.dumps(first["messages"]), json.dumps(second["messages"]))
+    assert shared > len(json.dumps(PIVOT_SYSTEM_PROMPT))
+    assert first["messages"][-1]["content"].startswith("TODAY: Friday, October 16, 2026 | Time: 10:00 AM ET")
+    assert second["messages"][-1]["content"].endswith("Quick market read?")
+
+
+def test_history_is_untouched_and_only_final_turn_gets_clock(stub, monkeypatch):
+    monkeypatch.setattr(pivot_agent, "LLM_MODEL", "openai/gpt-4o-mini")
+    image_turn = {"role": "user", "content": [{"type": "image_url", "image_url": {"url": "data:,"}}]}
+    history = [
+        {"role": "user", "content": "What is SPY doing?"},
+        {"role": "assistant", "content": "Grinding higher."},
+        image_turn,
+    ]
+    asyncio.run(pivot_agent.call_llm_messages(history))
+
+    (sent,) = stub["requests"]
+    assert sent["messages"][0] == {"role": "system", "content": PIVOT_SYSTEM_PROMPT}
+    assert sent["messages"][1:3] == history[:2]
+    assert sent["messages"][3]["content"][0] == {"type": "text", "text": _clock_for(stub)}
+    assert sent["messages"][3]["content"][1:] == image_turn["content"]
+    assert image_turn["content"][0]["type"] == "image_url"      # caller's message not mutated
+
+
+def test_identical_scheduled_prompt_is_deduplicated(stub):
+    async def run():
+        concurrent = await asyncio.gather(
+            pivot_agent.call_llm("EOD data ...", max_tokens=3000, dedupe_ttl=1800),
+            pivot_agent.call_llm("EOD data ...", max_tokens=3000, dedupe_ttl=1800),
+        )
+        stub["clock"]["minute"] = 5         # re-run a few minutes later, same inputs
+        again = await pivot_agent.call_llm("EOD data ...", max_tokens=3000, dedupe_ttl=1800)
+        changed = await pivot_agent.call_llm("EOD data (new) ...", max_tokens=3000, dedupe_ttl=1800)
+        return concurrent, again, changed
+
+    concurrent, again, changed = asyncio.run(run())
+    assert concurrent == ["reply 1", "reply 1"] and again == "reply 1"
+    assert changed == "reply 2"
+    assert len(stub["requests"]) == 2
+
+
+def test_dedupe_is_opt_in_and_errors_are_not_reused(stub):
+    asyncio.run(pivot_agent.call_llm("chat"))
+    asyncio.run(pivot_agent.call_llm("chat"))
+    assert len(stub["requests"]) == 2
+
+    _StubLLM.status = 500
+    failed = asyncio.run(pivot_agent.call_llm("brief", dedupe_ttl=1800))
+    assert failed.startswith("[LLM error: HTTP 500")
+    _StubLLM.status = 200
+    assert asyncio.run(pivot_agent.call_llm("brief", dedupe_ttl=1800)) == "reply 4"
+
+
+def test_clock_line_follows_daylight_saving(monkeypatch):
+    from datetime import datetime as real_datetime, timezone
+
+    class _Frozen(real_datetime):
+        now_utc = None
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_utc.astimezone(tz)
+
+    monkeypatch.setattr(pivot_agent, "datetime", _Frozen)
+    _Frozen.now_utc = real_datetime(2026, 7, 1, 14, 0, tzinfo=timezone.utc)    # EDT, UTC-4
+    assert pivot_agent._clock_line() == "TODAY: Wednesday, July 01, 2026 | Time: 10:00 AM ET"
+    _Frozen.now_utc = real_datetime(2026, 12, 1, 15, 0, tzinfo=timezone.utc)   # EST, UTC-5
+    assert pivot_agent._clock_line() == "TODAY: Tuesday, December 01, 2026 | Time: 10:00 AM ET"
+
+
+def test_response_cache_is_bounded(stub, monkeypatch):
+    monkeypatch.setattr(pivot_agent, "RESPONSE_CACHE_MAX", 3)
+
+    async def run():
+        for n in range(5):
+            await pivot_agent.call_llm(f"brief {n}", dedupe_ttl=1800)
+        return await pivot_agent.call_llm("brief 4", dedupe_ttl=1800)
+
+    assert asyncio.run(run()) == "reply 5"
+    assert len(pivot_agent._response_cache) == 3
+    assert len(stub["requests"]) == 5
@@ -0,0 +1,172 @@
+"""
+Binary per-symbol price-history cache behind factor_utils.get_price_history.
+
+Codec round trips, window slicing, and the memory → Redis → upstream order
+with one canonical key per symbol. Fake Redis and a stubbed bars source; no
+network.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+import bias_engine.factor_utils as fu
+import bias_engine.price_history_cache as phc
+from bias_engine.price_history_cache import (
+    PriceHistoryEntry,
+    SLICE_CALENDAR,
+    SLICE_ROWS,
+    decode_history,
+    encode_history,
+)
+
+
+def _frame(rows=120, tz=None, end=None):
+    end = end or pd.Timestamp.now().normalize()
+    idx = pd.bdate_range(end=end, periods=rows, tz=tz, name="Date")
+    rng = np.random.default_rng(7)
+    close = 400 + np.cumsum(rng.normal(0, 1, rows))
+    return pd.DataFrame(
+        {"open": close - 1, "high": close + 2, "low": close - 2, "close": close,
+         "volume": rng.integers(1_000_000, 2_000_000, rows)},
+        index=idx,
+    )
+
+
+def test_codec_round_trip_naive_and_tz_aware():
+    for tz in (None, "America/New_York"):
+        df = _frame(tz=tz)
+        df.iloc[3, 0] = np.nan
+        entry = PriceHistoryEntry(df, 120, SLICE_ROWS, 123.0)
+        back = decode_history(encode_history(entry))
+        pd.testing.assert_frame_equal(back.frame, df.astype("float64"), check_freq=False)
+        assert (back.days, back.slice_mode, back.fetched_at) == (120, SLICE_ROWS, 123.0)
+
+
+def test_binary_payload_is_smaller_than_json():
+    df = _frame(rows=252)
+    binary = encode_history(PriceHistoryEntry(df, 365, SLICE_CALENDAR, time.time()))
+    assert len(binary) < 0.6 * len(df.to_json(orient="split"))
+
+
+def test_non_numeric_frames_are_not_encoded():
+    df = _frame(rows=5)
+    df["note"] = "x"
+    assert encode_history(PriceHistoryEntry(df, 5, SLICE_ROWS, 0.0)) is None
+
+
+def test_window_slicing_modes():
+    df = _frame(rows=60)
+    for mode in (SLICE_ROWS, SLICE_CALENDAR):
+        entry = PriceHistoryEntry(df, 60, mode, 0.0)
+        assert len(entry.window(10)) == 10
+        assert entry.window(10).index[-1] == df.index[-1]
+        # yfinance period="5d" is five sessions: a 5-day slice is five bars.
+        assert len(entry.window(5)) == 5
+        assert len(entry.window(60)) == 60
+
+
+class FakeBinaryRedis:
+    def __init__(self):
+        self.store = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        assert isinstance(value, bytes)
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+def _patch(monkeypatch, fake, calls):
+    async def _client():
+        return fake
+
+    async def fake_bars(symbol, days):
+        calls.append((symbol, days))
+        return _frame(rows=days)
+
+    async def _no_reference(symbol):
+        return None
+
+    import integrations.uw_api as uw
+
+    monkeypatch.setattr("database.redis_client.get_redis_binary_client", _client)
+    monkeypatch.setattr(uw, "get_bars_as_dataframe", fake_bars)
+    monkeypatch.setattr(fu, "_get_live_reference_price", _no_reference)
+    phc.clear_memory_cache()
+
+
+def test_one_key_per_symbol_serves_shorter_windows(monkeypatch):
+    fake, calls = FakeBinaryRedis(), []
+    _patch(monkeypatch, fake, calls)
+
+    async def run():
+        a = await fu.get_price_history("IWM", days=30)
+        b = await fu.get_price_history("IWM", days=5)
+        c = await fu.get_price_history("IWM", days=60)
+        return a, b, c
+
+    a, b, c = asyncio.run(run())
+    assert calls == [("IWM", fu.PRICE_CACHE_MIN_FETCH_DAYS)]
+    assert list(fake.store) == [f"prices:{fu.PRICE_CACHE_VERSION}:IWM:adj"]
+    assert (len(a), len(b), len(c)) == (30, 5, 60)
+    assert b.index[-1] == c.index[-1]
+    # Callers get independent copies.
+    b["close"] = 0.0
+    assert asyncio.run(fu.get_price_history("IWM", days=5))["close"].iloc[-1] != 0.0
+
+
+def test_redis_tier_after_memory_eviction_and_wider_refetch(monkeypatch):
+    fake, calls = FakeBinaryRedis(), []
+    _patch(monkeypatch, fake, calls)
+
+    asyncio.run(fu.get_price_history("XLE", days=30))
+    phc.clear_memory_cache()
+    df = asyncio.run(fu.get_price_history("XLE", days=20))
+    assert len(df) == 20 and len(calls) == 1
+    assert phc.get_price_cache_stats()["redis_hits"] >= 1
+
+    # A wider window than the entry covers refetches and replaces it.
+    df = asyncio.run(fu.get_price_history("XLE", days=250))
+    assert calls[-1] == ("XLE", 250) and len(df) == 250
+    assert decode_history(fake.store[f"prices:{fu.PRICE_CACHE_VERSION}:XLE:adj"]).days == 250
+
+
+def test_unreadable_entry_is_discarded(monkeypatch):
+    fake, calls = FakeBinaryRedis(), []
+    _patch(monkeypatch, fake, calls)
+    key = f"prices:{fu.PRICE_CACHE_VERSION}:SMH:adj"
+    fake.store[key] = b"not a payload"
+
+    df = asyncio.run(fu.get_price_history("SMH", days=10))
+    assert len(df) == 10 and calls == [("SMH", fu.PRICE_CACHE_MIN_FETCH_DAYS)]
+    assert decode_history(fake.store[key]).days == fu.PRICE_CACHE_MIN_FETCH_DAYS
+
+
+def test_memory_tier_is_a_bounded_memory_cache_namespace(monkeypatch):
+    from utils.memory_cache import cache_stats
+
+    async def _no_client():
+        return None
+
+    monkeypatch.setattr(phc, "_binary_client", _no_client)
+    phc.clear_memory_cache()
+    fresh = PriceHistoryEntry(_frame(rows=5), 5, SLICE_ROWS, time.time())
+    stale = PriceHistoryEntry(_frame(rows=5), 5, SLICE_ROWS, time.time() - 900)
+
+    async def run():
+        await phc.write_entry("k1", "FRESH", fresh, 900)
+        await phc.write_entry("k2", "STALE", stale, 900)
+        return (await phc.read_entry("k1", "FRESH", 900))[1], (await phc.read_entry("k2", "STALE", 900))[1]
+
+    # The stale entry expires from memory with its Redis TTL.
+    assert asyncio.run(run()) == ("memory", "miss")
+    assert cache_stats()["bias_engine.price_history"]["max_entries"] == phc.LRU_MAX_ENTRIES
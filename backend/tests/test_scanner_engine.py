@@ -0,0 +1,167 @@
+"""Scanner engine (scanners/engine): one bar load per cycle, many detectors.
+
+bar_loader._download_batch is faked, so these run offline and count how many
+outbound requests a cycle costs. Detectors here are fakes; the built-in ones
+need pandas_ta.
+"""
+
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanners import bar_loader, engine
+
+
+def _frame(days=120):
+    idx = pd.date_range("2025-01-01", periods=days, freq="D")
+    close = np.linspace(100, 130, days)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                         "Close": close, "Volume": 1_000_000}, index=idx)
+
+
+class FakeDetector(engine.Detector):
+    def __init__(self, name, universe, period="4mo", interval="1d", min_bars=10, skip=None):
+        self.name = name
+        self.label = name
+        self.period = period
+        self.interval = interval
+        self.min_bars = min_bars
+        self._universe = universe
+        self._skip = skip
+        self.seen = []
+        self.finalized = None
+
+    async def prepare(self):
+        if self._skip:
+            raise engine.SkipCycle(self._skip, extra_field=1)
+        return {"ctx": self.name}
+
+    async def universe(self):
+        return list(self._universe)
+
+    async def evaluate(self, ticker, frame, ctx):
+        assert ctx == {"ctx": self.name}
+        self.seen.append(ticker)
+        frame.indicator(("mean", 5), lambda b: b["Close"].rolling(5).mean())
+        df = frame.bars()
+        df["scratch"] = 1.0  # private copy — must not leak to other detectors
+        return [{"ticker": ticker, "strategy": self.name}] if ticker == "AAPL" else []
+
+    async def finalize(self, signals, ctx):
+        self.finalized = list(signals)
+        return {"extra": "ok"}
+
+
+@pytest.fixture
+def setup(monkeypatch):
+    calls = []
+
+    def _fake(symbols, period, interval):
+        calls.append((period, interval, list(symbols)))
+        return {s: _frame() for s in symbols if s != "NODATA"}
+
+    fallbacks = []
+
+    def _fake_single(ticker, period, interval):
+        fallbacks.append(ticker)
+        return pd.DataFrame()
+
+    bar_loader.clear_cache()
+    monkeypatch.setattr(bar_loader, "_download_batch", _fake)
+    monkeypatch.setattr(engine, "_fetch_single", _fake_single)
+    monkeypatch.setattr(engine, "_registry", {})
+    monkeypatch.setattr(engine, "_last_run", {})
+    monkeypatch.setattr(engine, "_last_forced", {})
+    monkeypatch.setattr(engine, "_defaults_loaded", True)
+    yield calls, fallbacks
+    bar_loader.clear_cache()
+
+
+def test_detectors_on_one_spec_share_a_single_load_and_indicators(setup):
+    calls, fallbacks = setup
+    a = engine.register_detector(FakeDetector("a", ["AAPL", "MSFT", "NODATA"]))
+    b = engine.register_detector(FakeDetector("b", ["aapl", "NVDA"]))
+    result = asyncio.run(engine.run_scan_cycle(force=True))
+
+    assert calls == [("4mo", "1d", ["AAPL", "MSFT", "NODATA", "NVDA"])]
+    assert fallbacks == ["NODATA"]
+    assert a.seen == ["AAPL", "MSFT"]
+    assert b.seen == ["AAPL", "NVDA"]
+    assert result["indicators"] == {"computed": 3, "reused": 1}  # AAPL shared
+
+    stats = result["detectors"]["a"]
+    assert stats["tickers_scanned"] == 3
+    assert stats["signals_found"] == 1
+    assert stats["extra"] == "ok"
+    assert stats["eval_seconds"] >= 0 and stats["eval_p95_ms"] is not None
+    assert a.finalized == [{"ticker": "AAPL", "strategy": "a"}]
+    assert result["bar_loads"]["4mo/1d"]["batches"] == 1
+
+
+def test_each_bar_spec_is_loaded_once(setup):
+    calls, _ = setup
+    engine.register_detector(FakeDetector("daily", ["SPY", "QQQ"]))
+    engine.register_detector(FakeDetector("hourly", ["SPY"], period="3mo", interval="1h"))
+    asyncio.run(engine.run_scan_cycle(force=True))
+    assert sorted((p, i) for p, i, _ in calls) == [("3mo", "1h"), ("4mo", "1d")]
+
+
+def test_short_frames_and_skipped_detectors(setup):
+    calls, _ = setup
+    short = engine.register_detector(FakeDetector("short", ["SPY"], min_bars=500))
+    engine.register_detector(FakeDetector("off", ["SPY"], skip="bias_regime"))
+    result = asyncio.run(engine.run_scan_cycle(force=True))
+
+    assert short.seen == []
+    assert result["detectors"]["short"]["tickers_scanned"] == 1
+    assert result["detectors"]["off"] == {"skipped": True, "reason": "bias_regime", "extra_field": 1}
+    assert len(calls) == 1
+
+
+def test_cadence_and_window_gate_unforced_cycles(setup, monkeypatch):
+    engine.register_detector(FakeDetector("a", ["SPY"]))
+    monkeypatch.setattr(engine, "_now_et", lambda: datetime(2026, 3, 4, 10, 0))  # Wednesday
+    first = asyncio.run(engine.run_scan_cycle())
+    second = asyncio.run(engine.run_scan_cycle())
+    assert "a" in first["detectors"]
+    assert second["detectors"] == {}
+
+    engine._last_run.clear()
+    monkeypatch.setattr(engine, "_now_et", lambda: datetime(2026, 3, 7, 10, 0))  # Saturday
+    assert asyncio.run(engine.run_scan_cycle())["detectors"] == {}
+
+
+def test_forced_runs_do_not_shift_the_schedule(setup, monkeypatch):
+    a = engine.register_detector(FakeDetector("a", ["SPY"]))
+    monkeypatch.setattr(engine, "_now_et", lambda: datetime(2026, 3, 4, 10, 0))  # Wednesday
+    asyncio.run(engine.run_detector("a"))
+    assert engine._last_run == {} and "a" in engine.get_engine_stats()["last_forced"]
+
+    # The manual run did not start a new cadence window: the scheduled run is still due.
+    assert "a" in asyncio.run(engine.run_scan_cycle())["detectors"]
+    last = engine._last_run["a"]
+    asyncio.run(engine.run_detector("a"))
+    assert engine._last_run["a"] == last
+    assert asyncio.run(engine.run_scan_cycle())["detectors"] == {}
+    assert a.seen == ["SPY"] * 3
+
+
+def test_run_detector_uses_explicit_tickers(setup):
+    calls, _ = setup
+    a = engine.register_detector(FakeDetector("a", ["SPY"]))
+    engine.register_detector(FakeDetector("b", ["QQQ"]))
+    out = asyncio.run(engine.run_detector("a", ["aapl"]))
+    assert a.seen == ["AAPL"]
+    assert out["signals_found"] == 1
+    assert calls == [("4mo", "1d", ["AAPL"])]
+
+
+def test_detector_without_evaluate_cannot_be_instantiated():
+    class Incomplete(engine.Detector):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
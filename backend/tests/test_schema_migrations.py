@@ -0,0 +1,156 @@
+"""Versioned schema migrations (database/migrations).
+
+A fake connection stands in for asyncpg: it keeps the ledger rows in memory
+and records every statement, so the tests can assert that a current database
+costs exactly one query at startup.
+"""
+
+import asyncio
+
+import asyncpg
+
+from database import migrations
+from database.migrations import Migration, MigrationIncomplete, migrate
+
+
+class AdvisoryLock:
+    """Session-level pg_advisory_lock shared by FakeConns; honours lock_timeout."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, conn):
+        timeout = conn.settings.get("lock_timeout", "0")
+        if timeout in ("0", "DEFAULT"):
+            await self.lock.acquire()
+            return
+        try:
+            await asyncio.wait_for(self.lock.acquire(), 0.01)
+        except asyncio.TimeoutError:
+            raise asyncpg.LockNotAvailableError("canceling statement due to lock timeout")
+
+
+class FakeConn:
+    def __init__(self, ledger=None, ledger_exists=True, advisory=None):
+        self.ledger = {} if ledger is None else ledger
+        self.ledger_exists = ledger_exists
+        self.advisory = advisory or AdvisoryLock()
+        self.settings = {"lock_timeout": "5s"}   # as a pooled session might carry
+        self.statements = []
+
+    async def fetchval(self, sql, *args):
+        self.statements.append(sql)
+        if "MAX(version)" in sql:
+            if not self.ledger_exists:
+                raise asyncpg.UndefinedTableError("relation \"schema_migrations\" does not exist")
+            return max(self.ledger, default=None)
+        raise AssertionError(sql)
+
+    async def fetch(self, sql, *args):
+        self.statements.append(sql)
+        return [{"version": v} for v in self.ledger]
+
+    async def execute(self, sql, *args):
+        self.statements.append(sql)
+        if sql.startswith("SET "):
+            name, value = sql[4:].split(" = ")
+            self.settings[name] = value.strip("'")
+        elif sql.startswith("RESET "):
+            self.settings[sql[6:]] = "DEFAULT"
+        elif "pg_advisory_lock" in sql:
+            await self.advisory.acquire(self)
+        elif "pg_advisory_unlock" in sql:
+            self.advisory.lock.release()
+        elif "CREATE TABLE IF NOT EXISTS schema_migrations" in sql:
+            self.ledger_exists = True
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.ledger.setdefault(args[0], args[1])
+
+
+def _recorder(calls, name, fail=False):
+    async def apply(conn):
+        calls.append(name)
+        if fail:
+            raise MigrationIncomplete("lock timeout")
+    return apply
+
+
+def test_current_database_is_one_query():
+    calls = []
+    conn = FakeConn(ledger={1: "a", 2: "b"})
+    result = asyncio.run(migrate(conn, [Migration(1, "a", _recorder(calls, "a")),
+                                        Migration(2, "b", _recorder(calls, "b"))]))
+    assert result == {"version": 2, "applied": [], "pending": [], "fast_path": True}
+    assert calls == []
+    assert len(conn.statements) == 1
+
+
+def test_fresh_database_applies_everything_in_order_under_lock():
+    calls = []
+    conn = FakeConn(ledger_exists=False)
+    result = asyncio.run(migrate(conn, [Migration(2, "b", _recorder(calls, "b")),
+                                        Migration(1, "a", _recorder(calls, "a"))]))
+    assert calls == ["a", "b"]
+    assert result["applied"] == [1, 2] and result["version"] == 2
+    assert conn.ledger == {1: "a", 2: "b"}
+    lock = next(i for i, sql in enumerate(conn.statements) if "pg_advisory_lock" in sql)
+    assert conn.statements[1:lock] == ["SET lock_timeout = 0", "SET statement_timeout = 0"]
+    assert conn.statements[lock + 1].startswith("SET lock_timeout = '5s'")
+    assert "pg_advisory_unlock" in conn.statements[-1]
+    assert conn.settings == {"lock_timeout": "DEFAULT", "statement_timeout": "DEFAULT"}
+
+
+def test_concurrent_boots_wait_for_the_migration_lock():
+    calls = []
+
+    async def slow(conn):
+        calls.append(conn.name)
+        await asyncio.sleep(0.05)   # well past the fake 0.01s lock_timeout
+
+    async def run():
+        ledger, advisory = {}, AdvisoryLock()
+        api, worker = FakeConn(ledger, False, advisory), FakeConn(ledger, False, advisory)
+        api.name, worker.name = "api", "worker"
+        plan = [Migration(1, "a", slow)]
+        return await asyncio.gather(migrate(api, plan), migrate(worker, plan)), ledger
+
+    (first, second), ledger = asyncio.run(run())
+    # The second boot waited, then found the ledger current under the lock.
+    assert calls == ["api"]
+    assert first["applied"] == [1] and second["applied"] == []
+    assert first["version"] == second["version"] == 1
+    assert ledger == {1: "a"}
+
+
+def test_only_missing_versions_run():
+    calls = []
+    conn = FakeConn(ledger={1: "a"})
+    result = asyncio.run(migrate(conn, [Migration(1, "a", _recorder(calls, "a")),
+                                        Migration(2, "b", _recorder(calls, "b"))]))
+    assert calls == ["b"]
+    assert result["applied"] == [2]
+
+
+def test_incomplete_migration_still_runs_later_ones_unrecorded():
+    calls = []
+    conn = FakeConn(ledger_exists=False)
+    plan = [Migration(1, "a", _recorder(calls, "a", fail=True)),
+            Migration(2, "b", _recorder(calls, "b")),
+            Migration(3, "c", _recorder(calls, "c", fail=True))]
+    result = asyncio.run(migrate(conn, plan))
+    # Later side tables are still created; nothing is recorded past the gap.
+    assert calls == ["a", "b", "c"]
+    assert result == {"version": 0, "applied": [], "pending": [1, 2, 3], "fast_path": False}
+    assert conn.ledger == {}
+    assert "pg_advisory_unlock" in conn.statements[-1]
+
+    # Next boot retries from the incomplete version.
+    plan[0] = Migration(1, "a", _recorder(calls, "a"))
+    plan[2] = Migration(3, "c", _recorder(calls, "c"))
+    assert asyncio.run(migrate(conn, plan))["applied"] == [1, 2, 3]
+
+
+def test_registered_migrations_are_contiguous():
+    versions = [m.version for m in migrations.MIGRATIONS]
+    assert versions == list(range(1, len(versions) + 1))
+    assert migrations.latest_version() == versions[-1]
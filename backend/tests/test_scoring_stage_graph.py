@@ -0,0 +1,101 @@
+"""
+Stage graph behind apply_scoring.
+
+Independent stages must overlap, dependencies must be respected, and a stage
+that times out or raises must fall back to its default (and mark dependents
+skipped) without failing the whole graph. Also checks that concurrent
+metadata enrichers don't drop each other's keys.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from signals.stage_graph import Stage, run_stages, slowest_stage
+
+
+def _sleeper(value, delay):
+    async def fn(**_):
+        await asyncio.sleep(delay)
+        return value
+    return fn
+
+
+def test_independent_stages_overlap():
+    stages = [Stage(f"s{i}", _sleeper(i, 0.1), timeout=1.0) for i in range(5)]
+    t0 = time.perf_counter()
+    results, timings = asyncio.run(run_stages(stages))
+    assert time.perf_counter() - t0 < 0.3
+    assert results == {f"s{i}": i for i in range(5)}
+    assert all(t["status"] == "ok" for t in timings.values())
+
+
+def test_dependency_receives_result():
+    async def double(base):
+        return base * 2
+
+    stages = [
+        Stage("double", double, deps=("base",)),
+        Stage("base", _sleeper(21, 0.01)),
+    ]
+    results, _ = asyncio.run(run_stages(stages))
+    assert results["double"] == 42
+
+
+def test_timeout_and_error_fall_back_to_default():
+    async def boom():
+        raise RuntimeError("down")
+
+    async def dependent(slow):
+        return "ran"
+
+    stages = [
+        Stage("slow", _sleeper("late", 1.0), timeout=0.05, default="dflt"),
+        Stage("boom", boom, default={}),
+        Stage("dependent", dependent, deps=("slow",), default="skipped"),
+        Stage("fine", _sleeper("ok", 0.0)),
+    ]
+    t0 = time.perf_counter()
+    results, timings = asyncio.run(run_stages(stages))
+    assert time.perf_counter() - t0 < 0.5
+    assert results == {"slow": "dflt", "boom": {}, "dependent": "skipped", "fine": "ok"}
+    assert timings["slow"]["status"] == "timeout"
+    assert timings["boom"]["status"] == "error"
+    assert timings["dependent"]["status"] == "skipped"
+    assert slowest_stage(timings) == "slow"
+
+
+def test_cycle_and_unknown_dependency_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(run_stages([Stage("a", _sleeper(1, 0), deps=("b",)),
+                                Stage("b", _sleeper(1, 0), deps=("a",))]))
+    with pytest.raises(ValueError):
+        asyncio.run(run_stages([Stage("a", _sleeper(1, 0), deps=("missing",))]))
+
+
+def test_concurrent_enrichers_keep_all_metadata_keys():
+    from signals.pipeline import _merge_enriched_metadata, _run_enricher
+
+    # Mimics the real enrichers: read metadata, await, assign it back.
+    def enricher(key, delay):
+        async def fn(signal_data):
+            metadata = signal_data.get("metadata") or {}
+            await asyncio.sleep(delay)
+            metadata[key] = True
+            signal_data["metadata"] = metadata
+            return signal_data
+        return fn
+
+    signal = {"ticker": "SPY", "metadata": None}
+
+    async def run():
+        return await asyncio.gather(
+            _run_enricher(enricher("ten_day_high", 0.02), signal),
+            _run_enricher(enricher("flow_pc_ratio", 0.01), signal),
+            _run_enricher(enricher("darkpool_status", 0.0), signal),
+        )
+
+    price, flow, dp = asyncio.run(run())
+    _merge_enriched_metadata(signal, {"price_range": price, "flow_data": flow, "darkpool": dp})
+    assert signal["metadata"] == {"ten_day_high": True, "flow_pc_ratio": True, "darkpool_status": True}
@@ -0,0 +1,264 @@
+"""Sector constituent refresh over the local daily-bar panel (jobs/sector_bar_panel).
+
+UW get_ohlc is replaced by a fake serving synthetic regular-session bars and
+counting calls; live prices, Postgres and the sector cache are fakes too.
+Fields are checked against the per-ticker math the refresh used to run.
+"""
+
+import asyncio
+import math
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+import integrations.uw_api as uw
+from indicators import kernels
+from integrations.uw_governor import UWUnavailable
+from jobs import sector_bar_panel as sbp
+from jobs import sector_constituent_refresh as scr
+from utils.trading_calendar import ET, get_calendar
+
+# Tue 2025-12-02, mid-session; Thanksgiving (11/27) sits inside the MO window.
+MID_SESSION = datetime(2025, 12, 2, 11, 0, tzinfo=ET)
+AFTER_CLOSE = datetime(2025, 12, 2, 16, 6, tzinfo=ET)
+TODAY = date(2025, 12, 2)
+
+
+def _series(seed, n=120):
+    rng = np.random.default_rng(seed)
+    return list(100 * np.cumprod(1 + rng.normal(0, 0.015, n)))
+
+
+def _uw_bars(closes, through):
+    """UW /ohlc/1d shape for the sessions ending at `through`, with pre/post bars."""
+    sessions = get_calendar().trading_days(through - timedelta(days=400), through)[-len(closes):]
+    out = []
+    for day, close in zip(sessions, closes):
+        out.append({"market_time": "pr", "close": close * 0.99, "start_time": f"{day}T09:00:00Z"})
+        out.append({"market_time": "r", "close": close, "start_time": f"{day}T14:30:00Z"})
+        out.append({"market_time": "po", "close": close * 1.01, "start_time": f"{day}T21:00:00Z"})
+    return out
+
+
+def _legacy_pct(closes, offset):
+    if len(closes) < offset + 1:
+        return None
+    old = closes[-(offset + 1)]
+    return round((closes[-1] / old - 1) * 100, 2) if old else None
+
+
+class FakeConn:
+    def __init__(self, universe, stored=()):
+        self.universe = universe
+        self.stored = list(stored)
+        self.executes = []
+
+    async def fetch(self, sql, *args):
+        if "sector_constituents" in sql:
+            return [{"ticker": t} for t in self.universe]
+        return [{"ticker": t, "session": d, "close": c} for t, d, c in self.stored]
+
+    async def execute(self, sql, *args):
+        self.executes.append((sql, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *a):
+                return False
+
+        return _Ctx()
+
+
+class FakeOHLC:
+    def __init__(self, series, through):
+        self.series = series
+        self.through = through
+        self.calls = []
+        self.blocked = set()
+
+    async def __call__(self, ticker, candle_size="1d", lookback_days=30, caller="ohlc"):
+        self.calls.append(ticker)
+        if ticker in self.blocked:
+            return UWUnavailable("quota", caller=caller)
+        if ticker not in self.series:
+            return None
+        return _uw_bars(self.series[ticker], self.through)
+
+
+@pytest.fixture
+def world(monkeypatch):
+    universe = ["AAPL", "MSFT", "NEWCO", "XOM"]
+    series = {"AAPL": _series(1), "MSFT": _series(2), "XOM": _series(3), "NEWCO": _series(4, n=8)}
+    conn = FakeConn(universe)
+    ohlc = FakeOHLC(series, TODAY)
+    clock = {"now": MID_SESSION}
+    panel = sbp.SectorBarPanel(clock=lambda: clock["now"])
+    writes = []
+
+    async def _pool():
+        return FakePool(conn)
+
+    async def _write_many(values, source="UW"):
+        writes.append((source, values))
+        return sum(len(v) for v in values.values())
+
+    monkeypatch.setattr(uw, "get_ohlc", ohlc)
+    monkeypatch.setattr(sbp, "INTER_REQUEST_SLEEP", 0)
+    monkeypatch.setattr(sbp, "_check_headroom", lambda: 1.0)
+    monkeypatch.setattr(scr, "get_postgres_client", _pool)
+    monkeypatch.setattr(scr, "bar_panel", panel)
+    monkeypatch.setattr(scr, "_is_market_hours_safe", lambda: True)
+    monkeypatch.setattr(scr.sector_cache, "write_many", _write_many)
+    return {"panel": panel, "conn": conn, "ohlc": ohlc, "series": series,
+            "clock": clock, "writes": writes, "monkeypatch": monkeypatch}
+
+
+def _live(world, prices):
+    async def _fetch(tickers):
+        return {t: (TODAY, p) for t, p in prices.items() if t in tickers}
+    world["monkeypatch"].setattr(scr, "fetch_live_prices", _fetch)
+
+
+def test_fields_match_per_ticker_math():
+    histories = [_series(s, n) for s, n in ((1, 120), (2, 40), (3, 15), (4, 4))]
+    matrix = kernels.panel(histories, length=90)
+    fields = sbp.compute_fields(matrix)
+    for row, closes in enumerate(histories):
+        tail = closes[-90:]
+        for name, offset in (("wk_change_pct", 5), ("mo_change_pct", 21)):
+            expected = _legacy_pct(tail, offset)
+            got = fields[name][row]
+            assert (math.isnan(got) if expected is None else got == pytest.approx(expected))
+        expected_rsi = kernels.rsi(np.array(tail), 14)[-1]
+        got_rsi = fields["rsi_14"][row]
+        assert (math.isnan(got_rsi) if math.isnan(expected_rsi) else got_rsi == round(expected_rsi, 2))
+
+
+def test_gaps_carry_the_previous_close():
+    matrix = np.array([[10.0, np.nan, 12.0, np.nan], [np.nan, np.nan, 5.0, 6.0]])
+    assert sbp._ffill(matrix).tolist()[0] == [10.0, 10.0, 12.0, 12.0]
+    assert np.isnan(sbp._ffill(matrix)[1, :2]).all()
+
+
+def test_regular_session_closes_take_et_dates():
+    bars = [
+        {"market_time": "r", "close": "101.5", "start_time": "2025-11-28T14:30:00Z"},
+        {"market_time": "po", "close": 102, "start_time": "2025-11-28T21:00:00Z"},
+        {"market_time": "r", "close": None, "start_time": "2025-12-01T14:30:00Z"},
+    ]
+    assert sbp.regular_session_closes(bars) == {date(2025, 11, 28): 101.5}
+
+
+def test_one_fetch_per_ticker_per_session(world):
+    panel, ohlc, conn = world["panel"], world["ohlc"], world["conn"]
+    status = asyncio.run(panel.sync(conn.universe, FakePool(conn)))
+    assert sorted(ohlc.calls) == sorted(conn.universe)
+    assert status["fetched"] == 4 and status["succeeded"] == 4
+
+    # Mid-session: today's partial bar is not stored; everything ends yesterday.
+    assert max(panel._bars["AAPL"]) == date(2025, 12, 1)
+    (sql, args), = conn.executes
+    assert "UNNEST" in sql and TODAY not in args[1]
+
+    # Later ticks in the same session make no UW calls.
+    assert asyncio.run(panel.sync(conn.universe, FakePool(conn)))["fetched"] == 0
+    assert len(ohlc.calls) == 4
+
+    # After the close settles, each ticker is fetched once more for today.
+    world["clock"]["now"] = AFTER_CLOSE
+    asyncio.run(panel.sync(conn.universe, FakePool(conn)))
+    assert len(ohlc.calls) == 8
+    assert max(panel._bars["AAPL"]) == TODAY
+
+
+def test_quota_blocked_ticker_is_retried(world):
+    panel, ohlc, conn = world["panel"], world["ohlc"], world["conn"]
+    ohlc.blocked = {"MSFT"}
+    assert asyncio.run(panel.sync(conn.universe))["quota_blocked"] == 1
+    ohlc.blocked = set()
+    asyncio.run(panel.sync(conn.universe))
+    assert ohlc.calls.count("MSFT") == 2 and ohlc.calls.count("AAPL") == 1
+
+
+def test_failed_or_empty_fetch_is_retried(world):
+    panel, ohlc, conn = world["panel"], world["ohlc"], world["conn"]
+    real = ohlc.series.pop("XOM")
+
+    async def _flaky(ticker, *args, **kwargs):
+        if ticker == "MSFT":
+            ohlc.calls.append(ticker)
+            raise RuntimeError("UW timeout")
+        return await FakeOHLC.__call__(ohlc, ticker, *args, **kwargs)
+
+    world["monkeypatch"].setattr(uw, "get_ohlc", _flaky)
+    status = asyncio.run(panel.sync(conn.universe))
+    assert status["failures"] == 1 and status["succeeded"] == 2
+    assert panel.stale(conn.universe, panel.last_completed_session()) == ["MSFT", "XOM"]
+
+    ohlc.series["XOM"] = real
+    world["monkeypatch"].setattr(uw, "get_ohlc", ohlc)
+    assert asyncio.run(panel.sync(conn.universe))["succeeded"] == 2
+    assert ohlc.calls.count("MSFT") == 2 and ohlc.calls.count("XOM") == 2
+    assert ohlc.calls.count("AAPL") == 1
+
+
+def test_persisted_panel_skips_uw(world):
+    panel, ohlc, conn = world["panel"], world["ohlc"], world["conn"]
+    sessions = get_calendar().trading_days(date(2025, 7, 1), date(2025, 12, 1))
+    conn.stored = [(t, d, 100.0 + i) for t in conn.universe for i, d in enumerate(sessions)]
+    asyncio.run(panel.sync(conn.universe, FakePool(conn)))
+    assert ohlc.calls == []
+
+
+def test_refresh_fast_writes_every_field_from_live_prices(world):
+    series = world["series"]
+    live = {t: s[-1] for t, s in series.items() if t != "XOM"}     # XOM: no live price
+    _live(world, live)
+
+    result = asyncio.run(scr.refresh_fast())
+    (source, values), = world["writes"]
+    assert source == "UW+YF"
+    assert set(values) == {"AAPL", "MSFT", "NEWCO"}
+    assert result["tickers"] == 4 and result["live_priced"] == 3 and result["written"] == 3
+
+    # Same numbers the per-ticker refresh derived from UW bars incl. today's.
+    closes = series["AAPL"]
+    assert values["AAPL"]["wk_change_pct"] == _legacy_pct(closes, 5)
+    assert values["AAPL"]["mo_change_pct"] == _legacy_pct(closes, 21)
+    assert values["AAPL"]["rsi_14"] == round(kernels.rsi(np.array(closes[-90:]), 14)[-1], 2)
+    assert values["NEWCO"] == {"wk_change_pct": _legacy_pct(series["NEWCO"], 5),
+                               "mo_change_pct": None, "rsi_14": None}
+
+    # Second tick: zero UW calls, one more write.
+    calls = len(world["ohlc"].calls)
+    assert asyncio.run(scr.refresh_fast())["attempted"] == 0
+    assert len(world["ohlc"].calls) == calls and len(world["writes"]) == 2
+
+
+def test_stale_live_price_is_not_written(world):
+    async def _yesterday(tickers):
+        return {t: (date(2025, 12, 1), 50.0) for t in tickers}
+    world["monkeypatch"].setattr(scr, "fetch_live_prices", _yesterday)
+    assert asyncio.run(scr.refresh_fast())["written"] == 0
+    assert world["writes"] == [("UW+YF", {})]
+
+
+def test_close_snapshot_uses_official_closes(world):
+    world["clock"]["now"] = AFTER_CLOSE
+    result = asyncio.run(scr.refresh_close_snapshot())
+    (source, values), = world["writes"]
+    assert source == "UW"
+    assert result["attempted"] == 4 and result["written"] == 4
+    assert values["XOM"]["wk_change_pct"] == _legacy_pct(world["series"]["XOM"], 5)
+    assert any("DELETE FROM sector_daily_bars" in sql for sql, _ in world["conn"].executes)
@@ -0,0 +1,76 @@
+"""Nightly Stable Engine bar refresh (stable_engine.bars_yf) and re-adjusted histories.
+
+A dividend or split makes yfinance rescale a ticker's whole auto-adjusted
+history, but the nightly refresh only rewrites its last REFRESH_DAYS. The
+refresh flags such tickers and the nightly job backfills and rebuilds them.
+yfinance and Postgres are faked.
+"""
+
+from datetime import date
+
+import pandas as pd
+
+from jobs import stable_jobs
+from stable_engine import bars_yf, metrics
+
+DAYS = [date(2026, 3, d) for d in (2, 3, 4, 5, 6)]
+
+
+def _frame(scale=1.0):
+    closes = [100.0, 101.0, 102.0, 103.0, 104.0]
+    return pd.DataFrame({"date": DAYS, "o": closes, "h": closes, "l": closes,
+                         "c": [c * scale for c in closes], "v": 1000})
+
+
+def _fake_db(monkeypatch, stored):
+    def read_df(sql, params=None):
+        assert "stable_daily_bars" in sql
+        return pd.DataFrame([{"ticker": t, "date": DAYS[0], "c": c} for t, c in stored.items()])
+
+    written = []
+    monkeypatch.setattr(bars_yf.db, "init_schema", lambda: None)
+    monkeypatch.setattr(bars_yf.db, "read_df", read_df)
+    monkeypatch.setattr(bars_yf.db, "upsert_bars", lambda rows: written.extend(rows) or len(rows))
+    return written
+
+
+def test_refresh_flags_tickers_whose_stored_close_moved(monkeypatch):
+    _fake_db(monkeypatch, {"AAA": 100.0, "BBB": 100.0})
+    monkeypatch.setattr(bars_yf, "fetch_batch",
+                        lambda tickers, start, end: {"AAA": _frame(), "BBB": _frame(0.98)})
+    summary = bars_yf.download_and_store(["AAA", "BBB", "NEW"], days=metrics.REFRESH_DAYS)
+    assert summary["readjusted_tickers"] == ["BBB"]
+    assert summary["missing_tickers"] == ["NEW"]
+
+
+def test_backfill_does_not_check_for_readjustment(monkeypatch):
+    _fake_db(monkeypatch, {"AAA": 50.0})
+    monkeypatch.setattr(bars_yf, "fetch_batch", lambda tickers, start, end: {"AAA": _frame()})
+    assert bars_yf.download_and_store(["AAA"], years=1)["readjusted_tickers"] == []
+
+
+def test_nightly_backfills_and_rebuilds_readjusted_tickers(monkeypatch):
+    calls = []
+
+    def download(tickers, years=None, days=None, **kw):
+        calls.append(("download", list(tickers), days))
+        return {"coverage_pct": 100.0, "degraded": False, "readjusted_tickers": ["BBB"] if days else []}
+
+    def compute(tickers=None, incremental=False):
+        calls.append(("metrics", tickers, incremental))
+        return {"rows_written": 1}
+
+    monkeypatch.setattr(stable_jobs, "_all_tickers", lambda: ["AAA", "BBB"])
+    monkeypatch.setattr(bars_yf, "download_and_store", download)
+    monkeypatch.setattr(metrics, "compute_metrics", compute)
+    from stable_engine import scoring
+    monkeypatch.setattr(scoring, "compute_theme_scores", lambda: [])
+    monkeypatch.setattr(scoring, "store_theme_scores", lambda *a, **k: 0)
+
+    stable_jobs._nightly_work()
+    assert calls == [
+        ("download", ["AAA", "BBB"], metrics.REFRESH_DAYS),
+        ("download", ["BBB"], None),
+        ("metrics", ["BBB"], False),
+        ("metrics", None, True),
+    ]
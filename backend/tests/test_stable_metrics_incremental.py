@@ -0,0 +1,171 @@
+"""Incremental Stable Engine metrics (stable_engine.metrics).
+
+An in-memory store stands in for Postgres: read_df answers the two bar
+queries and execute_values lands rows in a dict keyed (ticker, date), so a
+full run and an incremental run can be compared row for row.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stable_engine import metrics
+
+
+def _bars(ticker, days, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=days).date
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, days)))
+    return pd.DataFrame({
+        "ticker": ticker, "date": dates,
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": rng.integers(1_000_000, 5_000_000, days),
+    })
+
+
+class Store:
+    def __init__(self, bars):
+        self.bars = bars
+        self.metrics = {}
+        self.deletes = 0
+        self.reads = []
+
+    def read_df(self, sql, params=None):
+        self.reads.append(sql)
+        bars = self.bars
+        if "WITH last" in sql:
+            window, tickers = params[0], params[1:]
+            last = {}
+            for (t, d) in self.metrics:
+                last[t] = max(last.get(t, d), d)
+            bars = bars.assign(last_date=bars["ticker"].map(last))
+            if tickers:
+                bars = bars[bars["ticker"].isin(tickers)]
+            cutoff = bars["last_date"].map(lambda d: d - pd.Timedelta(days=window) if isinstance(d, date) else None)
+            keep = bars["last_date"].isna() | (bars["date"] > cutoff)
+            return bars[keep].reset_index(drop=True)
+        if params:
+            return bars[bars["ticker"].isin(params)].reset_index(drop=True)
+        return bars
+
+    def execute_values(self, cur, sql, rows, page_size=None):
+        for row in rows:
+            self.metrics[(row[0], row[1])] = row
+
+    class _Cur:
+        def __init__(self, store):
+            self.store = store
+
+        def execute(self, sql, params=None):
+            assert sql.startswith("DELETE FROM stable_metrics")
+            self.store.deletes += 1
+            self.store.metrics = {k: v for k, v in self.store.metrics.items() if k[0] not in params}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+    def connect(self):
+        store = self
+
+        class _Conn:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *a):
+                return False
+
+            def cursor(self):
+                return Store._Cur(store)
+
+        return _Conn()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    frames = [_bars(t, 600, i) for i, t in enumerate(["AAA", "BBB", "CCC", "QQQ", "RSP"])]
+    s = Store(pd.concat(frames, ignore_index=True))
+    monkeypatch.setattr(metrics.db, "read_df", s.read_df)
+    monkeypatch.setattr(metrics.db, "connect", s.connect)
+    monkeypatch.setattr(metrics.db, "init_schema", lambda: None)
+    monkeypatch.setattr(metrics, "execute_values", s.execute_values)
+    monkeypatch.setattr(metrics.settings_mod, "load",
+                        lambda: {"metrics": {"ma_periods": [20, 50, 200]}})
+    return s
+
+
+def _as_frame(rows):
+    return pd.DataFrame(sorted(rows.values(), key=lambda r: (r[0], r[1])), columns=metrics._OUT_COLS)
+
+
+def test_incremental_matches_full_and_writes_only_new_rows(store):
+    full_bars = store.bars
+    expected = metrics.compute_metrics()
+    reference = _as_frame(store.metrics)
+    assert expected["rows_written"] == 5 * 600
+
+    # Rewind: metrics stored through 10 sessions ago, bars have arrived since.
+    cutoff = sorted(full_bars["date"].unique())[-11]
+    store.metrics = {k: v for k, v in store.metrics.items() if k[1] <= cutoff}
+    store.deletes = 0
+
+    result = metrics.compute_metrics(incremental=True)
+    refresh_from = cutoff - pd.Timedelta(days=metrics.REFRESH_DAYS)
+    assert result["rows_written"] == 5 * int((reference["date"].unique() > refresh_from).sum())
+    assert result["incremental"] is True
+    assert store.deletes == 0
+
+    got = _as_frame(store.metrics)
+    pd.testing.assert_frame_equal(
+        got.drop(columns=["ticker", "date"]).astype(float),
+        reference.drop(columns=["ticker", "date"]).astype(float),
+        rtol=1e-9, atol=1e-12,
+    )
+
+
+def test_incremental_refreshes_current_tickers_and_fills_new_ones(store):
+    dates = sorted(store.bars["date"].unique())
+    window = sum(d > dates[-1] - pd.Timedelta(days=metrics.REFRESH_DAYS) for d in dates)
+
+    metrics.compute_metrics(tickers=["AAA", "QQQ", "RSP"])
+    result = metrics.compute_metrics(incremental=True)
+    assert result["tickers_current"] == 3
+    # New tickers in full; current ones only over the nightly refresh window.
+    assert result["rows_written"] == 2 * 600 + 3 * window
+
+    again = metrics.compute_metrics(incremental=True)
+    assert again["tickers_current"] == 5
+    assert again["rows_written"] == 5 * window
+
+
+def test_incremental_recomputes_bars_revised_by_the_refresh(store):
+    metrics.compute_metrics()
+    before = dict(store.metrics)
+
+    # The nightly refresh rewrote a bar a week back (a corrected print).
+    dates = sorted(store.bars["date"].unique())
+    revised = dates[-5]
+    hit = (store.bars["ticker"] == "AAA") & (store.bars["date"] == revised)
+    store.bars.loc[hit, ["close", "high"]] *= 1.05
+    metrics.compute_metrics(incremental=True)
+
+    after, ref = _as_frame(store.metrics), _as_frame(before)
+    changed = ~np.isclose(after.iloc[:, 2:].astype(float), ref.iloc[:, 2:].astype(float),
+                          rtol=1e-9, atol=1e-12, equal_nan=True).all(axis=1)
+    assert set(after.loc[changed, "ticker"]) == {"AAA"}
+    assert set(after.loc[changed, "date"]) == set(dates[-5:])
+
+
+def test_incremental_reads_only_a_warmup_window(store):
+    metrics.compute_metrics()
+    store.reads.clear()
+    metrics.compute_metrics(incremental=True)
+    assert any("WITH last" in sql for sql in store.reads)
+    window = store.read_df(store.reads[0], [metrics.REFRESH_DAYS + metrics.WARMUP_DAYS])
+    per_ticker = window.groupby("ticker").size()
+    assert (per_ticker >= metrics.WARMUP_BARS).all()
+    assert (per_ticker < 600).all()
@@ -0,0 +1,116 @@
+"""
+Unit tests for utils/trading_calendar.py (shared NYSE session index).
+
+Session counts are NYSE's published ones (2022: 251, 2023: 250, 2024: 252,
+2025: 250 incl. the 2025-01-09 Carter closure). Each lookup is also checked
+against a plain day-by-day walk over the same holiday set, which is what
+the scheduler/scorer/resolver copies used to do.
+"""
+
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.trading_calendar import (
+    ET,
+    SPECIAL_CLOSURES,
+    TradingCalendar,
+    get_calendar,
+    nth_trading_day,
+    nyse_holidays,
+)
+
+
+def _walk_is_session(day):
+    return day.weekday() < 5 and day not in nyse_holidays(day.year) and day not in SPECIAL_CLOSURES
+
+
+def _walk_nth_after(anchor, n):
+    day, count = anchor, 0
+    while count < n:
+        day += timedelta(days=1)
+        if _walk_is_session(day):
+            count += 1
+    return day
+
+
+@pytest.mark.parametrize("year,sessions", [(2022, 251), (2023, 250), (2024, 252), (2025, 250)])
+def test_published_session_counts(year, sessions):
+    cal = get_calendar()
+    assert len(cal.trading_days(date(year, 1, 1), date(year, 12, 31))) == sessions
+
+
+def test_holiday_rules():
+    cal = get_calendar()
+    assert not cal.is_trading_day(date(2025, 4, 18))    # Good Friday
+    assert not cal.is_trading_day(date(2026, 7, 3))     # July 4 on Saturday -> Friday
+    assert not cal.is_trading_day(date(2023, 1, 2))     # New Year's on Sunday -> Monday
+    assert cal.is_trading_day(date(2021, 12, 31))       # New Year's on Saturday: not observed
+    assert cal.is_trading_day(date(2021, 6, 18))        # Juneteenth only from 2022
+    assert not cal.is_trading_day(date(2022, 6, 20))
+    assert not cal.is_trading_day(date(2025, 1, 9))     # special closure
+
+
+def test_early_closes_and_session_open():
+    cal = get_calendar()
+    _, close = cal.session_bounds(date(2025, 11, 28))
+    assert (close.hour, close.minute) == (13, 0)
+    assert cal.session_bounds(date(2025, 12, 25)) is None
+    assert cal.session_bounds(date(2025, 12, 26))[1].hour == 16
+
+    assert cal.is_session_open(datetime(2025, 11, 28, 12, 59, tzinfo=ET))
+    assert not cal.is_session_open(datetime(2025, 11, 28, 13, 30, tzinfo=ET))
+    assert cal.is_session_open(datetime(2025, 3, 10, 16, 0, tzinfo=ET))     # close inclusive
+    assert not cal.is_session_open(datetime(2025, 3, 10, 9, 29, tzinfo=ET))
+    assert not cal.is_session_open(datetime(2025, 1, 20, 11, 0, tzinfo=ET))  # MLK Day
+    # Aware UTC timestamps convert (first Monday after the US DST switch).
+    assert cal.is_session_open(datetime(2025, 3, 10, 13, 30, tzinfo=timezone.utc))
+    assert not cal.is_session_open(datetime(2025, 3, 10, 13, 29, tzinfo=timezone.utc))
+
+
+def test_session_arithmetic_matches_day_walk():
+    cal = get_calendar()
+    day = date(2023, 12, 1)
+    while day < date(2026, 2, 1):
+        assert cal.is_trading_day(day) == _walk_is_session(day)
+        for n in (1, 5, 20):
+            assert cal.next_trading_day(day, n) == _walk_nth_after(day, n)
+        prev = cal.previous_trading_day(day)
+        assert prev < day and _walk_is_session(prev)
+        assert cal.next_trading_day(prev) == (day if _walk_is_session(day) else cal.next_trading_day(day))
+        day += timedelta(days=3)
+
+
+def test_sessions_between_and_alignment():
+    cal = get_calendar()
+    # Thanksgiving week 2025: Wed -> Mon spans Fri (early close) and Mon.
+    assert cal.sessions_between(date(2025, 11, 26), date(2025, 12, 1)) == 2
+    assert cal.sessions_between(date(2025, 12, 1), date(2025, 11, 26)) == 0
+    bars = [date(2025, 11, 25), date(2025, 11, 26), date(2025, 11, 27), date(2025, 11, 28), date(2025, 12, 1)]
+    pos = cal.align(bars)
+    assert pos[2] == -1
+    assert pos[1] + 1 == pos[3] and pos[3] + 1 == pos[4]
+    assert cal.align([date(1990, 1, 2)]) == [-1]
+
+
+def test_module_helper_and_range():
+    # Fri before the Memorial Day weekend: T+1 skips Mon 2025-05-26.
+    assert nth_trading_day(date(2025, 5, 23), 1) == date(2025, 5, 27)
+    small = TradingCalendar(2024, 2024)
+    with pytest.raises(ValueError):
+        small.is_trading_day(date(2025, 1, 2))
+    with pytest.raises(ValueError):
+        small.next_trading_day(date(2024, 12, 30), 5)
+
+
+def test_resolvers_use_the_calendar():
+    from jobs.a3_fwd_return_resolver import _nth_trading_day
+    from jobs.triton_shadow_common import nth_trading_day as triton_nth
+
+    # Good Friday 2025 is skipped (Mon–Fri stepping used to land on it).
+    assert _nth_trading_day(date(2025, 4, 17), 1) == date(2025, 4, 21)
+    assert triton_nth(date(2025, 4, 17), 1) == date(2025, 4, 21)
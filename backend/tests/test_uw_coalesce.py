@@ -0,0 +1,136 @@
+"""
+Singleflight coalescing of identical UW requests.
+
+Concurrent _uw_request calls for the same (path, params) must share one
+upstream fetch; different params must not. No network or Redis.
+"""
+
+import asyncio
+
+import integrations.uw_api as uw
+import integrations.uw_api_cache as uw_cache
+
+
+def _patch(monkeypatch, calls, delay=0.05, payload=None):
+    async def fake_fetch(path, params, caller, request=None):
+        calls.append((path, dict(params or {})))
+        await asyncio.sleep(delay)
+        return payload if payload is not None else {"data": [{"path": path}]}
+
+    async def _precheck(*a, **k):
+        return None
+
+    monkeypatch.setattr(uw, "UW_API_KEY", "test-key")
+    monkeypatch.setattr(uw, "_governor_precheck", _precheck)
+    monkeypatch.setattr(uw, "_uw_fetch", fake_fetch)
+    monkeypatch.setattr(uw_cache, "_stats", {"hits": 0, "misses": 0, "upstream": 0, "coalesced": 0})
+
+
+def test_concurrent_identical_requests_share_one_fetch(monkeypatch):
+    calls = []
+    _patch(monkeypatch, calls)
+
+    async def run():
+        return await asyncio.gather(*[
+            uw._uw_request("/api/stock/SPY/iv-rank", caller="iv_rank") for _ in range(5)
+        ])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == {"data": [{"path": "/api/stock/SPY/iv-rank"}]} for r in results)
+    # Shared results are independent copies.
+    assert len({id(r) for r in results}) == 5
+    stats = uw_cache.get_cache_stats()
+    assert stats["upstream"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["inflight"] == 0
+
+
+def test_params_are_part_of_the_key(monkeypatch):
+    calls = []
+    _patch(monkeypatch, calls)
+
+    async def run():
+        await asyncio.gather(
+            uw._uw_request("/api/news/headlines", params={"limit": 10, "ticker": "SPY"}),
+            uw._uw_request("/api/news/headlines", params={"ticker": "SPY", "limit": 10}),
+            uw._uw_request("/api/news/headlines", params={"limit": 20, "ticker": "SPY"}),
+        )
+
+    asyncio.run(run())
+    assert sorted(c[1]["limit"] for c in calls) == [10, 20]
+
+
+def test_sequential_requests_are_not_coalesced(monkeypatch):
+    calls = []
+    _patch(monkeypatch, calls, delay=0)
+
+    async def run():
+        await uw._uw_request("/api/market/market-tide")
+        await uw._uw_request("/api/market/market-tide")
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_cancelled_owner_does_not_cancel_waiters(monkeypatch):
+    calls = []
+    _patch(monkeypatch, calls, delay=0.1)
+
+    async def run():
+        owner = asyncio.ensure_future(uw._uw_request("/api/darkpool/recent"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(uw._uw_request("/api/darkpool/recent"))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await follower
+
+    result = asyncio.run(run())
+    assert result == {"data": [{"path": "/api/darkpool/recent"}]}
+    assert len(calls) == 1
+
+
+def test_exception_propagates_to_all_callers(monkeypatch):
+    async def boom(path, params, caller, request=None):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def _precheck(*a, **k):
+        return None
+
+    monkeypatch.setattr(uw, "UW_API_KEY", "test-key")
+    monkeypatch.setattr(uw, "_governor_precheck", _precheck)
+    monkeypatch.setattr(uw, "_uw_fetch", boom)
+
+    async def run():
+        return await asyncio.gather(
+            uw._uw_request("/api/stock/QQQ/max-pain"),
+            uw._uw_request("/api/stock/QQQ/max-pain"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert uw_cache._inflight == {}
+
+
+def test_foreground_joiner_raises_the_flight_token_tier(monkeypatch):
+    seen = []
+    _patch(monkeypatch, [], delay=0.05)
+
+    async def fake_fetch(path, params, caller, request=None):
+        await asyncio.sleep(0.01)
+        seen.append(request.tier)
+        return {"data": []}
+
+    monkeypatch.setattr(uw, "_uw_fetch", fake_fetch)
+
+    async def run():
+        bg = asyncio.ensure_future(uw._uw_request("/api/stock/XLK/ohlc/1d", caller="ohlc_sector"))
+        await asyncio.sleep(0)
+        await uw._uw_request("/api/stock/XLK/ohlc/1d", caller="snapshot")
+        await bg
+
+    asyncio.run(run())
+    assert seen == ["FOREGROUND"]
+    assert uw._flight_requests == {}
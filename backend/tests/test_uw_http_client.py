@@ -0,0 +1,76 @@
+"""
+Shared UW HTTP client — one pooled client per event loop, closed on shutdown.
+
+No network: _uw_request is driven against an httpx MockTransport.
+"""
+
+import asyncio
+
+import httpx
+
+import integrations.uw_api as uw
+
+
+def _reset():
+    uw._http_client = None
+    uw._http_client_loop = None
+
+
+def test_client_reused_within_loop_and_recreated_across_loops():
+    _reset()
+
+    async def grab_twice():
+        return uw._get_http_client(), uw._get_http_client()
+
+    a1, a2 = asyncio.run(grab_twice())
+    assert a1 is a2
+    b1, _ = asyncio.run(grab_twice())
+    assert b1 is not a1
+    asyncio.run(uw.close_http_client())
+    assert uw._http_client is None
+
+
+def test_close_then_get_builds_fresh_client():
+    _reset()
+
+    async def run():
+        first = uw._get_http_client()
+        await uw.close_http_client()
+        assert first.is_closed
+        second = uw._get_http_client()
+        await uw.close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second
+
+
+def test_uw_request_goes_through_shared_client(monkeypatch):
+    _reset()
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"data": [{"ok": 1}]})
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        uw._http_client = httpx.AsyncClient(base_url=uw.UW_BASE, transport=httpx.MockTransport(handler))
+        uw._http_client_loop = loop
+        client = uw._http_client
+        await uw._uw_request("/api/stock/SPY/quote")
+        await uw._uw_request("/api/stock/QQQ/quote")
+        assert uw._get_http_client() is client
+        await uw.close_http_client()
+
+    async def _noop(*a, **k):
+        return None
+
+    async def _precheck(*a, **k):
+        return None
+
+    monkeypatch.setattr(uw, "UW_API_KEY", "test-key")
+    monkeypatch.setattr(uw, "increment_daily_counter", _noop)
+    monkeypatch.setattr(uw, "_governor_precheck", _precheck)
+    asyncio.run(run())
+    assert seen == ["/api/stock/SPY/quote", "/api/stock/QQQ/quote"]
@@ -0,0 +1,164 @@
+"""
+UWRateScheduler — tier priority, non-serializing waits, round-robin fairness.
+
+Callers map to tiers through uw_governor.QUOTAS: "snapshot" is FOREGROUND,
+"ohlc_bars" STANDARD, "ohlc_sector"/"technical_indicator" BACKGROUND.
+"""
+
+import asyncio
+import time
+
+import integrations.uw_rate_scheduler as sched_mod
+from integrations.uw_governor import TIER_BACKGROUND, TIER_FOREGROUND
+from integrations.uw_rate_scheduler import UWRateScheduler
+
+
+def test_fast_path_grants_immediately_while_tokens_last():
+    s = UWRateScheduler(capacity=5, refill_rate=1)
+
+    async def run():
+        for _ in range(5):
+            await s.acquire("snapshot")
+
+    t0 = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - t0 < 0.05
+    st = s.stats()["tiers"][TIER_FOREGROUND]
+    assert st["granted"] == 5 and st["immediate"] == 5 and st["waited"] == 0
+
+
+def test_foreground_jumps_queued_background():
+    s = UWRateScheduler(capacity=1, refill_rate=50)
+    order = []
+
+    async def call(caller, tag):
+        await s.acquire(caller)
+        order.append(tag)
+
+    async def run():
+        await s.acquire("ohlc_sector")  # drain the bucket
+        bg = [asyncio.ensure_future(call("ohlc_sector", f"bg{i}")) for i in range(5)]
+        await asyncio.sleep(0)
+        fg = asyncio.ensure_future(call("snapshot", "fg"))
+        await asyncio.gather(fg, *bg)
+
+    asyncio.run(run())
+    # The foreground call arrived last but is served first.
+    assert order[0] == "fg"
+    st = s.stats()
+    assert st["tiers"][TIER_BACKGROUND]["waited"] == 5
+    assert st["queued"] == 0
+
+
+def test_waiters_do_not_serialize_behind_a_lock():
+    # 10 callers over a 50/s bucket of 1 should finish in ~0.2s, and the
+    # sleeping is done by one dispatcher rather than by each caller in turn.
+    s = UWRateScheduler(capacity=1, refill_rate=50)
+
+    async def run():
+        await asyncio.gather(*[s.acquire("ohlc_bars") for _ in range(11)])
+
+    t0 = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - t0 < 0.5
+
+
+def test_round_robin_between_callers_in_a_tier():
+    s = UWRateScheduler(capacity=1, refill_rate=100)
+    order = []
+
+    async def call(caller):
+        await s.acquire(caller)
+        order.append(caller)
+
+    async def run():
+        await s.acquire("ohlc_sector")
+        tasks = [asyncio.ensure_future(call("ohlc_sector")) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(call("technical_indicator")))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    # The single technical_indicator call is not parked behind all four
+    # ohlc_sector calls queued before it.
+    assert order.index("technical_indicator") <= 1
+
+
+def test_cancelled_waiter_is_dropped(monkeypatch):
+    s = UWRateScheduler(capacity=1, refill_rate=20)
+
+    async def run():
+        await s.acquire("snapshot")
+        doomed = asyncio.ensure_future(s.acquire("snapshot"))
+        kept = asyncio.ensure_future(s.acquire("snapshot"))
+        await asyncio.sleep(0)
+        doomed.cancel()
+        await kept
+        return doomed
+
+    doomed = asyncio.run(run())
+    assert doomed.cancelled()
+    st = s.stats()["tiers"][TIER_FOREGROUND]
+    assert st["cancelled"] == 1
+    assert st["queue_depth"] == 0
+
+
+def test_aged_background_waiter_is_not_starved(monkeypatch):
+    monkeypatch.setattr(sched_mod, "STARVATION_SECONDS", 0.0)
+    s = UWRateScheduler(capacity=1, refill_rate=100)
+    order = []
+
+    async def call(caller, tag):
+        await s.acquire(caller)
+        order.append(tag)
+
+    async def run():
+        await s.acquire("snapshot")
+        bg = asyncio.ensure_future(call("ohlc_sector", "bg"))
+        await asyncio.sleep(0)
+        fg = [asyncio.ensure_future(call("snapshot", f"fg{i}")) for i in range(3)]
+        await asyncio.gather(bg, *fg)
+
+    asyncio.run(run())
+    assert order[0] == "bg"
+
+
+def test_headroom_and_histogram_shape():
+    s = UWRateScheduler(capacity=4, refill_rate=1)
+
+    async def run():
+        await s.acquire("snapshot")
+        await s.acquire("snapshot")
+
+    asyncio.run(run())
+    assert 0.45 <= s.headroom() <= 0.6
+    hist = s.stats()["tiers"][TIER_FOREGROUND]["wait_histogram"]
+    assert hist["le_1ms"] == 2
+    assert sum(hist.values()) == 2
+
+
+def test_raised_request_moves_to_the_foreground_lane():
+    s = UWRateScheduler(capacity=1, refill_rate=50)
+    order = []
+
+    async def call(caller, tag, request=None):
+        await s.acquire(caller, request)
+        order.append(tag)
+
+    async def run():
+        await s.acquire("ohlc_sector")  # drain the bucket
+        bg = [asyncio.ensure_future(call("ohlc_sector", f"bg{i}")) for i in range(3)]
+        flight = sched_mod.TokenRequest("ohlc_sector")
+        shared = asyncio.ensure_future(call("ohlc_sector", "shared", flight))
+        await asyncio.sleep(0)
+        assert s.queue_depth(TIER_BACKGROUND) == 4
+        # A FOREGROUND caller joins the shared flight while its token is queued.
+        s.raise_tier(flight, "snapshot")
+        assert s.queue_depth(TIER_BACKGROUND) == 3 and s.queue_depth(TIER_FOREGROUND) == 1
+        s.raise_tier(flight, "ohlc_bars")          # never lowered
+        assert flight.tier == TIER_FOREGROUND
+        await asyncio.gather(shared, *bg)
+
+    asyncio.run(run())
+    assert order[0] == "shared"
+    assert s.stats()["tiers"][TIER_FOREGROUND]["granted"] == 1
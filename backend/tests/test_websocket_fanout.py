@@ -0,0 +1,205 @@
+"""WebSocket fan-out (websocket/broadcaster): per-client queues and topics.
+
+Sockets are fakes that record what they were sent; a "slow" one blocks in
+send_text until released, standing in for a phone on a bad network.
+"""
+
+import asyncio
+import json
+
+from websocket import broadcaster
+from websocket.broadcaster import ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, gate=None):
+        self.sent = []
+        self.gate = gate
+        self.fail = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(text)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_slow_client_does_not_stall_others():
+    async def _run():
+        manager = ConnectionManager()
+        gate = asyncio.Event()
+        slow, fast = FakeSocket(gate), FakeSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        await asyncio.wait_for(manager.broadcast_signal({"ticker": "SPY"}), timeout=0.5)
+        await manager.broadcast_signal({"ticker": "QQQ"})
+        await _settle()
+        assert [json.loads(m)["data"]["ticker"] for m in fast.sent] == ["SPY", "QQQ"]
+        assert slow.sent == []
+
+        gate.set()
+        await _settle()
+        assert len(slow.sent) == 2
+        # Serialized once: every client got the very same string object.
+        assert slow.sent[0] is fast.sent[0]
+
+    asyncio.run(_run())
+
+
+def test_topic_subscriptions_filter_messages():
+    async def _run():
+        manager = ConnectionManager()
+        everything, bias_only = FakeSocket(), FakeSocket()
+        await manager.connect(everything)
+        await manager.connect(bias_only, topics="bias")
+
+        await manager.broadcast_signal({"ticker": "SPY"})
+        await manager.broadcast_bias_update({"timeframe": "daily", "level": 1})
+        await manager.broadcast({"type": "circuit_breaker", "state": {}})
+        await _settle()
+        assert len(everything.sent) == 3
+        assert [json.loads(m)["type"] for m in bias_only.sent] == ["BIAS_UPDATE", "circuit_breaker"]
+
+        await manager.handle_client_message(bias_only, json.dumps({"action": "subscribe", "topics": ["signals"]}))
+        await manager.broadcast_signal({"ticker": "QQQ"})
+        await manager.broadcast_bias_update({"timeframe": "daily", "level": 2})
+        await _settle()
+        types = [json.loads(m)["type"] for m in bias_only.sent[2:]]
+        assert types == ["SUBSCRIBED", "NEW_SIGNAL"]
+
+        await manager.handle_client_message(bias_only, "ping")
+        await _settle()
+        assert bias_only.sent[-1] == "pong"
+
+    asyncio.run(_run())
+
+
+def test_backed_up_client_coalesces_snapshots_and_drops_oldest(monkeypatch):
+    monkeypatch.setattr(broadcaster, "QUEUE_MAX", 3)
+
+    async def _run():
+        manager = ConnectionManager()
+        gate = asyncio.Event()
+        sock = FakeSocket(gate)
+        client = await manager.connect(sock)
+        await _settle()
+
+        for level in range(5):
+            await manager.broadcast_bias_update({"timeframe": "daily", "level": level})
+        assert len(client.queue) == 1 and client.coalesced == 4
+
+        for n in range(4):
+            await manager.broadcast_signal({"ticker": f"T{n}"})
+        # Queue holds 3: the bias snapshot was dropped first, then the oldest signal.
+        assert client.dropped == 2
+        stats = manager.get_stats()["clients"][0]
+        assert stats["queue_depth"] == 3 and stats["max_queue_depth"] == 3
+
+        gate.set()
+        await _settle()
+        assert [json.loads(m)["data"]["ticker"] for m in sock.sent] == ["T1", "T2", "T3"]
+        assert manager.get_stats()["clients"][0]["send_ms_avg"] is not None
+
+    asyncio.run(_run())
+
+
+def test_position_events_are_never_coalesced():
+    async def _run():
+        manager = ConnectionManager()
+        gate = asyncio.Event()
+        sock = FakeSocket(gate)
+        client = await manager.connect(sock)
+        await manager.broadcast_position_update({"action": "POSITION_OPENED", "position": {"position_id": 1}})
+        await manager.broadcast_position_update({"action": "POSITION_CLOSED", "position": {"position_id": 1}})
+        await manager.broadcast_position_update({"action": "POSITION_UPDATED", "position": {"position_id": 1}})
+        await manager.broadcast_position_update({"action": "POSITION_UPDATED", "position": {"position_id": 1}})
+        await manager.broadcast_position_update({"action": "POSITION_UPDATED", "position": {"position_id": 2}})
+        assert len(client.queue) == 4 and client.coalesced == 1
+        gate.set()
+
+    asyncio.run(_run())
+
+
+def test_failed_send_disconnects_only_that_client():
+    async def _run():
+        manager = ConnectionManager()
+        bad, good = FakeSocket(), FakeSocket()
+        bad.fail = True
+        await manager.connect(bad)
+        await manager.connect(good)
+        await manager.broadcast_signal({"ticker": "SPY"})
+        await _settle()
+        assert manager.active_connections == [good]
+        assert len(good.sent) == 1
+
+    asyncio.run(_run())
+
+
+class FakeRelayRedis:
+    """PUBLISH / SUBSCRIBE over in-process queues, one per subscriber."""
+
+    def __init__(self):
+        self.subscribers = []
+
+    async def publish(self, channel, data):
+        for queue in self.subscribers:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(self.subscribers)
+
+    def pubsub(self):
+        redis = self
+
+        class _PubSub:
+            async def subscribe(self, channel):
+                self.queue = asyncio.Queue()
+                redis.subscribers.append(self.queue)
+
+            async def listen(self):
+                yield {"type": "subscribe", "data": 1}
+                while True:
+                    yield await self.queue.get()
+
+            async def aclose(self):
+                redis.subscribers.remove(self.queue)
+
+        return _PubSub()
+
+
+def test_relay_reaches_clients_of_other_processes_once():
+    async def _run():
+        redis = FakeRelayRedis()
+        api_a, api_b, worker = ConnectionManager(), ConnectionManager(), ConnectionManager()
+        api_a.start_relay(redis)
+        api_b.start_relay(redis)
+        worker.start_relay(redis, subscribe=False)
+        await _settle()
+        sock_a, sock_b = FakeSocket(), FakeSocket()
+        await api_a.connect(sock_a)
+        await api_b.connect(sock_b)
+
+        await worker.broadcast_bias_update({"timeframe": "daily", "level": "TORO_MINOR"})
+        await _settle()
+        await api_a.broadcast_signal({"ticker": "SPY"})
+        await _settle()
+        assert [json.loads(m)["type"] for m in sock_a.sent] == ["BIAS_UPDATE", "NEW_SIGNAL"]
+        assert [json.loads(m)["type"] for m in sock_b.sent] == ["BIAS_UPDATE", "NEW_SIGNAL"]
+        assert api_a.get_stats()["relay"]["received"] == 1
+        assert worker.get_stats()["relay"] == {
+            "enabled": True, "subscribed": False, "published": 1, "received": 0, "errors": 0,
+        }
+
+        await api_a.stop_relay()
+        await api_b.stop_relay()
+        assert redis.subscribers == []
+
+    asyncio.run(_run())
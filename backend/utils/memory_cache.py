@@ -0,0 +1,202 @@
+"""Bounded in-process TTL + LRU cache shared by module-level caches.
+
+Replaces the ad-hoc `{key: (timestamp, value)}` dicts that grew without
+bound and only expired an entry when the same key was read again.
+
+Each MemoryCache is a named namespace with:
+  - a default TTL (overridable per `set`), checked on every read;
+  - an entry budget and/or an approximate byte budget — when a write goes
+    over, expired entries are swept first, then the least recently used
+    ones are evicted;
+  - optional loader coalescing (`get_or_load`, or `load` to refresh a
+    fresh entry): concurrent misses for one key await a single load instead
+    of each calling the backend;
+  - hit / miss / expiry / eviction / load counters, reported for every
+    namespace by `cache_stats()` (surfaced on GET /health).
+
+Thread-safe: the sync methods take a lock, so caches used from worker
+threads (yfinance fallbacks) are safe. `get_or_load` / `load` are asyncio-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Returned by `get(key, MISSING)` when a cached None must be told apart from a miss.
+MISSING: Any = object()
+
+_registry: Dict[str, "MemoryCache"] = {}
+_registry_lock = threading.Lock()
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Rough deep size in bytes of JSON-like data (containers walked 4 levels deep)."""
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for v in value:
+            size += approx_size(v, _depth + 1)
+    return size
+
+
+class MemoryCache:
+    """One namespace: TTL per entry, LRU eviction under an entry/byte budget."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        max_entries: Optional[int] = 256,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = approx_size,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        # key -> (expires_at monotonic, size bytes, value); oldest use first
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0,
+                       "loads": 0, "load_errors": 0, "coalesced": 0}
+        with _registry_lock:
+            _registry[namespace] = self
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Fresh value for `key`, else `default`. A hit marks the entry recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            if time.monotonic() >= entry[0]:
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[2]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value` for `ttl` seconds (default: the namespace TTL), then enforce the budgets."""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            if self._over_budget():
+                self._sweep_expired()
+            while self._over_budget() and len(self._data) > 1:
+                self._drop(next(iter(self._data)))
+                self._stats["evicted"] += 1
+
+    def _over_budget(self) -> bool:
+        return ((self.max_entries is not None and len(self._data) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes))
+
+    def _sweep_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, entry in self._data.items() if now >= entry[0]]:
+            self._drop(key)
+            self._stats["expired"] += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        cache_none: bool = False,
+    ) -> Any:
+        """Cached value, or the result of one `loader()` shared by every concurrent
+        caller for `key`. A loader exception reaches all of them and is not cached;
+        a None result is only cached with `cache_none`."""
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        return await self.load(key, loader, ttl, cache_none)
+
+    async def load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        cache_none: bool = False,
+    ) -> Any:
+        """Run `loader()` and store its result even if a fresh entry exists
+        (background refresh); joins a load already in flight for `key`."""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._stats["loads"] += 1
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            self._stats["load_errors"] += 1
+            future.set_exception(exc)
+            future.exception()      # retrieved: no "never retrieved" warning when nobody waits
+            raise
+        else:
+            if value is not None or cache_none:
+                self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes if self.max_bytes is not None else None,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else None,
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every MemoryCache namespace created in this process."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.namespace: cache.stats() for cache in sorted(caches, key=lambda c: c.namespace)}
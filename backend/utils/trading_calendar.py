@@ -0,0 +1,263 @@
+"""NYSE trading calendar — one precomputed session index. Pure functions, no I/O.
+
+Replaces the holiday logic that was copy-pasted into the bias scheduler, the
+signal scorer and the Discord bot, and the Mon–Fri day-stepping in the
+forward-return resolvers (which ignored holidays).
+
+Built once per process over FIRST_YEAR..LAST_YEAR:
+  - `sessions`: sorted trading days; `opens` / `closes`: each session's
+    regular open and close as UTC epoch seconds (13:00 ET on early closes).
+  - Per calendar day: how many sessions fall on or before it, and whether
+    it is itself a session.
+
+So "is this a trading day", "is the market open now", "nth trading day
+after", and "sessions between" are array lookups (O(1)). Bar alignment
+maps each bar's date to its session position.
+
+Holiday rules are NYSE's current ones: New Year's Day (not observed on the
+Friday before when it falls on a Saturday), MLK Day, Presidents Day, Good
+Friday, Memorial Day, Juneteenth (from 2022), Independence Day, Labor Day,
+Thanksgiving, Christmas, plus the one-off closures in SPECIAL_CLOSURES.
+Early closes (13:00 ET): July 3 and Christmas Eve when they are sessions
+between Monday and Thursday, and the day after Thanksgiving.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo("America/New_York")
+
+FIRST_YEAR = 2000
+LAST_YEAR = 2045
+
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+SPECIAL_CLOSURES = frozenset({
+    date(2001, 9, 11), date(2001, 9, 12), date(2001, 9, 13), date(2001, 9, 14),  # 9/11
+    date(2004, 6, 11),    # President Reagan's funeral
+    date(2007, 1, 2),     # President Ford's funeral
+    date(2012, 10, 29), date(2012, 10, 30),  # Hurricane Sandy
+    date(2018, 12, 5),    # President G.H.W. Bush's funeral
+    date(2025, 1, 9),     # President Carter's funeral
+})
+
+
+# ── holiday rules ────────────────────────────────────────────────────────────
+
+def _observed_date(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    current = date(year, month, 1)
+    while current.weekday() != weekday:
+        current += timedelta(days=1)
+    return current + timedelta(weeks=n - 1)
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    if month == 12:
+        current = date(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        current = date(year, month + 1, 1) - timedelta(days=1)
+    while current.weekday() != weekday:
+        current -= timedelta(days=1)
+    return current
+
+
+def _easter_date(year: int) -> date:
+    a = year % 19
+    b = year // 100
+    c = year % 100
+    d = b // 4
+    e = b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i = c // 4
+    k = c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = ((h + l - 7 * m + 114) % 31) + 1
+    return date(year, month, day)
+
+
+def nyse_holidays(year: int) -> Set[date]:
+    """Full-day NYSE holidays observed in `year` (special closures not included)."""
+    holidays: Set[date] = set()
+
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:                          # Saturday: not observed
+        holidays.add(_observed_date(new_year))           # New Year's Day
+    holidays.add(_nth_weekday(year, 1, 0, 3))            # MLK Day (3rd Monday Jan)
+    holidays.add(_nth_weekday(year, 2, 0, 3))            # Presidents Day (3rd Monday Feb)
+    holidays.add(_easter_date(year) - timedelta(days=2)) # Good Friday
+    holidays.add(_last_weekday(year, 5, 0))              # Memorial Day (last Monday May)
+    if year >= 2022:
+        holidays.add(_observed_date(date(year, 6, 19)))  # Juneteenth
+    holidays.add(_observed_date(date(year, 7, 4)))       # Independence Day
+    holidays.add(_nth_weekday(year, 9, 0, 1))            # Labor Day (1st Monday Sep)
+    holidays.add(_nth_weekday(year, 11, 3, 4))           # Thanksgiving (4th Thursday Nov)
+    holidays.add(_observed_date(date(year, 12, 25)))     # Christmas
+
+    return holidays
+
+
+def _early_closes(year: int) -> Set[date]:
+    days = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}   # day after Thanksgiving
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() <= 3:
+            days.add(day)
+    return days
+
+
+# ── the index ────────────────────────────────────────────────────────────────
+
+def _epoch(day: date, at: time) -> int:
+    return int(datetime.combine(day, at, tzinfo=ET).timestamp())
+
+
+class TradingCalendar:
+    """Precomputed NYSE sessions between two years (inclusive)."""
+
+    def __init__(self, first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR):
+        self.first_day = date(first_year, 1, 1)
+        self.last_day = date(last_year, 12, 31)
+        self._base = self.first_day.toordinal()
+
+        closed: Set[date] = set(SPECIAL_CLOSURES)
+        early: Set[date] = set()
+        for year in range(first_year, last_year + 1):
+            closed |= nyse_holidays(year)
+            early |= _early_closes(year)
+
+        self.sessions: List[date] = []
+        self.opens = array("q")
+        self.closes = array("q")
+        # Per calendar day since first_day: sessions on or before it, and
+        # its own session position (-1 when the market is closed).
+        self._rank = array("l")
+        self._position = array("l")
+
+        day = self.first_day
+        while day <= self.last_day:
+            if day.weekday() < 5 and day not in closed:
+                self._position.append(len(self.sessions))
+                self.sessions.append(day)
+                self.opens.append(_epoch(day, REGULAR_OPEN))
+                self.closes.append(_epoch(day, EARLY_CLOSE if day in early else REGULAR_CLOSE))
+            else:
+                self._position.append(-1)
+            self._rank.append(len(self.sessions))
+            day += timedelta(days=1)
+
+    def _offset(self, day: date) -> int:
+        offset = day.toordinal() - self._base
+        if not 0 <= offset < len(self._rank):
+            raise ValueError(
+                f"{day} is outside the trading calendar ({self.first_day}..{self.last_day})"
+            )
+        return offset
+
+    def _session(self, position: int) -> date:
+        if not 0 <= position < len(self.sessions):
+            raise ValueError("session offset runs past the trading calendar")
+        return self.sessions[position]
+
+    def is_trading_day(self, day: date) -> bool:
+        return self._position[self._offset(day)] >= 0
+
+    def session_index(self, day: date) -> Optional[int]:
+        """Position of `day` in `sessions`, or None if the market is closed that day."""
+        position = self._position[self._offset(day)]
+        return position if position >= 0 else None
+
+    def next_trading_day(self, day: date, n: int = 1) -> date:
+        """The nth session strictly after `day` (n >= 1)."""
+        return self._session(self._rank[self._offset(day)] + n - 1)
+
+    def previous_trading_day(self, day: date, n: int = 1) -> date:
+        """The nth session strictly before `day` (n >= 1)."""
+        offset = self._offset(day)
+        before = self._rank[offset] - (1 if self._position[offset] >= 0 else 0)
+        return self._session(before - n)
+
+    def sessions_between(self, start: date, end: date) -> int:
+        """Sessions in (start, end] — 0 when end <= start."""
+        return max(0, self._rank[self._offset(end)] - self._rank[self._offset(start)])
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        """Sessions in [start, end]."""
+        first = self._rank[self._offset(start)] - (1 if self.is_trading_day(start) else 0)
+        return self.sessions[first:self._rank[self._offset(end)]]
+
+    def session_bounds(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """(open, close) of the session on `day` in ET, or None if closed."""
+        position = self.session_index(day)
+        if position is None:
+            return None
+        return (
+            datetime.fromtimestamp(self.opens[position], ET),
+            datetime.fromtimestamp(self.closes[position], ET),
+        )
+
+    def is_session_open(self, ts: datetime) -> bool:
+        """True from the open through the close (inclusive) of a session.
+        Naive datetimes are taken as ET wall time."""
+        local = ts.replace(tzinfo=ET) if ts.tzinfo is None else ts.astimezone(ET)
+        position = self.session_index(local.date())
+        if position is None:
+            return False
+        epoch = local.timestamp()
+        return self.opens[position] <= epoch <= self.closes[position]
+
+    def align(self, days: Iterable[date]) -> List[int]:
+        """Session position of each bar date (-1 for a date that is not a session).
+
+        Two bars `k` sessions apart have positions `k` apart, so a T+n lookup
+        is `position(anchor) + n` regardless of holidays or missing bars.
+        """
+        positions = self._position
+        base = self._base
+        out = []
+        for day in days:
+            offset = day.toordinal() - base
+            out.append(positions[offset] if 0 <= offset < len(positions) else -1)
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_calendar() -> TradingCalendar:
+    """The process-wide calendar (built on first use, tens of ms)."""
+    return TradingCalendar()
+
+
+def today_et() -> date:
+    return datetime.now(ET).date()
+
+
+def is_trading_day(day: Optional[date] = None) -> bool:
+    """Whether `day` (default: today in ET) is an NYSE session."""
+    return get_calendar().is_trading_day(day or today_et())
+
+
+def is_session_open(ts: Optional[datetime] = None) -> bool:
+    """Whether the regular session is open at `ts` (default: now)."""
+    return get_calendar().is_session_open(ts or datetime.now(ET))
+
+
+def nth_trading_day(anchor: date, n: int) -> date:
+    """The nth session strictly after `anchor`."""
+    return get_calendar().next_trading_day(anchor, n)
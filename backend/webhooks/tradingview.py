@@ -26,6 +26,7 @@ from utils.webhook_auth import (
     enforce_payload_size_cap,
 )
 from utils.pivot_auth import require_api_key
+from utils.memory_cache import MISSING, MemoryCache
 from jobs.crypto_bars import normalize_crypto_ticker as _normalize_crypto_ticker
 
 logger = logging.getLogger(__name__)
@@ -709,8 +710,9 @@ async def process_phalanx_signal(alert: TradingViewAlert, start_time: datetime):
 
 
 # ── ADX helpers (ZEUS Phase 5) ────────────────────────────────────────────────
-_adx_cache: dict = {}           # (ticker, timeframe) → (epoch_ts, adx_float|None)
 _ADX_CACHE_TTL = 300            # seconds — avoids redundant fetches within same scan
+# (ticker, timeframe) → adx_float|None
+_adx_cache = MemoryCache("tradingview.adx", ttl=_ADX_CACHE_TTL, max_entries=512)
 
 
 def _compute_adx_yf(ticker: str, timeframe: str = "15m", period: int = 14) -> float | None:
@@ -718,12 +720,10 @@ def _compute_adx_yf(ticker: str, timeframe: str = "15m", period: int = 14) -> fl
     Compute ADX(14) via yfinance. Fallback when TradingView alert doesn't carry ADX.
     Cached per (ticker, timeframe) for 5 min. Returns None on failure (fail-open).
     """
-    import time as _time
     cache_key = (ticker, timeframe)
-    if cache_key in _adx_cache:
-        ts, val = _adx_cache[cache_key]
-        if _time.time() - ts < _ADX_CACHE_TTL:
-            return val
+    cached = _adx_cache.get(cache_key, MISSING)
+    if cached is not MISSING:
+        return cached
     tf_map = {
         "1D": ("1d", "3mo"), "D": ("1d", "3mo"), "1d": ("1d", "3mo"),
         "1H": ("1h", "60d"), "H": ("1h", "60d"), "60": ("1h", "60d"),
@@ -733,27 +733,27 @@ def _compute_adx_yf(ticker: str, timeframe: str = "15m", period: int = 14) -> fl
     interval, lookback = tf_map.get(str(timeframe), ("15m", "5d"))
     try:
         import yfinance as yf
-        import pandas as pd
-        df = yf.Ticker(ticker).history(period=lookback, interval=interval)
+        from indicators import kernels
+        from scanners import bar_loader
+        # A recent scanner prefetch may already hold these bars.
+        df = bar_loader.get_cached(ticker, period=lookback, interval=interval)
+        if df is None:
+            df = yf.Ticker(ticker).history(period=lookback, interval=interval)
         if df.empty or len(df) < period * 2:
-            _adx_cache[cache_key] = (_time.time(), None)
+            _adx_cache.set(cache_key, None)
             return None
-        high, low, close = df["High"], df["Low"], df["Close"]
-        alpha = 1 / period
-        plus_dm  = high.diff().where((high.diff() > low.diff().abs()) & (high.diff() > 0), 0.0)
-        minus_dm = low.diff().abs().where((low.diff().abs() > high.diff()) & (low.diff() < 0), 0.0)
-        tr  = pd.concat([(high - low), (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
-        atr = tr.ewm(alpha=alpha, adjust=False).mean()
-        plus_di  = 100 * plus_dm.ewm(alpha=alpha, adjust=False).mean() / atr
-        minus_di = 100 * minus_dm.ewm(alpha=alpha, adjust=False).mean() / atr
-        dx  = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
-        adx_series = dx.ewm(alpha=alpha, adjust=False).mean()
-        val = float(adx_series.iloc[-1])
-        _adx_cache[cache_key] = (_time.time(), val)
+        adx_series = kernels.adx(
+            df["High"].to_numpy(dtype=float),
+            df["Low"].to_numpy(dtype=float),
+            df["Close"].to_numpy(dtype=float),
+            period, seed="first", min_periods=1,
+        )["adx"]
+        val = float(adx_series[-1])
+        _adx_cache.set(cache_key, val)
         return val
     except Exception as exc:
         logger.warning("ADX yfinance fallback failed for %s: %s", ticker, exc)
-        _adx_cache[cache_key] = (_time.time(), None)
+        _adx_cache.set(cache_key, None)
         return None
 
 
@@ -1,58 +1,395 @@
 """
 WebSocket Connection Manager
 Handles simultaneous connections from computer, laptop, and phone
+
+broadcast() never awaits a socket. The message is serialized once and the same
+string is queued on every subscribed connection; a writer task per connection
+drains its own bounded queue. One slow phone on a bad network only backs up
+its own queue instead of stalling delivery to every other device.
+
+  - Topics: each message type maps to a topic (signals, bias, positions, flow,
+    alerts). A client receives every topic until it subscribes, either with
+    `/ws?topics=signals,bias` or by sending
+    {"action": "subscribe", "topics": [...]} over the socket.
+  - Coalescing: high-rate snapshot types (BIAS_UPDATE, FLOW_UPDATE,
+    POSITION_UPDATE) replace an undelivered message with the same key in
+    place, so a backed-up client gets the latest state, not a backlog.
+  - Overflow: a full queue drops its oldest message (coalescable snapshots
+    first). A send that exceeds SEND_TIMEOUT_SECONDS drops the connection.
+  - Metrics: get_stats() reports queue depth, drops and send latency per
+    connection.
+  - Relay: background jobs may run in another process (worker.py, or whichever
+    API replica holds the job lease), so once start_relay() is called every
+    broadcast is also published on the RELAY_CHANNEL Redis channel. Each API
+    process subscribes and delivers messages from other processes to its own
+    sockets; its own messages were already delivered locally and are skipped.
 """
 
 from fastapi import WebSocket
-from typing import List, Dict, Any
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+import asyncio
+import itertools
 import json
 import logging
+import time
+import uuid
 
 from utils.json_sanitize import sanitize_for_json
 
 logger = logging.getLogger(__name__)
 
+QUEUE_MAX = 256
+SEND_TIMEOUT_SECONDS = 10.0
+
+RELAY_CHANNEL = "ws:broadcast"
+RELAY_RETRY_SECONDS = 5.0
+
+TOPICS = ("signals", "bias", "positions", "flow", "alerts")
+
+TOPIC_BY_TYPE = {
+    "NEW_SIGNAL": "signals",
+    "SIGNAL_PRIORITY_UPDATE": "signals",
+    "SIGNAL_ACCEPTED": "signals",
+    "SIGNAL_DISMISSED": "signals",
+    "SCOUT_ALERT": "signals",
+    "lightning_confirmation": "signals",
+    "confluence_update": "signals",
+    "catalyst_event": "signals",
+    "BIAS_UPDATE": "bias",
+    "bias_alert": "bias",
+    "circuit_breaker": "bias",
+    "circuit_breaker_pending_reset": "bias",
+    "POSITION_UPDATE": "positions",
+    "options_position_opened": "positions",
+    "options_position_closed": "positions",
+    "FLOW_UPDATE": "flow",
+}
+DEFAULT_TOPIC = "alerts"
+
+# Snapshot types where only the newest undelivered message matters.
+COALESCE_TYPES = {"BIAS_UPDATE", "FLOW_UPDATE", "POSITION_UPDATE"}
+
+
+def topic_for(message: Dict[Any, Any]) -> str:
+    return TOPIC_BY_TYPE.get(message.get("type"), DEFAULT_TOPIC)
+
+
+def _coalesce_key(message: Dict[Any, Any]) -> Optional[str]:
+    """Key under which a newer message supersedes an undelivered older one."""
+    msg_type = message.get("type")
+    if msg_type not in COALESCE_TYPES:
+        return None
+    data = message.get("data")
+    if not isinstance(data, dict):
+        return msg_type
+    if msg_type == "BIAS_UPDATE":
+        return f"{msg_type}:{data.get('timeframe', '')}"
+    if msg_type == "POSITION_UPDATE":
+        # Opens/closes/deletes are events; only in-place updates are snapshots.
+        if data.get("action") not in (None, "POSITION_UPDATED"):
+            return None
+        position = data.get("position") if isinstance(data.get("position"), dict) else data
+        ident = position.get("position_id") or position.get("id")
+        return f"{msg_type}:{ident}" if ident is not None else None
+    return msg_type
+
+
+class _Outbound:
+    """One queued frame. `text` is shared across clients (serialized once)."""
+
+    __slots__ = ("text", "key", "queued_at")
+
+    def __init__(self, text: str, key: Optional[str]):
+        self.text = text
+        self.key = key
+        self.queued_at = time.monotonic()
+
+
+class ClientConnection:
+    """A connected device: its topic filter, outbound queue and send metrics."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None):
+        self.id = next(self._ids)
+        self.websocket = websocket
+        self.topics: Optional[Set[str]] = set(topics) if topics else None  # None = everything
+        self.queue: Deque[_Outbound] = deque()
+        self.pending: Dict[str, _Outbound] = {}
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.send_ms_total = 0.0
+        self.send_ms_max = 0.0
+        self.last_send_ms: Optional[float] = None
+        self.queue_wait_ms_max = 0.0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def enqueue(self, text: str, key: Optional[str] = None) -> None:
+        if key is not None and key in self.pending:
+            self.pending[key].text = text
+            self.coalesced += 1
+            return
+        if len(self.queue) >= QUEUE_MAX:
+            self._drop_one()
+        item = _Outbound(text, key)
+        self.queue.append(item)
+        if key is not None:
+            self.pending[key] = item
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self.wakeup.set()
+
+    def _drop_one(self) -> None:
+        victim = next((item for item in self.queue if item.key is not None), self.queue[0])
+        self.queue.remove(victim)
+        if victim.key is not None:
+            self.pending.pop(victim.key, None)
+        self.dropped += 1
+
+    async def run(self, on_failure) -> None:
+        """Writer loop: drain the queue one frame at a time."""
+        while True:
+            if not self.queue:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            item = self.queue.popleft()
+            if item.key is not None:
+                self.pending.pop(item.key, None)
+            started = time.monotonic()
+            self.queue_wait_ms_max = max(self.queue_wait_ms_max, (started - item.queued_at) * 1000)
+            try:
+                async with asyncio.timeout(SEND_TIMEOUT_SECONDS):
+                    await self.websocket.send_text(item.text)
+            except Exception as e:
+                logger.error(f"Error sending to connection {self.id}: {e!r}")
+                on_failure(self)
+                return
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self.sent += 1
+            self.send_ms_total += elapsed_ms
+            self.send_ms_max = max(self.send_ms_max, elapsed_ms)
+            self.last_send_ms = elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "topics": sorted(self.topics) if self.topics is not None else "all",
+            "queue_depth": len(self.queue),
+            "max_queue_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "send_ms_avg": round(self.send_ms_total / self.sent, 2) if self.sent else None,
+            "send_ms_max": round(self.send_ms_max, 2),
+            "last_send_ms": round(self.last_send_ms, 2) if self.last_send_ms is not None else None,
+            "queue_wait_ms_max": round(self.queue_wait_ms_max, 2),
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+        }
+
+
+def _parse_topics(topics: Optional[Iterable[str]]) -> Optional[Set[str]]:
+    if topics is None:
+        return None
+    if isinstance(topics, str):
+        topics = topics.split(",")
+    wanted = {t.strip() for t in topics if t and t.strip()}
+    if not wanted or "all" in wanted or "*" in wanted:
+        return None
+    unknown = wanted - set(TOPICS)
+    if unknown:
+        logger.debug("Ignoring unknown WebSocket topics: %s", sorted(unknown))
+    return wanted & set(TOPICS)
+
+
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts signals to all devices"""
-    
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-    
-    async def connect(self, websocket: WebSocket):
-        """Accept a new WebSocket connection"""
+        self.clients: Dict[int, ClientConnection] = {}
+        self._by_socket: Dict[int, ClientConnection] = {}
+        self.messages_broadcast = 0
+        self.origin = uuid.uuid4().hex
+        self._relay_redis = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self.relay_published = 0
+        self.relay_received = 0
+        self.relay_errors = 0
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return [c.websocket for c in self.clients.values()]
+
+    async def connect(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None):
+        """Accept a new WebSocket connection and start its writer task"""
         await websocket.accept()
-        self.active_connections.append(websocket)
-    
+        client = ClientConnection(websocket, _parse_topics(topics))
+        self.clients[client.id] = client
+        self._by_socket[id(websocket)] = client
+        client.task = asyncio.create_task(client.run(self._on_send_failure))
+        return client
+
     def disconnect(self, websocket: WebSocket):
         """Remove a disconnected WebSocket"""
-        self.active_connections.remove(websocket)
-    
+        client = self._by_socket.pop(id(websocket), None)
+        if client is None:
+            return
+        self.clients.pop(client.id, None)
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+    def _on_send_failure(self, client: ClientConnection) -> None:
+        self.disconnect(client.websocket)
+
+    def subscribe(self, websocket: WebSocket, topics: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """Replace a connection's topic filter. Returns the active topics (None = all)."""
+        client = self._by_socket.get(id(websocket))
+        if client is None:
+            return None
+        client.topics = _parse_topics(topics)
+        return sorted(client.topics) if client.topics is not None else None
+
+    async def handle_client_message(self, websocket: WebSocket, data: str) -> None:
+        """Heartbeat and subscription control frames sent by the frontend."""
+        if data == "ping":
+            await self.send_personal_message("pong", websocket)
+            return
+        try:
+            msg = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(msg, dict) or msg.get("action") not in ("subscribe", "unsubscribe"):
+            return
+        client = self._by_socket.get(id(websocket))
+        if client is None:
+            return
+        requested = _parse_topics(msg.get("topics")) or set(TOPICS)
+        if msg["action"] == "subscribe":
+            current = requested
+        else:
+            current = (client.topics if client.topics is not None else set(TOPICS)) - requested
+        client.topics = current if current != set(TOPICS) else None
+        await self.send_personal_message(
+            json.dumps({"type": "SUBSCRIBED", "topics": sorted(current)}), websocket
+        )
+
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        """Send message to a specific connection"""
-        await websocket.send_text(message)
-    
+        """Send message to a specific connection (queued behind its broadcasts)"""
+        client = self._by_socket.get(id(websocket))
+        if client is None:
+            await websocket.send_text(message)
+            return
+        client.enqueue(message)
+
     async def broadcast(self, message: Dict[Any, Any]):
         """
-        Broadcast message to all connected devices
+        Broadcast message to all connected devices subscribed to its topic
         Critical for multi-device sync (computer + laptop + phone)
         """
         # Sanitize message to ensure all numpy types are converted
         sanitized_message = sanitize_for_json(message)
-        message_str = json.dumps(sanitized_message)
-        
-        # Send to all connections simultaneously
-        disconnected = []
-        for connection in self.active_connections:
+        message_str = self._deliver(sanitized_message)
+        if self._relay_redis is not None:
+            await self._publish(message_str)
+
+    def _deliver(self, message: Dict[Any, Any]) -> str:
+        """Queue an already-sanitized message on this process's connections."""
+        message_str = json.dumps(message)
+        topic = topic_for(message)
+        key = _coalesce_key(message)
+        self.messages_broadcast += 1
+        for client in list(self.clients.values()):
+            if client.wants(topic):
+                client.enqueue(message_str, key)
+        return message_str
+
+    # ── cross-process relay ──────────────────────────────────────────
+
+    def start_relay(self, redis, subscribe: bool = True) -> None:
+        """Publish broadcasts to Redis; with subscribe, deliver other processes' too.
+
+        The worker publishes only (it holds no sockets); API processes do both.
+        """
+        self._relay_redis = redis
+        if subscribe and (self._relay_task is None or self._relay_task.done()):
+            self._relay_task = asyncio.create_task(self._relay_loop(), name="ws-relay")
+
+    async def stop_relay(self) -> None:
+        task, self._relay_task = self._relay_task, None
+        self._relay_redis = None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _publish(self, message_str: str) -> None:
+        envelope = f'{{"origin": "{self.origin}", "message": {message_str}}}'
+        try:
+            await self._relay_redis.publish(RELAY_CHANNEL, envelope)
+            self.relay_published += 1
+        except Exception as e:
+            # Local sockets already have it; only other processes miss out.
+            self.relay_errors += 1
+            logger.warning(f"WebSocket relay publish failed: {e}")
+
+    def _on_relayed(self, raw: str) -> None:
+        try:
+            envelope = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(envelope, dict) or envelope.get("origin") == self.origin:
+            return
+        message = envelope.get("message")
+        if isinstance(message, dict):
+            self.relay_received += 1
+            self._deliver(message)
+
+    async def _relay_loop(self) -> None:
+        while True:
+            redis = self._relay_redis
+            if redis is None:
+                return
+            pubsub = redis.pubsub()
             try:
-                await connection.send_text(message_str)
+                await pubsub.subscribe(RELAY_CHANNEL)
+                async for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        self._on_relayed(item["data"])
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Error sending to connection: {e}")
-                disconnected.append(connection)
-        
-        # Clean up any failed connections
-        for connection in disconnected:
-            self.disconnect(connection)
-    
+                self.relay_errors += 1
+                logger.warning(f"WebSocket relay subscription dropped ({e}); retrying in {RELAY_RETRY_SECONDS}s")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(RELAY_RETRY_SECONDS)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-connection queue depth, drops and send latency"""
+        clients = [c.stats() for c in self.clients.values()]
+        return {
+            "connections": len(clients),
+            "messages_broadcast": self.messages_broadcast,
+            "total_queue_depth": sum(c["queue_depth"] for c in clients),
+            "relay": {
+                "enabled": self._relay_redis is not None,
+                "subscribed": self._relay_task is not None and not self._relay_task.done(),
+                "published": self.relay_published,
+                "received": self.relay_received,
+                "errors": self.relay_errors,
+            },
+            "clients": clients,
+        }
+
     async def broadcast_signal(self, signal_data: Dict[Any, Any]):
         """
         Broadcast a new trading signal to all devices
@@ -63,8 +400,8 @@ class ConnectionManager:
             "data": signal_data
         }
         await self.broadcast(message)
-        logger.info(f"Signal broadcast to {len(self.active_connections)} devices")
-    
+        logger.info(f"Signal broadcast to {len(self.clients)} devices")
+
     async def broadcast_bias_update(self, bias_data: Dict[Any, Any]):
         """Broadcast bias indicator changes"""
         message = {
@@ -72,7 +409,7 @@ class ConnectionManager:
             "data": bias_data
         }
         await self.broadcast(message)
-    
+
     async def broadcast_position_update(self, position_data: Dict[Any, Any]):
         """Broadcast open position updates"""
         message = {
@@ -80,7 +417,7 @@ class ConnectionManager:
             "data": position_data
         }
         await self.broadcast(message)
-    
+
     async def broadcast_priority_signal(self, signal_data: Dict[Any, Any]):
         """
         Broadcast a high-priority signal that should jump to the top.
@@ -92,14 +429,14 @@ class ConnectionManager:
         }
         await self.broadcast(message)
         logger.info(f"🔥 Priority signal broadcast: {signal_data.get('ticker', 'UNKNOWN')} (score: {signal_data.get('score', 0)})")
-    
+
     async def broadcast_signal_smart(self, signal_data: Dict[Any, Any], priority_threshold: float = 75.0):
         """
         Smart broadcast - sends priority update if signal scores above threshold.
         Otherwise sends as regular signal.
         """
         score = signal_data.get('score', 0)
-        
+
         if score >= priority_threshold:
             await self.broadcast_priority_signal(signal_data)
         else:
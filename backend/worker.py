@@ -0,0 +1,77 @@
+"""
+Pandora's Box - background job worker
+
+Hosts the scheduler and long-lived loops (jobs/loops.py) outside the web
+process. Run one or more of these next to an API started with
+RUN_BACKGROUND_JOBS=false; the Redis lease in jobs/runner.py makes exactly one
+instance the leader and keeps the rest on standby.
+
+    cd backend && python worker.py
+"""
+
+import asyncio
+import logging
+import signal
+import sys
+
+from database.postgres_client import get_postgres_client
+from database.redis_client import get_redis_client
+
+logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+logger = logging.getLogger("worker")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+async def main() -> None:
+    logger.info("🚀 Pandora's Box job worker starting...")
+    redis_client = await get_redis_client()
+    postgres_client = await get_postgres_client()
+
+    try:
+        from database.postgres_client import init_database
+        await init_database()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not initialize database schema: {e}")
+
+    try:
+        from webhooks.circuit_breaker import restore_circuit_breaker_state
+        await restore_circuit_breaker_state()
+    except Exception as e:
+        logger.warning(f"Could not restore circuit breaker state: {e}")
+
+    # Job broadcasts reach the API processes' WebSocket clients over Redis.
+    from websocket.broadcaster import manager
+    manager.start_relay(redis_client, subscribe=False)
+
+    from jobs.runner import start_job_runner
+    runner_task = await start_job_runner()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    await asyncio.wait(
+        [runner_task, asyncio.create_task(stop.wait())], return_when=asyncio.FIRST_COMPLETED
+    )
+    logger.info("🛑 Job worker shutting down...")
+    runner_task.cancel()
+    try:
+        await runner_task
+    except asyncio.CancelledError:
+        pass
+    try:
+        from integrations.uw_api import close_http_client as close_uw_http_client
+        await close_uw_http_client()
+    except Exception as e:
+        logger.warning(f"UW HTTP client close failed: {e}")
+    await redis_client.close()
+    await postgres_client.close()
+    logger.info("👋 Job worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
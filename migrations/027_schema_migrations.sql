@@ -0,0 +1,19 @@
+-- 027_schema_migrations.sql
+-- Versioned migration ledger (backend/database/migrations.py).
+--
+-- init_database() used to re-run every CREATE/ALTER/backfill on each boot. It
+-- now checks MAX(version) here and applies only the migrations that are missing:
+--   1  baseline_schema      — everything init_database ran up to and including 026
+--   2  startup_side_tables  — trade_watchlist, earnings_calendar, attribution and
+--                             confluence columns, stable_job_status,
+--                             v2_dashboard_layout, lightning_cards.confirmations
+--
+-- APPLICATION: created by the migration runner itself; new schema goes in a new
+-- NNN_*.sql file here plus the next Migration entry in database/migrations.py.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version     INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    applied_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    duration_ms INTEGER
+);
@@ -0,0 +1,19 @@
+-- 028_sector_daily_bars.sql
+-- Local daily-bar panel for the sector constituent refresh (jobs/sector_bar_panel).
+--
+-- One regular-session close per constituent per session, fetched from UW
+-- /ohlc/1d at most once per ticker per completed session. WK%, MO% and RSI(14)
+-- for the whole ~220-name universe are computed from these rows plus a batched
+-- live price, instead of two UW calls per ticker per tick. Rows older than the
+-- 150-day fetch window are pruned by the 16:05 ET close snapshot.
+--
+-- APPLICATION: migration 3 (sector_daily_bars) in backend/database/migrations.py;
+-- the DDL there is SECTOR_DAILY_BARS_DDL in jobs/sector_bar_panel.py.
+
+CREATE TABLE IF NOT EXISTS sector_daily_bars (
+    ticker      VARCHAR(10) NOT NULL,
+    session     DATE NOT NULL,
+    close       DOUBLE PRECISION NOT NULL,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (ticker, session)
+);
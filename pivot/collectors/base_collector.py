@@ -24,6 +24,31 @@ from .config import (
 logger = logging.getLogger(__name__)
 YF_LOCK = asyncio.Lock()
 
+# One keep-alive client for every hub call instead of a new AsyncClient (and
+# TCP/TLS handshake) per request. Bound to the loop it was created on and
+# re-created if that changes, so one-shot asyncio.run() callers stay safe.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 def _clamp(value: float, low: float = -1.0, high: float = 1.0) -> float:
     return max(low, min(high, value))
@@ -70,11 +95,10 @@ async def post_json(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     for attempt in range(1, RETRY_ATTEMPTS + 1):
         try:
             payload = _sanitize_payload(payload)
-            async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-                response = await client.post(_api_url(path), json=payload, headers=_headers())
-                if response.status_code >= 400:
-                    raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
-                return response.json()
+            response = await _get_http_client().post(_api_url(path), json=payload, headers=_headers())
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+            return response.json()
         except Exception as exc:
             last_error = exc
             logger.warning(f"POST {path} failed (attempt {attempt}/{RETRY_ATTEMPTS}): {exc}")
@@ -87,11 +111,10 @@ async def get_json(path: str) -> Dict[str, Any]:
     last_error: Optional[Exception] = None
     for attempt in range(1, RETRY_ATTEMPTS + 1):
         try:
-            async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-                response = await client.get(_api_url(path), headers=_headers())
-                if response.status_code >= 400:
-                    raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
-                return response.json()
+            response = await _get_http_client().get(_api_url(path), headers=_headers())
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+            return response.json()
         except Exception as exc:
             last_error = exc
             logger.warning(f"GET {path} failed (attempt {attempt}/{RETRY_ATTEMPTS}): {exc}")
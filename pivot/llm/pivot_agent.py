@@ -4,9 +4,15 @@ OpenRouter client for Pivot.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 import httpx
 
@@ -17,6 +23,16 @@ logger = logging.getLogger(__name__)
 
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+ET = ZoneInfo("America/New_York")
+
+# Responses of dedupe_ttl calls: request key -> (expires_at monotonic, text),
+# oldest first. Only scheduled briefs opt in, so a handful of live entries is
+# normal; RESPONSE_CACHE_MAX caps it. pivot/ deploys on its own (/opt/pivot)
+# without backend/utils, hence not utils.memory_cache.
+RESPONSE_CACHE_MAX = 32
+_response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_inflight: Dict[str, "asyncio.Future[str]"] = {}
+
 
 def _extract_text_from_response(data: Dict[str, Any]) -> str:
     choices = data.get("choices")
@@ -50,26 +66,113 @@ def _extract_text_from_response(data: Dict[str, Any]) -> str:
     return str(content or "")
 
 
-def _build_openrouter_payload(messages: List[Dict[str, Any]], max_tokens: int) -> Dict[str, Any]:
-    # Inject current ET date/time so the LLM always knows when "now" is.
-    et = timezone(timedelta(hours=-5))
-    now_et = datetime.now(et)
-    date_line = (
+def _clock_line() -> str:
+    now_et = datetime.now(ET)
+    return (
         f"TODAY: {now_et.strftime('%A, %B %d, %Y')} | "
         f"Time: {now_et.strftime('%I:%M %p')} ET"
     )
-    system_content = f"{date_line}\n\n{PIVOT_SYSTEM_PROMPT}"
+
+
+def _system_message() -> Dict[str, Any]:
+    # Byte-identical on every call so the provider can cache it as the prompt
+    # prefix. Anthropic models only cache behind an explicit breakpoint;
+    # OpenAI/DeepSeek-style providers cache stable prefixes automatically.
+    if LLM_MODEL.startswith("anthropic/"):
+        return {
+            "role": "system",
+            "content": [{"type": "text", "text": PIVOT_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+        }
+    return {"role": "system", "content": PIVOT_SYSTEM_PROMPT}
+
+
+def _with_clock(message: Dict[str, Any], clock: str) -> Dict[str, Any]:
+    content = message.get("content")
+    if isinstance(content, list):
+        return {**message, "content": [{"type": "text", "text": clock}, *content]}
+    return {**message, "content": f"{clock}\n\n{content or ''}"}
+
+
+def _build_openrouter_payload(messages: List[Dict[str, Any]], max_tokens: int) -> Dict[str, Any]:
+    # Static system prompt first, conversation next, volatile data last: the
+    # current ET date/time rides on the final user turn instead of leading the
+    # system prompt, where it changed the cacheable prefix every minute.
+    messages = list(messages)
+    if messages and messages[-1].get("role") == "user":
+        messages[-1] = _with_clock(messages[-1], _clock_line())
     return {
         "model": LLM_MODEL,
         "max_tokens": max_tokens,
-        "messages": [
-            {"role": "system", "content": system_content},
-            *messages,
-        ],
+        "messages": [_system_message(), *messages],
     }
 
 
-async def call_llm_messages(messages: List[Dict[str, Any]], max_tokens: int = 1000) -> str:
+def _request_key(messages: List[Dict[str, Any]], max_tokens: int) -> str:
+    # Keyed on the caller's messages, before the clock line is added, so a
+    # retried or double-fired job a minute later still matches.
+    raw = json.dumps([LLM_MODEL, max_tokens, messages], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _remember(key: str, text: str, ttl: float) -> None:
+    now = time.monotonic()
+    _response_cache.pop(key, None)
+    _response_cache[key] = (now + ttl, text)
+    # Drop expired entries from the old end, then the oldest beyond the cap.
+    while _response_cache:
+        oldest_key, (expires, _) = next(iter(_response_cache.items()))
+        if expires > now and len(_response_cache) <= RESPONSE_CACHE_MAX:
+            break
+        del _response_cache[oldest_key]
+
+
+async def call_llm_messages(
+    messages: List[Dict[str, Any]],
+    max_tokens: int = 1000,
+    dedupe_ttl: Optional[float] = None,
+) -> str:
+    """Send `messages` after the static system prompt.
+
+    With `dedupe_ttl`, an identical request (same model, messages and
+    max_tokens) made within that many seconds reuses the earlier response,
+    and concurrent identical requests share one upstream call. Error
+    strings ("[...]") are never reused.
+    """
+    if not dedupe_ttl:
+        return await _post_openrouter(messages, max_tokens)
+
+    key = _request_key(messages, max_tokens)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            logger.info("LLM request deduplicated (cached response, %s)", key[:12])
+            return cached[1]
+        del _response_cache[key]
+    pending = _inflight.get(key)
+    if pending is not None:
+        logger.info("LLM request deduplicated (in flight, %s)", key[:12])
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        text = await _post_openrouter(messages, max_tokens)
+        if text and not text.startswith("["):
+            _remember(key, text, dedupe_ttl)
+        future.set_result(text)
+        return text
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        future.exception()      # retrieved: no warning when nobody else waits
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _post_openrouter(messages: List[Dict[str, Any]], max_tokens: int) -> str:
     if not LLM_API_KEY:
         return "[LLM disabled: LLM_API_KEY not configured]"
 
@@ -113,14 +216,20 @@ async def call_llm_messages(messages: List[Dict[str, Any]], max_tokens: int = 10
                 logger.error("OpenRouter response missing content text: %s", data)
                 return "[LLM error: empty response content from OpenRouter]"
 
+            usage = data.get("usage") or {}
+            cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+            if cached_tokens is not None:
+                logger.debug("OpenRouter prompt tokens %s (cached %s)", usage.get("prompt_tokens"), cached_tokens)
+
             return response_text
     except Exception as exc:
         logger.exception("LLM call failed: %s", exc)
         return f"[LLM error: {exc}]"
 
 
-async def call_llm(user_prompt: str, max_tokens: int = 1000) -> str:
+async def call_llm(user_prompt: str, max_tokens: int = 1000, dedupe_ttl: Optional[float] = None) -> str:
     return await call_llm_messages(
         [{"role": "user", "content": user_prompt}],
         max_tokens=max_tokens,
+        dedupe_ttl=dedupe_ttl,
     )
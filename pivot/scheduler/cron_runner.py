@@ -55,6 +55,10 @@ COOLDOWNS = {
     "economic": 7200,
 }
 
+# A brief re-run on unchanged inputs (job retry, misfire catch-up, manual
+# trigger) reuses the earlier LLM response instead of paying for it again.
+BRIEF_DEDUPE_SECONDS = 1800
+
 
 def _repeat_high_stakes_prompt(prompt: str) -> str:
     normalized = (prompt or "").strip()
@@ -267,7 +271,7 @@ async def morning_brief():
 
         data_block = json.dumps(composite, indent=2)
         prompt = build_morning_brief_prompt(data_block + search_block)
-        text = await call_llm(prompt, max_tokens=700)
+        text = await call_llm(prompt, max_tokens=700, dedupe_ttl=BRIEF_DEDUPE_SECONDS)
         await send_discord("briefs", "Morning Brief", text, priority="MEDIUM")
     except Exception as exc:
         logger.warning(f"Morning brief failed: {exc}")
@@ -299,7 +303,7 @@ async def eod_brief():
         }
 
         prompt = _repeat_high_stakes_prompt(build_eod_prompt(json.dumps(payload, indent=2)))
-        text = await call_llm(prompt, max_tokens=3000)
+        text = await call_llm(prompt, max_tokens=3000, dedupe_ttl=BRIEF_DEDUPE_SECONDS)
         await send_discord("briefs", "EOD Summary", text, priority="MEDIUM")
     except Exception as exc:
         logger.warning(f"EOD summary failed: {exc}")
@@ -335,7 +339,11 @@ def start_scheduler() -> None:
 
 async def _run_forever() -> None:
     start_scheduler()
-    await asyncio.Event().wait()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        from collectors.base_collector import close_http_client
+        await close_http_client()
 
 
 if __name__ == "__main__":